@@ -0,0 +1,200 @@
+"""
+Este módulo contiene totales de todo el banco que se mantienen al día con los
+eventos de `negocio`, para que consultarlos no requiera recorrer `cuentas`.
+
+Cada evento actualiza los totales en O(1) (más O(k) si hay k umbrales de
+saldo configurados), así que las consultas devuelven un valor ya calculado:
+
+    - cantidad de cuentas y de préstamos activos,
+    - suma de los saldos disponibles y de la deuda pendiente,
+    - total transferido entre cuentas,
+    - cantidad de cuentas con saldo mayor a cada umbral configurado,
+    - las cuentas con mayor saldo (`mayores_saldos`).
+
+Para los mayores saldos se usa un heap con el saldo negado, de modo que el
+mayor quede primero. Cuando un saldo cambia no se busca la entrada vieja: se
+agrega una nueva y la vieja queda obsoleta hasta que una consulta la
+descarta (o el heap se reconstruye porque hay demasiadas obsoletas).
+
+Estructura de los agregados:
+
+    {
+        "cantidad_cuentas": 2,
+        "cantidad_prestamos_activos": 1,
+        "total_saldos": 1500,
+        "total_deuda_pendiente": 1300,
+        "total_transferido": 200,
+        "saldos": {12345678: 1000, ...},   # último saldo conocido por cuenta
+        "cuentas_sobre_umbral": {1000: 1, ...},
+        "heap_saldos": [(-1000, 12345678), ...],
+    }
+"""
+
+import heapq
+
+import constantes
+import negocio
+
+
+def crear_agregados(cuentas: dict, umbrales: tuple[int, ...] = ()) -> dict:
+    """
+    Calcula los agregados recorriendo `cuentas` una sola vez.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+        - `umbrales` son los saldos para los que se quiere contar cuántas
+          cuentas los superan.
+    Post:
+        - Devuelve los agregados al día con `cuentas`.
+    """
+    agregados = {
+        "cantidad_cuentas": 0,
+        "cantidad_prestamos_activos": 0,
+        "total_saldos": 0,
+        "total_deuda_pendiente": 0,
+        "total_transferido": 0,
+        "saldos": {},
+        "cuentas_sobre_umbral": dict.fromkeys(umbrales, 0),
+        "heap_saldos": [],
+    }
+
+    for dni, cuenta in cuentas.items():
+        _agregar_cuenta(agregados, dni)
+        _cambiar_saldo(agregados, dni, cuenta["saldo_disponible"])
+        agregados["cantidad_prestamos_activos"] += len(cuenta["prestamos"])
+        agregados["total_deuda_pendiente"] += cuenta["deuda_pendiente"]
+
+        for monto, tipo, _ in cuenta["transferencias"]:
+            if tipo == "envia":
+                agregados["total_transferido"] += monto
+
+    return agregados
+
+
+def _agregar_cuenta(agregados: dict, dni: int) -> None:
+    """
+    Cuenta una cuenta nueva, con saldo 0.
+    """
+    agregados["cantidad_cuentas"] += 1
+    agregados["saldos"][dni] = 0
+    heapq.heappush(agregados["heap_saldos"], (0, dni))
+    for umbral in agregados["cuentas_sobre_umbral"]:
+        if umbral < 0:
+            agregados["cuentas_sobre_umbral"][umbral] += 1
+
+
+def _cambiar_saldo(agregados: dict, dni: int, saldo: int) -> None:
+    """
+    Registra el nuevo saldo de una cuenta y actualiza los totales que dependen de él.
+    """
+    saldos = agregados["saldos"]
+    anterior = saldos[dni]
+    if saldo == anterior:
+        return
+
+    saldos[dni] = saldo
+    agregados["total_saldos"] += saldo - anterior
+
+    sobre_umbral = agregados["cuentas_sobre_umbral"]
+    for umbral in sobre_umbral:
+        if anterior > umbral >= saldo:
+            sobre_umbral[umbral] -= 1
+        elif saldo > umbral >= anterior:
+            sobre_umbral[umbral] += 1
+
+    heap = agregados["heap_saldos"]
+    heapq.heappush(heap, (-saldo, dni))
+    if len(heap) > constantes.FACTOR_COMPACTACION * len(saldos) + 64:
+        _compactar(agregados)
+
+
+def _compactar(agregados: dict) -> None:
+    """
+    Reconstruye el heap con una sola entrada (la vigente) por cuenta.
+    """
+    heap = [(-saldo, dni) for dni, saldo in agregados["saldos"].items()]
+    heapq.heapify(heap)
+    agregados["heap_saldos"] = heap
+
+
+def aplicar_evento(agregados: dict, evento: dict) -> None:
+    """
+    Actualiza los agregados con un evento publicado por `negocio`.
+    """
+    tipo = evento["tipo"]
+    if tipo == constantes.EVENTO_CUENTA_REGISTRADA:
+        _agregar_cuenta(agregados, evento["dni"])
+    elif tipo == constantes.EVENTO_DINERO_ACREDITADO:
+        _cambiar_saldo(agregados, evento["dni"], evento["saldo"])
+    elif tipo == constantes.EVENTO_TRANSFERENCIA_REALIZADA:
+        agregados["total_transferido"] += evento["monto"]
+        _cambiar_saldo(agregados, evento["dni_origen"], evento["saldo_origen"])
+        _cambiar_saldo(agregados, evento["dni_destino"], evento["saldo_destino"])
+    elif tipo == constantes.EVENTO_PRESTAMO_OTORGADO:
+        agregados["cantidad_prestamos_activos"] += 1
+        agregados["total_deuda_pendiente"] += negocio.deuda_total_prestamo(
+            evento["prestamo"]
+        )
+        _cambiar_saldo(agregados, evento["dni"], evento["saldo"])
+    elif tipo == constantes.EVENTO_PRESTAMO_PAGADO:
+        agregados["total_deuda_pendiente"] -= evento["monto"]
+        if negocio.deuda_total_prestamo(evento["prestamo"]) == 0:
+            agregados["cantidad_prestamos_activos"] -= 1
+        _cambiar_saldo(agregados, evento["dni"], evento["saldo"])
+
+
+def conectar(agregados: dict, cuentas: dict):
+    """
+    Suscribe los agregados a los eventos de `negocio` sobre `cuentas` para
+    mantenerlos al día.
+
+    Post:
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        aplicar_evento(agregados, evento)
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+def cuentas_sobre_umbral(agregados: dict, umbral: int) -> int:
+    """
+    Devuelve cuántas cuentas tienen saldo mayor a `umbral`.
+
+    Pre:
+        - `umbral` es uno de los umbrales con los que se crearon los agregados.
+    """
+    return agregados["cuentas_sobre_umbral"][umbral]
+
+
+def mayores_saldos(agregados: dict, cantidad: int) -> list[tuple[int, int]]:
+    """
+    Devuelve las `cantidad` cuentas con mayor saldo disponible.
+
+    Post:
+        - Devuelve una lista de (dni, saldo), de mayor a menor saldo.
+        - Las entradas obsoletas que aparecen en el camino se descartan del heap.
+    """
+    heap = agregados["heap_saldos"]
+    saldos = agregados["saldos"]
+
+    resultado = []
+    vigentes = []
+    vistos = set()
+    while heap and len(resultado) < cantidad:
+        entrada = heapq.heappop(heap)
+        saldo_negado, dni = entrada
+        # una entrada es vigente si coincide con el último saldo de la cuenta;
+        # si el saldo volvió a un valor anterior puede haber dos vigentes iguales
+        if saldos[dni] != -saldo_negado or dni in vistos:
+            continue
+        vistos.add(dni)
+        vigentes.append(entrada)
+        resultado.append((dni, -saldo_negado))
+
+    for entrada in vigentes:
+        heapq.heappush(heap, entrada)
+    return resultado
@@ -0,0 +1,130 @@
+"""
+Pruebas de los totales del banco mantenidos con eventos (`agregados`).
+
+Se pueden correr con pytest o directamente con `python agregados_test.py`.
+"""
+
+import random
+
+import agregados
+import constantes
+import negocio
+
+UMBRALES = (-1, 0, 1_000, 50_000)
+
+
+def _recalcular(cuentas: dict) -> dict:
+    """Calcula desde cero lo que deberían valer los agregados."""
+    saldos = {dni: cuenta["saldo_disponible"] for dni, cuenta in cuentas.items()}
+    return {
+        "cantidad_cuentas": len(cuentas),
+        "cantidad_prestamos_activos": sum(
+            len(cuenta["prestamos"]) for cuenta in cuentas.values()
+        ),
+        "total_saldos": sum(saldos.values()),
+        "total_deuda_pendiente": sum(
+            cuenta["deuda_pendiente"] for cuenta in cuentas.values()
+        ),
+        "cuentas_sobre_umbral": {
+            umbral: sum(saldo > umbral for saldo in saldos.values())
+            for umbral in UMBRALES
+        },
+        "mayores_saldos": sorted(saldos.items(), key=lambda par: (-par[1], par[0]))[
+            :10
+        ],
+    }
+
+
+def _consultar(ag: dict) -> dict:
+    """Devuelve los mismos datos que `_recalcular`, leídos de los agregados."""
+    return {
+        "cantidad_cuentas": ag["cantidad_cuentas"],
+        "cantidad_prestamos_activos": ag["cantidad_prestamos_activos"],
+        "total_saldos": ag["total_saldos"],
+        "total_deuda_pendiente": ag["total_deuda_pendiente"],
+        "cuentas_sobre_umbral": {
+            umbral: agregados.cuentas_sobre_umbral(ag, umbral) for umbral in UMBRALES
+        },
+        "mayores_saldos": agregados.mayores_saldos(ag, 10),
+    }
+
+
+def test_01_cuentas_nuevas_entran_en_los_mayores_saldos():
+    cuentas = {}
+    ag = agregados.crear_agregados(cuentas, UMBRALES)
+    observador = agregados.conectar(ag, cuentas)
+    try:
+        negocio.registrar_cuenta(cuentas, "Ana Lopez", 1)
+        negocio.registrar_cuenta(cuentas, "Juan Perez", 2)
+        negocio.acreditar_dinero(cuentas, 1, 100)
+        assert agregados.mayores_saldos(ag, 5) == [(1, 100), (2, 0)]
+
+        negocio.transferir_dinero(cuentas, 1, 2, 100)
+        assert agregados.mayores_saldos(ag, 5) == [(2, 100), (1, 0)]
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    # lo mismo creando los agregados desde cuentas existentes
+    ag = agregados.crear_agregados(cuentas, UMBRALES)
+    assert agregados.mayores_saldos(ag, 5) == [(2, 100), (1, 0)]
+
+
+def test_02_cien_mil_operaciones_al_azar():
+    generador = random.Random(0)
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Cliente Inicial", 10_000_000)
+    negocio.acreditar_dinero(cuentas, 10_000_000, 5_000)
+    ag = agregados.crear_agregados(cuentas, UMBRALES)
+    observador = agregados.conectar(ag, cuentas)
+    dnis = [10_000_000]
+    try:
+        for numero in range(1, 100_001):
+            eleccion = generador.random()
+            if eleccion < 0.05 or len(dnis) < 2:
+                dni = 10_000_000 + len(dnis)
+                negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+                dnis.append(dni)
+            elif eleccion < 0.3:
+                negocio.acreditar_dinero(
+                    cuentas, generador.choice(dnis), generador.randint(1, 3_000)
+                )
+            elif eleccion < 0.85:
+                origen, destino = generador.sample(dnis, 2)
+                negocio.transferir_dinero(
+                    cuentas, origen, destino, generador.randint(1, 2_000)
+                )
+            elif eleccion < 0.9:
+                negocio.otorgar_prestamo(
+                    cuentas, generador.choice(dnis), 10, generador.randint(500, 5_000)
+                )
+            else:
+                cuenta = cuentas[generador.choice(dnis)]
+                if cuenta["prestamos"]:
+                    prestamo = next(iter(cuenta["prestamos"].values()))
+                    monto = min(cuenta["saldo_disponible"], generador.randint(1, 3_000))
+                    if monto > 0:
+                        negocio.pagar_prestamo(cuenta, prestamo, monto)
+
+            if numero % 10_000 == 0:
+                assert _consultar(ag) == _recalcular(cuentas), numero
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    # el heap no crece sin límite
+    assert len(ag["heap_saldos"]) <= (
+        constantes.FACTOR_COMPACTACION * len(cuentas) + 64
+    )
+
+
+def main():
+    pruebas = [
+        test_01_cuentas_nuevas_entran_en_los_mayores_saldos,
+        test_02_cien_mil_operaciones_al_azar,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Este módulo contiene el alta masiva de cuentas desde un archivo CSV.
+
+El archivo tiene encabezado con (al menos) las columnas `nombre` y `dni`, y
+puede tener millones de filas. El alta se hace en tres pasos:
+
+    1. Validación en paralelo: las filas se leen en partes de
+       `FILAS_POR_PARTE_ALTAS` y un pool de procesos valida cada parte con
+       las mismas reglas que `validaciones` (nombre y formato de DNI).
+    2. Duplicados: el proceso principal recibe las filas válidas en orden y
+       descarta, con un diccionario por DNI, las que ya tienen cuenta o
+       repiten un DNI de una fila anterior del archivo.
+    3. Alta: todas las cuentas nuevas se agregan juntas a `cuentas` con
+       `negocio.registrar_cuentas`.
+
+Cada fila rechazada se escribe en un CSV de rechazos con el número de línea,
+los valores originales y el motivo (`ENCABEZADO_RECHAZOS_ALTAS`). Si el
+archivo tiene errores, las filas válidas igualmente se dan de alta.
+"""
+
+import csv
+import gc
+import itertools
+import multiprocessing
+import sys
+from typing import Iterator
+
+import constantes
+import negocio
+import validaciones
+
+
+def _validar_parte(filas: list[tuple]) -> tuple[list[tuple], list[tuple]]:
+    """
+    Valida una parte de filas (línea, nombre, dni) en un proceso del pool.
+
+    Post:
+        - Devuelve (válidas, rechazadas): las válidas como (línea, nombre,
+          dni entero, dni original) y las rechazadas como (línea, nombre, dni, motivo).
+    """
+    validas = []
+    rechazadas = []
+    for linea, nombre, texto_dni in filas:
+        if not validaciones.es_nombre_apellido_valido(nombre):
+            rechazadas.append(
+                (linea, nombre, texto_dni, constantes.MSG_NOMBRE_INVALIDO)
+            )
+            continue
+
+        dni = validaciones.convertir_dni(texto_dni)
+        if dni is None:
+            rechazadas.append((linea, nombre, texto_dni, constantes.MSG_DNI_INVALIDO))
+            continue
+
+        validas.append((linea, nombre, dni, texto_dni))
+    return validas, rechazadas
+
+
+def _leer_partes(lector, columna_nombre: int, columna_dni: int) -> Iterator[list]:
+    """
+    Recorre las filas del CSV y las devuelve en partes de `FILAS_POR_PARTE_ALTAS`
+    filas (línea, nombre, dni), con las celdas sin espacios en los extremos.
+    """
+    ultima_columna = max(columna_nombre, columna_dni)
+    while True:
+        parte = []
+        for fila in itertools.islice(lector, constantes.FILAS_POR_PARTE_ALTAS):
+            if len(fila) <= ultima_columna:
+                fila = fila + [""] * (ultima_columna + 1 - len(fila))
+            parte.append(
+                (
+                    lector.line_num,
+                    fila[columna_nombre].strip(),
+                    fila[columna_dni].strip(),
+                )
+            )
+        if not parte:
+            return
+        yield parte
+
+
+def _crear_pool(procesos: int | None):
+    """
+    Crea el pool de procesos, con "fork" si el sistema lo permite.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context("fork")
+    else:
+        contexto = multiprocessing.get_context()
+    return contexto.Pool(procesos)
+
+
+def importar(
+    cuentas: dict, ruta_entrada: str, ruta_rechazos: str, procesos: int | None = None
+) -> tuple[int, int] | None:
+    """
+    Da de alta las cuentas de un CSV y escribe las filas rechazadas con su motivo.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+        - `ruta_entrada` es un CSV con encabezado que incluye `nombre` y `dni`.
+        - `procesos` es la cantidad de procesos (None: uno por CPU; 1: sin pool).
+    Post:
+        - Se agregan a `cuentas` las filas válidas, con DNI nuevo y no repetido
+          en el archivo (de un DNI repetido se da de alta la primera fila).
+        - `ruta_rechazos` es un CSV con `ENCABEZADO_RECHAZOS_ALTAS` y una fila
+          por rechazo, en el orden del archivo de entrada.
+        - Devuelve (aceptadas, rechazadas), o None si no se pudieron abrir o
+          leer los archivos (por ejemplo, una entrada que no es UTF-8 o un CSV
+          mal formado) o el encabezado no tiene las columnas `nombre` y `dni`.
+          En ese caso no se agrega ninguna cuenta.
+    """
+    vistos = {}  # dni -> (línea, nombre) de las filas aceptadas
+    rechazadas = 0
+
+    try:
+        with open(ruta_entrada, "r", encoding="utf8", newline="") as entrada, open(
+            ruta_rechazos,
+            "w",
+            encoding="utf8",
+            newline="",
+            buffering=constantes.TAMANIO_BUFFER_LOTE,
+        ) as salida:
+            lector = csv.reader(entrada)
+            encabezado = [columna.strip() for columna in next(lector, [])]
+            if "nombre" not in encabezado or "dni" not in encabezado:
+                return None
+
+            escritor = csv.writer(salida)
+            escritor.writerow(constantes.ENCABEZADO_RECHAZOS_ALTAS)
+
+            partes = _leer_partes(
+                lector, encabezado.index("nombre"), encabezado.index("dni")
+            )
+            if procesos == 1:
+                pool = None
+                resultados = map(_validar_parte, partes)
+            else:
+                pool = _crear_pool(procesos)
+                # imap respeta el orden de las partes: la primera fila de un DNI gana
+                resultados = pool.imap(_validar_parte, partes)
+
+            try:
+                for validas, rechazos in resultados:
+                    for linea, nombre, dni, texto_dni in validas:
+                        if dni in cuentas:
+                            motivo = constantes.MSG_CUENTA_EXISTE.format(
+                                nombre=cuentas[dni]["nombre_apellido"]
+                            )
+                        elif dni in vistos:
+                            motivo = constantes.MSG_DNI_REPETIDO_ALTAS.format(
+                                linea=vistos[dni][0]
+                            )
+                        else:
+                            vistos[dni] = (linea, nombre)
+                            continue
+                        rechazos.append((linea, nombre, texto_dni, motivo))
+
+                    rechazos.sort()
+                    escritor.writerows(rechazos)
+                    rechazadas += len(rechazos)
+            finally:
+                if pool is not None:
+                    pool.terminate()
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+
+    # el alta crea millones de diccionarios y listas que nunca forman ciclos;
+    # sin pausar el recolector de ciclos se recorrerían una y otra vez
+    recolector_activo = gc.isenabled()
+    gc.disable()
+    try:
+        negocio.registrar_cuentas(
+            cuentas, ((dni, nombre) for dni, (_, nombre) in vistos.items())
+        )
+    finally:
+        if recolector_activo:
+            gc.enable()
+    return len(vistos), rechazadas
+
+
+def main():
+    """
+    Punto de entrada del alta masiva.
+
+    Post:
+        - Da de alta el archivo indicado sobre un diccionario `cuentas` vacío
+          e imprime la cantidad de filas aceptadas y rechazadas.
+    """
+    if not 3 <= len(sys.argv) <= 4:
+        print(constantes.MSG_USO_ALTAS)
+        return
+
+    procesos = int(sys.argv[3]) if len(sys.argv) == 4 else None
+    resultado = importar({}, sys.argv[1], sys.argv[2], procesos)
+    if resultado is None:
+        print(constantes.MSG_INPUT_INVALIDO)
+        return
+
+    aceptadas, rechazadas = resultado
+    print(
+        constantes.MSG_RESUMEN_LOTE.format(aceptados=aceptadas, rechazados=rechazadas)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Pruebas del alta masiva de cuentas (`altas`).
+
+Se pueden correr con pytest o directamente con `python altas_test.py`.
+"""
+
+import csv
+import os
+import tempfile
+
+import altas
+import constantes
+import negocio
+
+
+def _importar(cuentas: dict, contenido: bytes, procesos: int | None = 1) -> tuple:
+    """
+    Escribe `contenido` en un CSV temporal, lo importa sobre `cuentas` y
+    devuelve (resultado, filas del archivo de rechazos o None si no existe).
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, "altas.csv")
+        rechazos = os.path.join(directorio, "rechazos.csv")
+        with open(entrada, "wb") as archivo:
+            archivo.write(contenido)
+
+        resultado = altas.importar(cuentas, entrada, rechazos, procesos)
+        if not os.path.exists(rechazos):
+            return resultado, None
+        with open(rechazos, encoding="utf8", newline="") as archivo:
+            return resultado, list(csv.reader(archivo))
+
+
+def test_01_motivos_de_rechazo():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Eva Diaz", 34_567_890)
+
+    contenido = (
+        "dni, nombre ,otra\n"
+        "12.345.678,Ana Lopez,x\n"
+        "23.456.789,Juan 2,x\n"
+        "12345678,Juan Perez,x\n"
+        "34.567.890,Eva Otra,x\n"
+        "12.345.678,Ana Repetida,x\n"
+        "23.456.789\n"
+        " 45.678.901 ,  José Gómez  \n"
+    )
+    resultado, rechazos = _importar(cuentas, contenido.encode())
+    assert resultado == (2, 5)
+    assert rechazos == [
+        list(constantes.ENCABEZADO_RECHAZOS_ALTAS),
+        ["3", "Juan 2", "23.456.789", constantes.MSG_NOMBRE_INVALIDO],
+        ["4", "Juan Perez", "12345678", constantes.MSG_DNI_INVALIDO],
+        ["5", "Eva Otra", "34.567.890", constantes.MSG_CUENTA_EXISTE.format(nombre="Eva Diaz")],
+        ["6", "Ana Repetida", "12.345.678", constantes.MSG_DNI_REPETIDO_ALTAS.format(linea=2)],
+        ["7", "", "23.456.789", constantes.MSG_NOMBRE_INVALIDO],
+    ]  # fmt: skip
+
+    # la primera fila de un DNI gana; la cuenta existente no se toca
+    assert list(cuentas) == [34_567_890, 12_345_678, 45_678_901]
+    assert cuentas[12_345_678]["nombre_apellido"] == "Ana Lopez"
+    assert cuentas[45_678_901]["nombre_apellido"] == "José Gómez"
+    assert cuentas[34_567_890]["nombre_apellido"] == "Eva Diaz"
+
+
+def test_02_archivos_que_no_se_pueden_leer():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Eva Diaz", 34_567_890)
+    antes = dict(cuentas)
+
+    # sin las columnas necesarias
+    assert _importar(cuentas, b"nombre,documento\nAna Lopez,12.345.678\n")[0] is None
+    assert _importar(cuentas, b"")[0] is None
+
+    # una entrada que no es UTF-8, después de filas válidas
+    contenido = "nombre,dni\nAna Lopez,12.345.678\nJosé Gómez,23.456.789\n"
+    assert _importar(cuentas, contenido.encode("latin-1"))[0] is None
+
+    # una celda más larga que el límite del módulo csv
+    celda = "a" * (csv.field_size_limit() + 1)
+    contenido = f"nombre,dni\nAna Lopez,12.345.678\n{celda},23.456.789\n"
+    assert _importar(cuentas, contenido.encode())[0] is None
+
+    # un archivo que no existe
+    with tempfile.TemporaryDirectory() as directorio:
+        assert (
+            altas.importar(
+                cuentas,
+                os.path.join(directorio, "no_existe.csv"),
+                os.path.join(directorio, "rechazos.csv"),
+            )
+            is None
+        )
+
+    # ninguno dio de alta cuentas
+    assert cuentas == antes
+
+
+def test_03_en_paralelo_igual_que_secuencial():
+    filas = constantes.FILAS_POR_PARTE_ALTAS * 2 + 500
+    lineas = ["nombre,dni"]
+    for numero in range(filas):
+        dni = 10_000_000 + numero % (filas - 300)  # las últimas 300 repiten un DNI
+        texto_dni = f"{dni // 1_000_000}.{dni // 1_000 % 1_000:03}.{dni % 1_000:03}"
+        nombre = "Cliente Prueba" if numero % 97 else "Cliente 97"
+        lineas.append(f"{nombre},{texto_dni}")
+    contenido = ("\n".join(lineas) + "\n").encode()
+
+    cuentas_secuencial = {}
+    secuencial = _importar(cuentas_secuencial, contenido, procesos=1)
+    cuentas_paralelo = {}
+    paralelo = _importar(cuentas_paralelo, contenido, procesos=2)
+
+    assert paralelo == secuencial
+    assert cuentas_paralelo == cuentas_secuencial
+    aceptadas, rechazadas = secuencial[0]
+    assert aceptadas + rechazadas == filas
+    assert aceptadas == len(cuentas_secuencial)
+    # los rechazos quedan en el orden del archivo
+    rechazos = secuencial[1][1:]
+    assert len(rechazos) == rechazadas
+    assert [int(fila[0]) for fila in rechazos] == sorted(
+        int(fila[0]) for fila in rechazos
+    )
+    # la última fila repite el DNI de la fila 299 (línea 301), en otra parte
+    assert rechazos[-1] == [
+        str(filas + 1),
+        "Cliente Prueba",
+        "10.000.299",
+        constantes.MSG_DNI_REPETIDO_ALTAS.format(linea=301),
+    ]
+
+
+def main():
+    pruebas = [
+        test_01_motivos_de_rechazo,
+        test_02_archivos_que_no_se_pueden_leer,
+        test_03_en_paralelo_igual_que_secuencial,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Este módulo contiene los cronogramas de cuotas de los préstamos.
+
+La deuda de un préstamo es capital + impuestos + intereses (`cargos_prestamo`).
+`negocio.otorgar_prestamo` cotiza cada préstamo con `cotizar_prestamo` y
+guarda su plazo ("cantidad_cuotas"). Un cronograma divide la deuda en cuotas
+iguales (las primeras absorben el resto de la división) y reparte cada cuota
+entre impuestos, intereses y capital en el orden de
+`constantes.PRIORIDADES_PAGO`, igual que un pago real.
+
+Muchos clientes toman el mismo producto (mismo capital, tasa y cantidad de
+cuotas), así que los cronogramas se guardan en un caché LRU acotado. Cada
+cronograma es una tupla de tuplas: el mismo objeto se comparte entre todos
+los que lo piden y nadie puede modificarlo.
+
+Cada cuota del cronograma es la tupla:
+
+    (numero, monto, impuestos, intereses, capital, deuda_restante)
+"""
+
+from functools import lru_cache
+
+import constantes
+
+# posición de cada campo dentro de la tupla de una cuota
+CUOTA_NUMERO = 0
+CUOTA_MONTO = 1
+CUOTA_IMPUESTOS = 2
+CUOTA_INTERESES = 3
+CUOTA_CAPITAL = 4
+CUOTA_DEUDA_RESTANTE = 5
+
+
+def cargos_prestamo(monto: int, interes: int) -> tuple[int, int]:
+    """
+    Devuelve (impuestos, intereses) de un préstamo de `monto` con tasa `interes`,
+    ambos fijos sobre el monto original.
+    """
+    impuestos = (constantes.IMPUESTOS_PRESTAMO * monto) // 100
+    intereses = (interes * monto) // 100
+    return impuestos, intereses
+
+
+def deuda_original(capital: int, tasa_interes: int) -> tuple[int, int, int]:
+    """
+    Devuelve (impuestos, intereses, capital) de un préstamo recién otorgado,
+    en el orden de `PRIORIDADES_PAGO`.
+    """
+    impuestos, intereses = cargos_prestamo(capital, tasa_interes)
+    return impuestos, intereses, capital
+
+
+@lru_cache(maxsize=constantes.TAMANIO_CACHE_CRONOGRAMAS)
+def cronograma(capital: int, tasa_interes: int, cantidad_cuotas: int) -> tuple:
+    """
+    Genera el cronograma de cuotas de un préstamo.
+
+    Pre:
+        - `capital` y `tasa_interes` ya fueron validados.
+        - `cantidad_cuotas` es un entero positivo.
+    Post:
+        - Devuelve una tupla con una cuota por elemento (ver el formato arriba).
+        - La suma de los montos es la deuda total, y la de cada componente es
+          el total original de ese componente.
+        - Llamadas con los mismos argumentos devuelven el mismo objeto.
+    """
+    pendientes = list(deuda_original(capital, tasa_interes))
+    deuda_restante = sum(pendientes)
+    base, resto = divmod(deuda_restante, cantidad_cuotas)
+
+    cuotas = []
+    for numero in range(1, cantidad_cuotas + 1):
+        monto = base + 1 if numero <= resto else base
+
+        # mismo reparto que `negocio.distribuir_pago`
+        reparto = []
+        restante = monto
+        for indice, pendiente in enumerate(pendientes):
+            aplicado = min(restante, pendiente)
+            pendientes[indice] -= aplicado
+            restante -= aplicado
+            reparto.append(aplicado)
+
+        deuda_restante -= monto
+        cuotas.append((numero, monto, *reparto, deuda_restante))
+
+    return tuple(cuotas)
+
+
+def cotizar_prestamo(capital: int, tasa_interes: int, cantidad_cuotas: int) -> dict:
+    """
+    Devuelve la cotización de un préstamo sin otorgarlo.
+
+    Pre:
+        - Los mismos que `cronograma`.
+    Post:
+        - Devuelve {"cuota": monto de la primera (la mayor) cuota,
+          "cantidad_cuotas", "impuestos", "intereses", "capital", "total"}.
+    """
+    cuotas = cronograma(capital, tasa_interes, cantidad_cuotas)
+    impuestos, intereses, _ = deuda_original(capital, tasa_interes)
+    return {
+        "cuota": cuotas[0][CUOTA_MONTO],
+        "cantidad_cuotas": cantidad_cuotas,
+        "impuestos": impuestos,
+        "intereses": intereses,
+        "capital": capital,
+        "total": capital + impuestos + intereses,
+    }
+
+
+def cronograma_de_prestamo(prestamo: dict) -> tuple:
+    """
+    Devuelve el cronograma de un préstamo de `estructura_cuentas`, con el
+    plazo con que se otorgó.
+    """
+    return cronograma(
+        prestamo["monto_capital_original"],
+        prestamo["tasa_interes"],
+        prestamo["cantidad_cuotas"],
+    )
+
+
+def cuota_pendiente(cuotas: tuple, deuda_restante: int) -> tuple:
+    """
+    Devuelve la primera cuota del cronograma que todavía no está cubierta.
+
+    Pre:
+        - `cuotas` es un cronograma y `deuda_restante` es lo que falta pagar
+          del préstamo, mayor que cero.
+    Post:
+        - Devuelve la tupla de la cuota. Si se pagó en parte, lo que falta de
+          ella es `deuda_restante - cuota[CUOTA_DEUDA_RESTANTE]`.
+    """
+    # la deuda restante después de cada cuota decrece: búsqueda binaria
+    inicio = 0
+    fin = len(cuotas) - 1
+    while inicio < fin:
+        medio = (inicio + fin) // 2
+        if cuotas[medio][CUOTA_DEUDA_RESTANTE] >= deuda_restante:
+            inicio = medio + 1
+        else:
+            fin = medio
+    return cuotas[inicio]
+
+
+def proxima_cuota(prestamo: dict) -> tuple | None:
+    """
+    Devuelve la cuota vigente de un préstamo de `estructura_cuentas`, o None
+    si el préstamo está saldado.
+    """
+    # la misma deuda que `negocio.deuda_total_prestamo`
+    deuda_restante = (
+        prestamo["impuestos_pendientes"]
+        + prestamo["intereses_pendientes"]
+        + prestamo["capital_pendiente"]
+    )
+    if deuda_restante == 0:
+        return None
+
+    return cuota_pendiente(cronograma_de_prestamo(prestamo), deuda_restante)
+
+
+def estadisticas_cache():
+    """
+    Devuelve los aciertos, fallos y tamaño del caché de cronogramas.
+    """
+    return cronograma.cache_info()
+
+
+def vaciar_cache() -> None:
+    """
+    Descarta todos los cronogramas guardados.
+    """
+    cronograma.cache_clear()
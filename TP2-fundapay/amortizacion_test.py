@@ -0,0 +1,154 @@
+"""
+Pruebas de los cronogramas de cuotas (`amortizacion`).
+
+Se pueden correr con pytest o directamente con `python amortizacion_test.py`.
+"""
+
+import random
+
+import amortizacion
+import negocio
+
+DNI = 12_345_678
+
+
+def _otorgar(
+    capital: int, tasa_interes: int, cantidad_cuotas: int
+) -> tuple[dict, dict]:
+    """Crea una cuenta con un préstamo nuevo. Devuelve (cuenta, préstamo)."""
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", DNI)
+    negocio.acreditar_dinero(cuentas, DNI, 10**9)
+    negocio.otorgar_prestamo(cuentas, DNI, tasa_interes, capital, cantidad_cuotas)
+    cuenta = cuentas[DNI]
+    return cuenta, cuenta["prestamos"][1]
+
+
+def test_01_cronograma_cubre_la_deuda_original():
+    generador = random.Random(1)
+    for _ in range(200):
+        capital = generador.randint(100, 100_000)
+        tasa = generador.randint(5, 80)
+        cantidad = generador.randint(1, 36)
+        _, prestamo = _otorgar(capital, tasa, cantidad)
+        assert prestamo["cantidad_cuotas"] == cantidad
+
+        cuotas = amortizacion.cronograma(capital, tasa, cantidad)
+        assert [cuota[amortizacion.CUOTA_NUMERO] for cuota in cuotas] == list(
+            range(1, cantidad + 1)
+        )
+        montos = [cuota[amortizacion.CUOTA_MONTO] for cuota in cuotas]
+        # cuotas iguales salvo el resto, que absorben las primeras
+        assert max(montos) - min(montos) <= 1
+        assert montos == sorted(montos, reverse=True)
+
+        # la misma deuda que otorgó negocio, componente por componente
+        assert sum(montos) == negocio.deuda_total_prestamo(prestamo)
+        for campo, posicion in (
+            ("impuestos_total_original", amortizacion.CUOTA_IMPUESTOS),
+            ("intereses_total_original", amortizacion.CUOTA_INTERESES),
+            ("monto_capital_original", amortizacion.CUOTA_CAPITAL),
+        ):
+            assert sum(cuota[posicion] for cuota in cuotas) == prestamo[campo]
+        assert cuotas[-1][amortizacion.CUOTA_DEUDA_RESTANTE] == 0
+
+
+def test_02_pagar_las_cuotas_reparte_igual_que_negocio():
+    cuenta, prestamo = _otorgar(12_345, 17, 12)
+    cuotas = amortizacion.cronograma_de_prestamo(prestamo)
+    assert cuotas is amortizacion.cronograma(12_345, 17, 12)
+
+    for cuota in cuotas:
+        assert amortizacion.proxima_cuota(prestamo) is cuota
+        antes = dict(prestamo)
+        negocio.pagar_prestamo(cuenta, prestamo, cuota[amortizacion.CUOTA_MONTO])
+
+        assert (
+            prestamo["total_pagado_impuestos"] - antes["total_pagado_impuestos"]
+            == cuota[amortizacion.CUOTA_IMPUESTOS]
+        )
+        assert (
+            prestamo["total_pagado_intereses"] - antes["total_pagado_intereses"]
+            == cuota[amortizacion.CUOTA_INTERESES]
+        )
+        assert (
+            prestamo["total_pagado_capital"] - antes["total_pagado_capital"]
+            == cuota[amortizacion.CUOTA_CAPITAL]
+        )
+        assert (
+            negocio.deuda_total_prestamo(prestamo)
+            == cuota[amortizacion.CUOTA_DEUDA_RESTANTE]
+        )
+
+    # saldado: no hay cuota vigente
+    assert amortizacion.proxima_cuota(prestamo) is None
+    assert prestamo["id_prestamo"] not in cuenta["prestamos"]
+
+
+def test_03_cuota_pendiente_con_pagos_parciales():
+    cuotas = amortizacion.cronograma(10_000, 10, 7)
+    deuda_total = cuotas[0][amortizacion.CUOTA_MONTO] + (
+        cuotas[0][amortizacion.CUOTA_DEUDA_RESTANTE]
+    )
+
+    for deuda_restante in range(1, deuda_total + 1):
+        # la primera cuota cuya deuda restante queda por debajo de lo que falta
+        esperada = next(
+            cuota
+            for cuota in cuotas
+            if cuota[amortizacion.CUOTA_DEUDA_RESTANTE] < deuda_restante
+        )
+        assert amortizacion.cuota_pendiente(cuotas, deuda_restante) is esperada
+
+    cuenta, prestamo = _otorgar(10_000, 10, 7)
+    negocio.pagar_prestamo(cuenta, prestamo, cuotas[0][amortizacion.CUOTA_MONTO] + 5)
+    cuota = amortizacion.proxima_cuota(prestamo)
+    assert cuota is cuotas[1]
+    # lo que falta de la cuota vigente
+    faltante = negocio.deuda_total_prestamo(prestamo) - (
+        cuota[amortizacion.CUOTA_DEUDA_RESTANTE]
+    )
+    assert faltante == cuota[amortizacion.CUOTA_MONTO] - 5
+
+
+def test_04_cache_y_cotizacion():
+    amortizacion.vaciar_cache()
+    primero = amortizacion.cronograma(5_000, 12, 6)
+    assert amortizacion.cronograma(5_000, 12, 6) is primero
+    estadisticas = amortizacion.estadisticas_cache()
+    assert (estadisticas.hits, estadisticas.misses) == (1, 1)
+
+    impuestos, intereses = amortizacion.cargos_prestamo(5_000, 12)
+    assert amortizacion.deuda_original(5_000, 12) == (impuestos, intereses, 5_000)
+    assert amortizacion.cotizar_prestamo(5_000, 12, 6) == {
+        "cuota": primero[0][amortizacion.CUOTA_MONTO],
+        "cantidad_cuotas": 6,
+        "impuestos": impuestos,
+        "intereses": intereses,
+        "capital": 5_000,
+        "total": 5_000 + impuestos + intereses,
+    }
+
+    # otorgar un préstamo del mismo producto lo cotiza con el mismo cronograma
+    _, prestamo = _otorgar(5_000, 12, 6)
+    assert amortizacion.estadisticas_cache().hits == 3
+    assert amortizacion.cronograma_de_prestamo(prestamo) is primero
+
+    amortizacion.vaciar_cache()
+    assert amortizacion.estadisticas_cache().currsize == 0
+
+
+def main():
+    pruebas = [
+        test_01_cronograma_cubre_la_deuda_original,
+        test_02_pagar_las_cuotas_reparte_igual_que_negocio,
+        test_03_cuota_pendiente_con_pagos_parciales,
+        test_04_cache_y_cotizacion,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+Este módulo contiene el archivo en disco de las transferencias viejas.
+
+Cuando está conectado (`conectar`), cada cuenta guarda en memoria solo sus
+últimas transferencias (entre `TRANSFERENCIAS_EN_MEMORIA` y el doble) y las
+más viejas se agregan al final de un archivo binario. La memoria ocupada ya
+no crece con la cantidad de transferencias; el historial completo se lee del
+disco solo cuando se pide (`historial_completo`).
+
+El archivo empieza con un encabezado de 5 bytes, b"FPTA" y el número de
+versión del formato (`VERSION_FORMATO`), y sigue con una secuencia de
+bloques, uno por cada grupo de transferencias archivadas de una cuenta:
+
+    varint(dni) varint(largo del contenido) contenido
+
+y el contenido es la cantidad de transferencias seguida de cada una:
+
+    varint(zigzag(monto - monto anterior) * 2 + tipo)   # tipo: 0 envía, 1 recibe
+    varint(zigzag(dni_contraparte - dni_contraparte anterior))
+
+Los enteros se escriben en varint (7 bits por byte, el bit alto indica que
+sigue otro byte) y las diferencias en zigzag (0, -1, 1, -2, ... -> 0, 1, 2,
+3, ...), así que montos parecidos y contrapartes repetidas ocupan uno o dos
+bytes. La versión 1 del formato no tenía encabezado y guardaba además el
+nombre de la contraparte; esos archivos se rechazan al abrirlos (ValueError).
+
+El índice en memoria guarda, por DNI, la posición de cada bloque; al
+abrir un archivo existente se reconstruye leyendo solo los encabezados, y un
+último bloque incompleto se descarta.
+
+Estructura del archivo abierto:
+
+    {
+        "archivo": archivo binario abierto para agregar y leer,
+        "indice": {dni: [posicion_bloque, ...]},
+        "cerrojo": threading.Lock(),   # por si se usa desde `concurrencia`
+        "descartados": bytes de un bloque incompleto quitados al abrir,
+    }
+"""
+
+import os
+import threading
+
+import constantes
+import negocio
+
+_TIPOS = ("envia", "recibe")
+
+VERSION_FORMATO = 2
+_ENCABEZADO_ARCHIVO = b"FPTA" + bytes([VERSION_FORMATO])
+
+
+def _escribir_varint(salida: bytearray, valor: int) -> None:
+    """
+    Agrega un entero no negativo en formato varint.
+    """
+    while valor >= 0x80:
+        salida.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    salida.append(valor)
+
+
+def _leer_varint(datos: bytes, posicion: int) -> tuple[int, int]:
+    """
+    Lee un varint desde `posicion` y devuelve (valor, posición siguiente).
+    """
+    valor = 0
+    desplazamiento = 0
+    while True:
+        byte = datos[posicion]
+        posicion += 1
+        valor |= (byte & 0x7F) << desplazamiento
+        if byte < 0x80:
+            return valor, posicion
+        desplazamiento += 7
+
+
+def _zigzag(valor: int) -> int:
+    """
+    Convierte un entero con signo en uno no negativo (0, -1, 1, -2 -> 0, 1, 2, 3).
+    """
+    return valor * 2 if valor >= 0 else -valor * 2 - 1
+
+
+def _deszigzag(valor: int) -> int:
+    """
+    Inversa de `_zigzag`.
+    """
+    return valor // 2 if valor % 2 == 0 else -(valor + 1) // 2
+
+
+def codificar_bloque(transferencias: list[tuple]) -> bytes:
+    """
+    Codifica una lista de registros de transferencia (el contenido de un bloque).
+    """
+    contenido = bytearray()
+    _escribir_varint(contenido, len(transferencias))
+
+    monto_anterior = 0
+    dni_anterior = 0
+    for monto, tipo, dni_contraparte in transferencias:
+        _escribir_varint(
+            contenido, _zigzag(monto - monto_anterior) * 2 + _TIPOS.index(tipo)
+        )
+        _escribir_varint(contenido, _zigzag(dni_contraparte - dni_anterior))
+        monto_anterior = monto
+        dni_anterior = dni_contraparte
+
+    return bytes(contenido)
+
+
+def decodificar_bloque(contenido: bytes) -> list[tuple]:
+    """
+    Decodifica el contenido de un bloque (inversa de `codificar_bloque`).
+    """
+    cantidad, posicion = _leer_varint(contenido, 0)
+
+    transferencias = []
+    monto = 0
+    dni_contraparte = 0
+    for _ in range(cantidad):
+        valor, posicion = _leer_varint(contenido, posicion)
+        monto += _deszigzag(valor // 2)
+        tipo = _TIPOS[valor % 2]
+
+        valor, posicion = _leer_varint(contenido, posicion)
+        dni_contraparte += _deszigzag(valor)
+
+        transferencias.append((monto, tipo, dni_contraparte))
+
+    return transferencias
+
+
+def _leer_encabezado(archivo, posicion: int) -> tuple[int, int, int] | None:
+    """
+    Lee el encabezado del bloque en `posicion` y devuelve (dni, posición del
+    contenido, largo del contenido), o None si el archivo termina antes.
+    """
+    archivo.seek(posicion)
+    # encabezado: a lo sumo 10 bytes por varint
+    encabezado = archivo.read(20)
+    try:
+        dni, salto = _leer_varint(encabezado, 0)
+        largo, salto = _leer_varint(encabezado, salto)
+    except IndexError:
+        return None
+    return dni, posicion + salto, largo
+
+
+def abrir_archivo(ruta: str) -> dict:
+    """
+    Abre (o crea) un archivo de transferencias y arma su índice.
+
+    Post:
+        - Si el archivo no existía (o está vacío), se crea con el encabezado
+          de `VERSION_FORMATO`.
+        - Si el archivo ya existía, el índice tiene todos sus bloques. Se
+          recorren solo los encabezados, sin cargar el archivo en memoria.
+        - Si el archivo no empieza con el encabezado de `VERSION_FORMATO`
+          (por ejemplo, es de la versión 1), lanza ValueError sin modificarlo.
+        - Si el último bloque quedó incompleto (por ejemplo, por un corte
+          durante la escritura), se descarta: el archivo se trunca al final
+          del último bloque completo y "descartados" tiene los bytes quitados.
+    """
+    archivo = open(
+        ruta, "a+b", buffering=constantes.TAMANIO_BUFFER_ARCHIVO_TRANSFERENCIAS
+    )
+    indice = {}
+
+    tamanio = archivo.seek(0, os.SEEK_END)
+    if tamanio == 0:
+        archivo.write(_ENCABEZADO_ARCHIVO)
+        archivo.flush()
+        tamanio = len(_ENCABEZADO_ARCHIVO)
+    else:
+        archivo.seek(0)
+        if archivo.read(len(_ENCABEZADO_ARCHIVO)) != _ENCABEZADO_ARCHIVO:
+            archivo.close()
+            raise ValueError(
+                constantes.MSG_FORMATO_ARCHIVO_TRANSFERENCIAS.format(
+                    ruta=ruta, version=VERSION_FORMATO
+                )
+            )
+
+    posicion = len(_ENCABEZADO_ARCHIVO)
+    while posicion < tamanio:
+        encabezado = _leer_encabezado(archivo, posicion)
+        if encabezado is None or encabezado[1] + encabezado[2] > tamanio:
+            break
+        dni, contenido, largo = encabezado
+        indice.setdefault(dni, []).append(posicion)
+        posicion = contenido + largo
+
+    descartados = tamanio - posicion
+    if descartados:
+        archivo.truncate(posicion)
+
+    return {
+        "archivo": archivo,
+        "indice": indice,
+        "cerrojo": threading.Lock(),
+        "descartados": descartados,
+    }
+
+
+def cerrar_archivo(archivo_transferencias: dict) -> None:
+    """
+    Escribe lo que quede en el buffer y cierra el archivo.
+    """
+    archivo_transferencias["archivo"].close()
+
+
+def archivar(
+    archivo_transferencias: dict, dni: int, transferencias: list[tuple]
+) -> None:
+    """
+    Agrega al final del archivo un bloque con las transferencias de la cuenta `dni`.
+    """
+    contenido = codificar_bloque(transferencias)
+    bloque = bytearray()
+    _escribir_varint(bloque, dni)
+    _escribir_varint(bloque, len(contenido))
+    bloque += contenido
+
+    archivo = archivo_transferencias["archivo"]
+    with archivo_transferencias["cerrojo"]:
+        archivo.seek(0, os.SEEK_END)
+        posicion = archivo.tell()
+        archivo.write(bloque)
+        archivo_transferencias["indice"].setdefault(dni, []).append(posicion)
+
+
+def leer_archivadas(archivo_transferencias: dict, dni: int) -> list[tuple]:
+    """
+    Devuelve las transferencias archivadas de la cuenta, de la más vieja a la más nueva.
+    """
+    archivo = archivo_transferencias["archivo"]
+    transferencias = []
+    with archivo_transferencias["cerrojo"]:
+        for posicion in archivo_transferencias["indice"].get(dni, ()):
+            _, contenido, largo = _leer_encabezado(archivo, posicion)
+            archivo.seek(contenido)
+            transferencias.extend(decodificar_bloque(archivo.read(largo)))
+
+    return transferencias
+
+
+def historial_completo(archivo_transferencias: dict, cuenta: dict) -> list[tuple]:
+    """
+    Devuelve todas las transferencias de la cuenta, archivadas y en memoria,
+    de la más vieja a la más nueva.
+    """
+    return leer_archivadas(archivo_transferencias, cuenta["dni"]) + list(
+        cuenta["transferencias"]
+    )
+
+
+def conectar(archivo_transferencias: dict, cuentas: dict):
+    """
+    Instala el archivo en `negocio` para que las transferencias viejas de
+    `cuentas` se archiven.
+
+    Post:
+        - Devuelve el archivador instalado. Se quita con
+          `negocio.archivar_transferencias(cuentas, None)`.
+    """
+
+    def archivador(dni: int, transferencias: list[tuple]) -> None:
+        archivar(archivo_transferencias, dni, transferencias)
+
+    negocio.archivar_transferencias(cuentas, archivador)
+    return archivador
@@ -0,0 +1,193 @@
+"""
+Pruebas del archivo de transferencias viejas (`archivo_transferencias`).
+
+Se pueden correr con pytest o directamente con `python archivo_transferencias_test.py`.
+"""
+
+import os
+import random
+import tempfile
+
+import archivo_transferencias
+import constantes
+import negocio
+
+
+def _transferencias_al_azar(generador: random.Random, cantidad: int) -> list[tuple]:
+    """Devuelve `cantidad` registros de transferencia con montos y DNI variados."""
+    return [
+        (
+            generador.choice((1, 100, generador.randint(1, 10**12))),
+            generador.choice(("envia", "recibe")),
+            generador.randint(1_000_000, 99_999_999),
+        )
+        for _ in range(cantidad)
+    ]
+
+
+def test_01_varint_y_zigzag_ida_y_vuelta():
+    for valor in (0, 1, 127, 128, 300, 2**32, 2**63 - 1, 10**30):
+        datos = bytearray(b"x")
+        archivo_transferencias._escribir_varint(datos, valor)
+        assert archivo_transferencias._leer_varint(bytes(datos), 1) == (
+            valor,
+            len(datos),
+        )
+
+    for valor in range(-1_000, 1_000):
+        zigzag = archivo_transferencias._zigzag(valor)
+        assert zigzag >= 0
+        assert archivo_transferencias._deszigzag(zigzag) == valor
+    assert [archivo_transferencias._zigzag(valor) for valor in (0, -1, 1, -2)] == [
+        0,
+        1,
+        2,
+        3,
+    ]
+
+    generador = random.Random(0)
+    for cantidad in (0, 1, 50):
+        transferencias = _transferencias_al_azar(generador, cantidad)
+        bloque = archivo_transferencias.codificar_bloque(transferencias)
+        assert archivo_transferencias.decodificar_bloque(bloque) == transferencias
+
+
+def test_02_historial_completo_y_reapertura():
+    generador = random.Random(1)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "transferencias.bin")
+        archivo = archivo_transferencias.abrir_archivo(ruta)
+        cuentas = {}
+        archivador = archivo_transferencias.conectar(archivo, cuentas)
+        try:
+            dnis = list(range(10_000_000, 10_000_010))
+            for dni in dnis:
+                negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+                negocio.acreditar_dinero(cuentas, dni, 10**9)
+            esperado = {dni: [] for dni in dnis}
+            for _ in range(2_000):
+                origen, destino = generador.sample(dnis, 2)
+                monto = generador.randint(1, 5_000)
+                negocio.transferir_dinero(cuentas, origen, destino, monto)
+                esperado[origen].append((monto, "envia", destino))
+                esperado[destino].append((monto, "recibe", origen))
+        finally:
+            negocio.archivar_transferencias(cuentas, None)
+        assert archivador is not None
+
+        for dni in dnis:
+            cuenta = cuentas[dni]
+            assert (
+                len(cuenta["transferencias"]) < 2 * constantes.TRANSFERENCIAS_EN_MEMORIA
+            )
+            assert (
+                archivo_transferencias.historial_completo(archivo, cuenta)
+                == esperado[dni]
+            )
+        archivo_transferencias.cerrar_archivo(archivo)
+
+        # al reabrir, el índice se reconstruye con los mismos bloques
+        reabierto = archivo_transferencias.abrir_archivo(ruta)
+        try:
+            assert reabierto["indice"] == archivo["indice"]
+            assert reabierto["descartados"] == 0
+            for dni in dnis:
+                assert (
+                    archivo_transferencias.historial_completo(reabierto, cuentas[dni])
+                    == esperado[dni]
+                )
+        finally:
+            archivo_transferencias.cerrar_archivo(reabierto)
+
+
+def test_03_bloque_incompleto_al_final_se_descarta():
+    transferencias = _transferencias_al_azar(random.Random(2), 40)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "transferencias.bin")
+        archivo = archivo_transferencias.abrir_archivo(ruta)
+        archivo_transferencias.archivar(archivo, 12_345_678, transferencias[:20])
+        archivo_transferencias.archivar(archivo, 23_456_789, transferencias[20:])
+        archivo_transferencias.cerrar_archivo(archivo)
+        tamanio = os.path.getsize(ruta)
+
+        # un byte suelto (el comienzo de un encabezado)
+        with open(ruta, "ab") as crudo:
+            crudo.write(b"\x85")
+        reabierto = archivo_transferencias.abrir_archivo(ruta)
+        assert reabierto["descartados"] == 1
+        assert os.path.getsize(ruta) == tamanio
+        assert (
+            archivo_transferencias.leer_archivadas(reabierto, 23_456_789)
+            == transferencias[20:]
+        )
+        archivo_transferencias.cerrar_archivo(reabierto)
+
+        # un bloque cortado a la mitad del contenido
+        with open(ruta, "r+b") as crudo:
+            crudo.truncate(tamanio - 5)
+        reabierto = archivo_transferencias.abrir_archivo(ruta)
+        try:
+            assert list(reabierto["indice"]) == [12_345_678]
+            assert (
+                archivo_transferencias.leer_archivadas(reabierto, 12_345_678)
+                == transferencias[:20]
+            )
+            # lo que se archive después queda bien alineado
+            archivo_transferencias.archivar(reabierto, 23_456_789, transferencias[20:])
+            assert (
+                archivo_transferencias.leer_archivadas(reabierto, 23_456_789)
+                == transferencias[20:]
+            )
+        finally:
+            archivo_transferencias.cerrar_archivo(reabierto)
+
+
+def test_04_archivo_de_otra_version_se_rechaza():
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "transferencias.bin")
+        archivo_transferencias.cerrar_archivo(
+            archivo_transferencias.abrir_archivo(ruta)
+        )
+        with open(ruta, "rb") as crudo:
+            assert crudo.read() == b"FPTA" + bytes(
+                [archivo_transferencias.VERSION_FORMATO]
+            )
+
+        # un bloque de la versión 1: sin encabezado de archivo y con el nombre
+        # de la contraparte en cada registro
+        nombre = "Juan Perez".encode()
+        contenido = bytearray()
+        for valor in (1, 500 * 4, 23_456_789 * 2, len(nombre)):
+            archivo_transferencias._escribir_varint(contenido, valor)
+        bloque = bytearray()
+        for valor in (12_345_678, len(contenido) + len(nombre)):
+            archivo_transferencias._escribir_varint(bloque, valor)
+        bloque += contenido + nombre
+        with open(ruta, "wb") as crudo:
+            crudo.write(bloque)
+        try:
+            archivo_transferencias.abrir_archivo(ruta)
+        except ValueError as error:
+            assert ruta in str(error)
+        else:
+            raise AssertionError("Se esperaba ValueError")
+
+        # el archivo rechazado no se modifica
+        with open(ruta, "rb") as crudo:
+            assert crudo.read() == bloque
+
+
+def main():
+    pruebas = [
+        test_01_varint_y_zigzag_ida_y_vuelta,
+        test_02_historial_completo_y_reapertura,
+        test_03_bloque_incompleto_al_final_se_descarta,
+        test_04_archivo_de_otra_version_se_rechaza,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Este módulo contiene un generador de carga sintética y un medidor de
+rendimiento de FundaPay.
+
+La carga es una lista de operaciones con la mezcla de `MEZCLA_BENCHMARK`.
+Las cuentas elegidas siguen una distribución de Zipf (pocas cuentas
+concentran la mayor parte de la actividad, como en un banco real). Cada
+operación es una tupla:
+
+    ("crear_cuenta", dni, nombre)
+    ("ingresar_dinero", dni, monto)
+    ("transferir_dinero", dni_origen, dni_destino, monto)
+    ("otorgar_prestamo", dni, interes, monto)
+    ("pagar_prestamo", dni, monto)   # paga el préstamo activo más antiguo
+
+La misma carga se ejecuta de dos formas:
+
+    - "negocio": llamando directamente a las funciones de `negocio`.
+    - "operaciones": con las funciones interactivas de `operaciones`,
+      respondiendo sus preguntas con un guion (`entrada_salida.guionado`) y
+      descartando lo que muestran.
+
+Ambas dejan las cuentas exactamente en el mismo estado. De cada escenario se
+informan operaciones por segundo, latencias p50 y p99 y el pico de memoria,
+y el resultado se puede comparar contra una ejecución base guardada en JSON.
+"""
+
+import itertools
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import constantes
+import entrada_salida
+import estadisticas
+import negocio
+import operaciones
+import presentacion
+
+DNI_INICIAL = 10_000_000
+NOMBRE_CLIENTE = "Cliente Prueba"
+
+
+def generar_carga(
+    cantidad: int, cuentas_iniciales: int, semilla: int = 0
+) -> tuple[list, list]:
+    """
+    Genera una carga sintética reproducible.
+
+    Pre:
+        - `cantidad` y `cuentas_iniciales` son enteros positivos.
+    Post:
+        - Devuelve (preparacion, carga): `preparacion` crea `cuentas_iniciales`
+          cuentas con saldo, y `carga` tiene `cantidad` operaciones.
+        - La popularidad de las cuentas iniciales sigue una ley de Zipf con
+          exponente `EXPONENTE_ZIPF`; las cuentas creadas por la carga no
+          vuelven a usarse.
+    """
+    generador = random.Random(semilla)
+
+    preparacion = []
+    dnis = list(range(DNI_INICIAL, DNI_INICIAL + cuentas_iniciales))
+    for dni in dnis:
+        preparacion.append(("crear_cuenta", dni, NOMBRE_CLIENTE))
+        preparacion.append(("ingresar_dinero", dni, generador.randint(1_000, 50_000)))
+
+    # pesos acumulados de Zipf: la cuenta de rango r tiene peso 1 / r**s
+    acumulados = list(
+        itertools.accumulate(
+            1 / rango**constantes.EXPONENTE_ZIPF
+            for rango in range(1, cuentas_iniciales + 1)
+        )
+    )
+    nombres = list(constantes.MEZCLA_BENCHMARK)
+    pesos = list(constantes.MEZCLA_BENCHMARK.values())
+
+    tipos = generador.choices(nombres, pesos, k=cantidad)
+    elegidas = generador.choices(dnis, cum_weights=acumulados, k=2 * cantidad)
+    siguiente_dni = DNI_INICIAL + cuentas_iniciales
+
+    carga = []
+    for numero, tipo in enumerate(tipos):
+        dni = elegidas[2 * numero]
+        if tipo == "crear_cuenta":
+            carga.append((tipo, siguiente_dni, NOMBRE_CLIENTE))
+            siguiente_dni += 1
+        elif tipo == "ingresar_dinero":
+            carga.append((tipo, dni, generador.randint(constantes.MONTO_MINIMO, 5_000)))
+        elif tipo == "transferir_dinero":
+            monto = generador.randint(constantes.MONTO_MINIMO, 3_000)
+            carga.append((tipo, dni, elegidas[2 * numero + 1], monto))
+        elif tipo == "otorgar_prestamo":
+            interes = generador.randint(constantes.INTERES_MINIMO, 40)
+            monto = generador.randint(constantes.MONTO_MINIMO, 10_000)
+            carga.append((tipo, dni, interes, monto))
+        else:
+            carga.append(
+                (tipo, dni, generador.randint(constantes.MONTO_MINIMO_PAGO, 5_000))
+            )
+
+    return preparacion, carga
+
+
+def ejecutar_en_negocio(cuentas: dict, operacion: tuple) -> None:
+    """
+    Aplica una operación de la carga con `negocio`, con las mismas reglas que
+    `operaciones` (las que no cumplen una validación no modifican nada).
+    """
+    tipo = operacion[0]
+    if tipo == "crear_cuenta":
+        negocio.registrar_cuenta(cuentas, operacion[2], operacion[1])
+    elif tipo == "ingresar_dinero":
+        negocio.acreditar_dinero(cuentas, operacion[1], operacion[2])
+    elif tipo == "transferir_dinero":
+        _, dni_origen, dni_destino, monto = operacion
+        if dni_origen != dni_destino:
+            negocio.transferir_dinero(cuentas, dni_origen, dni_destino, monto)
+    elif tipo == "otorgar_prestamo":
+        _, dni, interes, monto = operacion
+        negocio.otorgar_prestamo(cuentas, dni, interes, monto)
+    else:
+        _, dni, monto = operacion
+        cuenta = cuentas[dni]
+        if cuenta["prestamos"] and cuenta["saldo_disponible"] >= monto:
+            negocio.pagar_prestamo(
+                cuenta, next(iter(cuenta["prestamos"].values())), monto
+            )
+
+
+def guion_operaciones(cuentas: dict, operacion: tuple) -> tuple:
+    """
+    Devuelve (función de `operaciones`, respuestas) para ejecutar una
+    operación de la carga en forma interactiva.
+
+    Post:
+        - Las respuestas son exactamente las que la función va a pedir con el
+          estado actual de `cuentas`.
+    """
+    tipo = operacion[0]
+    dni = presentacion.formatear_dni(operacion[1])
+    if tipo == "crear_cuenta":
+        return operaciones.crear_cuenta, [operacion[2], dni]
+    if tipo == "ingresar_dinero":
+        return operaciones.ingresar_dinero, [dni, str(operacion[2])]
+    if tipo == "transferir_dinero":
+        _, dni_origen, dni_destino, monto = operacion
+        respuestas = [dni, presentacion.formatear_dni(dni_destino)]
+        if dni_origen != dni_destino:
+            respuestas.append(str(monto))
+        return operaciones.transferir_dinero, respuestas
+    if tipo == "otorgar_prestamo":
+        _, _, interes, monto = operacion
+        return operaciones.otorgar_prestamo, [dni, str(interes), str(monto)]
+
+    prestamos = cuentas[operacion[1]]["prestamos"]
+    if not prestamos:
+        return operaciones.pagar_prestamo, [dni]
+    return operaciones.pagar_prestamo, [
+        dni,
+        str(next(iter(prestamos))),
+        str(operacion[2]),
+    ]
+
+
+def ejecutar_carga(escenario: str, preparacion: list, carga: list) -> tuple[dict, list]:
+    """
+    Ejecuta la preparación y la carga en un escenario y devuelve
+    (cuentas finales, latencias en segundos de cada operación de la carga).
+    """
+    cuentas = {}
+    latencias = []
+    reloj = time.perf_counter
+
+    if escenario == "negocio":
+        for operacion in preparacion:
+            ejecutar_en_negocio(cuentas, operacion)
+        for operacion in carga:
+            inicio = reloj()
+            ejecutar_en_negocio(cuentas, operacion)
+            latencias.append(reloj() - inicio)
+        return cuentas, latencias
+
+    # las respuestas salen del guion y lo mostrado se descarta
+    with entrada_salida.usando(entrada_salida.guionado(())) as backend:
+        respuestas = backend["respuestas"]
+        for medir, lista in ((False, preparacion), (True, carga)):
+            for operacion in lista:
+                funcion, guion = guion_operaciones(cuentas, operacion)
+                respuestas.extend(guion)
+
+                inicio = reloj()
+                funcion(cuentas)
+                if medir:
+                    latencias.append(reloj() - inicio)
+
+            respuestas.clear()
+
+    return cuentas, latencias
+
+
+def medir_escenario(escenario: str, preparacion: list, carga: list) -> dict:
+    """
+    Mide un escenario ("negocio" u "operaciones") sobre la carga.
+
+    Post:
+        - Devuelve {"escenario", "operaciones", "ops_por_segundo", "p50_us",
+          "p99_us", "memoria_pico_kb"}.
+        - El pico de memoria se mide en una segunda ejecución con
+          `tracemalloc`, para que su costo no afecte los tiempos.
+    """
+    _, latencias = ejecutar_carga(escenario, preparacion, carga)
+
+    tracemalloc.start()
+    ejecutar_carga(escenario, preparacion, carga)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(latencias)
+    return {
+        "escenario": escenario,
+        "operaciones": len(carga),
+        "ops_por_segundo": round(len(carga) / total) if total else 0,
+        "p50_us": round(estadisticas.percentil(latencias, 0.50) * 1e6, 2),
+        "p99_us": round(estadisticas.percentil(latencias, 0.99) * 1e6, 2),
+        "memoria_pico_kb": pico // 1024,
+    }
+
+
+def comparar_con_base(
+    resultados: list[dict],
+    base: list[dict],
+    tolerancia: float = constantes.TOLERANCIA_BENCHMARK,
+) -> list[str]:
+    """
+    Compara los resultados contra una ejecución base.
+
+    Post:
+        - Devuelve un mensaje por cada métrica que empeoró más que `tolerancia`
+          (fracción): menos operaciones por segundo, o más latencia o memoria.
+        - Los escenarios que no están en la base no se comparan.
+    """
+    por_escenario = {resultado["escenario"]: resultado for resultado in base}
+
+    regresiones = []
+    for resultado in resultados:
+        anterior = por_escenario.get(resultado["escenario"])
+        if anterior is None:
+            continue
+
+        metricas = (
+            ("ops_por_segundo", anterior["ops_por_segundo"] * (1 - tolerancia), -1),
+            ("p50_us", anterior["p50_us"] * (1 + tolerancia), 1),
+            ("p99_us", anterior["p99_us"] * (1 + tolerancia), 1),
+            ("memoria_pico_kb", anterior["memoria_pico_kb"] * (1 + tolerancia), 1),
+        )
+        for metrica, limite, sentido in metricas:
+            # sentido 1: peor si crece; sentido -1: peor si baja
+            if sentido * (resultado[metrica] - limite) > 0:
+                regresiones.append(
+                    constantes.MSG_REGRESION.format(
+                        escenario=resultado["escenario"],
+                        metrica=metrica,
+                        actual=resultado[metrica],
+                        base=anterior[metrica],
+                    )
+                )
+
+    return regresiones
+
+
+def main():
+    """
+    Mide los dos escenarios, guarda los resultados en JSON e informa las
+    regresiones respecto de una base, si se indica.
+    Uso: python benchmark.py <resultados.json> [cantidad_operaciones] [base.json]
+
+    Post:
+        - Termina con código 1 si hubo alguna regresión.
+    """
+    if not 2 <= len(sys.argv) <= 4:
+        print(constantes.MSG_USO_BENCHMARK)
+        return
+
+    cantidad = 50_000
+    if len(sys.argv) >= 3:
+        cantidad = int(sys.argv[2])
+
+    preparacion, carga = generar_carga(cantidad, cuentas_iniciales=1_000)
+    resultados = []
+    for escenario in ("negocio", "operaciones"):
+        resultado = medir_escenario(escenario, preparacion, carga)
+        resultados.append(resultado)
+        print(json.dumps(resultado, ensure_ascii=False))
+
+    with open(sys.argv[1], "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False, indent=2)
+
+    if len(sys.argv) == 4:
+        with open(sys.argv[3], encoding="utf-8") as archivo:
+            base = json.load(archivo)
+
+        regresiones = comparar_con_base(resultados, base)
+        for regresion in regresiones:
+            print(regresion)
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
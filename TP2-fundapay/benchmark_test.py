@@ -0,0 +1,63 @@
+"""
+Pruebas del generador de carga y del medidor de rendimiento (`benchmark`).
+
+Se pueden correr con pytest o directamente con `python benchmark_test.py`.
+"""
+
+import benchmark
+
+
+def test_01_carga_reproducible():
+    assert benchmark.generar_carga(2_000, 50, semilla=3) == benchmark.generar_carga(
+        2_000, 50, semilla=3
+    )
+
+
+def test_02_negocio_y_operaciones_dejan_el_mismo_estado():
+    preparacion, carga = benchmark.generar_carga(3_000, 100, semilla=1)
+
+    cuentas_negocio, latencias_negocio = benchmark.ejecutar_carga(
+        "negocio", preparacion, carga
+    )
+    cuentas_operaciones, latencias_operaciones = benchmark.ejecutar_carga(
+        "operaciones", preparacion, carga
+    )
+
+    assert cuentas_negocio == cuentas_operaciones
+    assert len(latencias_negocio) == len(latencias_operaciones) == 3_000
+    assert any(cuenta["prestamos_saldados"] for cuenta in cuentas_negocio.values())
+
+
+def test_03_comparar_con_base_detecta_regresiones():
+    base = [
+        {
+            "escenario": "negocio",
+            "ops_por_segundo": 1_000,
+            "p50_us": 10,
+            "p99_us": 100,
+            "memoria_pico_kb": 500,
+        }
+    ]
+    igual = [dict(base[0], ops_por_segundo=950, p99_us=105)]
+    peor = [dict(base[0], ops_por_segundo=800, memoria_pico_kb=700)]
+
+    assert benchmark.comparar_con_base(igual, base) == []
+    regresiones = benchmark.comparar_con_base(peor, base)
+    assert len(regresiones) == 2
+    assert "ops_por_segundo" in regresiones[0]
+    assert "memoria_pico_kb" in regresiones[1]
+
+
+def main():
+    pruebas = [
+        test_01_carga_reproducible,
+        test_02_negocio_y_operaciones_dejan_el_mismo_estado,
+        test_03_comparar_con_base_detecta_regresiones,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Este módulo contiene el flujo de cambios (captura de cambios) de FundaPay.
+
+Conectado a `negocio` (`conectar`), cada evento publicado se copia a un
+buffer circular en memoria con un número de orden creciente (su "offset").
+Los consumidores (reportes, controles de fraude, notificaciones) leen del
+flujo a su ritmo en lotes (`leer`) y confirman hasta dónde procesaron
+(`confirmar`); si se atrasan, retoman desde su último offset confirmado.
+
+Registrar un evento solo lo agrega al buffer: ni los consumidores ni los
+destinos externos frenan las operaciones. El buffer tiene `capacidad`
+eventos; un consumidor que se atrasa más que eso:
+
+    - si hay un archivo de destino (`agregar_archivo`), sigue leyendo del
+      archivo, que tiene todos los eventos, hasta alcanzar al buffer;
+    - si no, salta al evento más viejo que quede y los eventos salteados se
+      cuentan en `perdidos`.
+
+Los destinos externos (un archivo o un socket local, con una línea JSON por
+evento) los alimenta un hilo de envío, que manda los eventos en lotes de
+hasta `tamanio_lote`. La única contrapresión sobre las operaciones es para no
+perder eventos de un destino: si el hilo de envío se atrasa un buffer
+completo, la operación que publica espera a que libere lugar.
+
+Un destino que falla (un error de disco, un socket cerrado o que no recibe
+durante `SEGUNDOS_ESPERA_SOCKET_CAMBIOS`) se quita del flujo y el error se
+anota en "errores": así un destino roto nunca frena las operaciones. Si era
+el archivo, los consumidores atrasados dejan de leer de él.
+
+Cada evento del flujo es el evento de `negocio` más:
+
+    {"offset": 17, "momento": 1700000000.123, "tipo": "...", ...}
+
+Estructura del flujo:
+
+    {
+        "eventos": [evento o None] * capacidad,  # buffer circular por offset
+        "capacidad": 65536,
+        "tamanio_lote": 512,
+        "siguiente": 18,                          # offset del próximo evento
+        "consumidores": {nombre: offset del próximo evento a leer},
+        "perdidos": {nombre: eventos salteados},
+        "destinos": [{"nombre": "...", "escribir": f, "cerrar": f, "offset": n}, ...],
+        "errores": [(nombre del destino, error), ...],  # destinos quitados
+        "indice_archivo": [(primer offset del lote, posición), ...],
+        "ruta_archivo": ruta del archivo de destino o None,
+        "condicion": threading.Condition(),  # protege todo lo anterior
+        "hilo": hilo de envío o None,
+        "detenido": False,
+    }
+"""
+
+import bisect
+import json
+import socket
+import threading
+import time
+
+import constantes
+import negocio
+
+_CODIFICADOR = json.JSONEncoder(ensure_ascii=False)
+
+
+def crear_flujo(
+    capacidad: int = constantes.CAPACIDAD_FLUJO_CAMBIOS,
+    tamanio_lote: int = constantes.TAMANIO_LOTE_CAMBIOS,
+) -> dict:
+    """
+    Crea un flujo vacío.
+
+    Pre:
+        - `capacidad` y `tamanio_lote` son enteros positivos.
+    """
+    return {
+        "eventos": [None] * capacidad,
+        "capacidad": capacidad,
+        "tamanio_lote": tamanio_lote,
+        "siguiente": 0,
+        "consumidores": {},
+        "perdidos": {},
+        "destinos": [],
+        "errores": [],
+        "indice_archivo": [],
+        "ruta_archivo": None,
+        "condicion": threading.Condition(),
+        "hilo": None,
+        "detenido": False,
+    }
+
+
+def _primer_offset(flujo: dict) -> int:
+    """
+    Devuelve el offset del evento más viejo que sigue en el buffer.
+    """
+    return max(0, flujo["siguiente"] - flujo["capacidad"])
+
+
+def _offset_destinos(flujo: dict) -> int:
+    """
+    Devuelve el offset del próximo evento que le falta enviar al destino más
+    atrasado (sin destinos, el del próximo evento).
+    """
+    return min(
+        (destino["offset"] for destino in flujo["destinos"]),
+        default=flujo["siguiente"],
+    )
+
+
+def registrar_evento(flujo: dict, evento: dict) -> int:
+    """
+    Agrega un evento de `negocio` al flujo y devuelve su offset.
+
+    Post:
+        - El préstamo de los eventos de préstamos se copia: el del evento es
+          el diccionario vivo de la cuenta.
+        - Solo espera si un destino externo está atrasado un buffer completo.
+    """
+    registro = dict(evento)
+    if "prestamo" in registro:
+        registro["prestamo"] = dict(registro["prestamo"])
+    registro["momento"] = time.time()
+
+    condicion = flujo["condicion"]
+    with condicion:
+        if flujo["destinos"]:
+            # contrapresión: no se pisa un evento que algún destino no envió
+            # (un destino que falla se quita y avisa, así que la espera termina)
+            while (
+                not flujo["detenido"]
+                and _offset_destinos(flujo) <= flujo["siguiente"] - flujo["capacidad"]
+            ):
+                condicion.wait()
+
+        offset = flujo["siguiente"]
+        registro["offset"] = offset
+        flujo["eventos"][offset % flujo["capacidad"]] = registro
+        flujo["siguiente"] = offset + 1
+
+        if flujo["destinos"]:
+            condicion.notify_all()
+    return offset
+
+
+def conectar(flujo: dict, cuentas: dict):
+    """
+    Suscribe el flujo a los eventos de `negocio` sobre `cuentas`.
+
+    Post:
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        registrar_evento(flujo, evento)
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+# Consumidores
+
+
+def registrar_consumidor(flujo: dict, nombre: str, desde: int | None = None) -> None:
+    """
+    Registra un consumidor que empieza a leer en el offset `desde`.
+
+    Post:
+        - Con `desde` None, el consumidor lee solo los eventos que lleguen
+          después de registrarse. Si ya estaba registrado, no se modifica.
+    """
+    with flujo["condicion"]:
+        if nombre not in flujo["consumidores"]:
+            flujo["consumidores"][nombre] = (
+                flujo["siguiente"] if desde is None else desde
+            )
+            flujo["perdidos"][nombre] = 0
+
+
+def _leer_archivo(flujo: dict, desde: int, hasta: int) -> list[dict]:
+    """
+    Lee del archivo de destino los eventos con offset en [desde, hasta).
+
+    Pre:
+        - El hilo de envío ya escribió todos esos eventos.
+    """
+    indice = flujo["indice_archivo"]
+    # el último lote que empieza en `desde` o antes
+    numero = bisect.bisect_right(indice, (desde, float("inf"))) - 1
+    eventos = []
+    with open(flujo["ruta_archivo"], "r", encoding="utf8") as archivo:
+        archivo.seek(indice[numero][1])
+        for linea in archivo:
+            evento = json.loads(linea)
+            if evento["offset"] >= hasta:
+                break
+            if evento["offset"] >= desde:
+                eventos.append(evento)
+    return eventos
+
+
+def leer(
+    flujo: dict, nombre: str, maximo: int = constantes.TAMANIO_LOTE_CAMBIOS
+) -> list[dict]:
+    """
+    Devuelve hasta `maximo` eventos desde el último offset confirmado del consumidor.
+
+    Pre:
+        - `nombre` es un consumidor registrado.
+    Post:
+        - Los eventos están en orden de offset. Leer no avanza al consumidor:
+          hasta que no confirme (`confirmar`), vuelve a recibir los mismos.
+        - Si el consumidor se atrasó más que el buffer, lee del archivo de
+          destino o, si no hay, salta eventos y los suma a `perdidos`.
+    """
+    with flujo["condicion"]:
+        desde = flujo["consumidores"][nombre]
+        primero = _primer_offset(flujo)
+        if desde < primero:
+            # lo que ya no está en el buffer se busca en el archivo, si lo tiene
+            inicio = primero
+            indice = flujo["indice_archivo"]
+            if flujo["ruta_archivo"] is not None and indice:
+                inicio = min(primero, max(desde, indice[0][0]))
+            if inicio > desde:
+                flujo["perdidos"][nombre] += inicio - desde
+                flujo["consumidores"][nombre] = desde = inicio
+
+        if desde >= primero:
+            hasta = min(desde + maximo, flujo["siguiente"])
+            eventos = flujo["eventos"]
+            capacidad = flujo["capacidad"]
+            return [eventos[offset % capacidad] for offset in range(desde, hasta)]
+
+    # el archivo se lee sin el cerrojo; lo anterior a `primero` ya está
+    # escrito (por la contrapresión) y no cambia
+    return _leer_archivo(flujo, desde, min(desde + maximo, primero))
+
+
+def confirmar(flujo: dict, nombre: str, offset: int) -> None:
+    """
+    Marca como procesados los eventos del consumidor hasta `offset` inclusive.
+    """
+    with flujo["condicion"]:
+        if offset + 1 > flujo["consumidores"][nombre]:
+            flujo["consumidores"][nombre] = offset + 1
+
+
+def retraso(flujo: dict, nombre: str) -> int:
+    """
+    Devuelve cuántos eventos le faltan confirmar al consumidor.
+    """
+    with flujo["condicion"]:
+        return flujo["siguiente"] - flujo["consumidores"][nombre]
+
+
+# Destinos externos
+
+
+def _enviar(flujo: dict) -> None:
+    """
+    Cuerpo del hilo de envío: manda los eventos a cada destino en lotes,
+    hasta que el flujo se detiene y no queda nada por enviar.
+    """
+    condicion = flujo["condicion"]
+    while True:
+        with condicion:
+            desde = _offset_destinos(flujo)
+            while desde >= flujo["siguiente"] and not flujo["detenido"]:
+                condicion.wait()
+                desde = _offset_destinos(flujo)
+            if desde >= flujo["siguiente"]:
+                return
+
+            hasta = min(desde + flujo["tamanio_lote"], flujo["siguiente"])
+            capacidad = flujo["capacidad"]
+            lote = [
+                flujo["eventos"][offset % capacidad] for offset in range(desde, hasta)
+            ]
+            pendientes = [
+                destino for destino in flujo["destinos"] if destino["offset"] == desde
+            ]
+
+        # se serializa y escribe sin el cerrojo: las operaciones siguen mientras tanto
+        datos = ("\n".join(map(_CODIFICADOR.encode, lote)) + "\n").encode()
+        fallidos = []
+        for destino in pendientes:
+            try:
+                destino["escribir"](desde, datos)
+            except Exception as error:
+                fallidos.append((destino, error))
+
+        with condicion:
+            for destino in pendientes:
+                destino["offset"] = hasta
+            for destino, error in fallidos:
+                _quitar_destino(flujo, destino, error)
+            condicion.notify_all()
+
+
+def _quitar_destino(flujo: dict, destino: dict, error: Exception) -> None:
+    """
+    Quita un destino que falló, anota el error y lo cierra.
+
+    Pre:
+        - Se tiene el cerrojo del flujo.
+    """
+    flujo["destinos"] = [otro for otro in flujo["destinos"] if otro is not destino]
+    flujo["errores"].append((destino["nombre"], repr(error)))
+    if destino["nombre"] == flujo["ruta_archivo"]:
+        # el archivo puede estar incompleto: ya no sirve para ponerse al día
+        flujo["ruta_archivo"] = None
+    try:
+        destino["cerrar"]()
+    except Exception:
+        pass
+
+
+def agregar_destino(flujo: dict, nombre: str, escribir, cerrar) -> None:
+    """
+    Agrega un destino que recibe los eventos desde ahora y arranca el hilo de envío.
+
+    Pre:
+        - `escribir(desde, datos)` manda un lote (los bytes de las líneas JSON
+          de los eventos desde el offset `desde`) y lanza una excepción si falla.
+        - `cerrar()` libera el destino.
+    """
+    with flujo["condicion"]:
+        destino = {
+            "nombre": nombre,
+            "escribir": escribir,
+            "cerrar": cerrar,
+            "offset": flujo["siguiente"],
+        }
+        flujo["destinos"] = flujo["destinos"] + [destino]
+        if flujo["hilo"] is None:
+            flujo["hilo"] = threading.Thread(target=_enviar, args=(flujo,), daemon=True)
+            flujo["hilo"].start()
+
+
+def agregar_archivo(flujo: dict, ruta: str) -> None:
+    """
+    Agrega un archivo (una línea JSON por evento) como destino del flujo.
+
+    Post:
+        - El archivo se sobrescribe y recibe los eventos desde ahora.
+        - Los consumidores atrasados más que el buffer leen desde este archivo.
+    """
+    archivo = open(ruta, "wb")
+
+    def escribir(desde: int, datos: bytes) -> None:
+        posicion = archivo.tell()
+        archivo.write(datos)
+        # se vacía por lote, para que `leer` encuentre todo lo escrito
+        archivo.flush()
+        flujo["indice_archivo"].append((desde, posicion))
+
+    flujo["ruta_archivo"] = ruta
+    agregar_destino(flujo, ruta, escribir, archivo.close)
+
+
+def agregar_socket(
+    flujo: dict,
+    host: str,
+    puerto: int,
+    espera: float = constantes.SEGUNDOS_ESPERA_SOCKET_CAMBIOS,
+) -> None:
+    """
+    Agrega como destino un servidor TCP local que recibe una línea JSON por evento.
+
+    Post:
+        - Si la conexión se cae, o el servidor no recibe un lote en `espera`
+          segundos, el destino se quita del flujo (ver "errores").
+    """
+    conexion = socket.create_connection((host, puerto), timeout=espera)
+
+    def escribir(_desde: int, datos: bytes) -> None:
+        conexion.sendall(datos)
+
+    agregar_destino(flujo, f"{host}:{puerto}", escribir, conexion.close)
+
+
+def cerrar(flujo: dict) -> None:
+    """
+    Envía lo pendiente a los destinos, detiene el hilo de envío y los cierra.
+    """
+    with flujo["condicion"]:
+        flujo["detenido"] = True
+        flujo["condicion"].notify_all()
+
+    if flujo["hilo"] is not None:
+        flujo["hilo"].join()
+    for destino in flujo["destinos"]:
+        destino["cerrar"]()
@@ -0,0 +1,209 @@
+"""
+Pruebas del flujo de cambios (`cambios`).
+
+Se pueden correr con pytest o directamente con `python cambios_test.py`.
+"""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+
+import cambios
+import constantes
+import negocio
+
+
+def _operar(cuentas: dict, cantidad: int) -> None:
+    """Registra dos cuentas y hace `cantidad` acreditaciones y transferencias."""
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    for _ in range(cantidad):
+        negocio.acreditar_dinero(cuentas, 12_345_678, 100)
+        negocio.transferir_dinero(cuentas, 12_345_678, 23_456_789, 100)
+
+
+def _leer_todo(flujo: dict, nombre: str, maximo: int) -> list[dict]:
+    """Lee y confirma eventos en lotes hasta alcanzar el final del flujo."""
+    leidos = []
+    while True:
+        lote = cambios.leer(flujo, nombre, maximo)
+        if not lote:
+            return leidos
+        leidos.extend(lote)
+        cambios.confirmar(flujo, nombre, lote[-1]["offset"])
+
+
+def test_01_consumidores_con_offsets_independientes():
+    flujo = cambios.crear_flujo(capacidad=1_000)
+    cambios.registrar_consumidor(flujo, "reportes")
+    cuentas = {}
+    observador = cambios.conectar(flujo, cuentas)
+    try:
+        _operar(cuentas, 100)
+        cambios.registrar_consumidor(flujo, "fraude", desde=0)
+        negocio.registrar_cuenta(cuentas, "Otra Cuenta", 34_567_890)
+        # otro diccionario de cuentas no publica en este flujo
+        _operar({}, 10)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    # leer sin confirmar devuelve siempre lo mismo
+    assert cambios.leer(flujo, "reportes", 5) == cambios.leer(flujo, "reportes", 5)
+
+    reportes = _leer_todo(flujo, "reportes", 7)
+    assert [evento["offset"] for evento in reportes] == list(range(203))
+    assert reportes[0]["tipo"] == constantes.EVENTO_CUENTA_REGISTRADA
+    assert reportes[3]["tipo"] == constantes.EVENTO_TRANSFERENCIA_REALIZADA
+    assert reportes[3]["saldo_destino"] == 100
+    assert cambios.retraso(flujo, "reportes") == 0
+
+    assert len(_leer_todo(flujo, "fraude", 50)) == 203
+    assert flujo["perdidos"] == {"reportes": 0, "fraude": 0}
+
+
+def test_02_consumidor_atrasado_sin_archivo_pierde_eventos():
+    flujo = cambios.crear_flujo(capacidad=64)
+    cambios.registrar_consumidor(flujo, "lento")
+    cuentas = {}
+    observador = cambios.conectar(flujo, cuentas)
+    try:
+        _operar(cuentas, 100)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    leidos = _leer_todo(flujo, "lento", 10)
+    assert len(leidos) == 64
+    assert leidos[0]["offset"] == 202 - 64
+    assert flujo["perdidos"]["lento"] == 202 - 64
+
+
+def test_03_consumidor_atrasado_se_pone_al_dia_desde_el_archivo():
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "cambios.jsonl")
+        flujo = cambios.crear_flujo(capacidad=64, tamanio_lote=16)
+        cambios.registrar_consumidor(flujo, "lento")
+        cambios.agregar_archivo(flujo, ruta)
+        cuentas = {}
+        observador = cambios.conectar(flujo, cuentas)
+        try:
+            _operar(cuentas, 1_000)
+        finally:
+            negocio.desuscribir(cuentas, observador)
+
+        leidos = _leer_todo(flujo, "lento", 100)
+        cambios.cerrar(flujo)
+
+        assert [evento["offset"] for evento in leidos] == list(range(2_002))
+        assert flujo["perdidos"]["lento"] == 0
+        with open(ruta, encoding="utf8") as archivo:
+            en_archivo = [json.loads(linea) for linea in archivo]
+        assert en_archivo == leidos
+
+
+def test_04_socket_recibe_todos_los_eventos():
+    servidor = socket.create_server(("127.0.0.1", 0))
+    recibido = bytearray()
+
+    def recibir():
+        conexion, _ = servidor.accept()
+        with conexion:
+            while datos := conexion.recv(65_536):
+                recibido.extend(datos)
+
+    receptor = threading.Thread(target=recibir)
+    receptor.start()
+
+    flujo = cambios.crear_flujo(capacidad=32, tamanio_lote=8)
+    cambios.agregar_socket(flujo, "127.0.0.1", servidor.getsockname()[1])
+    cuentas = {}
+    observador = cambios.conectar(flujo, cuentas)
+    try:
+        _operar(cuentas, 500)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    cambios.cerrar(flujo)
+    receptor.join(timeout=10)
+    servidor.close()
+
+    offsets = [json.loads(linea)["offset"] for linea in recibido.splitlines()]
+    assert offsets == list(range(1_002))
+
+
+def test_05_destino_que_falla_no_frena_las_operaciones():
+    flujo = cambios.crear_flujo(capacidad=32, tamanio_lote=8)
+    escritos = []
+
+    def escribir(desde, datos):
+        if desde >= 40:
+            raise OSError("No queda espacio en el disco")
+        escritos.append(desde)
+
+    cambios.agregar_destino(flujo, "disco", escribir, lambda: None)
+    cuentas = {}
+    observador = cambios.conectar(flujo, cuentas)
+    terminado = threading.Event()
+
+    def operar():
+        _operar(cuentas, 500)
+        terminado.set()
+
+    hilo = threading.Thread(target=operar, daemon=True)
+    try:
+        hilo.start()
+        assert terminado.wait(timeout=10), "Las operaciones quedaron bloqueadas"
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    cambios.cerrar(flujo)
+
+    assert flujo["siguiente"] == 1_002
+    assert flujo["destinos"] == []
+    assert [nombre for nombre, _ in flujo["errores"]] == ["disco"]
+    assert escritos and max(escritos) < 40
+
+
+def test_06_socket_que_no_recibe_se_quita():
+    servidor = socket.create_server(("127.0.0.1", 0))
+    servidor.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4_096)
+    conexiones = []
+    aceptador = threading.Thread(
+        target=lambda: conexiones.append(servidor.accept()[0]), daemon=True
+    )
+    aceptador.start()
+
+    flujo = cambios.crear_flujo(capacidad=32, tamanio_lote=8)
+    cambios.agregar_socket(flujo, "127.0.0.1", servidor.getsockname()[1], espera=0.2)
+    cuentas = {}
+    observador = cambios.conectar(flujo, cuentas)
+    try:
+        # el servidor nunca lee: los buffers del sistema se llenan
+        _operar(cuentas, 20_000)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    cambios.cerrar(flujo)
+    aceptador.join(timeout=10)
+    for conexion in conexiones:
+        conexion.close()
+    servidor.close()
+
+    assert flujo["destinos"] == []
+    assert len(flujo["errores"]) == 1
+
+
+def main():
+    pruebas = [
+        test_01_consumidores_con_offsets_independientes,
+        test_02_consumidor_atrasado_sin_archivo_pierde_eventos,
+        test_03_consumidor_atrasado_se_pone_al_dia_desde_el_archivo,
+        test_04_socket_recibe_todos_los_eventos,
+        test_05_destino_que_falla_no_frena_las_operaciones,
+        test_06_socket_que_no_recibe_se_quita,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Este módulo contiene la cartera de préstamos del banco en formato columnar.
+
+Cada campo de préstamo de `estructura_cuentas` es una columna (un arreglo de
+NumPy) y cada préstamo es una fila. La cartera se mantiene al día con los
+eventos de `negocio` (préstamo otorgado y préstamo pagado), así que los
+reportes de todo el banco se calculan con operaciones vectorizadas sobre las
+columnas, sin recorrer `cuentas` ni los diccionarios de préstamos.
+
+Estructura de la cartera:
+
+    {
+        "cantidad": 3,                  # filas en uso
+        "columnas": {"id_prestamo": np.ndarray, ..., "clave": np.ndarray},
+        "claves_ordenadas": np.ndarray, # claves indexadas, de menor a mayor
+        "filas_ordenadas": np.ndarray,  # fila de cada clave indexada
+        "filas_nuevas": {clave: fila},  # filas agregadas desde el último índice
+        "indices_cuenta": {dni: indice},  # número denso por cuenta
+        "dnis": [dni, ...],             # indice -> dni
+        "pagos_en_bloque": False,       # True mientras se escriben pagos en bloque
+    }
+
+Mientras "pagos_en_bloque" es True, el observador de `conectar` ignora los
+pagos: quien escribe en bloque (`debito_automatico`) ya actualizó las filas.
+
+Cada fila guarda la clave de su préstamo, (dni << 32) | id_prestamo, en la
+columna "clave". Para encontrar la fila de un préstamo se busca la clave con
+búsqueda binaria en un índice ordenado (dos arreglos de NumPy, 16 bytes por
+préstamo en lugar de una entrada de diccionario). Las filas agregadas después
+de armar el índice quedan en un diccionario chico, y el índice se rearma
+cuando ese diccionario supera un octavo de las filas: el costo de rearmarlo
+se reparte entre todas esas altas.
+"""
+
+import numpy as np
+
+import constantes
+import negocio
+
+# columnas con los campos de cada préstamo, en el orden de `estructura_cuentas`
+CAMPOS_PRESTAMO = (
+    "id_prestamo",
+    "monto_capital_original",
+    "tasa_interes",
+    "cantidad_cuotas",
+    "impuestos_total_original",
+    "intereses_total_original",
+    "capital_pendiente",
+    "intereses_pendientes",
+    "impuestos_pendientes",
+    "total_pagado_impuestos",
+    "total_pagado_intereses",
+    "total_pagado_capital",
+)
+
+# campos que cambian con cada pago
+CAMPOS_PAGO = (
+    "capital_pendiente",
+    "intereses_pendientes",
+    "impuestos_pendientes",
+    "total_pagado_impuestos",
+    "total_pagado_intereses",
+    "total_pagado_capital",
+)
+
+
+def _clave(dni: int, id_prestamo: int) -> int:
+    """
+    Devuelve la clave de un préstamo en la columna "clave".
+    """
+    return (dni << 32) | id_prestamo
+
+
+def _reindexar(cartera: dict) -> None:
+    """
+    Rearma el índice ordenado con todas las filas en uso.
+    """
+    claves = columna(cartera, "clave")
+    orden = np.argsort(claves, kind="stable")
+    cartera["claves_ordenadas"] = claves[orden]
+    cartera["filas_ordenadas"] = orden
+    cartera["filas_nuevas"] = {}
+
+
+def _fila(cartera: dict, dni: int, id_prestamo: int) -> int:
+    """
+    Devuelve la fila del préstamo `id_prestamo` de la cuenta `dni`.
+    Lanza KeyError si el préstamo no está en la cartera.
+    """
+    clave = _clave(dni, id_prestamo)
+    fila = cartera["filas_nuevas"].get(clave)
+    if fila is not None:
+        return fila
+
+    claves = cartera["claves_ordenadas"]
+    posicion = int(np.searchsorted(claves, clave))
+    if posicion == len(claves) or claves[posicion] != clave:
+        raise KeyError(clave)
+    return int(cartera["filas_ordenadas"][posicion])
+
+
+def crear_cartera(cuentas: dict) -> dict:
+    """
+    Crea la cartera con todos los préstamos (activos y saldados) de `cuentas`.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+    Post:
+        - Devuelve la cartera columnar, con una fila por préstamo.
+    """
+    columnas = {
+        "indice_cuenta": np.zeros(constantes.CAPACIDAD_INICIAL_CARTERA, dtype=np.int64),
+        "clave": np.zeros(constantes.CAPACIDAD_INICIAL_CARTERA, dtype=np.int64),
+    }
+    for campo in CAMPOS_PRESTAMO:
+        columnas[campo] = np.zeros(constantes.CAPACIDAD_INICIAL_CARTERA, dtype=np.int64)
+
+    cartera = {
+        "cantidad": 0,
+        "columnas": columnas,
+        "claves_ordenadas": np.zeros(0, dtype=np.int64),
+        "filas_ordenadas": np.zeros(0, dtype=np.int64),
+        "filas_nuevas": {},
+        "indices_cuenta": {},
+        "dnis": [],
+        "pagos_en_bloque": False,
+    }
+
+    for dni, cuenta in cuentas.items():
+        for prestamo in negocio.listar_prestamos(cuenta):
+            agregar_prestamo(cartera, dni, prestamo)
+
+    _reindexar(cartera)
+    return cartera
+
+
+def _asegurar_capacidad(cartera: dict) -> None:
+    """
+    Duplica el tamaño de las columnas si no queda lugar para una fila más.
+    """
+    columnas = cartera["columnas"]
+    capacidad = len(columnas["id_prestamo"])
+    if cartera["cantidad"] < capacidad:
+        return
+
+    for campo, columna in columnas.items():
+        nueva = np.zeros(2 * capacidad, dtype=columna.dtype)
+        nueva[:capacidad] = columna
+        columnas[campo] = nueva
+
+
+def agregar_prestamo(cartera: dict, dni: int, prestamo: dict) -> None:
+    """
+    Agrega un préstamo como fila nueva de la cartera.
+
+    Pre:
+        - `prestamo` es el diccionario de un préstamo de la cuenta `dni`,
+          que todavía no está en la cartera.
+    Post:
+        - La fila queda con los valores actuales del préstamo.
+    """
+    _asegurar_capacidad(cartera)
+
+    indice_cuenta = cartera["indices_cuenta"].get(dni)
+    if indice_cuenta is None:
+        indice_cuenta = len(cartera["dnis"])
+        cartera["indices_cuenta"][dni] = indice_cuenta
+        cartera["dnis"].append(dni)
+
+    fila = cartera["cantidad"]
+    columnas = cartera["columnas"]
+    columnas["indice_cuenta"][fila] = indice_cuenta
+    for campo in CAMPOS_PRESTAMO:
+        columnas[campo][fila] = prestamo[campo]
+
+    clave = _clave(dni, prestamo["id_prestamo"])
+    columnas["clave"][fila] = clave
+    cartera["cantidad"] += 1
+
+    filas_nuevas = cartera["filas_nuevas"]
+    filas_nuevas[clave] = fila
+    if len(filas_nuevas) > max(
+        constantes.MIN_FILAS_NUEVAS_CARTERA, cartera["cantidad"] >> 3
+    ):
+        _reindexar(cartera)
+
+
+def actualizar_pago(cartera: dict, dni: int, prestamo: dict) -> None:
+    """
+    Copia a la fila del préstamo los campos que cambian con un pago.
+
+    Pre:
+        - El préstamo ya está en la cartera.
+    """
+    fila = _fila(cartera, dni, prestamo["id_prestamo"])
+    columnas = cartera["columnas"]
+    for campo in CAMPOS_PAGO:
+        columnas[campo][fila] = prestamo[campo]
+
+
+def conectar(cartera: dict, cuentas: dict):
+    """
+    Suscribe la cartera a los eventos de `negocio` sobre `cuentas` para
+    mantenerla al día.
+
+    Post:
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        if evento["tipo"] == constantes.EVENTO_PRESTAMO_OTORGADO:
+            agregar_prestamo(cartera, evento["dni"], evento["prestamo"])
+        elif (
+            evento["tipo"] == constantes.EVENTO_PRESTAMO_PAGADO
+            and not cartera["pagos_en_bloque"]
+        ):
+            actualizar_pago(cartera, evento["dni"], evento["prestamo"])
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+def columna(cartera: dict, campo: str) -> np.ndarray:
+    """
+    Devuelve la vista de una columna con solo las filas en uso.
+    """
+    return cartera["columnas"][campo][: cartera["cantidad"]]
+
+
+def deuda_por_prestamo(cartera: dict) -> np.ndarray:
+    """
+    Devuelve, por fila, la deuda pendiente (impuestos + intereses + capital).
+    """
+    return (
+        columna(cartera, "impuestos_pendientes")
+        + columna(cartera, "intereses_pendientes")
+        + columna(cartera, "capital_pendiente")
+    )
+
+
+# Reportes
+
+
+def total_capital_pendiente(cartera: dict) -> int:
+    """
+    Devuelve el capital prestado que todavía no fue devuelto, en todo el banco.
+    """
+    return int(columna(cartera, "capital_pendiente").sum())
+
+
+def total_impuestos_pendientes(cartera: dict) -> int:
+    """
+    Devuelve los impuestos de préstamos que todavía se adeudan, en todo el banco.
+    """
+    return int(columna(cartera, "impuestos_pendientes").sum())
+
+
+def intereses_cobrados_por_tasa(cartera: dict, ancho_rango: int) -> dict[int, int]:
+    """
+    Agrupa las tasas en rangos de `ancho_rango` puntos y devuelve los intereses
+    ya cobrados en cada rango.
+
+    Pre:
+        - `ancho_rango` es un entero positivo.
+    Post:
+        - Devuelve {tasa_inicial_del_rango: intereses_cobrados}, solo con los
+          rangos que tienen préstamos, ordenado por tasa.
+    """
+    rangos = columna(cartera, "tasa_interes") // ancho_rango
+    if len(rangos) == 0:
+        return {}
+
+    # se suma en int64 (bincount con pesos sumaría en float64 y perdería exactitud)
+    cantidades = np.bincount(rangos)
+    totales = np.zeros(len(cantidades), dtype=np.int64)
+    np.add.at(totales, rangos, columna(cartera, "total_pagado_intereses"))
+
+    resultado = {}
+    for rango in np.flatnonzero(cantidades):
+        resultado[int(rango) * ancho_rango] = int(totales[rango])
+    return resultado
+
+
+def mayores_deudores(cartera: dict, cantidad: int) -> list[tuple[int, int]]:
+    """
+    Devuelve las `cantidad` cuentas con mayor deuda pendiente total.
+
+    Post:
+        - Devuelve una lista de (dni, deuda), de mayor a menor deuda,
+          sin cuentas con deuda 0.
+    """
+    cantidad_cuentas = len(cartera["dnis"])
+    if cantidad_cuentas == 0 or cantidad <= 0:
+        return []
+
+    deuda_por_cuenta = np.zeros(cantidad_cuentas, dtype=np.int64)
+    np.add.at(
+        deuda_por_cuenta, columna(cartera, "indice_cuenta"), deuda_por_prestamo(cartera)
+    )
+
+    # argpartition separa los k mayores en O(n); solo esos k se ordenan
+    cantidad = min(cantidad, cantidad_cuentas)
+    mayores = np.argpartition(deuda_por_cuenta, cantidad_cuentas - cantidad)[
+        cantidad_cuentas - cantidad :
+    ]
+    mayores = mayores[np.argsort(deuda_por_cuenta[mayores])[::-1]]
+
+    resultado = []
+    for indice in mayores:
+        deuda = int(deuda_por_cuenta[indice])
+        if deuda > 0:
+            resultado.append((cartera["dnis"][indice], deuda))
+    return resultado
@@ -0,0 +1,212 @@
+"""
+Pruebas de la cartera columnar de préstamos (`cartera`).
+
+Se pueden correr con pytest o directamente con `python cartera_test.py`.
+"""
+
+import random
+
+import amortizacion
+import cartera
+import constantes
+import negocio
+
+
+def _crear_cuentas(semilla: int, cantidad: int) -> dict:
+    """Crea cuentas con préstamos al azar, algunos pagados en parte o saldados."""
+    generador = random.Random(semilla)
+    cuentas = {}
+    for dni in range(10_000_000, 10_000_000 + cantidad):
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        negocio.acreditar_dinero(cuentas, dni, generador.randint(0, 5_000))
+        for _ in range(generador.randint(0, 3)):
+            negocio.otorgar_prestamo(
+                cuentas, dni, generador.randint(5, 40), generador.randint(100, 3_000)
+            )
+        cuenta = cuentas[dni]
+        for prestamo in list(cuenta["prestamos"].values()):
+            if generador.random() < 0.5:
+                negocio.pagar_prestamo(cuenta, prestamo, generador.randint(1, 4_000))
+    return cuentas
+
+
+def _filas(cartera_actual: dict) -> dict:
+    """Devuelve {(dni, id_prestamo): {campo: valor}} a partir de las columnas."""
+    dnis = cartera_actual["dnis"]
+    indices = cartera.columna(cartera_actual, "indice_cuenta").tolist()
+    columnas = {
+        campo: cartera.columna(cartera_actual, campo).tolist()
+        for campo in cartera.CAMPOS_PRESTAMO
+    }
+    filas = {}
+    for fila, indice in enumerate(indices):
+        valores = {campo: columnas[campo][fila] for campo in columnas}
+        filas[(dnis[indice], valores["id_prestamo"])] = valores
+    assert len(filas) == cartera_actual["cantidad"]
+    return filas
+
+
+def _esperado(cuentas: dict) -> dict:
+    """Devuelve las mismas filas armadas desde los préstamos de `cuentas`."""
+    return {
+        (dni, prestamo["id_prestamo"]): {
+            campo: prestamo[campo] for campo in cartera.CAMPOS_PRESTAMO
+        }
+        for dni, cuenta in cuentas.items()
+        for prestamo in negocio.listar_prestamos(cuenta)
+    }
+
+
+def test_01_una_fila_por_prestamo():
+    cuentas = _crear_cuentas(1, 1_000)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    assert cartera_actual["cantidad"] > constantes.CAPACIDAD_INICIAL_CARTERA
+    assert _filas(cartera_actual) == _esperado(cuentas)
+
+    vacia = cartera.crear_cartera({})
+    assert vacia["cantidad"] == 0
+    assert cartera.total_capital_pendiente(vacia) == 0
+    assert cartera.intereses_cobrados_por_tasa(vacia, 5) == {}
+    assert cartera.mayores_deudores(vacia, 3) == []
+
+
+def test_02_conectada_se_mantiene_al_dia():
+    generador = random.Random(2)
+    cuentas = _crear_cuentas(2, 300)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    observador = cartera.conectar(cartera_actual, cuentas)
+    try:
+        # suficientes altas para rearmar el índice varias veces
+        dnis = list(cuentas)
+        for _ in range(5 * constantes.MIN_FILAS_NUEVAS_CARTERA):
+            dni = generador.choice(dnis)
+            negocio.otorgar_prestamo(
+                cuentas, dni, generador.randint(5, 40), generador.randint(100, 3_000)
+            )
+            cuenta = cuentas[dni]
+            if generador.random() < 0.5:
+                prestamo = generador.choice(list(cuenta["prestamos"].values()))
+                negocio.pagar_prestamo(cuenta, prestamo, generador.randint(1, 2_000))
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    assert len(cartera_actual["filas_nuevas"]) <= max(
+        constantes.MIN_FILAS_NUEVAS_CARTERA, cartera_actual["cantidad"] >> 3
+    )
+    assert _filas(cartera_actual) == _esperado(cuentas)
+    # una cartera nueva de las mismas cuentas da los mismos reportes
+    assert _filas(cartera.crear_cartera(cuentas)) == _filas(cartera_actual)
+
+
+def test_03_prestamo_desconocido():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_000)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    antes = _filas(cartera_actual)
+
+    prestamo = dict(cuentas[12_345_678]["prestamos"][1], id_prestamo=2)
+    for dni in (12_345_678, 23_456_789):
+        try:
+            cartera.actualizar_pago(cartera_actual, dni, prestamo)
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("Se esperaba KeyError")
+    assert _filas(cartera_actual) == antes
+
+
+def test_04_reportes():
+    cuentas = _crear_cuentas(4, 500)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    prestamos = [
+        prestamo
+        for cuenta in cuentas.values()
+        for prestamo in negocio.listar_prestamos(cuenta)
+    ]
+
+    assert cartera.total_capital_pendiente(cartera_actual) == sum(
+        prestamo["capital_pendiente"] for prestamo in prestamos
+    )
+    assert cartera.total_impuestos_pendientes(cartera_actual) == sum(
+        prestamo["impuestos_pendientes"] for prestamo in prestamos
+    )
+
+    esperado = {}
+    for prestamo in prestamos:
+        rango = prestamo["tasa_interes"] // 10 * 10
+        esperado[rango] = esperado.get(rango, 0) + prestamo["total_pagado_intereses"]
+    assert cartera.intereses_cobrados_por_tasa(cartera_actual, 10) == dict(
+        sorted(esperado.items())
+    )
+
+    deudas = [(dni, cuenta["deuda_pendiente"]) for dni, cuenta in cuentas.items()]
+    deudas = [(dni, deuda) for dni, deuda in deudas if deuda > 0]
+    deudas.sort(key=lambda par: par[1], reverse=True)
+    mayores = cartera.mayores_deudores(cartera_actual, 20)
+    # mismas deudas en el mismo orden (los empates pueden salir en otro orden)
+    assert [deuda for _, deuda in mayores] == [deuda for _, deuda in deudas[:20]]
+    for dni, deuda in mayores:
+        assert cuentas[dni]["deuda_pendiente"] == deuda
+    assert len(cartera.mayores_deudores(cartera_actual, 10**6)) == len(deudas)
+
+
+def test_05_pagos_en_bloque_no_se_duplican():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 5_000)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_000)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    observador = cartera.conectar(cartera_actual, cuentas)
+    cuenta = cuentas[12_345_678]
+    try:
+        cartera_actual["pagos_en_bloque"] = True
+        negocio.pagar_prestamo(cuenta, cuenta["prestamos"][1], 500)
+        cartera_actual["pagos_en_bloque"] = False
+        # el pago no llegó a la cartera: quien escribe en bloque lo hace
+        assert cartera.total_capital_pendiente(cartera_actual) == 1_000
+
+        negocio.pagar_prestamo(cuenta, cuenta["prestamos"][1], 100)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    assert _filas(cartera_actual) == _esperado(cuentas)
+
+
+def test_06_reportes_exactos_con_montos_grandes():
+    cuentas = {}
+    for dni in (12_345_678, 23_456_789):
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        for _ in range(2):
+            negocio.otorgar_prestamo(cuentas, dni, 10, 1_000)
+    cartera_actual = cartera.crear_cartera(cuentas)
+
+    # montos que en float64 no se distinguen de su vecino
+    grande = 2**53 + 1
+    cartera.columna(cartera_actual, "total_pagado_intereses")[:] = grande
+    cartera.columna(cartera_actual, "capital_pendiente")[:] = [grande, 1, grande, 2]
+
+    assert cartera.intereses_cobrados_por_tasa(cartera_actual, 10) == {10: 4 * grande}
+    deudas = dict(cartera.mayores_deudores(cartera_actual, 2))
+    otros = sum(amortizacion.cargos_prestamo(1_000, 10))  # impuestos e intereses
+    assert deudas == {
+        12_345_678: grande + 1 + 2 * otros,
+        23_456_789: grande + 2 + 2 * otros,
+    }
+
+
+def main():
+    pruebas = [
+        test_01_una_fila_por_prestamo,
+        test_02_conectada_se_mantiene_al_dia,
+        test_03_prestamo_desconocido,
+        test_04_reportes,
+        test_05_pagos_en_bloque_no_se_duplican,
+        test_06_reportes_exactos_con_montos_grandes,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
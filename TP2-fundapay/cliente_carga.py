@@ -0,0 +1,182 @@
+"""
+Este módulo contiene un generador de carga para `servidor`.
+
+Abre muchas conexiones a la vez y, en cada una, envía rondas de pedidos sin
+esperar las respuestas (pipelining). Mide la latencia de cada pedido desde
+que se envía hasta que llega su respuesta e imprime el rendimiento y los
+percentiles p50/p99, junto con las estadísticas que reporta el servidor.
+
+Uso:
+    python cliente_carga.py [conexiones] [rondas] [profundidad] [puerto]
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+
+import constantes
+import estadisticas
+import presentacion
+import servidor
+
+CUENTAS_DE_PRUEBA = 1_000
+
+
+def _pedido_aleatorio(
+    generador: random.Random, dnis: list[str], id_pedido: int
+) -> dict:
+    """
+    Devuelve un pedido de la mezcla de carga: 70% transferencias,
+    20% ingresos y 10% resúmenes.
+    """
+    eleccion = generador.random()
+    if eleccion < 0.7:
+        origen, destino = generador.sample(dnis, 2)
+        return {
+            "id": id_pedido,
+            "operacion": "transferir_dinero",
+            "dni": origen,
+            "dni_destino": destino,
+            "monto": 100,
+        }
+    if eleccion < 0.9:
+        return {
+            "id": id_pedido,
+            "operacion": "ingresar_dinero",
+            "dni": generador.choice(dnis),
+            "monto": 100,
+        }
+    return {"id": id_pedido, "operacion": "ver_resumen", "dni": generador.choice(dnis)}
+
+
+async def _enviar_y_esperar(lector, escritor, pedidos: list[dict]) -> list[dict]:
+    """
+    Envía todos los pedidos juntos y devuelve las respuestas en orden.
+    """
+    escritor.write(b"".join(json.dumps(pedido).encode() + b"\n" for pedido in pedidos))
+    await escritor.drain()
+
+    respuestas = []
+    for _ in pedidos:
+        respuestas.append(json.loads(await lector.readline()))
+    return respuestas
+
+
+async def _preparar_cuentas(host: str, puerto: int, dnis: list[str]) -> None:
+    """
+    Crea las cuentas de prueba y les acredita saldo.
+    """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    pedidos = []
+    for dni in dnis:
+        pedidos.append(
+            {"operacion": "crear_cuenta", "nombre": "Cliente Carga", "dni": dni}
+        )
+        pedidos.append({"operacion": "ingresar_dinero", "dni": dni, "monto": 1_000_000})
+    await _enviar_y_esperar(lector, escritor, pedidos)
+    escritor.close()
+
+
+async def _cliente(
+    host: str,
+    puerto: int,
+    indice: int,
+    dnis: list[str],
+    rondas: int,
+    profundidad: int,
+    latencias: list[float],
+) -> None:
+    """
+    Una conexión: `rondas` veces envía `profundidad` pedidos y lee sus respuestas.
+    """
+    generador = random.Random(indice)
+    lector, escritor = await asyncio.open_connection(host, puerto)
+
+    for ronda in range(rondas):
+        pedidos = []
+        for numero in range(profundidad):
+            pedidos.append(
+                _pedido_aleatorio(generador, dnis, ronda * profundidad + numero)
+            )
+
+        escritor.write(
+            b"".join(json.dumps(pedido).encode() + b"\n" for pedido in pedidos)
+        )
+        enviado = time.perf_counter()
+        await escritor.drain()
+
+        for _ in pedidos:
+            await lector.readline()
+            latencias.append(time.perf_counter() - enviado)
+
+    escritor.close()
+
+
+async def generar_carga(
+    host: str, puerto: int, conexiones: int, rondas: int, profundidad: int
+) -> dict:
+    """
+    Ejecuta la carga completa y devuelve un diccionario con los resultados.
+
+    Post:
+        - Devuelve pedidos, segundos, pedidos por segundo, p50 y p99 en
+          microsegundos medidos por el cliente, y las estadísticas del servidor.
+    """
+    dnis = [
+        presentacion.formatear_dni(10_000_000 + numero)
+        for numero in range(CUENTAS_DE_PRUEBA)
+    ]
+    await _preparar_cuentas(host, puerto, dnis)
+
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _cliente(host, puerto, indice, dnis, rondas, profundidad, latencias)
+            for indice in range(conexiones)
+        )
+    )
+    segundos = time.perf_counter() - inicio
+
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    respuesta = await _enviar_y_esperar(
+        lector, escritor, [{"operacion": "estadisticas"}]
+    )
+    escritor.close()
+
+    return {
+        "pedidos": len(latencias),
+        "segundos": round(segundos, 3),
+        "pedidos_por_segundo": round(len(latencias) / segundos),
+        "p50_us": round(estadisticas.percentil(latencias, 0.50) * 1e6, 1),
+        "p99_us": round(estadisticas.percentil(latencias, 0.99) * 1e6, 1),
+        "servidor": respuesta[0]["estadisticas"],
+    }
+
+
+def main():
+    """
+    Punto de entrada del generador de carga.
+    """
+    argumentos = [int(argumento) for argumento in sys.argv[1:]]
+    conexiones, rondas, profundidad, puerto = (
+        argumentos
+        + [
+            1_000,
+            10,
+            8,
+            constantes.PUERTO_SERVIDOR,
+        ][len(argumentos) :]
+    )
+
+    servidor.elevar_limite_archivos()
+    resultados = asyncio.run(
+        generar_carga(constantes.HOST_SERVIDOR, puerto, conexiones, rondas, profundidad)
+    )
+    print(json.dumps(resultados, indent=4))
+
+
+if __name__ == "__main__":
+    main()
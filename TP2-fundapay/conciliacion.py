@@ -0,0 +1,261 @@
+"""
+Este módulo contiene la conciliación de fin de día: verifica en paralelo los
+invariantes del libro de cuentas.
+
+    1. Saldos: la suma de los saldos es igual a lo depositado más el capital
+       prestado menos lo pagado de préstamos (las transferencias se cancelan
+       entre cuentas). Como los depósitos no quedan registrados en las
+       cuentas, el total depositado se recibe de afuera (por ejemplo, de los
+       resultados de `lote` o del flujo de `cambios`); sin él, se informa el
+       total depositado que implican los saldos.
+    2. Préstamos: en cada préstamo activo, para cada componente de
+       `PRIORIDADES_PAGO`, lo pagado más lo pendiente es igual al original,
+       sin valores negativos, y la deuda pendiente de la cuenta es la suma
+       de lo pendiente de sus préstamos.
+    3. Transferencias: cada envío de A a B por un monto tiene su recepción
+       en B desde A por el mismo monto. Para no juntar todos los registros en
+       un solo proceso, cada registro suma (envío) o resta (recepción) el
+       hash de (dni_origen, dni_destino, monto): si todos se aparean, la
+       firma total es 0.
+
+Las cuentas se reparten en partes de `CUENTAS_POR_PARTE_CONCILIACION` entre
+los procesos de un pool (como en `extractos`); cada parte devuelve sumas
+parciales y los problemas que encontró, y el proceso principal las combina.
+Si hay un archivo de transferencias (`archivo_transferencias`), cada proceso
+lo abre para lectura y suma también las transferencias archivadas.
+"""
+
+import multiprocessing
+import threading
+
+import archivo_transferencias
+import constantes
+
+MASCARA_FIRMA = (1 << 64) - 1
+
+# (pendiente, pagado, original) de cada componente, en el orden de PRIORIDADES_PAGO
+_ORIGINALES = {
+    "impuestos_pendientes": "impuestos_total_original",
+    "intereses_pendientes": "intereses_total_original",
+    "capital_pendiente": "monto_capital_original",
+}
+COMPONENTES = [
+    (pendiente, pagado, _ORIGINALES[pendiente])
+    for pendiente, pagado in constantes.PRIORIDADES_PAGO
+]
+
+# estado de cada proceso del pool, cargado por `_inicializar_proceso`
+_cuentas_proceso = None
+_dnis_proceso = None
+_archivo_proceso = None
+
+
+def _inicializar_proceso(
+    cuentas: dict, dnis: list[int], ruta_archivo: str | None, indice: dict | None
+) -> None:
+    """
+    Guarda las cuentas, el orden de los DNI y el archivo de transferencias
+    (abierto solo para lectura) en el proceso del pool.
+    """
+    global _cuentas_proceso, _dnis_proceso, _archivo_proceso
+    _cuentas_proceso = cuentas
+    _dnis_proceso = dnis
+    _archivo_proceso = None
+    if ruta_archivo is not None:
+        _archivo_proceso = {
+            "archivo": open(ruta_archivo, "rb"),
+            "indice": indice,
+            "cerrojo": threading.Lock(),
+        }
+
+
+def _resultado_vacio() -> dict:
+    """
+    Devuelve las sumas parciales en cero y las listas de problemas vacías.
+    """
+    return {
+        "cantidad_cuentas": 0,
+        "total_saldos": 0,
+        "capital_prestado": 0,
+        "total_pagado": 0,
+        "transferencias_enviadas": 0,
+        "transferencias_recibidas": 0,
+        "monto_enviado": 0,
+        "monto_recibido": 0,
+        "firma_transferencias": 0,
+        "saldos_negativos": [],
+        "deudas_inconsistentes": [],
+        "prestamos_inconsistentes": [],
+    }
+
+
+def _conciliar_parte(rango: tuple[int, int]) -> dict:
+    """
+    Calcula las sumas parciales de las cuentas en las posiciones [inicio, fin).
+    """
+    inicio, fin = rango
+    resultado = _resultado_vacio()
+    total_saldos = 0
+    capital_prestado = 0
+    total_pagado = 0
+    enviadas = recibidas = monto_enviado = monto_recibido = firma = 0
+
+    for dni in _dnis_proceso[inicio:fin]:
+        cuenta = _cuentas_proceso[dni]
+        saldo = cuenta["saldo_disponible"]
+        total_saldos += saldo
+        if saldo < 0:
+            resultado["saldos_negativos"].append(dni)
+
+        deuda = 0
+        for prestamo in cuenta["prestamos"].values():
+            capital_prestado += prestamo["monto_capital_original"]
+            for pendiente, pagado, original in COMPONENTES:
+                monto_pendiente = prestamo[pendiente]
+                monto_pagado = prestamo[pagado]
+                deuda += monto_pendiente
+                total_pagado += monto_pagado
+                if (
+                    monto_pendiente < 0
+                    or monto_pagado < 0
+                    or monto_pendiente + monto_pagado != prestamo[original]
+                ):
+                    resultado["prestamos_inconsistentes"].append(
+                        (dni, prestamo["id_prestamo"], pendiente)
+                    )
+        if deuda != cuenta["deuda_pendiente"]:
+            resultado["deudas_inconsistentes"].append(dni)
+
+        # un préstamo saldado se pagó completo
+        for saldado in cuenta["prestamos_saldados"]:
+            _, capital, _, impuestos, intereses, _ = saldado
+            capital_prestado += capital
+            total_pagado += capital + impuestos + intereses
+
+        transferencias = cuenta["transferencias"]
+        if _archivo_proceso is not None:
+            transferencias = archivo_transferencias.historial_completo(
+                _archivo_proceso, cuenta
+            )
+        for monto, tipo, dni_contraparte in transferencias:
+            if tipo == "envia":
+                enviadas += 1
+                monto_enviado += monto
+                firma += hash((dni, dni_contraparte, monto))
+            else:
+                recibidas += 1
+                monto_recibido += monto
+                firma -= hash((dni_contraparte, dni, monto))
+
+    resultado["cantidad_cuentas"] = fin - inicio
+    resultado["total_saldos"] = total_saldos
+    resultado["capital_prestado"] = capital_prestado
+    resultado["total_pagado"] = total_pagado
+    resultado["transferencias_enviadas"] = enviadas
+    resultado["transferencias_recibidas"] = recibidas
+    resultado["monto_enviado"] = monto_enviado
+    resultado["monto_recibido"] = monto_recibido
+    resultado["firma_transferencias"] = firma & MASCARA_FIRMA
+    return resultado
+
+
+def _combinar(total: dict, parcial: dict) -> None:
+    """
+    Suma un resultado parcial al total.
+    """
+    for clave, valor in parcial.items():
+        total[clave] += valor
+    total["firma_transferencias"] &= MASCARA_FIRMA
+
+
+def _rangos(cantidad: int) -> list[tuple[int, int]]:
+    """
+    Divide las posiciones 0..cantidad en rangos de `CUENTAS_POR_PARTE_CONCILIACION`.
+    """
+    tamanio = constantes.CUENTAS_POR_PARTE_CONCILIACION
+    return [
+        (inicio, min(inicio + tamanio, cantidad))
+        for inicio in range(0, cantidad, tamanio)
+    ]
+
+
+def conciliar(
+    cuentas: dict,
+    total_acreditado: int | None = None,
+    archivo: dict | None = None,
+    procesos: int | None = None,
+) -> dict:
+    """
+    Verifica los invariantes de todas las cuentas.
+
+    Pre:
+        - `total_acreditado` es la suma de todos los depósitos, o None si no se conoce.
+        - `archivo` es el archivo de transferencias conectado, o None. Si
+          las transferencias se archivan hay que pasarlo: en memoria solo
+          quedan las últimas de cada cuenta y no se aparearían.
+        - `procesos` es la cantidad de procesos (None: uno por CPU; 1: sin pool).
+    Post:
+        - Devuelve las sumas totales (las mismas claves que cada parte) más:
+            - "depositos_implicitos": saldos - capital prestado + pagado.
+            - "saldos_conciliados": si coincide con `total_acreditado`
+              (None si no se recibió).
+            - "transferencias_apareadas": si la firma es 0 y coinciden
+              cantidades y montos enviados y recibidos.
+            - "ok": True si no se encontró ningún problema.
+        - Los problemas se listan como DNI (o (dni, id_prestamo, componente)),
+          en el orden de `cuentas`.
+    """
+    dnis = list(cuentas)
+    ruta_archivo = None
+    indice = None
+    if archivo is not None:
+        # lo que quede en el buffer tiene que estar en disco para los procesos
+        archivo["archivo"].flush()
+        ruta_archivo = archivo["archivo"].name
+        indice = archivo["indice"]
+
+    total = _resultado_vacio()
+    if procesos == 1:
+        _inicializar_proceso(cuentas, dnis, ruta_archivo, indice)
+        try:
+            for rango in _rangos(len(dnis)):
+                _combinar(total, _conciliar_parte(rango))
+        finally:
+            if _archivo_proceso is not None:
+                _archivo_proceso["archivo"].close()
+            # no se retienen las cuentas en este proceso
+            _inicializar_proceso(None, None, None, None)
+    else:
+        if "fork" in multiprocessing.get_all_start_methods():
+            contexto = multiprocessing.get_context("fork")
+        else:
+            contexto = multiprocessing.get_context()
+        with contexto.Pool(
+            procesos,
+            initializer=_inicializar_proceso,
+            initargs=(cuentas, dnis, ruta_archivo, indice),
+        ) as pool:
+            # imap respeta el orden de las partes, y así el de los problemas
+            for parcial in pool.imap(_conciliar_parte, _rangos(len(dnis))):
+                _combinar(total, parcial)
+
+    total["depositos_implicitos"] = (
+        total["total_saldos"] - total["capital_prestado"] + total["total_pagado"]
+    )
+    total["saldos_conciliados"] = None
+    if total_acreditado is not None:
+        total["saldos_conciliados"] = total["depositos_implicitos"] == total_acreditado
+
+    total["transferencias_apareadas"] = (
+        total["firma_transferencias"] == 0
+        and total["transferencias_enviadas"] == total["transferencias_recibidas"]
+        and total["monto_enviado"] == total["monto_recibido"]
+    )
+    total["ok"] = (
+        total["saldos_conciliados"] is not False
+        and total["transferencias_apareadas"]
+        and not total["saldos_negativos"]
+        and not total["deudas_inconsistentes"]
+        and not total["prestamos_inconsistentes"]
+    )
+    return total
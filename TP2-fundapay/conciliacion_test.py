@@ -0,0 +1,190 @@
+"""
+Pruebas de la conciliación de fin de día (`conciliacion`).
+
+Se pueden correr con pytest o directamente con `python conciliacion_test.py`.
+"""
+
+import os
+import random
+import tempfile
+
+import archivo_transferencias
+import conciliacion
+import negocio
+
+
+def _crear_cuentas(semilla: int, cantidad: int, transferencias: int) -> tuple:
+    """
+    Crea cuentas con depósitos, transferencias y préstamos (algunos saldados)
+    al azar. Devuelve (cuentas, total acreditado).
+    """
+    generador = random.Random(semilla)
+    cuentas = {}
+    dnis = list(range(10_000_000, 10_000_000 + cantidad))
+    total_acreditado = 0
+    for dni in dnis:
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        monto = generador.randint(0, 50_000)
+        negocio.acreditar_dinero(cuentas, dni, monto)
+        total_acreditado += monto
+        if generador.random() < 0.5:
+            negocio.otorgar_prestamo(
+                cuentas, dni, generador.randint(5, 40), generador.randint(100, 3_000)
+            )
+
+    for _ in range(transferencias):
+        origen, destino = generador.sample(dnis, 2)
+        negocio.transferir_dinero(cuentas, origen, destino, generador.randint(1, 500))
+
+    for dni in dnis:
+        cuenta = cuentas[dni]
+        for prestamo in list(cuenta["prestamos"].values()):
+            monto = min(generador.randint(1, 5_000), cuenta["saldo_disponible"])
+            if monto > 0:
+                negocio.pagar_prestamo(cuenta, prestamo, monto)
+    return cuentas, total_acreditado
+
+
+def _problemas(resultado: dict) -> tuple:
+    """Devuelve las listas de problemas de un resultado."""
+    return (
+        resultado["saldos_negativos"],
+        resultado["deudas_inconsistentes"],
+        resultado["prestamos_inconsistentes"],
+    )
+
+
+def test_01_libro_consistente_con_y_sin_pool():
+    cuentas, total_acreditado = _crear_cuentas(1, 300, 1_000)
+
+    resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=1)
+    assert resultado["ok"]
+    assert resultado["saldos_conciliados"]
+    assert resultado["transferencias_apareadas"]
+    assert resultado["cantidad_cuentas"] == 300
+    assert resultado["transferencias_enviadas"] > 0
+    assert any(cuenta["prestamos_saldados"] for cuenta in cuentas.values())
+
+    # sin el total depositado se informa el que implican los saldos
+    sin_total = conciliacion.conciliar(cuentas, procesos=1)
+    assert sin_total["saldos_conciliados"] is None
+    assert sin_total["depositos_implicitos"] == total_acreditado
+    assert sin_total["ok"]
+
+    assert conciliacion.conciliar(cuentas, total_acreditado, procesos=2) == resultado
+
+
+def test_02_componente_de_prestamo_alterado():
+    cuentas, total_acreditado = _crear_cuentas(2, 100, 200)
+    dni, prestamo = next(
+        (dni, prestamo)
+        for dni, cuenta in cuentas.items()
+        for prestamo in cuenta["prestamos"].values()
+    )
+    prestamo["intereses_pendientes"] += 7
+
+    resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=1)
+    assert not resultado["ok"]
+    assert resultado["prestamos_inconsistentes"] == [
+        (dni, prestamo["id_prestamo"], "intereses_pendientes")
+    ]
+    # la deuda de la cuenta ya no es la suma de sus préstamos
+    assert resultado["deudas_inconsistentes"] == [dni]
+    assert resultado["saldos_conciliados"]
+
+
+def test_03_saldo_alterado():
+    cuentas, total_acreditado = _crear_cuentas(3, 100, 200)
+    dnis = list(cuentas)
+    cuentas[dnis[10]]["saldo_disponible"] += 1
+
+    resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=1)
+    assert not resultado["ok"]
+    assert resultado["saldos_conciliados"] is False
+    assert resultado["depositos_implicitos"] == total_acreditado + 1
+    assert _problemas(resultado) == ([], [], [])
+
+    cuentas[dnis[20]]["saldo_disponible"] = -5
+    resultado = conciliacion.conciliar(cuentas, procesos=1)
+    assert not resultado["ok"]
+    assert resultado["saldos_negativos"] == [dnis[20]]
+
+
+def test_04_monto_de_transferencia_alterado():
+    cuentas, total_acreditado = _crear_cuentas(4, 100, 500)
+    cuenta = next(
+        cuenta
+        for cuenta in cuentas.values()
+        if any(tipo == "envia" for _, tipo, _ in cuenta["transferencias"])
+    )
+    transferencias = cuenta["transferencias"]
+    posicion = next(
+        posicion
+        for posicion, (_, tipo, _) in enumerate(transferencias)
+        if tipo == "envia"
+    )
+    monto, tipo, dni_contraparte = transferencias[posicion]
+    transferencias[posicion] = (monto + 1, tipo, dni_contraparte)
+
+    resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=1)
+    assert not resultado["ok"]
+    assert not resultado["transferencias_apareadas"]
+    assert resultado["transferencias_enviadas"] == resultado["transferencias_recibidas"]
+    assert resultado["monto_enviado"] == resultado["monto_recibido"] + 1
+    assert resultado["saldos_conciliados"]
+
+
+def test_05_con_archivo_de_transferencias():
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = archivo_transferencias.abrir_archivo(
+            os.path.join(directorio, "transferencias.bin")
+        )
+        cuentas = {}
+        archivo_transferencias.conectar(archivo, cuentas)
+        try:
+            generador = random.Random(5)
+            dnis = list(range(10_000_000, 10_000_020))
+            for dni in dnis:
+                negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+                negocio.acreditar_dinero(cuentas, dni, 10**6)
+            for _ in range(2_000):
+                origen, destino = generador.sample(dnis, 2)
+                negocio.transferir_dinero(
+                    cuentas, origen, destino, generador.randint(1, 100)
+                )
+        finally:
+            negocio.archivar_transferencias(cuentas, None)
+
+        try:
+            assert archivo["indice"]
+            total_acreditado = 20 * 10**6
+            for procesos in (1, 2):
+                resultado = conciliacion.conciliar(
+                    cuentas, total_acreditado, archivo, procesos=procesos
+                )
+                assert resultado["ok"]
+                assert resultado["transferencias_enviadas"] == 2_000
+
+            # sin el archivo, en memoria quedan solo las últimas de cada cuenta
+            resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=1)
+            assert resultado["transferencias_enviadas"] < 2_000
+            assert not resultado["transferencias_apareadas"]
+        finally:
+            archivo_transferencias.cerrar_archivo(archivo)
+
+
+def main():
+    pruebas = [
+        test_01_libro_consistente_con_y_sin_pool,
+        test_02_componente_de_prestamo_alterado,
+        test_03_saldo_alterado,
+        test_04_monto_de_transferencia_alterado,
+        test_05_con_archivo_de_transferencias,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
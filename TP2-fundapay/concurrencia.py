@@ -0,0 +1,366 @@
+"""
+Este módulo contiene un almacén de cuentas que puede usarse desde varios hilos.
+
+Cada cuenta tiene su propio cerrojo. Las operaciones toman solamente los
+cerrojos de las cuentas que modifican, y las transferencias los toman en
+orden de DNI, por lo que dos transferencias opuestas (A -> B y B -> A) nunca
+pueden quedar esperándose mutuamente. La lógica de cada operación sigue
+estando en `negocio`.
+
+Lecturas con instantáneas (varias versiones por cuenta): cada operación que
+modifica cuentas, antes de soltar sus cerrojos, publica una copia de solo
+lectura (una "foto") de cada cuenta modificada con un número de versión
+global. Un lector abre una lectura (`abrir_lectura`) que fija la última
+versión confirmada y, para cada cuenta, ve la foto más nueva que no la supera.
+Así un resumen o reporte ve todas sus cuentas en el mismo instante (nunca la
+mitad de una transferencia) sin tomar los cerrojos de las cuentas: los
+lectores nunca frenan a los escritores. De cada cuenta se conservan solo las
+versiones que algún lector abierto todavía puede necesitar.
+
+Estructura del almacén:
+
+    {
+        "cuentas": {...},  # el mismo diccionario `cuentas` de FundaPay
+        "cerrojos": {12345678: threading.Lock(), ...},
+        "cerrojo_registro": threading.Lock(),  # protege altas de cuentas
+        "versiones": {12345678: [(version, foto), ...]},  # de la más vieja a la más nueva
+        "version_confirmada": 7,
+        "lectores": {version: cantidad de lecturas abiertas},
+        "cerrojo_versiones": threading.Lock(),  # breve: confirmar versiones y abrir lecturas
+    }
+
+Una foto tiene las mismas claves que una cuenta (ver `estructura_cuentas`),
+pero con solo las últimas `TRANSFERENCIAS_A_MOSTRAR` transferencias.
+"""
+
+import contextlib
+import threading
+
+import constantes
+import negocio
+import presentacion
+
+
+def crear_almacen(cuentas: dict) -> dict:
+    """
+    Crea un almacén concurrente a partir de un diccionario de cuentas.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas (puede estar vacío).
+    Post:
+        - Devuelve el almacén con un cerrojo por cada cuenta existente.
+    """
+    cerrojos = {}
+    versiones = {}
+    for dni, cuenta in cuentas.items():
+        cerrojos[dni] = threading.Lock()
+        versiones[dni] = [(0, _tomar_foto(cuenta, None, True))]
+
+    return {
+        "cuentas": cuentas,
+        "cerrojos": cerrojos,
+        "cerrojo_registro": threading.Lock(),
+        "versiones": versiones,
+        "version_confirmada": 0,
+        "lectores": {},
+        "cerrojo_versiones": threading.Lock(),
+    }
+
+
+def _tomar_foto(cuenta: dict, anterior: dict | None, cambian_prestamos: bool) -> dict:
+    """
+    Devuelve una copia de solo lectura del estado actual de la cuenta.
+
+    Pre:
+        - Quien llama tiene el cerrojo de la cuenta.
+        - `anterior` es la foto anterior de la cuenta, o None si es la primera.
+    Post:
+        - Las partes que no cambiaron desde `anterior` se comparten con ella en
+          vez de copiarse: los préstamos activos si `cambian_prestamos` es
+          False, y los préstamos saldados si no se agregó ninguno.
+    """
+    if anterior is None or cambian_prestamos:
+        prestamos = {}
+        for id_prestamo, prestamo in cuenta["prestamos"].items():
+            prestamos[id_prestamo] = dict(prestamo)
+    else:
+        prestamos = anterior["prestamos"]
+
+    saldados = cuenta["prestamos_saldados"]
+    if anterior is not None and len(anterior["prestamos_saldados"]) == len(saldados):
+        prestamos_saldados = anterior["prestamos_saldados"]
+    else:
+        prestamos_saldados = tuple(saldados)
+
+    return {
+        "nombre_apellido": cuenta["nombre_apellido"],
+        "dni": cuenta["dni"],
+        "saldo_disponible": cuenta["saldo_disponible"],
+        "next_prestamo_id": cuenta["next_prestamo_id"],
+        "prestamos": prestamos,
+        "prestamos_saldados": prestamos_saldados,
+        "deuda_pendiente": cuenta["deuda_pendiente"],
+        "transferencias": tuple(
+            cuenta["transferencias"][-constantes.TRANSFERENCIAS_A_MOSTRAR :]
+        ),
+    }
+
+
+def _publicar_versiones(
+    almacen: dict, dnis: tuple[int, ...], cambian_prestamos: bool
+) -> None:
+    """
+    Publica una foto nueva de cada cuenta de `dnis`, todas con la misma versión.
+
+    Pre:
+        - Quien llama tiene los cerrojos de todas las cuentas de `dnis` y ya
+          terminó de modificarlas.
+    Post:
+        - Las fotos quedan visibles juntas para las lecturas que se abran después.
+        - Se descartan las versiones que ninguna lectura abierta puede ver.
+    """
+    versiones = almacen["versiones"]
+    fotos = []
+    for dni in dnis:
+        anteriores = versiones.get(dni)
+        anterior = anteriores[-1][1] if anteriores else None
+        fotos.append(
+            (dni, _tomar_foto(almacen["cuentas"][dni], anterior, cambian_prestamos))
+        )
+
+    with almacen["cerrojo_versiones"]:
+        version = almacen["version_confirmada"] + 1
+        lectores = almacen["lectores"]
+        if not lectores:
+            # nadie puede necesitar versiones viejas: queda solo la nueva
+            for dni, foto in fotos:
+                versiones[dni] = [(version, foto)]
+        else:
+            minima_leida = min(lectores)
+            for dni, foto in fotos:
+                todas = versiones.get(dni, []) + [(version, foto)]
+                # la versión que ve el lector más viejo es la última <= minima_leida
+                inicio = 0
+                while inicio + 1 < len(todas) and todas[inicio + 1][0] <= minima_leida:
+                    inicio += 1
+                # se reemplaza la lista entera: un lector nunca ve una lista a medio cambiar
+                versiones[dni] = todas[inicio:]
+
+        almacen["version_confirmada"] = version
+
+
+def registrar_cuenta(almacen: dict, nombre: str, dni: int) -> bool:
+    """
+    Crea una cuenta nueva en el almacén.
+
+    Pre:
+        - `nombre` y `dni` ya fueron validados.
+    Post:
+        - Devuelve True si la cuenta se creó.
+        - Devuelve False si ya existía una cuenta con ese DNI.
+    """
+    with almacen["cerrojo_registro"]:
+        if dni in almacen["cuentas"]:
+            return False
+
+        # el cerrojo se crea antes que la cuenta: quien vea la cuenta ya puede bloquearla
+        cerrojo = threading.Lock()
+        almacen["cerrojos"][dni] = cerrojo
+        with cerrojo:
+            negocio.registrar_cuenta(almacen["cuentas"], nombre, dni)
+            _publicar_versiones(almacen, (dni,), True)
+
+    return True
+
+
+def acreditar_dinero(almacen: dict, dni: int, monto: int) -> None:
+    """
+    Acredita un monto en la cuenta indicada.
+
+    Pre:
+        - `dni` existe en el almacén.
+        - `monto` es un número entero mayor que cero.
+    Post:
+        - Se incrementa el saldo disponible de la cuenta.
+    """
+    with almacen["cerrojos"][dni]:
+        negocio.acreditar_dinero(almacen["cuentas"], dni, monto)
+        _publicar_versiones(almacen, (dni,), False)
+
+
+def transferir_dinero(
+    almacen: dict, dni_origen: int, dni_destino: int, monto_a_transferir: int
+) -> bool:
+    """
+    Transfiere dinero entre dos cuentas tomando ambos cerrojos en orden de DNI.
+
+    Pre:
+        - `dni_origen` y `dni_destino` existen en el almacén.
+        - `monto_a_transferir` es un entero positivo.
+    Post:
+        - Igual que `negocio.transferir_dinero`: devuelve True si se realizó
+          y False si el saldo de origen era insuficiente.
+        - Si `dni_origen` y `dni_destino` son iguales, devuelve False sin
+          modificar nada (el cerrojo de la cuenta no se puede tomar dos veces).
+        - Verificar el saldo y moverlo ocurre sin que otro hilo modifique
+          ninguna de las dos cuentas en el medio.
+    """
+    if dni_origen == dni_destino:
+        return False
+
+    # el orden es total y fijo, así que no hay ciclos de espera entre hilos
+    primero, segundo = sorted((dni_origen, dni_destino))
+    cerrojos = almacen["cerrojos"]
+
+    with cerrojos[primero], cerrojos[segundo]:
+        realizada = negocio.transferir_dinero(
+            almacen["cuentas"], dni_origen, dni_destino, monto_a_transferir
+        )
+        if realizada:
+            _publicar_versiones(almacen, (dni_origen, dni_destino), False)
+        return realizada
+
+
+def transferir_lote(almacen: dict, dni_origen: int, pagos: list[tuple]) -> bool:
+    """
+    Realiza un lote de transferencias desde una cuenta tomando los cerrojos de
+    todas las cuentas involucradas en orden de DNI.
+
+    Pre:
+        - Las mismas que `negocio.transferir_lote`.
+    Post:
+        - Igual que `negocio.transferir_lote`: se aplican todos los pagos o ninguno.
+        - Ningún otro hilo ve ni modifica las cuentas a mitad del lote; las
+          lecturas con instantáneas ven todos los pagos juntos.
+    """
+    dnis = sorted({dni_origen, *(dni_destino for dni_destino, _ in pagos)})
+    cerrojos = almacen["cerrojos"]
+
+    with contextlib.ExitStack() as tomados:
+        for dni in dnis:
+            tomados.enter_context(cerrojos[dni])
+
+        realizado = negocio.transferir_lote(almacen["cuentas"], dni_origen, pagos)
+        if realizado:
+            _publicar_versiones(almacen, tuple(dnis), False)
+        return realizado
+
+
+def otorgar_prestamo(almacen: dict, dni: int, interes: int, monto: int) -> None:
+    """
+    Otorga un préstamo a la cuenta indicada.
+
+    Pre:
+        - `dni` existe en el almacén.
+        - `interes` y `monto` ya fueron validados.
+    Post:
+        - Igual que `negocio.otorgar_prestamo`.
+    """
+    with almacen["cerrojos"][dni]:
+        negocio.otorgar_prestamo(almacen["cuentas"], dni, interes, monto)
+        _publicar_versiones(almacen, (dni,), True)
+
+
+def pagar_prestamo(almacen: dict, dni: int, id_prestamo: int, monto: int) -> bool:
+    """
+    Paga un préstamo de la cuenta indicada con su saldo disponible.
+
+    Pre:
+        - `dni` existe en el almacén.
+        - `monto` es un entero positivo.
+    Post:
+        - Si el préstamo está activo y el saldo alcanza, aplica el pago
+          (como mucho la deuda total) y devuelve True.
+        - En cualquier otro caso no modifica la cuenta y devuelve False.
+    """
+    with almacen["cerrojos"][dni]:
+        cuenta = almacen["cuentas"][dni]
+        prestamo = negocio.buscar_prestamo(cuenta, id_prestamo)
+        if prestamo is None:
+            return False
+
+        deuda_total = negocio.deuda_total_prestamo(prestamo)
+        if cuenta["saldo_disponible"] < monto:
+            return False
+
+        negocio.pagar_prestamo(cuenta, prestamo, min(monto, deuda_total))
+        _publicar_versiones(almacen, (dni,), True)
+
+    return True
+
+
+# Lecturas con instantáneas
+
+
+def abrir_lectura(almacen: dict) -> int:
+    """
+    Abre una lectura en la última versión confirmada.
+
+    Post:
+        - Devuelve la versión de la lectura. Hay que cerrarla con
+          `cerrar_lectura` para que sus versiones puedan descartarse.
+    """
+    with almacen["cerrojo_versiones"]:
+        version = almacen["version_confirmada"]
+        lectores = almacen["lectores"]
+        lectores[version] = lectores.get(version, 0) + 1
+    return version
+
+
+def cerrar_lectura(almacen: dict, version: int) -> None:
+    """
+    Cierra una lectura abierta con `abrir_lectura`.
+    """
+    with almacen["cerrojo_versiones"]:
+        lectores = almacen["lectores"]
+        lectores[version] -= 1
+        if lectores[version] == 0:
+            del lectores[version]
+
+
+def leer_cuenta(almacen: dict, version: int, dni: int) -> dict | None:
+    """
+    Devuelve la foto de la cuenta tal como estaba en `version`, sin tomar cerrojos.
+
+    Pre:
+        - `version` es una lectura abierta.
+    Post:
+        - Devuelve None si la cuenta no existía en esa versión.
+        - La foto no debe modificarse.
+    """
+    versiones = almacen["versiones"].get(dni)
+    if versiones is None:
+        return None
+
+    for numero, foto in reversed(versiones):
+        if numero <= version:
+            return foto
+    return None
+
+
+def leer_cuentas(almacen: dict, dnis) -> dict:
+    """
+    Devuelve {dni: foto} de las cuentas pedidas, todas en el mismo instante.
+    Las cuentas que no existen se omiten.
+    """
+    version = abrir_lectura(almacen)
+    try:
+        fotos = {}
+        for dni in dnis:
+            foto = leer_cuenta(almacen, version, dni)
+            if foto is not None:
+                fotos[dni] = foto
+        return fotos
+    finally:
+        cerrar_lectura(almacen, version)
+
+
+def resumen_cuenta(almacen: dict, dni: int) -> list[str] | None:
+    """
+    Devuelve las líneas del resumen de la cuenta (`presentacion.formatear_resumen_cuenta`)
+    a partir de una foto consistente, o None si la cuenta no existe.
+    """
+    foto = leer_cuentas(almacen, (dni,)).get(dni)
+    if foto is None:
+        return None
+    return presentacion.formatear_resumen_cuenta(foto, almacen["cuentas"])
@@ -0,0 +1,312 @@
+"""
+Pruebas de estrés del almacén concurrente (`concurrencia`).
+
+Se pueden correr con pytest o directamente con `python concurrencia_test.py`,
+que además imprime el rendimiento según la cantidad de hilos.
+"""
+
+import random
+import threading
+import time
+
+import concurrencia
+import negocio
+
+HILOS = 8
+CUENTAS = 50
+SALDO_INICIAL = 10_000
+OPERACIONES_POR_HILO = 5_000
+
+
+def _crear_almacen_con_saldo(cantidad: int, saldo: int) -> tuple[dict, list[int]]:
+    """Crea un almacén con `cantidad` cuentas, cada una con `saldo` acreditado."""
+    almacen = concurrencia.crear_almacen({})
+    dnis = list(range(10_000_000, 10_000_000 + cantidad))
+    for dni in dnis:
+        concurrencia.registrar_cuenta(almacen, "Cliente Prueba", dni)
+        concurrencia.acreditar_dinero(almacen, dni, saldo)
+    return almacen, dnis
+
+
+def _correr_hilos(funcion, cantidad: int) -> float:
+    """
+    Corre `funcion(indice)` en `cantidad` hilos y devuelve los segundos que tardó.
+    Si algún hilo lanzó una excepción (por ejemplo, un assert), la relanza.
+    """
+    errores = []
+
+    def correr(indice):
+        try:
+            funcion(indice)
+        except Exception as error:
+            errores.append(error)
+
+    hilos = [threading.Thread(target=correr, args=(i,)) for i in range(cantidad)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join(timeout=60)
+        assert not hilo.is_alive(), "Un hilo quedó bloqueado (posible deadlock)"
+    segundos = time.perf_counter() - inicio
+
+    if errores:
+        raise errores[0]
+    return segundos
+
+
+def test_01_acreditaciones_concurrentes_no_pierden_actualizaciones():
+    almacen, dnis = _crear_almacen_con_saldo(1, 0)
+
+    def acreditar(_):
+        for _ in range(OPERACIONES_POR_HILO):
+            concurrencia.acreditar_dinero(almacen, dnis[0], 1)
+
+    _correr_hilos(acreditar, HILOS)
+
+    saldo = almacen["cuentas"][dnis[0]]["saldo_disponible"]
+    assert saldo == HILOS * OPERACIONES_POR_HILO
+
+
+def test_02_transferencias_cruzadas_conservan_el_total():
+    almacen, dnis = _crear_almacen_con_saldo(CUENTAS, SALDO_INICIAL)
+
+    def transferir(indice):
+        generador = random.Random(indice)
+        for _ in range(OPERACIONES_POR_HILO):
+            origen, destino = generador.sample(dnis, 2)
+            concurrencia.transferir_dinero(
+                almacen, origen, destino, generador.randint(100, 3_000)
+            )
+
+    _correr_hilos(transferir, HILOS)
+
+    cuentas = almacen["cuentas"]
+    total = sum(cuenta["saldo_disponible"] for cuenta in cuentas.values())
+    assert total == CUENTAS * SALDO_INICIAL
+
+    enviado = 0
+    recibido = 0
+    for cuenta in cuentas.values():
+        assert cuenta["saldo_disponible"] >= 0
+        for monto, tipo, _ in cuenta["transferencias"]:
+            if tipo == "envia":
+                enviado += monto
+            else:
+                recibido += monto
+    assert enviado == recibido
+
+
+def test_03_transferencias_opuestas_no_se_bloquean():
+    almacen, dnis = _crear_almacen_con_saldo(2, SALDO_INICIAL)
+
+    def ida_y_vuelta(indice):
+        origen, destino = (dnis[0], dnis[1]) if indice % 2 else (dnis[1], dnis[0])
+        for _ in range(OPERACIONES_POR_HILO):
+            concurrencia.transferir_dinero(almacen, origen, destino, 100)
+
+    _correr_hilos(ida_y_vuelta, HILOS)
+
+    cuentas = almacen["cuentas"]
+    total = sum(cuenta["saldo_disponible"] for cuenta in cuentas.values())
+    assert total == 2 * SALDO_INICIAL
+
+
+def test_04_prestamos_y_pagos_concurrentes_son_consistentes():
+    almacen, dnis = _crear_almacen_con_saldo(1, 0)
+    dni = dnis[0]
+    for _ in range(HILOS):
+        concurrencia.otorgar_prestamo(almacen, dni, 10, 1_000)
+
+    def pagar(indice):
+        for _ in range(OPERACIONES_POR_HILO):
+            concurrencia.pagar_prestamo(almacen, dni, indice + 1, 7)
+
+    _correr_hilos(pagar, HILOS)
+
+    cuenta = almacen["cuentas"][dni]
+    pagado = 0
+    for prestamo in negocio.listar_prestamos(cuenta):
+        pagado += (
+            prestamo["total_pagado_impuestos"]
+            + prestamo["total_pagado_intereses"]
+            + prestamo["total_pagado_capital"]
+        )
+        assert prestamo["capital_pendiente"] >= 0
+    assert cuenta["saldo_disponible"] == HILOS * 1_000 - pagado
+    assert cuenta["deuda_pendiente"] == HILOS * 1_300 - pagado
+
+
+def medir_rendimiento(cantidad_hilos: int) -> float:
+    """
+    Mide transferencias por segundo con `cantidad_hilos` hilos que trabajan
+    sobre pares de cuentas disjuntos (ningún hilo comparte cuentas con otro).
+    """
+    almacen, dnis = _crear_almacen_con_saldo(2 * cantidad_hilos, SALDO_INICIAL)
+
+    def transferir(indice):
+        origen, destino = dnis[2 * indice], dnis[2 * indice + 1]
+        for _ in range(OPERACIONES_POR_HILO):
+            concurrencia.transferir_dinero(almacen, origen, destino, 100)
+            concurrencia.transferir_dinero(almacen, destino, origen, 100)
+
+    segundos = _correr_hilos(transferir, cantidad_hilos)
+    return 2 * cantidad_hilos * OPERACIONES_POR_HILO / segundos
+
+
+def test_05_transferencia_a_la_misma_cuenta_se_rechaza():
+    almacen, dnis = _crear_almacen_con_saldo(1, SALDO_INICIAL)
+
+    def transferir(_):
+        for _ in range(100):
+            assert not concurrencia.transferir_dinero(almacen, dnis[0], dnis[0], 10)
+
+    _correr_hilos(transferir, 2)
+
+    cuenta = almacen["cuentas"][dnis[0]]
+    assert cuenta["saldo_disponible"] == SALDO_INICIAL
+    assert cuenta["transferencias"] == []
+    # el cerrojo quedó libre
+    concurrencia.acreditar_dinero(almacen, dnis[0], 1)
+
+
+def test_06_lecturas_ven_instantaneas_consistentes():
+    almacen, dnis = _crear_almacen_con_saldo(CUENTAS, SALDO_INICIAL)
+    escribiendo = threading.Event()
+    escribiendo.set()
+    lecturas = []
+
+    def trabajar(indice):
+        generador = random.Random(indice)
+        if indice % 2 == 0:
+            try:
+                for _ in range(OPERACIONES_POR_HILO):
+                    origen, destino = generador.sample(dnis, 2)
+                    concurrencia.transferir_dinero(
+                        almacen, origen, destino, generador.randint(1, 500)
+                    )
+            finally:
+                # aunque falle, los lectores no se quedan esperando
+                escribiendo.clear()
+        else:
+            while escribiendo.is_set():
+                fotos = concurrencia.leer_cuentas(almacen, dnis)
+                # una transferencia a medio hacer cambiaría el total
+                total = sum(foto["saldo_disponible"] for foto in fotos.values())
+                assert total == CUENTAS * SALDO_INICIAL
+                lecturas.append(len(fotos))
+
+    _correr_hilos(trabajar, HILOS)
+
+    assert lecturas and all(cantidad == CUENTAS for cantidad in lecturas)
+    assert almacen["lectores"] == {}
+    # sin lectores abiertos queda una sola versión por cuenta
+    for dni in dnis:
+        version, foto = almacen["versiones"][dni][-1]
+        assert len(almacen["versiones"][dni]) == 1
+        assert foto["saldo_disponible"] == almacen["cuentas"][dni]["saldo_disponible"]
+
+    lineas = concurrencia.resumen_cuenta(almacen, dnis[0])
+    assert "Cliente Prueba" in lineas[0]
+    assert concurrencia.resumen_cuenta(almacen, 1) is None
+
+
+def test_07_una_lectura_abierta_no_ve_escrituras_posteriores():
+    almacen, dnis = _crear_almacen_con_saldo(2, 1_000)
+    lectura = concurrencia.abrir_lectura(almacen)
+
+    concurrencia.transferir_dinero(almacen, dnis[0], dnis[1], 300)
+    concurrencia.registrar_cuenta(almacen, "Cliente Nuevo", 20_000_000)
+
+    assert (
+        concurrencia.leer_cuenta(almacen, lectura, dnis[0])["saldo_disponible"] == 1_000
+    )
+    assert (
+        concurrencia.leer_cuenta(almacen, lectura, dnis[1])["saldo_disponible"] == 1_000
+    )
+    assert concurrencia.leer_cuenta(almacen, lectura, 20_000_000) is None
+    concurrencia.cerrar_lectura(almacen, lectura)
+
+    fotos = concurrencia.leer_cuentas(almacen, dnis)
+    assert fotos[dnis[0]]["saldo_disponible"] == 700
+    assert fotos[dnis[1]]["saldo_disponible"] == 1_300
+
+
+def test_08_lotes_concurrentes_son_todo_o_nada():
+    almacen, dnis = _crear_almacen_con_saldo(CUENTAS, SALDO_INICIAL)
+    realizados = [0] * HILOS
+
+    def pagar_sueldos(indice):
+        generador = random.Random(indice)
+        for _ in range(OPERACIONES_POR_HILO // 50):
+            origen = generador.choice(dnis)
+            pagos = [
+                (destino, generador.randint(1, 100))
+                for destino in generador.sample(dnis, 10)
+                if destino != origen
+            ]
+            if concurrencia.transferir_lote(almacen, origen, pagos):
+                realizados[indice] += 1
+
+    _correr_hilos(pagar_sueldos, HILOS)
+
+    cuentas = almacen["cuentas"]
+    assert sum(realizados) > 0
+    assert sum(c["saldo_disponible"] for c in cuentas.values()) == (
+        CUENTAS * SALDO_INICIAL
+    )
+    enviado = sum(
+        monto
+        for c in cuentas.values()
+        for monto, tipo, _ in c["transferencias"]
+        if tipo == "envia"
+    )
+    recibido = sum(
+        monto
+        for c in cuentas.values()
+        for monto, tipo, _ in c["transferencias"]
+        if tipo == "recibe"
+    )
+    assert enviado == recibido
+
+    # un lote sin fondos suficientes no modifica ninguna cuenta
+    origen, destino = dnis[0], dnis[1]
+
+    def estado():
+        return [
+            (cuentas[dni]["saldo_disponible"], len(cuentas[dni]["transferencias"]))
+            for dni in (origen, destino)
+        ]
+
+    antes = estado()
+    saldo = cuentas[origen]["saldo_disponible"]
+    assert not concurrencia.transferir_lote(
+        almacen, origen, [(destino, 1), (destino, saldo)]
+    )
+    assert estado() == antes
+
+
+def main():
+    pruebas = [
+        test_01_acreditaciones_concurrentes_no_pierden_actualizaciones,
+        test_02_transferencias_cruzadas_conservan_el_total,
+        test_03_transferencias_opuestas_no_se_bloquean,
+        test_04_prestamos_y_pagos_concurrentes_son_consistentes,
+        test_05_transferencia_a_la_misma_cuenta_se_rechaza,
+        test_06_lecturas_ven_instantaneas_consistentes,
+        test_07_una_lectura_abierta_no_ve_escrituras_posteriores,
+        test_08_lotes_concurrentes_son_todo_o_nada,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+    # con el GIL de CPython el rendimiento no escala; con un intérprete
+    # sin GIL (free-threaded) los hilos sobre cuentas disjuntas no compiten
+    for cantidad_hilos in (1, 2, 4, 8):
+        rendimiento = medir_rendimiento(cantidad_hilos)
+        print(f"{cantidad_hilos} hilos: {rendimiento:,.0f} transferencias/s")
+
+
+if __name__ == "__main__":
+    main()
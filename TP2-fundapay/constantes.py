@@ -13,6 +13,7 @@ MSG_PRESTAMO_CREADO = (
     "El balance de la cuenta de {nombre} es de ${balance}"
 )
 MSG_MONTO_NO_DISPONIBLE = "Monto no disponible en la cuenta de origen"
+MSG_LIMITE_TRANSFERENCIAS = "La cuenta de origen superó su límite de transferencias"
 MSG_TRANSFERENCIA_EXITOSA = (
     "Los ${monto} fueron transferidos desde la cuenta de {nombre_origen} "
     "a la de {nombre_destino} correctamente"
@@ -28,6 +29,11 @@ MSG_TASA_INTERES_INVALIDA = "La tasa de interés debe ser de al menos 5%"
 MSG_NOMBRE_INVALIDO = "Formato de nombre y apellido incorrecto"
 MSG_NO_EXISTE_CUENTA = "No existe cuenta con ese DNI"
 MSG_SELECCION_INVALIDA = "Selección inválida"
+MSG_OK = "OK"
+MSG_CLAVE_IDEMPOTENCIA_REUTILIZADA = "La clave de idempotencia ya se usó en otro pedido"
+MSG_OPERACION_DESCONOCIDA = "Operación desconocida: {operacion}"
+MSG_RESUMEN_LOTE = "Registros procesados: {aceptados} aceptados, {rechazados} rechazados"
+MSG_USO_LOTE = "Uso: python lote.py <entrada.jsonl|entrada.csv> <resultados.jsonl>"
 
 PRESTAMO_TEMPLATE = """{id_prestamo}) Monto total: ${monto_total}
 Interés: {tasa_interes}%
@@ -45,6 +51,7 @@ Saldo: {saldo}
 
 TRANSFERENCIA_ENTRANTE_TEMPLATE = "- Recibe ${monto} de {nombre} (DNI {dni})"
 TRANSFERENCIA_SALIENTE_TEMPLATE = "- Envía ${monto} a {nombre} (DNI {dni})"
+NOMBRE_CONTRAPARTE_DESCONOCIDA = "(cuenta desconocida)"
 
 COMANDO_RETROCEDER = "**"
 
@@ -54,6 +61,12 @@ PRIORIDADES_PAGO = [
     ("capital_pendiente", "total_pagado_capital"),
 ]
 
+EVENTO_CUENTA_REGISTRADA = "cuenta_registrada"
+EVENTO_DINERO_ACREDITADO = "dinero_acreditado"
+EVENTO_TRANSFERENCIA_REALIZADA = "transferencia_realizada"
+EVENTO_PRESTAMO_OTORGADO = "prestamo_otorgado"
+EVENTO_PRESTAMO_PAGADO = "prestamo_pagado"
+
 OPCION_CREAR_CUENTA = 1
 OPCION_INGRESAR_DINERO = 2
 OPCION_TRANSFERIR_DINERO = 3
@@ -64,4 +77,109 @@ OPCION_SALIR = 7
 
 IMPUESTOS_PRESTAMO = 20
 
+MONTO_MINIMO = 100
+INTERES_MINIMO = 5
+MONTO_MINIMO_PAGO = 1
+
 TRANSFERENCIAS_A_MOSTRAR = 5
+
+TAMANIO_BUFFER_LOTE = 1 << 20
+
+HOST_SERVIDOR = "127.0.0.1"
+PUERTO_SERVIDOR = 8765
+MAX_CONEXIONES_ACTIVAS = 10_000
+
+TAMANIO_CACHE_CRONOGRAMAS = 4096
+# plazo de un préstamo que se otorga sin indicar la cantidad de cuotas
+CUOTAS_PRESTAMO = 12
+
+SEGUNDOS_VIDA_IDEMPOTENCIA = 600
+MAX_CLAVES_IDEMPOTENCIA = 100_000
+
+# límites de velocidad de transferencias por cuenta de origen
+SEGUNDOS_POR_BUCKET_MINUTO = 5
+BUCKETS_MINUTO = 12
+SEGUNDOS_POR_BUCKET_HORA = 300
+BUCKETS_HORA = 12
+MAX_TRANSFERENCIAS_MINUTO = 10
+MAX_MONTO_MINUTO = 1_000_000
+MAX_TRANSFERENCIAS_HORA = 100
+MAX_MONTO_HORA = 10_000_000
+
+# analítica de flujos de transferencias (ver `flujos`)
+TRANSFERENCIAS_RECIENTES = 10_000
+ANCHO_SKETCH = 4096
+PROFUNDIDAD_SKETCH = 4
+CANTIDAD_MAYORES_FLUJOS = 20
+
+# carga sintética de `benchmark`: peso relativo de cada operación
+MEZCLA_BENCHMARK = {
+    "crear_cuenta": 2,
+    "ingresar_dinero": 25,
+    "transferir_dinero": 50,
+    "otorgar_prestamo": 8,
+    "pagar_prestamo": 15,
+}
+EXPONENTE_ZIPF = 1.1
+TOLERANCIA_BENCHMARK = 0.10
+MSG_USO_BENCHMARK = (
+    "Uso: python benchmark.py <resultados.json> [cantidad_operaciones] [base.json]"
+)
+MSG_REGRESION = "Regresión en {escenario}: {metrica} {actual} (base {base})"
+
+# histogramas de `instrumentacion`: cada potencia de 2 se divide en 16 buckets
+BITS_SUBBUCKETS_HISTOGRAMA = 4
+CUANTILES_EXPORTADOS = (0.5, 0.9, 0.99)
+
+# extractos masivos de `extractos`
+EXTRACTO_ENCABEZADO = "=== Extracto de la cuenta DNI {dni} ==="
+CUENTAS_POR_PARTE_EXTRACTOS = 2_000
+TAMANIO_BUFFER_EXTRACTOS = 1 << 20
+
+# transferencias en memoria por cuenta cuando hay archivo (ver `archivo_transferencias`)
+TRANSFERENCIAS_EN_MEMORIA = 16
+TAMANIO_BUFFER_ARCHIVO_TRANSFERENCIAS = 1 << 16
+MSG_FORMATO_ARCHIVO_TRANSFERENCIAS = (
+    "{ruta} no es un archivo de transferencias en el formato {version} "
+    "(puede ser de una versión anterior, sin encabezado)"
+)
+
+# búsqueda de cuentas por nombre (ver `indice_nombres`)
+RESULTADOS_BUSQUEDA_NOMBRES = 20
+
+# alta masiva de cuentas desde CSV (ver `altas`)
+FILAS_POR_PARTE_ALTAS = 20_000
+ENCABEZADO_RECHAZOS_ALTAS = ("linea", "nombre", "dni", "motivo")
+MSG_DNI_REPETIDO_ALTAS = "DNI repetido en el archivo (línea {linea})"
+MSG_USO_ALTAS = "Uso: python altas.py <entrada.csv> <rechazos.csv> [procesos]"
+
+# flujo de cambios para consumidores externos (ver `cambios`)
+CAPACIDAD_FLUJO_CAMBIOS = 65_536
+TAMANIO_LOTE_CAMBIOS = 512
+SEGUNDOS_ESPERA_SOCKET_CAMBIOS = 2.0
+
+# conciliación de fin de día (ver `conciliacion`)
+CUENTAS_POR_PARTE_CONCILIACION = 20_000
+
+# procesos de fin de día sobre una carga sintética (ver `fin_de_dia`)
+OPERACIONES_FIN_DE_DIA = 200_000
+CUENTAS_FIN_DE_DIA = 50_000
+MSG_USO_FIN_DE_DIA = (
+    "Uso: python fin_de_dia.py conciliar [procesos]\n"
+    "     python fin_de_dia.py extractos <salida.txt|directorio/> [procesos]"
+)
+
+# backend de salida con buffer (ver `entrada_salida`)
+LINEAS_BUFFER_SALIDA = 256
+
+# índice ordenado de DNI (ver `indice_dni`): dígitos de un DNI completo
+DIGITOS_DNI = 8
+
+# agregados de cuentas (ver `agregados`): el heap de saldos se reconstruye si
+# tiene más de este múltiplo de entradas por cuenta
+FACTOR_COMPACTACION = 2
+
+# cartera columnar de préstamos (ver `cartera`): filas de las columnas al
+# crearla, y filas nuevas que se aceptan sin indexar, como mínimo
+CAPACIDAD_INICIAL_CARTERA = 1024
+MIN_FILAS_NUEVAS_CARTERA = 1024
@@ -0,0 +1,205 @@
+"""
+Este módulo contiene el débito automático de fin de día de las cuotas de préstamos.
+
+A cada préstamo activo de la cartera (`cartera`) se le debita su cuota del
+saldo de la cuenta. El cálculo se hace en bloque con arreglos de NumPy:
+
+    1. El pago de cada préstamo es el mínimo entre su cuota y su deuda.
+    2. Dentro de cada cuenta, los préstamos se pagan en orden de otorgamiento
+       mientras alcance el saldo: el último puede pagarse en parte y los
+       siguientes quedan sin pagar.
+    3. Cada pago se reparte entre impuestos, intereses y capital en el orden
+       de `constantes.PRIORIDADES_PAGO`, igual que `negocio.distribuir_pago`.
+
+Todos los resultados se calculan y todos los préstamos se buscan antes de
+modificar nada; recién después se escriben en la cartera (en bloque) y en las
+cuentas (en una sola pasada, con `negocio.aplicar_pagos_calculados`). Si la
+cartera está conectada, no vuelve a copiar las filas que ya se escribieron.
+El resultado es idéntico a pagar préstamo por préstamo con
+`negocio.pagar_prestamo` (ver `debitar_escalar`).
+"""
+
+import numpy as np
+
+import amortizacion
+import cartera as modulo_cartera
+import constantes
+import negocio
+
+
+def cuotas_uniformes(cartera: dict, monto: int) -> np.ndarray:
+    """
+    Devuelve un arreglo de cuotas con el mismo `monto` para cada fila de la cartera.
+    """
+    return np.full(cartera["cantidad"], monto, dtype=np.int64)
+
+
+def cuotas_por_cronograma(cartera: dict) -> np.ndarray:
+    """
+    Devuelve, por fila de la cartera, lo que falta pagar de la cuota vigente
+    según el cronograma del préstamo (`amortizacion`), con su propio plazo.
+
+    Post:
+        - Las filas de préstamos saldados tienen cuota 0.
+    """
+    columna = modulo_cartera.columna
+    capitales = columna(cartera, "monto_capital_original").tolist()
+    tasas = columna(cartera, "tasa_interes").tolist()
+    plazos = columna(cartera, "cantidad_cuotas").tolist()
+    deudas = modulo_cartera.deuda_por_prestamo(cartera).tolist()
+
+    cuotas = np.zeros(cartera["cantidad"], dtype=np.int64)
+    for fila, deuda in enumerate(deudas):
+        if deuda == 0:
+            continue
+        cronograma = amortizacion.cronograma(capitales[fila], tasas[fila], plazos[fila])
+        cuota = amortizacion.cuota_pendiente(cronograma, deuda)
+        cuotas[fila] = deuda - cuota[amortizacion.CUOTA_DEUDA_RESTANTE]
+    return cuotas
+
+
+def _saldos_por_cuenta(cuentas: dict, cartera: dict) -> np.ndarray:
+    """
+    Devuelve el saldo disponible de cada cuenta de la cartera, por índice de cuenta.
+    """
+    return np.fromiter(
+        (cuentas[dni]["saldo_disponible"] for dni in cartera["dnis"]),
+        dtype=np.int64,
+        count=len(cartera["dnis"]),
+    )
+
+
+def calcular_debitos(cuentas: dict, cartera: dict, cuotas: np.ndarray) -> dict:
+    """
+    Calcula los pagos del débito automático sin modificar cuentas ni cartera.
+
+    Pre:
+        - `cartera` está al día con `cuentas`.
+        - `cuotas` tiene un entero no negativo por fila de la cartera.
+    Post:
+        - Devuelve {"pagos": monto por fila, "componentes": [pagos por componente
+          en el orden de PRIORIDADES_PAGO]}.
+    """
+    columna = modulo_cartera.columna
+    indice_cuenta = columna(cartera, "indice_cuenta")
+    pedidos = np.minimum(cuotas, modulo_cartera.deuda_por_prestamo(cartera))
+
+    # se agrupan las filas por cuenta sin alterar el orden de otorgamiento
+    orden = np.argsort(indice_cuenta, kind="stable")
+    cuentas_ordenadas = indice_cuenta[orden]
+    pedidos_ordenados = pedidos[orden]
+
+    # lo pedido por los préstamos anteriores de la misma cuenta
+    acumulado = np.cumsum(pedidos_ordenados) - pedidos_ordenados
+    inicio_grupo = np.ones(len(orden), dtype=bool)
+    inicio_grupo[1:] = cuentas_ordenadas[1:] != cuentas_ordenadas[:-1]
+    posicion_inicio = np.maximum.accumulate(
+        np.where(inicio_grupo, np.arange(len(orden)), 0)
+    )
+    anteriores = acumulado - acumulado[posicion_inicio]
+
+    # cada préstamo paga lo que pide mientras el saldo que queda alcance
+    saldos = _saldos_por_cuenta(cuentas, cartera)[cuentas_ordenadas]
+    pagos_ordenados = np.clip(saldos - anteriores, 0, pedidos_ordenados)
+
+    pagos = np.empty_like(pagos_ordenados)
+    pagos[orden] = pagos_ordenados
+
+    # mismo reparto que distribuir_pago, componente por componente
+    componentes = []
+    restante = pagos.copy()
+    for clave_pendiente, _ in constantes.PRIORIDADES_PAGO:
+        aplicado = np.minimum(restante, columna(cartera, clave_pendiente))
+        componentes.append(aplicado)
+        restante = restante - aplicado
+
+    return {"pagos": pagos, "componentes": componentes}
+
+
+def debitar(cuentas: dict, cartera: dict, cuotas: np.ndarray) -> tuple[int, int]:
+    """
+    Ejecuta el débito automático en bloque.
+
+    Pre:
+        - `cartera` está al día con `cuentas`.
+        - `cuotas` tiene un entero no negativo por fila de la cartera.
+    Post:
+        - Se aplican los pagos calculados por `calcular_debitos` a las cuentas,
+          los préstamos y la cartera.
+        - Devuelve (cantidad de préstamos debitados, total debitado).
+    """
+    resultado = calcular_debitos(cuentas, cartera, cuotas)
+    pagos = resultado["pagos"]
+    componentes = resultado["componentes"]
+
+    filas = np.flatnonzero(pagos)
+    if len(filas) == 0:
+        return 0, 0
+
+    # se buscan todos los préstamos antes de escribir: si la cartera no está
+    # al día, falla acá sin dejar un débito a medias
+    columna = modulo_cartera.columna
+    dnis = cartera["dnis"]
+    indices_cuenta = columna(cartera, "indice_cuenta")[filas].tolist()
+    ids = columna(cartera, "id_prestamo")[filas].tolist()
+    montos = pagos[filas].tolist()
+    repartos = list(zip(*(aplicado[filas].tolist() for aplicado in componentes)))
+
+    pagos_calculados = []
+    for indice_cuenta, id_prestamo, monto, reparto in zip(
+        indices_cuenta, ids, montos, repartos
+    ):
+        cuenta = cuentas[dnis[indice_cuenta]]
+        pagos_calculados.append(
+            (cuenta, cuenta["prestamos"][id_prestamo], monto, reparto)
+        )
+
+    # escritura: la cartera en bloque y las cuentas en una pasada
+    for (clave_pendiente, clave_pagado), aplicado in zip(
+        constantes.PRIORIDADES_PAGO, componentes
+    ):
+        columna(cartera, clave_pendiente)[filas] -= aplicado[filas]
+        columna(cartera, clave_pagado)[filas] += aplicado[filas]
+
+    cartera["pagos_en_bloque"] = True
+    try:
+        negocio.aplicar_pagos_calculados(cuentas, pagos_calculados)
+    finally:
+        cartera["pagos_en_bloque"] = False
+
+    return len(filas), int(pagos.sum())
+
+
+def debitar_escalar(
+    cuentas: dict, cartera: dict, cuotas: np.ndarray
+) -> tuple[int, int]:
+    """
+    Versión de referencia de `debitar`: recorre la cartera fila por fila y paga
+    cada préstamo con `negocio.pagar_prestamo`.
+
+    Post:
+        - Mismo efecto y mismo resultado que `debitar`.
+    """
+    columna = modulo_cartera.columna
+    dnis = cartera["dnis"]
+    indices_cuenta = columna(cartera, "indice_cuenta").tolist()
+    ids = columna(cartera, "id_prestamo").tolist()
+
+    cantidad = 0
+    total = 0
+    for fila, cuota in enumerate(cuotas.tolist()):
+        cuenta = cuentas[dnis[indices_cuenta[fila]]]
+        prestamo = negocio.buscar_prestamo(cuenta, ids[fila])
+        if prestamo is None:
+            continue
+
+        monto = min(cuota, negocio.deuda_total_prestamo(prestamo))
+        monto = min(monto, cuenta["saldo_disponible"])
+        if monto <= 0:
+            continue
+
+        negocio.pagar_prestamo(cuenta, prestamo, monto)
+        cantidad += 1
+        total += monto
+
+    return cantidad, total
@@ -0,0 +1,212 @@
+"""
+Pruebas del débito automático en bloque (`debito_automatico`).
+
+Se pueden correr con pytest o directamente con `python debito_automatico_test.py`.
+"""
+
+import copy
+import random
+
+import numpy as np
+
+import amortizacion
+import cartera
+import constantes
+import debito_automatico
+import negocio
+
+
+def _crear_cuentas(semilla: int, cantidad: int) -> dict:
+    """Crea cuentas con saldos y préstamos (algunos pagados en parte) al azar."""
+    generador = random.Random(semilla)
+    cuentas = {}
+    for dni in range(10_000_000, 10_000_000 + cantidad):
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        negocio.acreditar_dinero(cuentas, dni, generador.randint(0, 5_000))
+        for _ in range(generador.randint(0, 4)):
+            negocio.otorgar_prestamo(
+                cuentas, dni, generador.randint(5, 40), generador.randint(100, 3_000)
+            )
+
+        cuenta = cuentas[dni]
+        for prestamo in list(cuenta["prestamos"].values()):
+            if generador.random() < 0.5:
+                negocio.pagar_prestamo(cuenta, prestamo, generador.randint(1, 4_000))
+    return cuentas
+
+
+def _comparar(cuentas_a: dict, cartera_a: dict, cuentas_b: dict, cartera_b: dict):
+    """Verifica que dos cuentas y sus carteras tengan exactamente el mismo estado."""
+    assert cuentas_a == cuentas_b
+    for campo in cartera.CAMPOS_PRESTAMO:
+        assert np.array_equal(
+            cartera.columna(cartera_a, campo), cartera.columna(cartera_b, campo)
+        ), campo
+
+
+def _debitar_ambos(cuentas: dict, cuotas: np.ndarray) -> tuple:
+    """
+    Aplica el débito en bloque y el escalar sobre copias de `cuentas`, y verifica
+    que ambos dejen el mismo estado. Las dos carteras tienen las mismas filas y
+    están conectadas a sus cuentas.
+    """
+    cuentas_bloque = copy.deepcopy(cuentas)
+    cartera_bloque = cartera.crear_cartera(cuentas_bloque)
+    observador = cartera.conectar(cartera_bloque, cuentas_bloque)
+    try:
+        resultado_bloque = debito_automatico.debitar(
+            cuentas_bloque, cartera_bloque, cuotas
+        )
+    finally:
+        negocio.desuscribir(cuentas_bloque, observador)
+
+    cuentas_escalar = copy.deepcopy(cuentas)
+    cartera_escalar = cartera.crear_cartera(cuentas_escalar)
+    observador = cartera.conectar(cartera_escalar, cuentas_escalar)
+    try:
+        resultado_escalar = debito_automatico.debitar_escalar(
+            cuentas_escalar, cartera_escalar, cuotas
+        )
+    finally:
+        negocio.desuscribir(cuentas_escalar, observador)
+
+    _comparar(cuentas_bloque, cartera_bloque, cuentas_escalar, cartera_escalar)
+    return resultado_bloque, resultado_escalar
+
+
+def test_01_reparto_por_prioridad_y_saldo():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_000)  # deuda 1300
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 500)  # deuda 650
+    # saldo 1500: el primero paga 1000 y el segundo solo los 500 restantes
+
+    resultado_bloque, resultado_escalar = _debitar_ambos(
+        cuentas, np.array([1_000, 1_000])
+    )
+    assert resultado_bloque == resultado_escalar == (2, 1_500)
+
+
+def test_02_identico_al_camino_escalar():
+    for semilla in range(5):
+        cuentas = _crear_cuentas(semilla, 300)
+        cantidad_filas = cartera.crear_cartera(cuentas)["cantidad"]
+        cuotas = np.random.default_rng(semilla).integers(0, 2_000, cantidad_filas)
+
+        resultado_bloque, resultado_escalar = _debitar_ambos(cuentas, cuotas)
+        assert resultado_bloque == resultado_escalar
+        assert resultado_bloque[1] > 0
+
+
+def test_03_prestamos_saldados_se_archivan():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 10_000)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_000)
+
+    cartera_actual = cartera.crear_cartera(cuentas)
+    debito_automatico.debitar(
+        cuentas,
+        cartera_actual,
+        debito_automatico.cuotas_uniformes(cartera_actual, 5_000),
+    )
+
+    cuenta = cuentas[12_345_678]
+    assert cuenta["prestamos"] == {}
+    assert cuenta["deuda_pendiente"] == 0
+    assert cuenta["saldo_disponible"] == 11_000 - 1_300
+    assert cuenta["prestamos_saldados"] == [
+        (1, 1_000, 10, 200, 100, constantes.CUOTAS_PRESTAMO)
+    ]
+
+
+def test_04_eventos_despues_de_escribir_todo():
+    cuentas = _crear_cuentas(7, 200)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    cuotas = debito_automatico.cuotas_uniformes(cartera_actual, 500)
+
+    esperado = copy.deepcopy(cuentas)
+    cantidad, _ = debito_automatico.debitar_escalar(
+        esperado, cartera.crear_cartera(esperado), cuotas
+    )
+
+    # cada evento se publica con todas las cuentas ya debitadas
+    vistos = []
+
+    def observador(evento):
+        vistos.append(evento["dni"])
+        assert cuentas == esperado
+
+    negocio.suscribir(cuentas, observador)
+    try:
+        debito_automatico.debitar(cuentas, cartera_actual, cuotas)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    assert len(vistos) == cantidad > 0
+    assert not cartera_actual["pagos_en_bloque"]
+
+
+def test_05_cartera_desactualizada_no_modifica_nada():
+    cuentas = _crear_cuentas(3, 50)
+    cartera_actual = cartera.crear_cartera(cuentas)
+
+    # un préstamo se salda por fuera de la cartera, que queda desactualizada
+    dni = cartera_actual["dnis"][-1]
+    cuenta = cuentas[dni]
+    prestamo = next(iter(cuenta["prestamos"].values()))
+    negocio.acreditar_dinero(cuentas, dni, negocio.deuda_total_prestamo(prestamo))
+    negocio.pagar_prestamo(cuenta, prestamo, negocio.deuda_total_prestamo(prestamo))
+
+    cuentas_antes = copy.deepcopy(cuentas)
+    columnas_antes = {
+        campo: cartera.columna(cartera_actual, campo).copy()
+        for campo in cartera.CAMPOS_PRESTAMO
+    }
+    cuotas = debito_automatico.cuotas_uniformes(cartera_actual, 5_000)
+    try:
+        debito_automatico.debitar(cuentas, cartera_actual, cuotas)
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("Se esperaba KeyError")
+
+    assert cuentas == cuentas_antes
+    for campo, valores in columnas_antes.items():
+        assert np.array_equal(cartera.columna(cartera_actual, campo), valores), campo
+
+
+def test_06_cuotas_con_el_plazo_de_cada_prestamo():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_200, 12)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_200, 3)
+    cartera_actual = cartera.crear_cartera(cuentas)
+    assert cartera.columna(cartera_actual, "cantidad_cuotas").tolist() == [12, 3]
+
+    # el mismo producto a menos cuotas tiene cuotas más altas
+    cuotas = debito_automatico.cuotas_por_cronograma(cartera_actual).tolist()
+    prestamos = cuentas[12_345_678]["prestamos"]
+    assert cuotas == [
+        amortizacion.proxima_cuota(prestamos[1])[amortizacion.CUOTA_MONTO],
+        amortizacion.proxima_cuota(prestamos[2])[amortizacion.CUOTA_MONTO],
+    ]
+    assert cuotas[0] < cuotas[1]
+
+
+def main():
+    pruebas = [
+        test_01_reparto_por_prioridad_y_saldo,
+        test_02_identico_al_camino_escalar,
+        test_03_prestamos_saldados_se_archivan,
+        test_04_eventos_despues_de_escribir_todo,
+        test_05_cartera_desactualizada_no_modifica_nada,
+        test_06_cuotas_con_el_plazo_de_cada_prestamo,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
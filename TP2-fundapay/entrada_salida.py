@@ -0,0 +1,158 @@
+"""
+Este módulo contiene la entrada y salida de la interfaz de FundaPay.
+
+`validaciones`, `presentacion`, `operaciones` y `fundapay` no llaman a
+`input()` ni a `print()`: piden cada respuesta con `pedir` y muestran cada
+texto con `mostrar`, que delegan en el backend instalado con `usar`. Así el
+flujo completo de `fundapay.main` puede correr con un guion de respuestas, a
+la velocidad de la máquina, para repetir sesiones y medir rendimiento.
+
+Un backend es un diccionario {"pedir": f(mensaje) -> str, "mostrar": f(texto)}:
+
+    - `interactivo()`: la consola, con `input()` y `print()` (el de siempre).
+    - `guionado(respuestas, salida)`: responde con una cola de respuestas y
+      agrega lo mostrado (y los mensajes de cada pedido) a la lista `salida`,
+      o lo descarta si es None. Sin respuestas, `pedir` lanza EOFError, como
+      `input()` al final de la entrada.
+    - `bufferizado(destino)`: pide por consola pero junta lo mostrado y lo
+      escribe en `destino` de a bloques (y siempre antes de pedir algo).
+      Hay que llamar a `vaciar` al terminar.
+"""
+
+import collections
+import contextlib
+import sys
+
+import constantes
+
+
+def interactivo() -> dict:
+    """
+    Devuelve el backend de consola.
+    """
+
+    # `input` y `print` se buscan en cada llamada, así que siguen funcionando
+    # los reemplazos de la salida estándar (por ejemplo, `redirect_stdout`)
+    def pedir(mensaje: str = "") -> str:
+        return input(mensaje)
+
+    def mostrar(texto: str) -> None:
+        print(texto)
+
+    return {"pedir": pedir, "mostrar": mostrar}
+
+
+def guionado(respuestas, salida: list | None = None) -> dict:
+    """
+    Devuelve un backend que responde cada pedido con la siguiente de `respuestas`.
+
+    Pre:
+        - `respuestas` es un iterable de textos.
+    Post:
+        - El backend tiene además "respuestas", la cola de respuestas
+          pendientes, a la que se pueden agregar más.
+        - Si `salida` es una lista, cada mensaje de pedido y cada texto
+          mostrado se le agrega en orden; si es None, se descartan.
+    """
+    cola = collections.deque(respuestas)
+
+    def pedir(mensaje: str = "") -> str:
+        if not cola:
+            raise EOFError
+        if salida is not None:
+            salida.append(mensaje)
+        return cola.popleft()
+
+    if salida is None:
+
+        def mostrar(_texto: str) -> None:
+            pass
+
+    else:
+        mostrar = salida.append
+
+    return {"pedir": pedir, "mostrar": mostrar, "respuestas": cola}
+
+
+def bufferizado(destino=None, tamanio: int = constantes.LINEAS_BUFFER_SALIDA) -> dict:
+    """
+    Devuelve un backend que pide por consola y escribe lo mostrado de a bloques.
+
+    Pre:
+        - `destino` es un archivo de texto abierto (None: la salida estándar).
+    Post:
+        - Lo mostrado se escribe al juntar `tamanio` líneas, antes de cada
+          pedido y al llamar a `vaciar`.
+    """
+    pendientes = []
+
+    def vaciar_pendientes() -> None:
+        if pendientes:
+            archivo = sys.stdout if destino is None else destino
+            archivo.write("\n".join(pendientes) + "\n")
+            archivo.flush()
+            pendientes.clear()
+
+    def pedir(mensaje: str = "") -> str:
+        vaciar_pendientes()
+        return input(mensaje)
+
+    def mostrar(texto: str) -> None:
+        pendientes.append(texto)
+        if len(pendientes) >= tamanio:
+            vaciar_pendientes()
+
+    return {"pedir": pedir, "mostrar": mostrar, "vaciar": vaciar_pendientes}
+
+
+_backend = interactivo()
+_pedir = _backend["pedir"]
+_mostrar = _backend["mostrar"]
+
+
+def usar(backend: dict) -> dict:
+    """
+    Instala `backend` y devuelve el que estaba instalado.
+    """
+    global _backend, _pedir, _mostrar
+    anterior = _backend
+    _backend = backend
+    _pedir = backend["pedir"]
+    _mostrar = backend["mostrar"]
+    return anterior
+
+
+@contextlib.contextmanager
+def usando(backend: dict):
+    """
+    Instala `backend` mientras dura el bloque `with`; al salir, vacía lo que
+    tenga pendiente y vuelve a instalar el anterior.
+    """
+    anterior = usar(backend)
+    try:
+        yield backend
+    finally:
+        vaciar()
+        usar(anterior)
+
+
+def vaciar() -> None:
+    """
+    Escribe lo que el backend instalado tenga pendiente de mostrar, si tiene algo.
+    """
+    if "vaciar" in _backend:
+        _backend["vaciar"]()
+
+
+def pedir(mensaje: str) -> str:
+    """
+    Muestra `mensaje` y devuelve la respuesta, según el backend instalado.
+    """
+    return _pedir(mensaje)
+
+
+def mostrar(texto: str) -> None:
+    """
+    Muestra un texto (una o más líneas), según el backend instalado.
+    """
+    _mostrar(texto)
@@ -0,0 +1,82 @@
+"""
+Pruebas de los backends de entrada y salida (`entrada_salida`).
+
+Se pueden correr con pytest o directamente con `python entrada_salida_test.py`.
+"""
+
+import io
+
+import constantes
+import entrada_salida
+import fundapay
+
+
+def test_01_sesion_completa_con_guion():
+    respuestas = [
+        "1", "Ana Lopez", "12.345.678",
+        "1", "Juan Perez", "23.456.789",
+        "2", "12.345.678", "1000",
+        "3", "12.345.678", "23.456.789", "5000",  # saldo insuficiente
+        "3", "12.345.678", "23.456.789", "400",
+        "6", "23.456.789",
+        "x",
+        "7",
+    ]  # fmt: skip
+    salida = []
+    with entrada_salida.usando(entrada_salida.guionado(respuestas, salida)) as backend:
+        fundapay.main()
+
+    assert not backend["respuestas"]
+    assert (
+        constantes.MSG_INGRESO_ACREDITADO.format(monto=1000, nombre="Ana Lopez")
+        in salida
+    )
+    assert constantes.MSG_MONTO_NO_DISPONIBLE in salida
+    assert (
+        constantes.MSG_TRANSFERENCIA_EXITOSA.format(
+            monto=400, nombre_origen="Ana Lopez", nombre_destino="Juan Perez"
+        )
+        in salida
+    )
+    assert salida.count(constantes.MSG_INPUT_INVALIDO) == 1
+    assert salida[-1] == constantes.MSG_FIN
+
+
+def test_02_guion_agotado_termina_como_fin_de_entrada():
+    backend = entrada_salida.guionado(["1"])
+    with entrada_salida.usando(backend):
+        try:
+            fundapay.main()
+        except EOFError:
+            pass
+        else:
+            raise AssertionError("Se esperaba EOFError")
+
+
+def test_03_salida_con_buffer_escribe_de_a_bloques():
+    destino = io.StringIO()
+    with entrada_salida.usando(entrada_salida.bufferizado(destino, tamanio=3)):
+        entrada_salida.mostrar("uno")
+        entrada_salida.mostrar("dos")
+        assert destino.getvalue() == ""
+        entrada_salida.mostrar("tres")
+        assert destino.getvalue() == "uno\ndos\ntres\n"
+        entrada_salida.mostrar("cuatro")
+
+    # al salir del bloque se escribe lo pendiente
+    assert destino.getvalue() == "uno\ndos\ntres\ncuatro\n"
+
+
+def main():
+    pruebas = [
+        test_01_sesion_completa_con_guion,
+        test_02_guion_agotado_termina_como_fin_de_entrada,
+        test_03_salida_con_buffer_escribe_de_a_bloques,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
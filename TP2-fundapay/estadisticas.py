@@ -0,0 +1,80 @@
+"""
+Este módulo contiene las funciones de percentiles que comparten el servidor,
+la instrumentación y los medidores de carga.
+
+    - `percentil`: percentil exacto de una lista de muestras.
+    - Histogramas logarítmicos al estilo HDR ({indice_bucket: cantidad}): cada
+      potencia de 2 se divide en 2**BITS_SUBBUCKETS_HISTOGRAMA buckets, así que
+      cualquier percentil tiene un error relativo de a lo sumo 1/16 sin
+      guardar las muestras. Registrar un valor es O(1) y calcular un
+      percentil recorre solo los buckets usados (unos cientos).
+"""
+
+import constantes
+
+_SUBBUCKETS = 1 << constantes.BITS_SUBBUCKETS_HISTOGRAMA
+
+
+def percentil(valores: list[float], fraccion: float) -> float:
+    """
+    Devuelve el percentil `fraccion` (entre 0 y 1) de `valores`, o 0 si está vacía.
+    """
+    if not valores:
+        return 0.0
+
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(fraccion * len(ordenados)))
+    return ordenados[indice]
+
+
+def indice_bucket(valor: int) -> int:
+    """
+    Devuelve el bucket del histograma de un valor entero no negativo.
+
+    Post:
+        - Los valores menores que 2 * _SUBBUCKETS tienen un bucket cada uno.
+        - Los mayores comparten bucket con los que tienen los mismos
+          BITS_SUBBUCKETS_HISTOGRAMA + 1 bits más significativos.
+    """
+    if valor < 2 * _SUBBUCKETS:
+        return valor
+
+    desplazamiento = valor.bit_length() - constantes.BITS_SUBBUCKETS_HISTOGRAMA - 1
+    return _SUBBUCKETS * desplazamiento + (valor >> desplazamiento)
+
+
+def limite_inferior(indice: int) -> int:
+    """
+    Devuelve el menor valor que cae en el bucket `indice` (inversa de `indice_bucket`).
+    """
+    if indice < 2 * _SUBBUCKETS:
+        return indice
+
+    desplazamiento = indice // _SUBBUCKETS - 1
+    return (indice - _SUBBUCKETS * desplazamiento) << desplazamiento
+
+
+def percentil_histograma(histograma: dict, fraccion: float) -> int:
+    """
+    Devuelve el percentil `fraccion` (entre 0 y 1) de un histograma, como el
+    límite inferior de su bucket, o 0 si está vacío.
+    """
+    total = sum(histograma.values())
+    if total == 0:
+        return 0
+
+    objetivo = min(total, int(fraccion * total) + 1)
+    acumulado = 0
+    for indice in sorted(histograma):
+        acumulado += histograma[indice]
+        if acumulado >= objetivo:
+            return limite_inferior(indice)
+    return 0
+
+
+def registrar(histograma: dict, valor: int) -> None:
+    """
+    Suma una muestra (un entero no negativo) al histograma.
+    """
+    indice = indice_bucket(valor)
+    histograma[indice] = histograma.get(indice, 0) + 1
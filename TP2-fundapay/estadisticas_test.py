@@ -0,0 +1,76 @@
+"""
+Pruebas de los percentiles y los histogramas (`estadisticas`).
+
+Se pueden correr con pytest o directamente con `python estadisticas_test.py`.
+"""
+
+import random
+
+import constantes
+import estadisticas
+
+
+def test_01_buckets_del_histograma():
+    generador = random.Random(1)
+    valores = list(range(200)) + [generador.randrange(1, 1 << 40) for _ in range(5_000)]
+
+    for valor in valores:
+        indice = estadisticas.indice_bucket(valor)
+        inferior = estadisticas.limite_inferior(indice)
+        assert inferior <= valor
+        # el siguiente bucket empieza después del valor
+        assert estadisticas.limite_inferior(indice + 1) > valor
+        # error relativo de a lo sumo 1/16
+        assert valor - inferior <= valor >> constantes.BITS_SUBBUCKETS_HISTOGRAMA
+
+    # los buckets son crecientes con el valor
+    indices = [estadisticas.indice_bucket(valor) for valor in sorted(valores)]
+    assert indices == sorted(indices)
+
+
+def test_02_percentiles_del_histograma():
+    generador = random.Random(2)
+    muestras = sorted(generador.randrange(1_000, 10_000_000) for _ in range(10_000))
+    histograma = {}
+    for muestra in muestras:
+        estadisticas.registrar(histograma, muestra)
+    assert sum(histograma.values()) == len(muestras)
+
+    for fraccion in (0.0, 0.5, 0.9, 0.99):
+        exacto = muestras[int(fraccion * len(muestras))]
+        estimado = estadisticas.percentil_histograma(histograma, fraccion)
+        assert estimado <= exacto
+        assert exacto - estimado <= exacto >> constantes.BITS_SUBBUCKETS_HISTOGRAMA
+
+    assert estadisticas.percentil_histograma(histograma, 1.0) == (
+        estadisticas.limite_inferior(estadisticas.indice_bucket(muestras[-1]))
+    )
+    assert estadisticas.percentil_histograma({}, 0.5) == 0
+
+
+def test_03_percentil_exacto():
+    assert estadisticas.percentil([], 0.5) == 0.0
+    assert estadisticas.percentil([3.0], 0.99) == 3.0
+
+    valores = [float(valor) for valor in range(100, 0, -1)]
+    assert estadisticas.percentil(valores, 0.0) == 1.0
+    assert estadisticas.percentil(valores, 0.5) == 51.0
+    assert estadisticas.percentil(valores, 0.99) == 100.0
+    assert estadisticas.percentil(valores, 1.0) == 100.0
+    # no modifica la lista recibida
+    assert valores[0] == 100.0
+
+
+def main():
+    pruebas = [
+        test_01_buckets_del_histograma,
+        test_02_percentiles_del_histograma,
+        test_03_percentil_exacto,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,19 @@
 """
-Estructura de datos de una cuenta en el diccionario `cuentas`:
+Estructura de datos de una cuenta en el diccionario `cuentas`.
+Las claves son el DNI como entero de 8 dígitos; el formato XX.YYY.ZZZ
+se usa solamente al pedirlo y al mostrarlo (`presentacion.formatear_dni`).
 
-    "12.345.678": {
+    12345678: {
         "nombre_apellido": "Pepe Pepito",
-        "dni": "12.345.678",
+        "dni": 12345678,
         "saldo_disponible": 1500,
         "next_prestamo_id": 3,
-        "prestamos": [
-            {
+        "prestamos": { # solo los préstamos activos (con deuda), por id
+            2: {
                 "id_prestamo": 2,
                 "monto_capital_original": 1400, # monto original del préstamo
                 "tasa_interes": 15,
+                "cantidad_cuotas": 12, # plazo con que se otorgó
                 "impuestos_total_original": 280, # 20% del monto original
                 "intereses_total_original": 210, # 15% del monto original
                 "capital_pendiente": 1300,
@@ -20,14 +23,16 @@ Estructura de datos de una cuenta en el diccionario `cuentas`:
                 "total_pagado_intereses": 210,
                 "total_pagado_capital": 100,
             }
-        ],
-        "transferencias": [
-            {
-                "monto": 500,
-                "tipo": "recibe", # puede ser "envia" o "recibe"
-                "nombre_contraparte": "Pepe Pepito Jr", # nombre de la cuenta contraria
-                "dni_contraparte": "23.456.789",
-            }
-        ]
+        },
+        # préstamos ya saldados, compactados como
+        # (id_prestamo, monto_capital_original, tasa_interes,
+        #  impuestos_total_original, intereses_total_original, cantidad_cuotas)
+        "prestamos_saldados": [(1, 500, 10, 100, 50, 6)],
+        "deuda_pendiente": 1300, # suma de lo pendiente de todos los préstamos activos
+        # transferencias compactadas como (monto, tipo, dni_contraparte), de la
+        # más vieja a la más nueva; tipo es "envia" o "recibe" y de la cuenta
+        # contraria se guarda solo el DNI (el nombre se busca al mostrar). Si hay
+        # un archivo conectado (`archivo_transferencias`), solo las más recientes
+        "transferencias": [(500, "recibe", 23456789)]
     }
 """
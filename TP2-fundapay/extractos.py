@@ -0,0 +1,143 @@
+"""
+Este módulo genera los extractos de todas las cuentas en paralelo.
+
+Cada extracto tiene un encabezado (`EXTRACTO_ENCABEZADO`) y las mismas líneas
+que `presentacion.mostrar_resumen_cuenta`: `RESUMEN_TEMPLATE`, las últimas
+transferencias y un bloque `PRESTAMO_TEMPLATE` por préstamo.
+
+Las cuentas se reparten en partes de `CUENTAS_POR_PARTE_EXTRACTOS` y cada
+parte la arma un proceso de un pool. Los procesos reciben `cuentas` una sola
+vez, al iniciarse (con el método "fork" lo heredan sin copiarlo), y después
+cada tarea es solo un rango de posiciones. Hay dos salidas:
+
+    - `exportar`: un único flujo (un archivo o la salida estándar), con los
+      extractos en el orden de `cuentas`. El proceso principal escribe cada
+      parte apenas la recibe.
+    - `exportar_en_partes`: un archivo por parte en un directorio, que cada
+      proceso escribe directamente.
+
+En ambos casos las escrituras pasan por un buffer de
+`TAMANIO_BUFFER_EXTRACTOS` bytes.
+"""
+
+import multiprocessing
+import os
+
+import constantes
+import presentacion
+
+# estado de cada proceso del pool, cargado por `_inicializar_proceso`
+_cuentas_proceso = None
+_dnis_proceso = None
+
+
+def formatear_extracto(cuenta: dict, cuentas: dict) -> str:
+    """
+    Devuelve el texto del extracto de una cuenta, terminado en salto de línea.
+    """
+    lineas = [
+        constantes.EXTRACTO_ENCABEZADO.format(
+            dni=presentacion.formatear_dni(cuenta["dni"])
+        )
+    ]
+    lineas.extend(presentacion.formatear_resumen_cuenta(cuenta, cuentas))
+    lineas.append("")
+    return "\n".join(lineas) + "\n"
+
+
+def _inicializar_proceso(cuentas: dict, dnis: list[int]) -> None:
+    """
+    Guarda las cuentas y el orden de los DNI en el proceso del pool.
+    """
+    global _cuentas_proceso, _dnis_proceso
+    _cuentas_proceso = cuentas
+    _dnis_proceso = dnis
+
+
+def _renderizar_parte(rango: tuple[int, int]) -> bytes:
+    """
+    Arma los extractos de las cuentas en las posiciones [inicio, fin) de los DNI.
+    """
+    inicio, fin = rango
+    textos = []
+    for dni in _dnis_proceso[inicio:fin]:
+        textos.append(formatear_extracto(_cuentas_proceso[dni], _cuentas_proceso))
+    return "".join(textos).encode()
+
+
+def _escribir_parte(tarea: tuple[str, tuple[int, int]]) -> int:
+    """
+    Arma una parte y la escribe en su propio archivo. Devuelve la cantidad de cuentas.
+    """
+    ruta, rango = tarea
+    with open(ruta, "wb", buffering=constantes.TAMANIO_BUFFER_EXTRACTOS) as archivo:
+        archivo.write(_renderizar_parte(rango))
+    return rango[1] - rango[0]
+
+
+def _rangos(cantidad: int) -> list[tuple[int, int]]:
+    """
+    Divide las posiciones 0..cantidad en rangos de `CUENTAS_POR_PARTE_EXTRACTOS`.
+    """
+    tamanio = constantes.CUENTAS_POR_PARTE_EXTRACTOS
+    return [
+        (inicio, min(inicio + tamanio, cantidad))
+        for inicio in range(0, cantidad, tamanio)
+    ]
+
+
+def _crear_pool(cuentas: dict, dnis: list[int], procesos: int | None):
+    """
+    Crea el pool de procesos, con "fork" si el sistema lo permite.
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        contexto = multiprocessing.get_context("fork")
+    else:
+        contexto = multiprocessing.get_context()
+
+    return contexto.Pool(
+        procesos, initializer=_inicializar_proceso, initargs=(cuentas, dnis)
+    )
+
+
+def exportar(cuentas: dict, salida, procesos: int | None = None) -> int:
+    """
+    Escribe los extractos de todas las cuentas en un único flujo.
+
+    Pre:
+        - `salida` es un archivo abierto en modo binario.
+        - `procesos` es la cantidad de procesos (None: uno por CPU).
+    Post:
+        - Los extractos quedan en el orden de `cuentas`.
+        - Devuelve la cantidad de extractos escritos.
+    """
+    dnis = list(cuentas)
+    with _crear_pool(cuentas, dnis, procesos) as pool:
+        # imap respeta el orden de las partes y deja escribir mientras se arman las siguientes
+        for texto in pool.imap(_renderizar_parte, _rangos(len(dnis))):
+            salida.write(texto)
+
+    salida.flush()
+    return len(dnis)
+
+
+def exportar_en_partes(cuentas: dict, directorio: str, procesos: int | None = None):
+    """
+    Escribe los extractos en un archivo por parte dentro de `directorio`.
+
+    Post:
+        - Crea `directorio` si no existe y escribe `extractos_00000.txt`,
+          `extractos_00001.txt`, ... en el orden de `cuentas`.
+        - Devuelve la lista de rutas escritas.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    dnis = list(cuentas)
+
+    tareas = []
+    for numero, rango in enumerate(_rangos(len(dnis))):
+        tareas.append((os.path.join(directorio, f"extractos_{numero:05d}.txt"), rango))
+
+    with _crear_pool(cuentas, dnis, procesos) as pool:
+        pool.map(_escribir_parte, tareas)
+
+    return [ruta for ruta, _ in tareas]
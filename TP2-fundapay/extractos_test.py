@@ -0,0 +1,103 @@
+"""
+Pruebas de los extractos masivos (`extractos`).
+
+Se pueden correr con pytest o directamente con `python extractos_test.py`.
+"""
+
+import io
+import os
+import random
+import tempfile
+
+import constantes
+import extractos
+import negocio
+import presentacion
+
+
+def _crear_cuentas(semilla: int, cantidad: int) -> dict:
+    """Crea cuentas con saldos, transferencias y préstamos al azar."""
+    generador = random.Random(semilla)
+    cuentas = {}
+    dnis = list(range(10_000_000, 10_000_000 + cantidad))
+    for dni in dnis:
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        negocio.acreditar_dinero(cuentas, dni, generador.randint(0, 5_000))
+        if generador.random() < 0.3:
+            negocio.otorgar_prestamo(cuentas, dni, 10, generador.randint(100, 3_000))
+    for _ in range(cantidad):
+        origen, destino = generador.sample(dnis, 2)
+        negocio.transferir_dinero(cuentas, origen, destino, generador.randint(1, 500))
+    return cuentas
+
+
+def _esperado(cuentas: dict) -> bytes:
+    """Devuelve todos los extractos, en el orden de `cuentas`, armados de a uno."""
+    return "".join(
+        extractos.formatear_extracto(cuenta, cuentas) for cuenta in cuentas.values()
+    ).encode()
+
+
+def test_01_formato_del_extracto():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 1_000)
+    negocio.transferir_dinero(cuentas, 12_345_678, 23_456_789, 400)
+    negocio.otorgar_prestamo(cuentas, 12_345_678, 10, 1_000)
+
+    cuenta = cuentas[12_345_678]
+    texto = extractos.formatear_extracto(cuenta, cuentas)
+    encabezado = constantes.EXTRACTO_ENCABEZADO.format(dni="12.345.678")
+    resumen = presentacion.formatear_resumen_cuenta(cuenta, cuentas)
+
+    # encabezado, resumen y una línea en blanco que separa del siguiente extracto
+    assert texto == "\n".join([encabezado, *resumen]) + "\n\n"
+    assert "Juan Perez" in texto
+
+
+def test_02_un_flujo_en_orden():
+    # más de una parte, la última incompleta
+    cuentas = _crear_cuentas(1, 2 * constantes.CUENTAS_POR_PARTE_EXTRACTOS + 100)
+
+    salida = io.BytesIO()
+    assert extractos.exportar(cuentas, salida, procesos=2) == len(cuentas)
+    assert salida.getvalue() == _esperado(cuentas)
+
+    vacia = io.BytesIO()
+    assert extractos.exportar({}, vacia, procesos=2) == 0
+    assert vacia.getvalue() == b""
+
+
+def test_03_un_archivo_por_parte():
+    cuentas = _crear_cuentas(2, 2 * constantes.CUENTAS_POR_PARTE_EXTRACTOS + 100)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        destino = os.path.join(directorio, "extractos")
+        rutas = extractos.exportar_en_partes(cuentas, destino, procesos=2)
+        assert [os.path.basename(ruta) for ruta in rutas] == [
+            "extractos_00000.txt",
+            "extractos_00001.txt",
+            "extractos_00002.txt",
+        ]
+
+        contenido = b""
+        for ruta in rutas:
+            with open(ruta, "rb") as archivo:
+                contenido += archivo.read()
+        assert contenido == _esperado(cuentas)
+
+
+def main():
+    pruebas = [
+        test_01_formato_del_extracto,
+        test_02_un_flujo_en_orden,
+        test_03_un_archivo_por_parte,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
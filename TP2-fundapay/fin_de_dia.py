@@ -0,0 +1,97 @@
+"""
+Este módulo ejecuta los procesos de fin de día sobre las cuentas que deja una
+carga sintética de `benchmark`, para probarlos a escala sin datos reales.
+
+    python fin_de_dia.py conciliar [procesos]
+    python fin_de_dia.py extractos <salida.txt|directorio/> [procesos]
+
+`conciliacion` y `extractos` no dependen de `benchmark`: solo reciben las cuentas.
+"""
+
+import json
+import sys
+
+import benchmark
+import conciliacion
+import constantes
+import extractos
+
+
+def cuentas_sinteticas() -> tuple[dict, int]:
+    """
+    Ejecuta una carga sintética directamente sobre `negocio`.
+
+    Post:
+        - Devuelve (cuentas, total acreditado por la carga).
+    """
+    preparacion, carga = benchmark.generar_carga(
+        constantes.OPERACIONES_FIN_DE_DIA,
+        cuentas_iniciales=constantes.CUENTAS_FIN_DE_DIA,
+    )
+    cuentas, _ = benchmark.ejecutar_carga("negocio", preparacion, carga)
+
+    total_acreditado = 0
+    for operacion in preparacion + carga:
+        if operacion[0] == "ingresar_dinero":
+            total_acreditado += operacion[2]
+    return cuentas, total_acreditado
+
+
+def conciliar(argumentos: list[str]) -> None:
+    """
+    Concilia las cuentas sintéticas e imprime el resultado en JSON.
+    Termina con código 1 si algún invariante no se cumple.
+    """
+    procesos = int(argumentos[0]) if argumentos else None
+    cuentas, total_acreditado = cuentas_sinteticas()
+
+    resultado = conciliacion.conciliar(cuentas, total_acreditado, procesos=procesos)
+    print(json.dumps(resultado, indent=2))
+    if not resultado["ok"]:
+        sys.exit(1)
+
+
+def exportar_extractos(argumentos: list[str]) -> None:
+    """
+    Genera los extractos de las cuentas sintéticas. Si la salida termina en
+    "/" se escribe un archivo por parte en ese directorio.
+    """
+    destino = argumentos[0]
+    procesos = int(argumentos[1]) if len(argumentos) == 2 else None
+    cuentas, _ = cuentas_sinteticas()
+
+    if destino.endswith("/"):
+        extractos.exportar_en_partes(cuentas, destino, procesos)
+    else:
+        with open(
+            destino, "wb", buffering=constantes.TAMANIO_BUFFER_EXTRACTOS
+        ) as archivo:
+            extractos.exportar(cuentas, archivo, procesos)
+
+
+# procesos disponibles: nombre -> (función, cantidad mínima y máxima de argumentos)
+PROCESOS = {
+    "conciliar": (conciliar, 0, 1),
+    "extractos": (exportar_extractos, 1, 2),
+}
+
+
+def main():
+    """
+    Ejecuta el proceso de fin de día indicado en la línea de comandos.
+    """
+    if len(sys.argv) < 2 or sys.argv[1] not in PROCESOS:
+        print(constantes.MSG_USO_FIN_DE_DIA)
+        return
+
+    proceso, minimo, maximo = PROCESOS[sys.argv[1]]
+    argumentos = sys.argv[2:]
+    if not minimo <= len(argumentos) <= maximo:
+        print(constantes.MSG_USO_FIN_DE_DIA)
+        return
+
+    proceso(argumentos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Este módulo contiene la analítica de flujos de dinero entre cuentas.
+
+Se alimenta de los eventos de transferencia de `negocio` y responde, sin
+recorrer las listas de transferencias de las cuentas:
+
+    - los mayores flujos entre pares de cuentas en la actividad reciente
+      (exactos, sobre las últimas `TRANSFERENCIAS_RECIENTES` transferencias),
+    - los mayores flujos entre pares y las cuentas que más dinero movieron
+      desde siempre (aproximados, ver abajo),
+    - una estimación del flujo total entre dos cuentas cualesquiera.
+
+Para el histórico se usa un Count-Min sketch: una tabla de
+`PROFUNDIDAD_SKETCH` filas por `ANCHO_SKETCH` columnas donde cada clave suma
+su monto en una columna por fila, elegida con una función de hash distinta
+para cada fila. La estimación de una clave es el mínimo de sus columnas:
+nunca es menor que el valor real y lo supera solo por colisiones. Junto al
+sketch se mantiene un top-K con las claves de mayor estimación. La memoria
+es fija, sin importar cuántas transferencias haya.
+
+Estructura:
+
+    {
+        "recientes": deque([(dni_origen, dni_destino, monto), ...]),
+        "flujos_recientes": {(dni_origen, dni_destino): monto, ...},
+        "pares": sketch de pares (origen, destino),
+        "cuentas": sketch de cuentas (monto enviado + recibido),
+    }
+
+donde cada sketch es:
+
+    {
+        "tabla": [[0, ...], ...],    # PROFUNDIDAD x ANCHO
+        "semillas": [(a, b), ...],   # una función de hash por fila
+        "top": {clave: estimacion},  # a lo sumo CANTIDAD_MAYORES_FLUJOS claves
+        "heap_top": [(estimacion, clave), ...],
+    }
+"""
+
+import heapq
+import random
+from collections import deque
+
+import constantes
+import negocio
+
+# primo de Mersenne 2**61 - 1 para el hash universal (a * x + b) mod p
+_PRIMO_HASH = (1 << 61) - 1
+
+# los DNI tienen 8 dígitos: un par se codifica como un único entero
+_BASE_PAR = 100_000_000
+
+
+def _crear_sketch(semilla: int) -> dict:
+    """
+    Crea un sketch vacío. La semilla hace reproducibles las funciones de hash.
+    """
+    generador = random.Random(semilla)
+    semillas = []
+    for _ in range(constantes.PROFUNDIDAD_SKETCH):
+        semillas.append(
+            (generador.randrange(1, _PRIMO_HASH), generador.randrange(_PRIMO_HASH))
+        )
+
+    return {
+        "tabla": [
+            [0] * constantes.ANCHO_SKETCH for _ in range(constantes.PROFUNDIDAD_SKETCH)
+        ],
+        "semillas": semillas,
+        "top": {},
+        "heap_top": [],
+    }
+
+
+def crear_flujos(semilla: int = 0) -> dict:
+    """
+    Crea la analítica de flujos vacía.
+    """
+    return {
+        "recientes": deque(),
+        "flujos_recientes": {},
+        "pares": _crear_sketch(semilla),
+        "cuentas": _crear_sketch(semilla + 1),
+    }
+
+
+def _sumar_en_sketch(sketch: dict, clave: int, monto: int) -> int:
+    """
+    Suma `monto` a la clave en el sketch y devuelve la nueva estimación.
+    """
+    ancho = constantes.ANCHO_SKETCH
+    estimacion = None
+    for fila, (a, b) in zip(sketch["tabla"], sketch["semillas"]):
+        columna = ((a * clave + b) % _PRIMO_HASH) % ancho
+        fila[columna] += monto
+        if estimacion is None or fila[columna] < estimacion:
+            estimacion = fila[columna]
+    return estimacion
+
+
+def _actualizar_top(sketch: dict, clave: int, estimacion: int) -> None:
+    """
+    Mantiene en `top` las claves de mayor estimación.
+
+    El heap de mínimos tiene entradas obsoletas (de estimaciones anteriores de
+    una clave); una entrada es vigente si coincide con `top[clave]`.
+    """
+    top = sketch["top"]
+    heap = sketch["heap_top"]
+
+    if clave in top or len(top) < constantes.CANTIDAD_MAYORES_FLUJOS:
+        top[clave] = estimacion
+        heapq.heappush(heap, (estimacion, clave))
+    else:
+        # se descartan entradas obsoletas hasta llegar al mínimo vigente
+        while top.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        minimo, clave_minima = heap[0]
+        if estimacion <= minimo:
+            return
+        heapq.heapreplace(heap, (estimacion, clave))
+        del top[clave_minima]
+        top[clave] = estimacion
+
+    if len(heap) > 4 * constantes.CANTIDAD_MAYORES_FLUJOS:
+        sketch["heap_top"] = [(valor, clave) for clave, valor in top.items()]
+        heapq.heapify(sketch["heap_top"])
+
+
+def registrar_transferencia(
+    flujos: dict, dni_origen: int, dni_destino: int, monto: int
+) -> None:
+    """
+    Agrega una transferencia a la actividad reciente y al histórico.
+    """
+    par = (dni_origen, dni_destino)
+    recientes = flujos["recientes"]
+    flujos_recientes = flujos["flujos_recientes"]
+
+    recientes.append((dni_origen, dni_destino, monto))
+    flujos_recientes[par] = flujos_recientes.get(par, 0) + monto
+    if len(recientes) > constantes.TRANSFERENCIAS_RECIENTES:
+        origen_viejo, destino_viejo, monto_viejo = recientes.popleft()
+        par_viejo = (origen_viejo, destino_viejo)
+        flujos_recientes[par_viejo] -= monto_viejo
+        if flujos_recientes[par_viejo] == 0:
+            del flujos_recientes[par_viejo]
+
+    pares = flujos["pares"]
+    clave_par = dni_origen * _BASE_PAR + dni_destino
+    _actualizar_top(pares, clave_par, _sumar_en_sketch(pares, clave_par, monto))
+
+    cuentas = flujos["cuentas"]
+    for dni in par:
+        _actualizar_top(cuentas, dni, _sumar_en_sketch(cuentas, dni, monto))
+
+
+def conectar(flujos: dict, cuentas: dict):
+    """
+    Suscribe la analítica a las transferencias de `negocio` entre `cuentas`.
+
+    Post:
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        if evento["tipo"] == constantes.EVENTO_TRANSFERENCIA_REALIZADA:
+            registrar_transferencia(
+                flujos, evento["dni_origen"], evento["dni_destino"], evento["monto"]
+            )
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+def mayores_flujos_recientes(flujos: dict, cantidad: int) -> list[tuple]:
+    """
+    Devuelve los `cantidad` pares con mayor flujo en la actividad reciente.
+
+    Post:
+        - Devuelve una lista de (dni_origen, dni_destino, monto) exactos,
+          de mayor a menor monto.
+    """
+    mayores = heapq.nlargest(
+        cantidad, flujos["flujos_recientes"].items(), key=lambda item: item[1]
+    )
+    return [(origen, destino, monto) for (origen, destino), monto in mayores]
+
+
+def mayores_flujos(flujos: dict) -> list[tuple]:
+    """
+    Devuelve los pares con mayor flujo histórico estimado.
+
+    Post:
+        - Devuelve hasta `CANTIDAD_MAYORES_FLUJOS` tuplas
+          (dni_origen, dni_destino, monto_estimado), de mayor a menor.
+    """
+    resultado = []
+    for clave, estimacion in sorted(
+        flujos["pares"]["top"].items(), key=lambda item: item[1], reverse=True
+    ):
+        dni_origen, dni_destino = divmod(clave, _BASE_PAR)
+        resultado.append((dni_origen, dni_destino, estimacion))
+    return resultado
+
+
+def mayores_cuentas(flujos: dict) -> list[tuple[int, int]]:
+    """
+    Devuelve las cuentas que más dinero movieron (enviado + recibido).
+
+    Post:
+        - Devuelve hasta `CANTIDAD_MAYORES_FLUJOS` tuplas (dni, monto_estimado),
+          de mayor a menor.
+    """
+    return sorted(
+        flujos["cuentas"]["top"].items(), key=lambda item: item[1], reverse=True
+    )
+
+
+def estimar_flujo(flujos: dict, dni_origen: int, dni_destino: int) -> int:
+    """
+    Devuelve el flujo histórico estimado de `dni_origen` a `dni_destino`.
+    Nunca es menor que el flujo real.
+    """
+    sketch = flujos["pares"]
+    clave = dni_origen * _BASE_PAR + dni_destino
+    ancho = constantes.ANCHO_SKETCH
+    return min(
+        fila[((a * clave + b) % _PRIMO_HASH) % ancho]
+        for fila, (a, b) in zip(sketch["tabla"], sketch["semillas"])
+    )
@@ -0,0 +1,201 @@
+"""
+Pruebas de la analítica de flujos de dinero (`flujos`).
+
+Se pueden correr con pytest o directamente con `python flujos_test.py`.
+"""
+
+import math
+import random
+from collections import Counter
+
+import constantes
+import flujos
+import negocio
+
+
+def _registrar(analitica: dict, transferencias: list[tuple]) -> None:
+    """Registra una lista de (dni_origen, dni_destino, monto)."""
+    for dni_origen, dni_destino, monto in transferencias:
+        flujos.registrar_transferencia(analitica, dni_origen, dni_destino, monto)
+
+
+def _verificar_top(sketch: dict) -> None:
+    """Verifica que el heap tenga una entrada vigente por clave del top."""
+    top = sketch["top"]
+    heap = sketch["heap_top"]
+    assert len(top) <= constantes.CANTIDAD_MAYORES_FLUJOS
+    assert len(heap) <= 4 * constantes.CANTIDAD_MAYORES_FLUJOS
+    vigentes = {clave for estimacion, clave in heap if top.get(clave) == estimacion}
+    assert vigentes == set(top)
+
+
+def test_01_cotas_del_sketch():
+    generador = random.Random(1)
+    analitica = flujos.crear_flujos()
+    dnis = list(range(10_000_000, 10_000_200))
+    reales = Counter()
+    transferencias = []
+    for _ in range(20_000):
+        dni_origen, dni_destino = generador.sample(dnis, 2)
+        monto = generador.randint(1, 1_000)
+        reales[(dni_origen, dni_destino)] += monto
+        transferencias.append((dni_origen, dni_destino, monto))
+    _registrar(analitica, transferencias)
+
+    # con probabilidad 1 - e^-profundidad el error no supera e * total / ancho
+    total = sum(reales.values())
+    cota = math.e * total / constantes.ANCHO_SKETCH
+    fuera_de_cota = 0
+    for (dni_origen, dni_destino), real in reales.items():
+        estimacion = flujos.estimar_flujo(analitica, dni_origen, dni_destino)
+        assert estimacion >= real
+        if estimacion - real > cota:
+            fuera_de_cota += 1
+    probabilidad = math.exp(-constantes.PROFUNDIDAD_SKETCH)
+    assert fuera_de_cota <= 2 * probabilidad * len(reales)
+
+    # un par sin transferencias tampoco queda por debajo de su flujo real (0)
+    assert flujos.estimar_flujo(analitica, dnis[0], dnis[0]) >= 0
+    # cada fila de la tabla suma todo lo registrado
+    for fila in analitica["pares"]["tabla"]:
+        assert sum(fila) == total
+    for fila in analitica["cuentas"]["tabla"]:
+        assert sum(fila) == 2 * total
+
+
+def test_02_top_exacto_con_pocas_claves():
+    generador = random.Random(2)
+    analitica = flujos.crear_flujos()
+    pares = [(10_000_000 + numero, 20_000_000 + numero) for numero in range(15)]
+    reales = Counter()
+    for _ in range(2_000):
+        dni_origen, dni_destino = generador.choice(pares)
+        monto = generador.randint(1, 500)
+        reales[(dni_origen, dni_destino)] += monto
+        flujos.registrar_transferencia(analitica, dni_origen, dni_destino, monto)
+        _verificar_top(analitica["pares"])
+        _verificar_top(analitica["cuentas"])
+
+    # menos claves que lugares en el top y sin colisiones: todo exacto
+    esperado = sorted(
+        ((origen, destino, monto) for (origen, destino), monto in reales.items()),
+        key=lambda flujo: flujo[2],
+        reverse=True,
+    )
+    assert flujos.mayores_flujos(analitica) == esperado
+
+    # hay más cuentas que lugares, pero una clave fuera del top nunca supera
+    # al mínimo del top: quedan las mayores
+    movido = Counter()
+    for (dni_origen, dni_destino), monto in reales.items():
+        movido[dni_origen] += monto
+        movido[dni_destino] += monto
+    assert (
+        flujos.mayores_cuentas(analitica)
+        == sorted(movido.items(), key=lambda item: item[1], reverse=True)[
+            : constantes.CANTIDAD_MAYORES_FLUJOS
+        ]
+    )
+
+
+def test_03_top_con_muchas_claves():
+    generador = random.Random(3)
+    analitica = flujos.crear_flujos()
+    grandes = [(30_000_000 + numero, 40_000_000 + numero) for numero in range(5)]
+    chicos = [(50_000_000 + numero, 60_000_000 + numero) for numero in range(3_000)]
+
+    for paso in range(30_000):
+        if paso % 10 == 0:
+            dni_origen, dni_destino = grandes[paso // 10 % len(grandes)]
+            monto = 1_000 * (1 + grandes.index((dni_origen, dni_destino)))
+        else:
+            dni_origen, dni_destino = generador.choice(chicos)
+            monto = generador.randint(1, 100)
+        flujos.registrar_transferencia(analitica, dni_origen, dni_destino, monto)
+        _verificar_top(analitica["pares"])
+    _verificar_top(analitica["cuentas"])
+
+    mayores = flujos.mayores_flujos(analitica)
+    assert len(mayores) == constantes.CANTIDAD_MAYORES_FLUJOS
+    # los pares grandes encabezan el top, de mayor a menor
+    assert [(origen, destino) for origen, destino, _ in mayores[:5]] == grandes[::-1]
+    # el top informa la estimación al actualizarse: nunca más que la actual
+    for dni_origen, dni_destino, estimacion in mayores:
+        assert estimacion <= flujos.estimar_flujo(analitica, dni_origen, dni_destino)
+    montos = [estimacion for _, _, estimacion in mayores]
+    assert montos == sorted(montos, reverse=True)
+
+
+def test_04_ventana_de_recientes():
+    generador = random.Random(4)
+    analitica = flujos.crear_flujos()
+    dnis = list(range(10_000_000, 10_000_030))
+    transferencias = []
+    for _ in range(constantes.TRANSFERENCIAS_RECIENTES + 2_500):
+        dni_origen, dni_destino = generador.sample(dnis, 2)
+        transferencias.append((dni_origen, dni_destino, generador.randint(1, 1_000)))
+    # un par que solo aparece al principio sale de la ventana
+    transferencias.insert(0, (20_000_000, 20_000_001, 5))
+    _registrar(analitica, transferencias)
+
+    ventana = transferencias[-constantes.TRANSFERENCIAS_RECIENTES :]
+    assert list(analitica["recientes"]) == ventana
+    esperado = Counter()
+    for dni_origen, dni_destino, monto in ventana:
+        esperado[(dni_origen, dni_destino)] += monto
+    assert analitica["flujos_recientes"] == dict(esperado)
+    assert (20_000_000, 20_000_001) not in analitica["flujos_recientes"]
+
+    mayores = flujos.mayores_flujos_recientes(analitica, 10)
+    assert [monto for _, _, monto in mayores] == sorted(
+        esperado.values(), reverse=True
+    )[:10]
+    for dni_origen, dni_destino, monto in mayores:
+        assert esperado[(dni_origen, dni_destino)] == monto
+    # el histórico no olvida el par viejo
+    assert flujos.estimar_flujo(analitica, 20_000_000, 20_000_001) >= 5
+
+
+def test_05_conectada_a_negocio():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 1_000)
+
+    analitica = flujos.crear_flujos()
+    observador = flujos.conectar(analitica, cuentas)
+    try:
+        assert negocio.transferir_dinero(cuentas, 12_345_678, 23_456_789, 300)
+        assert negocio.transferir_dinero(cuentas, 23_456_789, 12_345_678, 100)
+        # un rechazo no se registra
+        assert not negocio.transferir_dinero(cuentas, 12_345_678, 23_456_789, 5_000)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    assert negocio.transferir_dinero(cuentas, 12_345_678, 23_456_789, 50)
+
+    assert flujos.mayores_flujos_recientes(analitica, 5) == [
+        (12_345_678, 23_456_789, 300),
+        (23_456_789, 12_345_678, 100),
+    ]
+    assert flujos.mayores_flujos(analitica) == [
+        (12_345_678, 23_456_789, 300),
+        (23_456_789, 12_345_678, 100),
+    ]
+    assert flujos.mayores_cuentas(analitica) == [(12_345_678, 400), (23_456_789, 400)]
+
+
+def main():
+    pruebas = [
+        test_01_cotas_del_sketch,
+        test_02_top_exacto_con_pocas_claves,
+        test_03_top_con_muchas_claves,
+        test_04_ventana_de_recientes,
+        test_05_conectada_a_negocio,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+"""
+Este módulo reparte el diccionario `cuentas` entre varios procesos (fragmentos).
+
+Cada fragmento es un proceso con su propio `cuentas` y atiende solamente los
+DNI que le corresponden según el resto del DNI por la cantidad de fragmentos.
+Un enrutador, en el proceso principal, manda cada operación al fragmento que
+corresponde usando `negocio` dentro de cada proceso.
+
+Las transferencias entre fragmentos distintos usan un protocolo de dos fases
+coordinado por el enrutador:
+
+    1. Preparación: el fragmento de origen reserva el monto (lo descuenta del
+       saldo si alcanza) y el de destino confirma que la cuenta existe.
+    2. Confirmación: si ambos aceptaron, el origen registra el envío y el
+       destino acredita el monto y registra la recepción. Si alguno rechazó,
+       el origen devuelve la reserva.
+
+Las operaciones se envían en lotes: cada fragmento recibe un único mensaje
+con sus operaciones en orden y todos los fragmentos trabajan en paralelo.
+
+Operaciones (tuplas):
+    ("registrar_cuenta", nombre, dni)              -> bool
+    ("acreditar_dinero", dni, monto)               -> bool
+    ("transferir_dinero", dni_origen, dni_destino, monto) -> bool
+    ("otorgar_prestamo", dni, interes, monto)      -> bool
+    ("pagar_prestamo", dni, id_prestamo, monto)    -> bool
+    ("obtener_cuenta", dni)                        -> dict | None
+
+Los registros de transferencia guardan solo el DNI de la contraparte, que
+puede estar en otro fragmento: `resumen_cuenta` busca esos nombres en sus
+fragmentos (con la acción interna "obtener_nombres") antes de armar el
+resumen.
+"""
+
+import multiprocessing
+import random
+import sys
+import time
+
+import negocio
+import presentacion
+
+# Operaciones que se ejecutan dentro de cada fragmento
+
+
+def _registrar_cuenta(estado: dict, nombre: str, dni: int) -> bool:
+    """
+    Crea la cuenta si el DNI no existe en el fragmento.
+    """
+    if dni in estado["cuentas"]:
+        return False
+
+    negocio.registrar_cuenta(estado["cuentas"], nombre, dni)
+    return True
+
+
+def _acreditar_dinero(estado: dict, dni: int, monto: int) -> bool:
+    """
+    Acredita el monto si la cuenta existe.
+    """
+    if dni not in estado["cuentas"]:
+        return False
+
+    negocio.acreditar_dinero(estado["cuentas"], dni, monto)
+    return True
+
+
+def _transferir_dinero(
+    estado: dict, dni_origen: int, dni_destino: int, monto: int
+) -> bool:
+    """
+    Transferencia entre dos cuentas del mismo fragmento.
+    """
+    cuentas = estado["cuentas"]
+    if dni_origen not in cuentas or dni_destino not in cuentas:
+        return False
+
+    return negocio.transferir_dinero(cuentas, dni_origen, dni_destino, monto)
+
+
+def _otorgar_prestamo(estado: dict, dni: int, interes: int, monto: int) -> bool:
+    """
+    Otorga el préstamo si la cuenta existe.
+    """
+    if dni not in estado["cuentas"]:
+        return False
+
+    negocio.otorgar_prestamo(estado["cuentas"], dni, interes, monto)
+    return True
+
+
+def _pagar_prestamo(estado: dict, dni: int, id_prestamo: int, monto: int) -> bool:
+    """
+    Paga el préstamo si está activo y el saldo alcanza.
+    """
+    cuenta = estado["cuentas"].get(dni)
+    if cuenta is None:
+        return False
+
+    prestamo = negocio.buscar_prestamo(cuenta, id_prestamo)
+    if prestamo is None:
+        return False
+
+    deuda_total = negocio.deuda_total_prestamo(prestamo)
+    if cuenta["saldo_disponible"] < monto:
+        return False
+
+    negocio.pagar_prestamo(cuenta, prestamo, min(monto, deuda_total))
+    return True
+
+
+def _obtener_cuenta(estado: dict, dni: int) -> dict | None:
+    """
+    Devuelve la cuenta (se envía una copia al enrutador) o None.
+    """
+    return estado["cuentas"].get(dni)
+
+
+def _obtener_nombres(estado: dict, dnis: list[int]) -> dict[int, str]:
+    """
+    Devuelve los nombres de las cuentas de `dnis` que están en el fragmento.
+    """
+    cuentas = estado["cuentas"]
+    return {dni: cuentas[dni]["nombre_apellido"] for dni in dnis if dni in cuentas}
+
+
+def _reservar(estado: dict, id_transaccion: int, dni: int, monto: int) -> bool:
+    """
+    Fase 1 en el origen: descuenta el monto y lo guarda como reserva.
+
+    Post:
+        - Devuelve True si la reserva se hizo.
+        - Devuelve False si la cuenta no existe o el saldo no alcanza.
+    """
+    cuenta = estado["cuentas"].get(dni)
+    if cuenta is None or cuenta["saldo_disponible"] < monto:
+        return False
+
+    cuenta["saldo_disponible"] -= monto
+    estado["reservas"][id_transaccion] = (dni, monto)
+    return True
+
+
+def _preparar_destino(estado: dict, id_transaccion: int, dni: int) -> bool:
+    """
+    Fase 1 en el destino: confirma que la cuenta existe.
+    """
+    return dni in estado["cuentas"]
+
+
+def _confirmar_origen(estado: dict, id_transaccion: int, dni_destino: int) -> bool:
+    """
+    Fase 2 en el origen: la reserva se da por gastada y se registra el envío.
+    """
+    dni, monto = estado["reservas"].pop(id_transaccion)
+    negocio.registrar_transferencia(estado["cuentas"][dni], "envia", monto, dni_destino)
+    return True
+
+
+def _confirmar_destino(
+    estado: dict,
+    id_transaccion: int,
+    dni: int,
+    monto: int,
+    dni_origen: int,
+) -> bool:
+    """
+    Fase 2 en el destino: se acredita el monto y se registra la recepción.
+    """
+    cuenta = estado["cuentas"][dni]
+    cuenta["saldo_disponible"] += monto
+    negocio.registrar_transferencia(cuenta, "recibe", monto, dni_origen)
+    return True
+
+
+def _abortar(estado: dict, id_transaccion: int) -> bool:
+    """
+    Fase 2 en el origen cuando la transferencia no procede: se devuelve la reserva.
+    """
+    dni, monto = estado["reservas"].pop(id_transaccion)
+    estado["cuentas"][dni]["saldo_disponible"] += monto
+    return True
+
+
+ACCIONES_FRAGMENTO = {
+    "registrar_cuenta": _registrar_cuenta,
+    "acreditar_dinero": _acreditar_dinero,
+    "transferir_dinero": _transferir_dinero,
+    "otorgar_prestamo": _otorgar_prestamo,
+    "pagar_prestamo": _pagar_prestamo,
+    "obtener_cuenta": _obtener_cuenta,
+    "obtener_nombres": _obtener_nombres,
+    "reservar": _reservar,
+    "preparar_destino": _preparar_destino,
+    "confirmar_origen": _confirmar_origen,
+    "confirmar_destino": _confirmar_destino,
+    "abortar": _abortar,
+}
+
+
+def _trabajador(conexion) -> None:
+    """
+    Bucle principal de un fragmento: recibe listas de operaciones, las aplica
+    en orden sobre su `cuentas` y devuelve la lista de resultados.
+    Termina al recibir None.
+    """
+    estado = {"cuentas": {}, "reservas": {}}
+
+    while True:
+        operaciones = conexion.recv()
+        if operaciones is None:
+            break
+
+        resultados = []
+        for operacion in operaciones:
+            accion = ACCIONES_FRAGMENTO[operacion[0]]
+            resultados.append(accion(estado, *operacion[1:]))
+
+        conexion.send(resultados)
+
+    conexion.close()
+
+
+# Enrutador (proceso principal)
+
+
+def iniciar_fragmentos(cantidad: int) -> dict:
+    """
+    Inicia `cantidad` procesos fragmento.
+
+    Pre:
+        - `cantidad` es un entero mayor que cero.
+    Post:
+        - Devuelve el enrutador: {"conexiones": [...], "procesos": [...],
+          "siguiente_transaccion": 1}.
+    """
+    conexiones = []
+    procesos = []
+    for _ in range(cantidad):
+        extremo_enrutador, extremo_fragmento = multiprocessing.Pipe()
+        proceso = multiprocessing.Process(
+            target=_trabajador, args=(extremo_fragmento,), daemon=True
+        )
+        proceso.start()
+        extremo_fragmento.close()
+        conexiones.append(extremo_enrutador)
+        procesos.append(proceso)
+
+    return {"conexiones": conexiones, "procesos": procesos, "siguiente_transaccion": 1}
+
+
+def detener_fragmentos(enrutador: dict) -> None:
+    """
+    Detiene todos los procesos fragmento. Las cuentas se pierden.
+    """
+    for conexion in enrutador["conexiones"]:
+        conexion.send(None)
+        conexion.close()
+
+    for proceso in enrutador["procesos"]:
+        proceso.join()
+
+
+def fragmento_de(enrutador: dict, dni: int) -> int:
+    """
+    Devuelve el índice del fragmento que atiende el DNI.
+    Los DNI son enteros de 8 dígitos bien repartidos, así que el resto alcanza.
+    """
+    return dni % len(enrutador["conexiones"])
+
+
+def _enviar_ronda(enrutador: dict, pedidos: list[list[tuple]]) -> list[list]:
+    """
+    Envía a cada fragmento su lista de operaciones y espera todas las respuestas.
+    Los fragmentos trabajan en paralelo mientras el enrutador espera.
+    """
+    conexiones = enrutador["conexiones"]
+    for indice, operaciones in enumerate(pedidos):
+        if operaciones:
+            conexiones[indice].send(operaciones)
+
+    respuestas = []
+    for indice, operaciones in enumerate(pedidos):
+        if operaciones:
+            respuestas.append(conexiones[indice].recv())
+        else:
+            respuestas.append([])
+
+    return respuestas
+
+
+def _dnis_de(operacion: tuple) -> tuple:
+    """
+    Devuelve los DNI de las cuentas que usa una operación.
+    """
+    if operacion[0] == "registrar_cuenta":
+        return (operacion[2],)
+    if operacion[0] == "transferir_dinero":
+        return (operacion[1], operacion[2])
+    return (operacion[1],)
+
+
+def ejecutar_lote(enrutador: dict, operaciones: list[tuple]) -> list:
+    """
+    Ejecuta una lista de operaciones repartiéndolas entre los fragmentos.
+
+    Pre:
+        - `operaciones` son tuplas con el formato descrito en el módulo,
+          con datos ya validados (formato de DNI, montos mínimos, origen != destino).
+    Post:
+        - Devuelve la lista de resultados en el mismo orden que `operaciones`,
+          los mismos que si se ejecutaran de a una con `ejecutar`.
+        - Las transferencias entre fragmentos se confirman o se abortan
+          completas: nunca queda un monto descontado sin acreditar.
+        - Una transferencia entre fragmentos se resuelve en dos rondas, así
+          que el lote se parte en tramos: una operación que usa una cuenta
+          con una transferencia entre fragmentos todavía sin confirmar en el
+          tramo (por ejemplo, A -> B y después B -> C) empieza un tramo nuevo
+          y ve el resultado de esa transferencia. Cada tramo cuesta dos
+          rondas de mensajes.
+    """
+    resultados = []
+    tramo = []
+    # cuentas con una transferencia entre fragmentos pendiente en el tramo
+    pendientes = set()
+
+    for operacion in operaciones:
+        dnis = _dnis_de(operacion)
+        if pendientes and not pendientes.isdisjoint(dnis):
+            resultados.extend(_ejecutar_tramo(enrutador, tramo))
+            tramo = []
+            pendientes.clear()
+
+        tramo.append(operacion)
+        if operacion[0] == "transferir_dinero" and fragmento_de(
+            enrutador, operacion[1]
+        ) != fragmento_de(enrutador, operacion[2]):
+            pendientes.update(dnis)
+
+    if tramo:
+        resultados.extend(_ejecutar_tramo(enrutador, tramo))
+    return resultados
+
+
+def _ejecutar_tramo(enrutador: dict, operaciones: list[tuple]) -> list:
+    """
+    Ejecuta operaciones en los fragmentos en dos rondas: la primera aplica las
+    operaciones locales y prepara las transferencias entre fragmentos, la
+    segunda las confirma o las aborta.
+
+    Pre:
+        - Ninguna operación usa una cuenta que participe de una transferencia
+          entre fragmentos anterior en `operaciones` (ver `ejecutar_lote`).
+    Post:
+        - Devuelve la lista de resultados en el mismo orden que `operaciones`.
+        - Las operaciones de un mismo fragmento se aplican en el orden recibido.
+    """
+    cantidad = len(enrutador["conexiones"])
+    pedidos = [[] for _ in range(cantidad)]
+    # por cada operación: (fragmento, posición en su pedido) o los datos de la transacción
+    ubicaciones = []
+
+    for operacion in operaciones:
+        # en "registrar_cuenta" el DNI va después del nombre
+        if operacion[0] == "registrar_cuenta":
+            fragmento = fragmento_de(enrutador, operacion[2])
+        else:
+            fragmento = fragmento_de(enrutador, operacion[1])
+
+        if operacion[0] == "transferir_dinero":
+            _, dni_origen, dni_destino, monto = operacion
+            fragmento_destino = fragmento_de(enrutador, dni_destino)
+
+            if fragmento_destino != fragmento:
+                id_transaccion = enrutador["siguiente_transaccion"]
+                enrutador["siguiente_transaccion"] += 1
+
+                pedidos[fragmento].append(
+                    ("reservar", id_transaccion, dni_origen, monto)
+                )
+                pedidos[fragmento_destino].append(
+                    ("preparar_destino", id_transaccion, dni_destino)
+                )
+                ubicaciones.append(
+                    (
+                        id_transaccion,
+                        fragmento,
+                        len(pedidos[fragmento]) - 1,
+                        fragmento_destino,
+                        len(pedidos[fragmento_destino]) - 1,
+                        operacion,
+                    )
+                )
+                continue
+
+        pedidos[fragmento].append(operacion)
+        ubicaciones.append((fragmento, len(pedidos[fragmento]) - 1))
+
+    # primera ronda: operaciones locales y preparación de las transferencias
+    respuestas = _enviar_ronda(enrutador, pedidos)
+
+    # segunda ronda: confirmación o aborto de cada transferencia entre fragmentos
+    confirmaciones = [[] for _ in range(cantidad)]
+    resultados = []
+    for ubicacion in ubicaciones:
+        if len(ubicacion) == 2:
+            fragmento, posicion = ubicacion
+            resultados.append(respuestas[fragmento][posicion])
+            continue
+
+        id_transaccion, origen, pos_origen, destino, pos_destino, operacion = ubicacion
+        _, dni_origen, dni_destino, monto = operacion
+        reservado = respuestas[origen][pos_origen]
+        destino_existe = respuestas[destino][pos_destino]
+
+        if reservado and destino_existe:
+            confirmaciones[origen].append(
+                ("confirmar_origen", id_transaccion, dni_destino)
+            )
+            confirmaciones[destino].append(
+                (
+                    "confirmar_destino",
+                    id_transaccion,
+                    dni_destino,
+                    monto,
+                    dni_origen,
+                )
+            )
+            resultados.append(True)
+        else:
+            if reservado:
+                confirmaciones[origen].append(("abortar", id_transaccion))
+            resultados.append(False)
+
+    _enviar_ronda(enrutador, confirmaciones)
+
+    return resultados
+
+
+def ejecutar(enrutador: dict, operacion: tuple):
+    """
+    Ejecuta una sola operación. Ver `ejecutar_lote`.
+    """
+    return ejecutar_lote(enrutador, [operacion])[0]
+
+
+def resumen_cuenta(enrutador: dict, dni: int) -> list[str] | None:
+    """
+    Devuelve las líneas del resumen de la cuenta (`presentacion.formatear_resumen_cuenta`),
+    o None si no existe.
+
+    Post:
+        - Los nombres de las contrapartes se buscan en sus fragmentos, en una
+          sola ronda; una contraparte que no existe en ninguno se muestra
+          como `NOMBRE_CONTRAPARTE_DESCONOCIDA`.
+    """
+    cuenta = ejecutar(enrutador, ("obtener_cuenta", dni))
+    if cuenta is None:
+        return None
+
+    pedidos = [set() for _ in enrutador["conexiones"]]
+    for _, _, dni_contraparte in cuenta["transferencias"]:
+        pedidos[fragmento_de(enrutador, dni_contraparte)].add(dni_contraparte)
+    respuestas = _enviar_ronda(
+        enrutador,
+        [[("obtener_nombres", sorted(dnis))] if dnis else [] for dnis in pedidos],
+    )
+
+    # `formatear_resumen_cuenta` solo usa el nombre de cada contraparte
+    contrapartes = {}
+    for respuesta in respuestas:
+        for dni_contraparte, nombre in (respuesta[0] if respuesta else {}).items():
+            contrapartes[dni_contraparte] = {"nombre_apellido": nombre}
+    return presentacion.formatear_resumen_cuenta(cuenta, contrapartes)
+
+
+def medir_rendimiento(
+    cantidad_fragmentos: int,
+    cantidad_cuentas: int = 10_000,
+    cantidad_operaciones: int = 200_000,
+    tamanio_lote: int = 5_000,
+) -> float:
+    """
+    Mide operaciones por segundo con una mezcla con mayoría de transferencias
+    (80% transferencias, 15% acreditaciones, 5% préstamos).
+    """
+    enrutador = iniciar_fragmentos(cantidad_fragmentos)
+    dnis = list(range(10_000_000, 10_000_000 + cantidad_cuentas))
+    altas = []
+    for dni in dnis:
+        altas.append(("registrar_cuenta", "Cliente Prueba", dni))
+        altas.append(("acreditar_dinero", dni, 100_000))
+    ejecutar_lote(enrutador, altas)
+
+    generador = random.Random(0)
+    operaciones = []
+    for _ in range(cantidad_operaciones):
+        eleccion = generador.random()
+        if eleccion < 0.8:
+            origen, destino = generador.sample(dnis, 2)
+            operaciones.append(("transferir_dinero", origen, destino, 100))
+        elif eleccion < 0.95:
+            operaciones.append(("acreditar_dinero", generador.choice(dnis), 100))
+        else:
+            operaciones.append(("otorgar_prestamo", generador.choice(dnis), 10, 1_000))
+
+    inicio = time.perf_counter()
+    for desde in range(0, cantidad_operaciones, tamanio_lote):
+        ejecutar_lote(enrutador, operaciones[desde : desde + tamanio_lote])
+    segundos = time.perf_counter() - inicio
+
+    detener_fragmentos(enrutador)
+    return cantidad_operaciones / segundos
+
+
+def main():
+    """
+    Imprime el rendimiento para distintas cantidades de fragmentos.
+    Uso: python fragmentos.py [cantidad_maxima_de_fragmentos]
+    """
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    cantidad = 1
+    while cantidad <= maximo:
+        rendimiento = medir_rendimiento(cantidad)
+        print(f"{cantidad} fragmentos: {rendimiento:,.0f} operaciones/s")
+        cantidad *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Pruebas de las cuentas repartidas en procesos (`fragmentos`).
+
+Se pueden correr con pytest o directamente con `python fragmentos_test.py`.
+"""
+
+import random
+
+import constantes
+import fragmentos
+import negocio
+import presentacion
+
+CANTIDAD_FRAGMENTOS = 3
+# con 3 fragmentos, cada DNI cae en el fragmento de su resto por 3
+ANA = 12_345_678  # fragmento 0
+JUAN = 23_456_789  # fragmento 2
+LUZ = 34_567_891  # fragmento 1
+# sin cuenta, en otro fragmento que LUZ: sus transferencias usan las dos fases
+FALTANTE = 45_678_911  # fragmento 2
+
+
+def _iniciar_con_cuentas() -> dict:
+    """Inicia los fragmentos con tres cuentas de saldo 1.000."""
+    enrutador = fragmentos.iniciar_fragmentos(CANTIDAD_FRAGMENTOS)
+    operaciones = []
+    for nombre, dni in (("Ana Lopez", ANA), ("Juan Perez", JUAN), ("Luz Diaz", LUZ)):
+        operaciones.append(("registrar_cuenta", nombre, dni))
+        operaciones.append(("acreditar_dinero", dni, 1_000))
+    assert all(fragmentos.ejecutar_lote(enrutador, operaciones))
+    return enrutador
+
+
+def test_01_resumen_con_contrapartes_de_otros_fragmentos():
+    enrutador = _iniciar_con_cuentas()
+    try:
+        assert fragmentos.fragmento_de(enrutador, ANA) != fragmentos.fragmento_de(
+            enrutador, JUAN
+        )
+        fragmentos.ejecutar_lote(
+            enrutador,
+            [
+                ("transferir_dinero", ANA, JUAN, 100),
+                ("transferir_dinero", LUZ, ANA, 30),
+            ],
+        )
+        lineas = fragmentos.resumen_cuenta(enrutador, ANA)
+        assert fragmentos.resumen_cuenta(enrutador, 45_678_912) is None
+    finally:
+        fragmentos.detener_fragmentos(enrutador)
+
+    assert lineas[0] == constantes.RESUMEN_TEMPLATE.format(
+        nombre="Ana Lopez", saldo=930
+    )
+    assert lineas[1] == constantes.TRANSFERENCIA_ENTRANTE_TEMPLATE.format(
+        monto=30, nombre="Luz Diaz", dni=presentacion.formatear_dni(LUZ)
+    )
+    assert lineas[2] == constantes.TRANSFERENCIA_SALIENTE_TEMPLATE.format(
+        monto=100, nombre="Juan Perez", dni=presentacion.formatear_dni(JUAN)
+    )
+
+
+def _saldos(enrutador: dict, dnis) -> list[int]:
+    """Devuelve el saldo de cada cuenta de `dnis`, en orden."""
+    cuentas = fragmentos.ejecutar_lote(
+        enrutador, [("obtener_cuenta", dni) for dni in dnis]
+    )
+    return [cuenta["saldo_disponible"] for cuenta in cuentas]
+
+
+def test_02_transferencias_entre_fragmentos_confirmadas_y_abortadas():
+    enrutador = _iniciar_con_cuentas()
+    try:
+        resultados = fragmentos.ejecutar_lote(
+            enrutador,
+            [
+                ("transferir_dinero", ANA, JUAN, 400),  # se confirma
+                ("transferir_dinero", LUZ, JUAN, 5_000),  # saldo insuficiente
+                ("transferir_dinero", LUZ, FALTANTE, 10),  # el destino no existe
+            ],
+        )
+        saldos = _saldos(enrutador, (ANA, JUAN, LUZ))
+        cuenta_luz = fragmentos.ejecutar(enrutador, ("obtener_cuenta", LUZ))
+        cuenta_faltante = fragmentos.ejecutar(enrutador, ("obtener_cuenta", FALTANTE))
+        distintos = fragmentos.fragmento_de(enrutador, LUZ) != (
+            fragmentos.fragmento_de(enrutador, FALTANTE)
+        )
+    finally:
+        fragmentos.detener_fragmentos(enrutador)
+
+    assert distintos
+    assert resultados == [True, False, False]
+    # la reserva abortada se devolvió y no quedó ningún registro en ningún lado
+    assert saldos == [600, 1_400, 1_000]
+    assert cuenta_luz["transferencias"] == []
+    assert cuenta_faltante is None
+
+
+def test_03_operacion_que_depende_de_una_transferencia_del_mismo_lote():
+    enrutador = _iniciar_con_cuentas()
+    try:
+        resultados = fragmentos.ejecutar_lote(
+            enrutador,
+            [
+                # Juan reenvía a Luz lo que recibe de Ana
+                ("transferir_dinero", ANA, JUAN, 1_000),
+                ("transferir_dinero", JUAN, LUZ, 2_000),
+                # una transferencia abortada devuelve la reserva antes de que
+                # Luz vuelva a usar su saldo
+                ("transferir_dinero", LUZ, FALTANTE, 3_000),
+                ("transferir_dinero", LUZ, ANA, 3_000),
+            ],
+        )
+        saldos = _saldos(enrutador, (ANA, JUAN, LUZ))
+    finally:
+        fragmentos.detener_fragmentos(enrutador)
+
+    assert resultados == [True, True, False, True]
+    assert saldos == [3_000, 0, 0]
+
+
+def test_04_lote_equivale_a_ejecutar_en_orden():
+    generador = random.Random(0)
+    dnis = list(range(10_000_000, 10_000_012))
+    operaciones = [("registrar_cuenta", "Cliente Prueba", dni) for dni in dnis]
+    for _ in range(2_000):
+        eleccion = generador.random()
+        if eleccion < 0.7:
+            origen, destino = generador.sample(dnis, 2)
+            monto = generador.randint(1, 3_000)
+            operaciones.append(("transferir_dinero", origen, destino, monto))
+        else:
+            dni = generador.choice(dnis)
+            operaciones.append(("acreditar_dinero", dni, generador.randint(1, 2_000)))
+
+    # lo esperado: las mismas operaciones de a una, sobre un solo diccionario
+    cuentas = {}
+    esperados = []
+    for operacion in operaciones:
+        if operacion[0] == "registrar_cuenta":
+            negocio.registrar_cuenta(cuentas, operacion[1], operacion[2])
+            esperados.append(True)
+        elif operacion[0] == "acreditar_dinero":
+            negocio.acreditar_dinero(cuentas, operacion[1], operacion[2])
+            esperados.append(True)
+        else:
+            esperados.append(negocio.transferir_dinero(cuentas, *operacion[1:]))
+
+    enrutador = fragmentos.iniciar_fragmentos(CANTIDAD_FRAGMENTOS)
+    try:
+        resultados = []
+        for desde in range(0, len(operaciones), 500):
+            resultados.extend(
+                fragmentos.ejecutar_lote(enrutador, operaciones[desde : desde + 500])
+            )
+        saldos = _saldos(enrutador, dnis)
+    finally:
+        fragmentos.detener_fragmentos(enrutador)
+
+    assert resultados == esperados
+    assert saldos == [cuentas[dni]["saldo_disponible"] for dni in dnis]
+
+
+def main():
+    pruebas = [
+        test_01_resumen_con_contrapartes_de_otros_fragmentos,
+        test_02_transferencias_entre_fragmentos_confirmadas_y_abortadas,
+        test_03_operacion_que_depende_de_una_transferencia_del_mismo_lote,
+        test_04_lote_equivale_a_ejecutar_en_orden,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ según la opción seleccionada por el usuario.
 
 import presentacion
 import constantes
+import entrada_salida
 import operaciones
 
 
@@ -42,23 +43,23 @@ def main():
         opcion_str = presentacion.pedir_opcion_menu()
 
         if opcion_str == constantes.COMANDO_RETROCEDER:
-            print(constantes.MSG_INPUT_INVALIDO)
+            entrada_salida.mostrar(constantes.MSG_INPUT_INVALIDO)
             continue
 
         try:
             opcion = int(opcion_str)
         except ValueError:
-            print(constantes.MSG_INPUT_INVALIDO)
+            entrada_salida.mostrar(constantes.MSG_INPUT_INVALIDO)
             continue
 
         # si la opción existe en el diccionario, ejecutar la función correspondiente
         if opcion in acciones:
             acciones[opcion](cuentas)
         elif opcion == constantes.OPCION_SALIR:
-            print(constantes.MSG_FIN)
+            entrada_salida.mostrar(constantes.MSG_FIN)
             break
         else:
-            print(constantes.MSG_INPUT_INVALIDO)
+            entrada_salida.mostrar(constantes.MSG_INPUT_INVALIDO)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Este módulo contiene el caché de claves de idempotencia.
+
+Un cliente que reintenta una operación (por ejemplo, después de un timeout)
+envía la misma clave de idempotencia. Si la clave ya se usó, se devuelve el
+resultado guardado sin volver a ejecutar la operación, así un reintento no
+mueve dos veces el dinero.
+
+Con cada clave se guarda también la huella del pedido (la operación y sus
+campos). Un pedido distinto que llega con una clave ya usada es un error del
+cliente: no se ejecuta ni recibe el resultado de otro pedido.
+
+El caché está acotado en tiempo y en memoria: cada clave vence
+`segundos_vida` después de usarse, y nunca hay más de `capacidad` claves.
+Como todas las claves viven lo mismo, el orden de inserción es también el
+orden de vencimiento: las vencidas (y, si falta lugar, las más viejas) están
+siempre al principio y se descartan en O(1) cada una.
+
+Estructura del caché:
+
+    {
+        "entradas": OrderedDict({clave: (vence, huella, resultado), ...}),
+        "capacidad": 100000,
+        "segundos_vida": 600,
+    }
+"""
+
+import time
+from collections import OrderedDict
+
+import constantes
+
+
+def crear_cache(
+    capacidad: int = constantes.MAX_CLAVES_IDEMPOTENCIA,
+    segundos_vida: float = constantes.SEGUNDOS_VIDA_IDEMPOTENCIA,
+) -> dict:
+    """
+    Crea un caché de idempotencia vacío.
+    """
+    return {
+        "entradas": OrderedDict(),
+        "capacidad": capacidad,
+        "segundos_vida": segundos_vida,
+    }
+
+
+def _descartar_vencidas(cache: dict, ahora: float) -> None:
+    """
+    Quita las claves vencidas y, si el caché está lleno, las más viejas.
+    """
+    entradas = cache["entradas"]
+    while entradas:
+        vence, _, _ = next(iter(entradas.values()))
+        if vence > ahora and len(entradas) < cache["capacidad"]:
+            break
+        entradas.popitem(last=False)
+
+
+def ejecutar_una_vez(
+    cache: dict, clave: str | None, operacion, ahora=None, huella=None
+):
+    """
+    Ejecuta `operacion()` salvo que `clave` ya se haya usado y no haya vencido.
+
+    Pre:
+        - `operacion` es una función sin argumentos.
+        - `clave` es la clave de idempotencia del pedido, o None si no tiene.
+        - `ahora` es el instante actual en segundos (por defecto, `time.monotonic()`).
+        - `huella` identifica el pedido (comparable con ==), o None.
+    Post:
+        - Si `clave` es None, ejecuta la operación y devuelve su resultado.
+        - Si `clave` está en el caché con otra huella, lanza ValueError sin ejecutar.
+        - Si `clave` está en el caché, devuelve el resultado guardado sin ejecutar.
+        - Si no, ejecuta la operación, guarda el resultado y la huella con la
+          clave y devuelve el resultado.
+    """
+    if clave is None:
+        return operacion()
+
+    if ahora is None:
+        ahora = time.monotonic()
+
+    entradas = cache["entradas"]
+    entrada = entradas.get(clave)
+    if entrada is not None and entrada[0] > ahora:
+        _, huella_guardada, resultado = entrada
+        if huella_guardada != huella:
+            raise ValueError(clave)
+        return resultado
+
+    # una clave vencida se vuelve a insertar al final, en su nuevo orden de vencimiento
+    entradas.pop(clave, None)
+    _descartar_vencidas(cache, ahora)
+    resultado = operacion()
+    entradas[clave] = (ahora + cache["segundos_vida"], huella, resultado)
+    return resultado
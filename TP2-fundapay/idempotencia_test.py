@@ -0,0 +1,185 @@
+"""
+Pruebas del caché de claves de idempotencia (`idempotencia`).
+
+Se pueden correr con pytest o directamente con `python idempotencia_test.py`.
+"""
+
+import json
+
+import constantes
+import idempotencia
+import servidor
+
+
+class _Operacion:
+    """Operación que cuenta sus ejecuciones y devuelve el número de ejecución."""
+
+    def __init__(self):
+        self.ejecuciones = 0
+
+    def __call__(self) -> int:
+        self.ejecuciones += 1
+        return self.ejecuciones
+
+
+def test_01_una_clave_se_ejecuta_una_vez():
+    cache = idempotencia.crear_cache()
+    operacion = _Operacion()
+
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, ahora=0) == 1
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, ahora=1) == 1
+    assert idempotencia.ejecutar_una_vez(cache, "b", operacion, ahora=2) == 2
+    assert operacion.ejecuciones == 2
+
+    # sin clave se ejecuta siempre y no se guarda nada
+    assert idempotencia.ejecutar_una_vez(cache, None, operacion) == 3
+    assert idempotencia.ejecutar_una_vez(cache, None, operacion) == 4
+    assert list(cache["entradas"]) == ["a", "b"]
+
+
+def test_02_las_claves_vencen():
+    cache = idempotencia.crear_cache(segundos_vida=10)
+    operacion = _Operacion()
+
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, ahora=0) == 1
+    assert idempotencia.ejecutar_una_vez(cache, "b", operacion, ahora=5) == 2
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, ahora=9.999) == 1
+
+    # al vencer se vuelve a ejecutar y la clave pasa al final, con su nuevo vencimiento
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, ahora=10) == 3
+    assert list(cache["entradas"]) == ["b", "a"]
+    assert cache["entradas"]["a"] == (20, None, 3)
+
+    # insertar otra clave descarta las vencidas del principio
+    assert idempotencia.ejecutar_una_vez(cache, "c", operacion, ahora=15) == 4
+    assert list(cache["entradas"]) == ["a", "c"]
+    assert idempotencia.ejecutar_una_vez(cache, "b", operacion, ahora=15) == 5
+    assert operacion.ejecuciones == 5
+
+
+def test_03_capacidad_acotada():
+    cache = idempotencia.crear_cache()
+    capacidad = constantes.MAX_CLAVES_IDEMPOTENCIA
+    assert cache["capacidad"] == capacidad
+
+    for numero in range(capacidad):
+        idempotencia.ejecutar_una_vez(cache, f"clave-{numero}", lambda: numero, ahora=0)
+    assert len(cache["entradas"]) == capacidad
+
+    # con el caché lleno, una clave nueva descarta la más vieja
+    operacion = _Operacion()
+    idempotencia.ejecutar_una_vez(cache, "nueva", operacion, ahora=1)
+    assert len(cache["entradas"]) == capacidad
+    assert "clave-0" not in cache["entradas"]
+    assert next(iter(cache["entradas"])) == "clave-1"
+
+    # la descartada se vuelve a ejecutar; las demás siguen guardadas
+    assert idempotencia.ejecutar_una_vez(cache, "clave-0", operacion, ahora=2) == 2
+    assert "clave-1" not in cache["entradas"]
+    ultima = f"clave-{capacidad - 1}"
+    assert idempotencia.ejecutar_una_vez(cache, ultima, operacion, ahora=3) == (
+        capacidad - 1
+    )
+    assert operacion.ejecuciones == 2
+
+
+def test_04_otra_huella_con_la_misma_clave():
+    cache = idempotencia.crear_cache()
+    operacion = _Operacion()
+
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, 0, "x") == 1
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, 1, "x") == 1
+    for huella in ("y", None):
+        try:
+            idempotencia.ejecutar_una_vez(cache, "a", operacion, 2, huella)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Se esperaba ValueError")
+    assert operacion.ejecuciones == 1
+    assert cache["entradas"]["a"] == (600, "x", 1)
+
+    # vencida, la clave se puede usar para otro pedido
+    assert idempotencia.ejecutar_una_vez(cache, "a", operacion, 600, "y") == 2
+
+
+def _pedir(estado: dict, pedido: dict) -> dict:
+    """Procesa un pedido en el servidor y devuelve la respuesta."""
+    return json.loads(servidor.procesar_pedido(estado, json.dumps(pedido).encode()))
+
+
+def test_05_reintento_en_el_servidor():
+    estado = servidor.crear_servidor({})
+    for pedido in [
+        {"operacion": "crear_cuenta", "nombre": "Ana Lopez", "dni": "12.345.678"},
+        {"operacion": "crear_cuenta", "nombre": "Juan Perez", "dni": "23.456.789"},
+        {"operacion": "ingresar_dinero", "dni": "12.345.678", "monto": 1_000},
+    ]:
+        assert _pedir(estado, pedido)["ok"]
+
+    transferencia = {
+        "id": 1,
+        "operacion": "transferir_dinero",
+        "dni": "12.345.678",
+        "dni_destino": "23.456.789",
+        "monto": 600,
+        "clave_idempotencia": "transferencia-1",
+    }
+    exito = {"id": 1, "ok": True, "mensaje": constantes.MSG_OK}
+    assert _pedir(estado, transferencia) == exito
+
+    # el reintento recibe la respuesta original, con su propio id, y no mueve dinero
+    transferencia["id"] = 2
+    assert _pedir(estado, transferencia) == dict(exito, id=2)
+    cuentas = estado["cuentas"]
+    assert cuentas[12_345_678]["saldo_disponible"] == 400
+    assert cuentas[23_456_789]["saldo_disponible"] == 600
+
+    # con otra clave es otra operación: esta vez falta saldo, y el rechazo también se guarda
+    transferencia["clave_idempotencia"] = "transferencia-2"
+    rechazo = {"id": 2, "ok": False, "mensaje": constantes.MSG_MONTO_NO_DISPONIBLE}
+    assert _pedir(estado, transferencia) == rechazo
+    assert _pedir(
+        estado, {"operacion": "ingresar_dinero", "dni": "12.345.678", "monto": 1_000}
+    )["ok"]
+    assert _pedir(estado, transferencia) == rechazo
+    assert cuentas[12_345_678]["saldo_disponible"] == 1_400
+
+    # la misma clave en un pedido con otros campos se rechaza sin aplicarlo
+    otro_monto = dict(transferencia, clave_idempotencia="transferencia-1", monto=100)
+    assert _pedir(estado, otro_monto) == {
+        "id": 2,
+        "ok": False,
+        "mensaje": constantes.MSG_CLAVE_IDEMPOTENCIA_REUTILIZADA,
+    }
+    assert cuentas[12_345_678]["saldo_disponible"] == 1_400
+
+    # una clave que no es texto se rechaza sin aplicar la operación
+    transferencia["clave_idempotencia"] = 7
+    assert _pedir(estado, transferencia) == {
+        "id": 2,
+        "ok": False,
+        "mensaje": constantes.MSG_INPUT_INVALIDO,
+    }
+    assert cuentas[12_345_678]["saldo_disponible"] == 1_400
+    assert list(estado["idempotencia"]["entradas"]) == [
+        "transferencia-1",
+        "transferencia-2",
+    ]
+
+
+def main():
+    pruebas = [
+        test_01_una_clave_se_ejecuta_una_vez,
+        test_02_las_claves_vencen,
+        test_03_capacidad_acotada,
+        test_04_otra_huella_con_la_misma_clave,
+        test_05_reintento_en_el_servidor,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Este módulo contiene un índice ordenado de los DNI de `cuentas`.
+
+El índice es una lista de DNI (enteros) ordenada de menor a mayor, que se
+mantiene al día con los eventos de `negocio`: cada cuenta nueva se inserta
+en su posición con búsqueda binaria. Permite recorrer las cuentas en orden
+de DNI sin ordenar el diccionario completo cada vez:
+
+    - rangos de DNI (`rango`),
+    - paginación ordenada (`pagina`),
+    - búsqueda por prefijo del DNI (`buscar_prefijo`).
+"""
+
+import bisect
+
+import constantes
+import negocio
+
+
+def crear_indice(cuentas: dict) -> dict:
+    """
+    Crea el índice a partir de las cuentas existentes.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas (claves enteras).
+    Post:
+        - Devuelve {"dnis": lista ordenada de los DNI de `cuentas`}.
+    """
+    return {"dnis": sorted(cuentas)}
+
+
+def agregar_dni(indice: dict, dni: int) -> None:
+    """
+    Inserta un DNI en su posición. Si ya estaba, no hace nada.
+    """
+    dnis = indice["dnis"]
+    posicion = bisect.bisect_left(dnis, dni)
+    if posicion == len(dnis) or dnis[posicion] != dni:
+        dnis.insert(posicion, dni)
+
+
+def conectar(indice: dict, cuentas: dict):
+    """
+    Suscribe el índice a los eventos de `negocio` sobre `cuentas` para
+    mantenerlo al día.
+
+    Post:
+        - Cada cuenta registrada en `cuentas` se agrega al índice.
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        if evento["tipo"] == constantes.EVENTO_CUENTA_REGISTRADA:
+            agregar_dni(indice, evento["dni"])
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+def rango(indice: dict, desde: int, hasta: int) -> list[int]:
+    """
+    Devuelve los DNI entre `desde` y `hasta` (ambos incluidos), en orden.
+    """
+    dnis = indice["dnis"]
+    inicio = bisect.bisect_left(dnis, desde)
+    fin = bisect.bisect_right(dnis, hasta)
+    return dnis[inicio:fin]
+
+
+def pagina(indice: dict, despues_de: int | None, cantidad: int) -> list[int]:
+    """
+    Devuelve hasta `cantidad` DNI en orden, empezando por el siguiente a `despues_de`.
+
+    Pre:
+        - `despues_de` es el último DNI de la página anterior, o None para la primera.
+        - `cantidad` es un entero positivo.
+    Post:
+        - Devuelve la página. Si tiene menos de `cantidad` elementos, es la última.
+    """
+    dnis = indice["dnis"]
+    inicio = 0
+    if despues_de is not None:
+        inicio = bisect.bisect_right(dnis, despues_de)
+
+    return dnis[inicio : inicio + cantidad]
+
+
+def buscar_prefijo(indice: dict, prefijo: str) -> list[int]:
+    """
+    Devuelve los DNI cuyo formato XX.YYY.ZZZ empieza con `prefijo`, en orden.
+
+    Pre:
+        - `prefijo` es una cadena con dígitos y, opcionalmente, los puntos del formato.
+    Post:
+        - Devuelve la lista de DNI que empiezan con esos dígitos.
+        - Devuelve una lista vacía si `prefijo` no es un prefijo de DNI válido.
+    """
+    digitos = prefijo.replace(".", "")
+    if len(digitos) > constantes.DIGITOS_DNI or (digitos and not digitos.isdecimal()):
+        return []
+
+    # un prefijo de k dígitos corresponde a un rango contiguo de enteros
+    faltantes = 10 ** (constantes.DIGITOS_DNI - len(digitos))
+    valor = int(digitos) if digitos else 0
+    return rango(indice, valor * faltantes, (valor + 1) * faltantes - 1)
@@ -0,0 +1,80 @@
+"""
+Pruebas del índice ordenado de DNI (`indice_dni`).
+
+Se pueden correr con pytest o directamente con `python indice_dni_test.py`.
+"""
+
+import random
+
+import indice_dni
+import negocio
+
+
+def test_01_conectado_mantiene_el_orden():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 30_000_000)
+    indice = indice_dni.crear_indice(cuentas)
+    observador = indice_dni.conectar(indice, cuentas)
+    generador = random.Random(0)
+    try:
+        for dni in generador.sample(range(10_000_000, 99_999_999), 1_000):
+            if dni not in cuentas:
+                negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+        negocio.registrar_cuentas(cuentas, [(5_000_000, "Juan Perez")])
+        # las cuentas de otro diccionario no entran en el índice
+        negocio.registrar_cuenta({}, "Otra Cuenta", 1_000_000)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    assert indice["dnis"] == sorted(cuentas)
+    # agregar un DNI que ya estaba no lo duplica
+    indice_dni.agregar_dni(indice, 30_000_000)
+    assert indice["dnis"] == sorted(cuentas)
+
+
+def test_02_rango_y_paginas():
+    indice = {"dnis": list(range(10_000_000, 10_000_100))}
+
+    assert indice_dni.rango(indice, 10_000_010, 10_000_012) == [
+        10_000_010,
+        10_000_011,
+        10_000_012,
+    ]
+    assert indice_dni.rango(indice, 1, 2) == []
+
+    paginas = []
+    despues_de = None
+    while True:
+        pagina = indice_dni.pagina(indice, despues_de, 30)
+        paginas.append(pagina)
+        if len(pagina) < 30:
+            break
+        despues_de = pagina[-1]
+    assert [len(pagina) for pagina in paginas] == [30, 30, 30, 10]
+    assert sum(paginas, []) == indice["dnis"]
+
+
+def test_03_buscar_prefijo():
+    indice = {"dnis": [12_345_678, 12_399_999, 12_400_000, 23_456_789]}
+
+    assert indice_dni.buscar_prefijo(indice, "12.3") == [12_345_678, 12_399_999]
+    assert indice_dni.buscar_prefijo(indice, "124") == [12_400_000]
+    assert indice_dni.buscar_prefijo(indice, "23.456.789") == [23_456_789]
+    assert indice_dni.buscar_prefijo(indice, "") == indice["dnis"]
+    assert indice_dni.buscar_prefijo(indice, "1a") == []
+    assert indice_dni.buscar_prefijo(indice, "123456789") == []
+
+
+def main():
+    pruebas = [
+        test_01_conectado_mantiene_el_orden,
+        test_02_rango_y_paginas,
+        test_03_buscar_prefijo,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+Este módulo contiene un índice de los nombres de las cuentas, para buscar
+clientes por una parte de `nombre_apellido` sin recorrer `cuentas`.
+
+El índice trabaja por palabras: cada nombre se normaliza (minúsculas, sin
+tildes) y se parte en palabras. Como muchos clientes comparten nombres y
+apellidos, hay muchas menos palabras distintas que cuentas, y los índices de
+texto se arman solo sobre las palabras distintas:
+
+    - `palabras`: cada palabra con los DNI de las cuentas que la tienen
+      (un `array` de enteros sin signo de 32 bits, 4 bytes por DNI),
+    - `ordenadas`: las palabras en orden alfabético, para buscar por prefijo
+      con búsqueda binaria,
+    - `trigramas`: cada secuencia de 3 letras con las palabras que la
+      contienen, para buscar una parte de una palabra sin recorrerlas todas.
+
+Se mantiene al día con los eventos de `negocio` (`conectar`): cada cuenta
+registrada agrega su DNI a las palabras de su nombre.
+
+Estructura del índice:
+
+    {
+        "palabras": {"perez": array("I", [12345678, ...]), ...},
+        "ordenadas": ["ana", "garcia", "perez", ...],
+        "trigramas": {"per": {"perez", "pereyra"}, ...},
+    }
+"""
+
+import bisect
+import heapq
+import unicodedata
+from array import array
+
+import constantes
+import negocio
+
+LARGO_TRIGRAMA = 3
+
+# calidad de coincidencia de una palabra buscada (menor es mejor)
+COINCIDENCIA_EXACTA = 0
+COINCIDENCIA_PREFIJO = 1
+COINCIDENCIA_PARCIAL = 2
+
+
+def normalizar(texto: str) -> list[str]:
+    """
+    Devuelve las palabras de `texto` en minúsculas y sin tildes.
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_tildes = "".join(
+        caracter for caracter in descompuesto if not unicodedata.combining(caracter)
+    )
+    return sin_tildes.split()
+
+
+def _trigramas(palabra: str) -> set[str]:
+    """
+    Devuelve las secuencias de 3 letras de `palabra` (vacío si es más corta).
+    """
+    trigramas = set()
+    for inicio in range(len(palabra) - LARGO_TRIGRAMA + 1):
+        trigramas.add(palabra[inicio : inicio + LARGO_TRIGRAMA])
+    return trigramas
+
+
+def crear_indice(cuentas: dict) -> dict:
+    """
+    Crea el índice a partir de las cuentas existentes.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+    """
+    indice = {"palabras": {}, "ordenadas": [], "trigramas": {}}
+    for dni, cuenta in cuentas.items():
+        agregar_cuenta(indice, dni, cuenta["nombre_apellido"])
+    return indice
+
+
+def agregar_cuenta(indice: dict, dni: int, nombre: str) -> None:
+    """
+    Agrega la cuenta `dni` a las palabras de `nombre`.
+
+    Pre:
+        - La cuenta no estaba en el índice.
+    Post:
+        - Las palabras nuevas se agregan a `ordenadas` y a sus trigramas.
+    """
+    palabras = indice["palabras"]
+    for palabra in set(normalizar(nombre)):
+        dnis = palabras.get(palabra)
+        if dnis is None:
+            dnis = array("I")
+            palabras[palabra] = dnis
+            bisect.insort(indice["ordenadas"], palabra)
+            for trigrama in _trigramas(palabra):
+                indice["trigramas"].setdefault(trigrama, set()).add(palabra)
+        dnis.append(dni)
+
+
+def conectar(indice: dict, cuentas: dict):
+    """
+    Suscribe el índice a los eventos de `negocio` sobre `cuentas` para
+    mantenerlo al día.
+
+    Post:
+        - Cada cuenta registrada en `cuentas` se agrega al índice.
+        - Devuelve el observador, para poder quitarlo con
+          `negocio.desuscribir(cuentas, observador)`.
+    """
+
+    def observador(evento: dict) -> None:
+        if evento["tipo"] == constantes.EVENTO_CUENTA_REGISTRADA:
+            agregar_cuenta(indice, evento["dni"], evento["nombre"])
+
+    negocio.suscribir(cuentas, observador)
+    return observador
+
+
+def _palabras_con_prefijo(indice: dict, prefijo: str) -> list[str]:
+    """
+    Devuelve las palabras del índice que empiezan con `prefijo`.
+    """
+    ordenadas = indice["ordenadas"]
+    encontradas = []
+    posicion = bisect.bisect_left(ordenadas, prefijo)
+    while posicion < len(ordenadas) and ordenadas[posicion].startswith(prefijo):
+        encontradas.append(ordenadas[posicion])
+        posicion += 1
+    return encontradas
+
+
+def _palabras_que_contienen(indice: dict, parte: str) -> list[str]:
+    """
+    Devuelve las palabras del índice que contienen `parte`.
+
+    Pre:
+        - `parte` tiene al menos `LARGO_TRIGRAMA` letras.
+    """
+    conjuntos = []
+    for trigrama in _trigramas(parte):
+        palabras = indice["trigramas"].get(trigrama)
+        if palabras is None:
+            return []
+        conjuntos.append(palabras)
+
+    # se parte del trigrama menos frecuente; tener todos los trigramas no
+    # garantiza que estén seguidos, así que se confirma cada candidata
+    conjuntos.sort(key=len)
+    candidatas = conjuntos[0].intersection(*conjuntos[1:])
+    return [palabra for palabra in candidatas if parte in palabra]
+
+
+def _coincidencias(indice: dict, buscada: str, solo_prefijo: bool) -> dict:
+    """
+    Devuelve {palabra del índice: calidad de coincidencia} para una palabra buscada.
+
+    Post:
+        - Si `solo_prefijo` es True, o `buscada` tiene menos de `LARGO_TRIGRAMA`
+          letras, solo coinciden las palabras que empiezan con `buscada`.
+    """
+    coincidencias = {}
+    if not solo_prefijo and len(buscada) >= LARGO_TRIGRAMA:
+        for palabra in _palabras_que_contienen(indice, buscada):
+            coincidencias[palabra] = COINCIDENCIA_PARCIAL
+
+    for palabra in _palabras_con_prefijo(indice, buscada):
+        coincidencias[palabra] = COINCIDENCIA_PREFIJO
+    if buscada in coincidencias:
+        coincidencias[buscada] = COINCIDENCIA_EXACTA
+    return coincidencias
+
+
+def _calidades_por_dni(indice: dict, coincidencias: dict) -> dict:
+    """
+    Devuelve {dni: mejor calidad} de las cuentas con alguna palabra de `coincidencias`.
+    """
+    calidades = {}
+    # se recorren de peor a mejor calidad: la mejor queda escrita al final
+    for palabra, calidad in sorted(
+        coincidencias.items(), key=lambda item: item[1], reverse=True
+    ):
+        calidades.update(dict.fromkeys(indice["palabras"][palabra], calidad))
+    return calidades
+
+
+def _mejores_de_una_palabra(
+    indice: dict, coincidencias: dict, cantidad: int
+) -> list[int]:
+    """
+    Devuelve los `cantidad` mejores DNI para una sola palabra buscada, sin
+    armar un diccionario con todas las cuentas que coinciden (con una o dos
+    letras, pueden ser casi todas).
+
+    Las calidades se recorren de mejor a peor, y dentro de cada una se toman
+    los DNI más chicos: de cada palabra alcanzan sus `faltan + len(vistos)`
+    DNI más chicos (un heap acotado), porque antes de uno de los resultados
+    solo puede haber DNI ya vistos o resultados anteriores. En cuanto se juntan
+    `cantidad` resultados, las calidades peores no se miran.
+    """
+    por_calidad = {}
+    for palabra, calidad in coincidencias.items():
+        por_calidad.setdefault(calidad, []).append(indice["palabras"][palabra])
+
+    resultado = []
+    vistos = set()
+    for calidad in sorted(por_calidad):
+        faltan = cantidad - len(resultado)
+        if faltan <= 0:
+            break
+        candidatos = set()
+        for dnis in por_calidad[calidad]:
+            candidatos.update(heapq.nsmallest(faltan + len(vistos), dnis))
+        nuevos = sorted(candidatos - vistos)[:faltan]
+        resultado.extend(nuevos)
+        vistos.update(nuevos)
+    return resultado
+
+
+def buscar(
+    indice: dict,
+    texto: str,
+    cantidad: int = constantes.RESULTADOS_BUSQUEDA_NOMBRES,
+    solo_prefijo: bool = False,
+) -> list[int]:
+    """
+    Busca cuentas cuyo nombre tenga todas las palabras de `texto`, enteras o en parte.
+
+    Pre:
+        - `cantidad` es un entero positivo.
+    Post:
+        - Devuelve hasta `cantidad` DNI, de la mejor coincidencia a la peor:
+          primero las palabras iguales, después las que empiezan con lo buscado
+          y al final las que lo contienen en el medio. Los empates se ordenan por DNI.
+        - Si `solo_prefijo` es True, cada palabra buscada tiene que ser el
+          comienzo de una palabra del nombre. Las palabras buscadas de menos de
+          `LARGO_TRIGRAMA` letras siempre se buscan así.
+        - Devuelve una lista vacía si `texto` no tiene palabras.
+    """
+    buscadas = normalizar(texto)
+    if not buscadas:
+        return []
+
+    coincidencias = []
+    for buscada in set(buscadas):
+        por_palabra = _coincidencias(indice, buscada, solo_prefijo)
+        if not por_palabra:
+            return []
+        tamanio = sum(len(indice["palabras"][palabra]) for palabra in por_palabra)
+        coincidencias.append((tamanio, por_palabra))
+
+    if len(coincidencias) == 1:
+        return _mejores_de_una_palabra(indice, coincidencias[0][1], cantidad)
+
+    # se empieza por la palabra buscada con menos cuentas; las demás solo filtran
+    coincidencias.sort(key=lambda item: item[0])
+    puntajes = _calidades_por_dni(indice, coincidencias[0][1])
+    for _, por_palabra in coincidencias[1:]:
+        calidades = {}
+        for palabra, calidad in por_palabra.items():
+            # la intersección se hace en C, sin armar un diccionario por palabra
+            for dni in puntajes.keys() & indice["palabras"][palabra]:
+                calidades[dni] = min(calidad, calidades.get(dni, calidad))
+        puntajes = {dni: puntajes[dni] + calidad for dni, calidad in calidades.items()}
+
+    mejores = heapq.nsmallest(
+        cantidad, puntajes.items(), key=lambda item: (item[1], item[0])
+    )
+    return [dni for dni, _ in mejores]
+
+
+def buscar_prefijo(
+    indice: dict, texto: str, cantidad: int = constantes.RESULTADOS_BUSQUEDA_NOMBRES
+) -> list[int]:
+    """
+    Como `buscar`, pero cada palabra de `texto` tiene que ser el comienzo de
+    una palabra del nombre (búsqueda mientras se escribe).
+    """
+    return buscar(indice, texto, cantidad, solo_prefijo=True)
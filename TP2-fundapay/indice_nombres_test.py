@@ -0,0 +1,188 @@
+"""
+Pruebas del índice de nombres de las cuentas (`indice_nombres`).
+
+Se pueden correr con pytest o directamente con `python indice_nombres_test.py`.
+"""
+
+import random
+
+import indice_nombres
+import negocio
+
+CLIENTES = [
+    (10_000_001, "Ana Perez"),
+    (10_000_002, "Juan Pereyra"),
+    (10_000_003, "Ana María López"),
+    (10_000_004, "Mariana Perez"),
+    (10_000_005, "Pedro Lopez Perez"),
+    (10_000_006, "JOSÉ GÓMEZ"),
+    (10_000_007, "Anabel Sperez"),
+]
+
+
+def _crear_cuentas(clientes: list[tuple[int, str]]) -> dict:
+    """Crea una cuenta por cliente (dni, nombre)."""
+    cuentas = {}
+    for dni, nombre in clientes:
+        negocio.registrar_cuenta(cuentas, nombre, dni)
+    return cuentas
+
+
+def _buscar_recorriendo(cuentas: dict, texto: str, solo_prefijo: bool) -> list[int]:
+    """Busca como `indice_nombres.buscar`, recorriendo todas las cuentas."""
+    buscadas = set(indice_nombres.normalizar(texto))
+    if not buscadas:
+        return []
+
+    puntajes = {}
+    for dni, cuenta in cuentas.items():
+        palabras = indice_nombres.normalizar(cuenta["nombre_apellido"])
+        puntaje = 0
+        for buscada in buscadas:
+            calidades = []
+            for palabra in palabras:
+                if palabra == buscada:
+                    calidades.append(indice_nombres.COINCIDENCIA_EXACTA)
+                elif palabra.startswith(buscada):
+                    calidades.append(indice_nombres.COINCIDENCIA_PREFIJO)
+                elif (
+                    not solo_prefijo
+                    and len(buscada) >= indice_nombres.LARGO_TRIGRAMA
+                    and buscada in palabra
+                ):
+                    calidades.append(indice_nombres.COINCIDENCIA_PARCIAL)
+            if not calidades:
+                break
+            puntaje += min(calidades)
+        else:
+            puntajes[dni] = puntaje
+    return sorted(puntajes, key=lambda dni: (puntajes[dni], dni))
+
+
+def test_01_normalizacion():
+    assert indice_nombres.normalizar("  José   GÓMEZ ") == ["jose", "gomez"]
+    assert indice_nombres.normalizar("Ñandú Müller") == ["nandu", "muller"]
+    assert indice_nombres.normalizar("   ") == []
+
+    indice = indice_nombres.crear_indice(_crear_cuentas(CLIENTES))
+    assert indice_nombres.buscar(indice, "jose gomez") == [10_000_006]
+    assert indice_nombres.buscar(indice, "GOMEZ José") == [10_000_006]
+    assert indice_nombres.buscar(indice, "lopez") == [10_000_003, 10_000_005]
+    assert indice_nombres.buscar(indice, "") == []
+    assert indice_nombres.buscar(indice, "zzz") == []
+
+
+def test_02_prefijo_y_parte_de_palabra():
+    indice = indice_nombres.crear_indice(_crear_cuentas(CLIENTES))
+
+    # exacta, después prefijo, después en el medio ("anabel" y "mariana")
+    assert indice_nombres.buscar(indice, "ana") == [
+        10_000_001,
+        10_000_003,
+        10_000_007,
+        10_000_004,
+    ]
+    assert indice_nombres.buscar_prefijo(indice, "ana") == [
+        10_000_001,
+        10_000_003,
+        10_000_007,
+    ]
+    # "pere" es prefijo de perez y pereyra; "erez" solo aparece en el medio
+    assert indice_nombres.buscar(indice, "pere") == [
+        10_000_001,
+        10_000_002,
+        10_000_004,
+        10_000_005,
+        10_000_007,
+    ]
+    assert indice_nombres.buscar_prefijo(indice, "erez") == []
+    assert indice_nombres.buscar(indice, "erez") == [
+        10_000_001,
+        10_000_004,
+        10_000_005,
+        10_000_007,
+    ]
+    # menos de 3 letras: solo prefijo
+    assert indice_nombres.buscar(indice, "ez") == []
+    assert indice_nombres.buscar(indice, "jo") == [10_000_006]
+    # una parte que no está en ninguna palabra
+    assert indice_nombres.buscar(indice, "anaz") == []
+
+
+def test_03_varias_palabras_y_orden():
+    indice = indice_nombres.crear_indice(_crear_cuentas(CLIENTES))
+
+    # todas las palabras tienen que coincidir; se suman sus calidades
+    assert indice_nombres.buscar(indice, "ana perez") == [
+        10_000_001,
+        10_000_004,
+        10_000_007,
+    ]
+    assert indice_nombres.buscar(indice, "perez lopez") == [10_000_005]
+    assert indice_nombres.buscar(indice, "ana gomez") == []
+    # una palabra repetida cuenta una vez
+    assert indice_nombres.buscar(indice, "perez perez ana") == [
+        10_000_001,
+        10_000_004,
+        10_000_007,
+    ]
+    # el límite de resultados se aplica después de ordenar
+    assert indice_nombres.buscar(indice, "ana", cantidad=2) == [
+        10_000_001,
+        10_000_003,
+    ]
+
+
+def test_04_igual_a_recorrer_las_cuentas():
+    generador = random.Random(4)
+    nombres = ["Ana", "Juan", "María", "Mariana", "Pedro", "José", "Lucía", "Luciano"]
+    apellidos = ["Pérez", "Pereyra", "López", "Gómez", "Sperez", "Lopresti"]
+    clientes = []
+    for _ in range(2_000):
+        nombre = " ".join(
+            generador.sample(nombres, generador.randint(1, 2))
+            + generador.sample(apellidos, generador.randint(1, 2))
+        )
+        clientes.append((10_000_000 + generador.randrange(1_000_000), nombre))
+    cuentas = _crear_cuentas(dict(clientes).items())
+
+    indice = indice_nombres.crear_indice({})
+    observador = indice_nombres.conectar(indice, cuentas)
+    try:
+        negocio.registrar_cuenta(cuentas, "Ana Nueva", 99_999_999)
+    finally:
+        negocio.desuscribir(cuentas, observador)
+    # las cuentas anteriores a conectar no están; se agregan con crear_indice
+    assert indice_nombres.buscar(indice, "ana") == [99_999_999]
+    indice = indice_nombres.crear_indice(cuentas)
+    assert indice["ordenadas"] == sorted(indice["palabras"])
+
+    busquedas = ["ana", "an", "pere", "erez", "lu", "lucia", "ana perez", "mari lop"]
+    busquedas += ["o", "ez", "jose gomez", "x", "pres", "ian ana"]
+    for texto in busquedas:
+        for solo_prefijo in (False, True):
+            esperado = _buscar_recorriendo(cuentas, texto, solo_prefijo)
+            assert (
+                indice_nombres.buscar(indice, texto, 10**6, solo_prefijo) == esperado
+            ), texto
+            # con pocos resultados se cortan antes; tienen que ser los mismos
+            for cantidad in (1, 5, 50):
+                assert indice_nombres.buscar(indice, texto, cantidad, solo_prefijo) == (
+                    esperado[:cantidad]
+                )
+
+
+def main():
+    pruebas = [
+        test_01_normalizacion,
+        test_02_prefijo_y_parte_de_palabra,
+        test_03_varias_palabras_y_orden,
+        test_04_igual_a_recorrer_las_cuentas,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
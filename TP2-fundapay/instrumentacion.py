@@ -0,0 +1,244 @@
+"""
+Este módulo contiene la instrumentación de FundaPay: cantidad de llamadas,
+errores, rechazos y latencias de cada punto de entrada de `operaciones` y
+`negocio`.
+
+`activar` reemplaza esas funciones en sus módulos por versiones que miden
+cada llamada, y `desactivar` vuelve a poner las originales. Como los demás
+módulos las llaman a través del módulo (`negocio.transferir_dinero(...)`),
+no hace falta cambiar nada más; y mientras la instrumentación está
+desactivada, el costo es exactamente cero.
+
+Las latencias se guardan en nanosegundos en histogramas logarítmicos
+(`estadisticas`), así que los percentiles se calculan sin guardar las muestras.
+
+Estructura de las métricas:
+
+    {
+        "funciones": {
+            "negocio.intentar_transferencia": {
+                "llamadas": 10,
+                "errores": 0,           # llamadas que lanzaron una excepción
+                "histograma": {indice_bucket: cantidad, ...},
+            },
+            ...
+        },
+        "rechazos": {"dni_invalido": 2, "fondos_insuficientes": 1, ...},
+    }
+"""
+
+import functools
+import json
+import time
+
+import constantes
+import estadisticas
+import fundapay
+import negocio
+import operaciones
+import validaciones
+
+# puntos de entrada instrumentados, por módulo
+FUNCIONES_INSTRUMENTADAS = (
+    (
+        operaciones,
+        (
+            "crear_cuenta",
+            "ingresar_dinero",
+            "transferir_dinero",
+            "otorgar_prestamo",
+            "pagar_prestamo",
+            "ver_resumen",
+        ),
+    ),
+    (
+        negocio,
+        (
+            "registrar_cuenta",
+            "acreditar_dinero",
+            "intentar_transferencia",
+            "otorgar_prestamo",
+            "pagar_prestamo",
+        ),
+    ),
+    (validaciones, ("convertir_dni",)),
+)
+
+# funciones originales reemplazadas por `activar`: (módulo, nombre) -> función
+_originales = {}
+
+
+def crear_metricas() -> dict:
+    """
+    Crea métricas vacías.
+    """
+    return {"funciones": {}, "rechazos": {}}
+
+
+# motivos de rechazo de `negocio.intentar_transferencia`
+_MOTIVOS_TRANSFERENCIA = {
+    constantes.MSG_MONTO_NO_DISPONIBLE: "fondos_insuficientes",
+    constantes.MSG_LIMITE_TRANSFERENCIAS: "limite_transferencias",
+}
+
+
+def _rechazo_transferencia(resultado) -> str | None:
+    """
+    Clasifica el motivo que informa `negocio.intentar_transferencia`. Un
+    motivo que no está en `_MOTIVOS_TRANSFERENCIA` se cuenta como "otro".
+    """
+    if resultado is None:
+        return None
+    return _MOTIVOS_TRANSFERENCIA.get(resultado, "otro")
+
+
+def _rechazo_dni(resultado) -> str | None:
+    """
+    Clasifica un DNI que `validaciones.convertir_dni` no pudo convertir.
+    """
+    if resultado is None:
+        return "dni_invalido"
+    return None
+
+
+# funciones cuyo resultado indica un rechazo: nombre -> clasificador del resultado
+_CLASIFICADORES = {
+    "negocio.intentar_transferencia": _rechazo_transferencia,
+    "validaciones.convertir_dni": _rechazo_dni,
+}
+
+
+def _envolver(metricas: dict, nombre: str, funcion):
+    """
+    Devuelve una versión de `funcion` que registra sus llamadas en `metricas`.
+    """
+    datos = metricas["funciones"].setdefault(
+        nombre, {"llamadas": 0, "errores": 0, "histograma": {}}
+    )
+    histograma = datos["histograma"]
+    rechazos = metricas["rechazos"]
+    clasificar = _CLASIFICADORES.get(nombre)
+    reloj = time.perf_counter_ns
+
+    @functools.wraps(funcion)
+    def instrumentada(*argumentos, **opciones):
+        inicio = reloj()
+        try:
+            resultado = funcion(*argumentos, **opciones)
+        except Exception:
+            datos["errores"] += 1
+            raise
+        finally:
+            estadisticas.registrar(histograma, reloj() - inicio)
+            datos["llamadas"] += 1
+
+        if clasificar is not None:
+            motivo = clasificar(resultado)
+            if motivo is not None:
+                rechazos[motivo] = rechazos.get(motivo, 0) + 1
+        return resultado
+
+    return instrumentada
+
+
+def activar(metricas: dict) -> None:
+    """
+    Reemplaza los puntos de entrada de `FUNCIONES_INSTRUMENTADAS` por versiones
+    instrumentadas que registran en `metricas`. Si ya estaba activa, primero
+    se desactiva.
+    """
+    desactivar()
+    for modulo, nombres in FUNCIONES_INSTRUMENTADAS:
+        for nombre in nombres:
+            original = getattr(modulo, nombre)
+            _originales[(modulo, nombre)] = original
+            nombre_completo = f"{modulo.__name__}.{nombre}"
+            setattr(modulo, nombre, _envolver(metricas, nombre_completo, original))
+
+
+def desactivar() -> None:
+    """
+    Vuelve a poner las funciones originales. Si no estaba activa, no hace nada.
+    """
+    for (modulo, nombre), original in _originales.items():
+        setattr(modulo, nombre, original)
+    _originales.clear()
+
+
+def instantanea(metricas: dict) -> dict:
+    """
+    Devuelve un resumen de las métricas, listo para convertir a JSON.
+
+    Post:
+        - Por función: llamadas, errores y los percentiles de
+          `CUANTILES_EXPORTADOS` y el máximo, en microsegundos.
+        - Los rechazos por motivo.
+    """
+    funciones = {}
+    for nombre, datos in sorted(metricas["funciones"].items()):
+        histograma = datos["histograma"]
+        latencias = {}
+        for cuantil in constantes.CUANTILES_EXPORTADOS:
+            latencias[f"p{cuantil * 100:g}_us"] = (
+                estadisticas.percentil_histograma(histograma, cuantil) / 1000
+            )
+        latencias["max_us"] = estadisticas.percentil_histograma(histograma, 1.0) / 1000
+
+        funciones[nombre] = {
+            "llamadas": datos["llamadas"],
+            "errores": datos["errores"],
+            "latencias": latencias,
+        }
+
+    return {
+        "funciones": funciones,
+        "rechazos": dict(sorted(metricas["rechazos"].items())),
+    }
+
+
+def exportar_json(metricas: dict) -> str:
+    """
+    Devuelve la instantánea de las métricas como texto JSON.
+    """
+    return json.dumps(instantanea(metricas), ensure_ascii=False, indent=2)
+
+
+def exportar_texto(metricas: dict) -> str:
+    """
+    Devuelve las métricas en formato de exposición de texto (una métrica por
+    línea, con etiquetas entre llaves), como el que leen los sistemas de monitoreo.
+    """
+    lineas = []
+    datos = instantanea(metricas)
+    for nombre, funcion in datos["funciones"].items():
+        etiqueta = f'funcion="{nombre}"'
+        lineas.append(f"fundapay_llamadas_total{{{etiqueta}}} {funcion['llamadas']}")
+        lineas.append(f"fundapay_errores_total{{{etiqueta}}} {funcion['errores']}")
+        for cuantil in constantes.CUANTILES_EXPORTADOS:
+            valor = funcion["latencias"][f"p{cuantil * 100:g}_us"]
+            lineas.append(
+                f'fundapay_latencia_us{{{etiqueta},cuantil="{cuantil}"}} {valor}'
+            )
+
+    for motivo, cantidad in datos["rechazos"].items():
+        lineas.append(f'fundapay_rechazos_total{{motivo="{motivo}"}} {cantidad}')
+
+    return "\n".join(lineas)
+
+
+def main():
+    """
+    Ejecuta FundaPay con la instrumentación activa y, al salir, imprime las
+    métricas en formato de texto.
+    """
+    metricas = crear_metricas()
+    activar(metricas)
+    try:
+        fundapay.main()
+    finally:
+        desactivar()
+        print(exportar_texto(metricas))
+
+
+if __name__ == "__main__":
+    main()
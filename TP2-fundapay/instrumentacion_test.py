@@ -0,0 +1,117 @@
+"""
+Pruebas de la instrumentación (`instrumentacion`).
+
+Se pueden correr con pytest o directamente con `python instrumentacion_test.py`.
+"""
+
+import constantes
+import instrumentacion
+import negocio
+import operaciones
+import validaciones
+import velocidad
+
+
+def test_01_activar_y_desactivar():
+    originales = {
+        (modulo, nombre): getattr(modulo, nombre)
+        for modulo, nombres in instrumentacion.FUNCIONES_INSTRUMENTADAS
+        for nombre in nombres
+    }
+
+    metricas = instrumentacion.crear_metricas()
+    instrumentacion.activar(metricas)
+    try:
+        # activar dos veces no envuelve dos veces
+        instrumentacion.activar(metricas)
+        assert operaciones.transferir_dinero.__wrapped__ is (
+            originales[(operaciones, "transferir_dinero")]
+        )
+        assert validaciones.convertir_dni("12.345.678") == 12_345_678
+        assert validaciones.convertir_dni("123") is None
+    finally:
+        instrumentacion.desactivar()
+
+    for (modulo, nombre), original in originales.items():
+        assert getattr(modulo, nombre) is original
+
+    datos = metricas["funciones"]["validaciones.convertir_dni"]
+    assert datos["llamadas"] == 2
+    assert datos["errores"] == 0
+    assert sum(datos["histograma"].values()) == 2
+    assert metricas["rechazos"] == {"dni_invalido": 1}
+
+    # desactivada, las llamadas no se registran
+    validaciones.convertir_dni("123")
+    assert datos["llamadas"] == 2
+
+
+def test_02_argumentos_por_nombre_y_errores():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 100)
+
+    metricas = instrumentacion.crear_metricas()
+    instrumentacion.activar(metricas)
+    try:
+        assert negocio.transferir_dinero(
+            cuentas, 12_345_678, dni_destino=23_456_789, monto_a_transferir=60
+        )
+        motivo = negocio.intentar_transferencia(
+            cuentas,
+            dni_origen=12_345_678,
+            dni_destino=23_456_789,
+            monto_a_transferir=60,
+        )
+        assert motivo == constantes.MSG_MONTO_NO_DISPONIBLE
+
+        # un límite de una transferencia por minuto rechaza la segunda
+        velocidad.conectar(
+            velocidad.crear_limites(max_transferencias_minuto=1), cuentas
+        )
+        try:
+            assert negocio.transferir_dinero(cuentas, 23_456_789, 12_345_678, 10)
+            assert not negocio.transferir_dinero(cuentas, 23_456_789, 12_345_678, 10)
+        finally:
+            negocio.limitar_transferencias(cuentas, None)
+
+        try:
+            negocio.transferir_dinero(cuentas, 99_999_999, 23_456_789, 1)
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("Se esperaba KeyError")
+    finally:
+        instrumentacion.desactivar()
+
+    datos = metricas["funciones"]["negocio.intentar_transferencia"]
+    assert datos["llamadas"] == 5
+    assert datos["errores"] == 1
+    assert metricas["rechazos"] == {
+        "fondos_insuficientes": 1,
+        "limite_transferencias": 1,
+    }
+    assert cuentas[23_456_789]["saldo_disponible"] == 50
+
+    instantanea = instrumentacion.instantanea(metricas)
+    assert instantanea["funciones"]["negocio.intentar_transferencia"]["llamadas"] == 5
+    texto = instrumentacion.exportar_texto(metricas)
+    assert 'fundapay_rechazos_total{motivo="fondos_insuficientes"} 1' in texto
+
+    # un motivo que no está en la tabla se cuenta como "otro", sin lanzar KeyError
+    assert instrumentacion._rechazo_transferencia("Otro motivo") == "otro"
+
+
+def main():
+    pruebas = [
+        test_01_activar_y_desactivar,
+        test_02_argumentos_por_nombre_y_errores,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+Este módulo contiene el procesamiento por lotes de FundaPay.
+
+Permite aplicar un archivo JSONL o CSV de operaciones sin pasar por los
+prompts interactivos. Cada registro se valida con las mismas reglas que
+`validaciones` y se aplica a través de `negocio`. Por cada registro se escribe
+una línea JSON de resultado, a medida que se procesa, para que el uso de
+memoria no dependa del tamaño del archivo.
+
+Campos de un registro (los que no aplican a la operación se ignoran):
+    operacion, nombre, dni, dni_destino, interes, monto, id_prestamo
+
+Operaciones: crear_cuenta, ingresar_dinero, transferir_dinero,
+otorgar_prestamo, pagar_prestamo.
+"""
+
+import csv
+import json
+import sys
+from typing import Iterator
+
+import constantes
+import negocio
+import validaciones
+
+
+def _convertir_entero(valor) -> int | None:
+    """
+    Convierte el valor de un campo numérico a entero.
+
+    Pre:
+        - `valor` es el valor leído de un registro (str, int u otro).
+    Post:
+        - Devuelve el entero si `valor` es un int (no bool) o una cadena con un entero.
+        - Devuelve None en cualquier otro caso.
+    """
+    if type(valor) is int:
+        return valor
+
+    if isinstance(valor, str):
+        try:
+            return int(valor)
+        except ValueError:
+            return None
+
+    return None
+
+
+def _convertir_dni(valor) -> int | None:
+    """
+    Convierte el DNI de un registro (XX.YYY.ZZZ) a la clave entera de `cuentas`.
+    Devuelve None si no es una cadena con formato válido.
+    """
+    if not isinstance(valor, str):
+        return None
+
+    return validaciones.convertir_dni(valor)
+
+
+def _dni_existente(cuentas: dict, valor) -> tuple[bool, int | str]:
+    """
+    Valida el formato de un DNI y que exista una cuenta con ese DNI.
+
+    Post:
+        - Devuelve (True, dni) si es válido y existe, con el DNI como entero.
+        - Devuelve (False, mensaje_error) en caso contrario.
+    """
+    dni = _convertir_dni(valor)
+    if dni is None:
+        return False, constantes.MSG_DNI_INVALIDO
+
+    if dni not in cuentas:
+        return False, constantes.MSG_NO_EXISTE_CUENTA
+
+    return True, dni
+
+
+def _monto_valido(valor, minimo: int, mensaje_error: str) -> tuple[bool, int | str]:
+    """
+    Valida que un campo numérico sea un entero mayor o igual a `minimo`.
+
+    Post:
+        - Devuelve (True, monto) si es válido.
+        - Devuelve (False, mensaje_error) en caso contrario.
+    """
+    monto = _convertir_entero(valor)
+    if monto is None or monto < minimo:
+        return False, mensaje_error
+
+    return True, monto
+
+
+def _crear_cuenta(cuentas: dict, registro: dict) -> tuple[bool, str]:
+    """
+    Aplica un registro `crear_cuenta`. Mismas reglas que `operaciones.crear_cuenta`.
+    """
+    nombre = registro.get("nombre")
+    if not isinstance(nombre, str) or not validaciones.es_nombre_apellido_valido(
+        nombre
+    ):
+        return False, constantes.MSG_NOMBRE_INVALIDO
+
+    dni = _convertir_dni(registro.get("dni"))
+    if dni is None:
+        return False, constantes.MSG_DNI_INVALIDO
+
+    if dni in cuentas:
+        return False, constantes.MSG_CUENTA_EXISTE.format(
+            nombre=cuentas[dni]["nombre_apellido"]
+        )
+
+    negocio.registrar_cuenta(cuentas, nombre, dni)
+    return True, constantes.MSG_OK
+
+
+def _ingresar_dinero(cuentas: dict, registro: dict) -> tuple[bool, str]:
+    """
+    Aplica un registro `ingresar_dinero`. Mismas reglas que `operaciones.ingresar_dinero`.
+    """
+    ok, dni = _dni_existente(cuentas, registro.get("dni"))
+    if not ok:
+        return False, dni
+
+    ok, monto = _monto_valido(
+        registro.get("monto"), constantes.MONTO_MINIMO, constantes.MSG_MONTO_INVALIDO
+    )
+    if not ok:
+        return False, monto
+
+    negocio.acreditar_dinero(cuentas, dni, monto)
+    return True, constantes.MSG_OK
+
+
+def _transferir_dinero(cuentas: dict, registro: dict) -> tuple[bool, str]:
+    """
+    Aplica un registro `transferir_dinero`. Mismas reglas que `operaciones.transferir_dinero`.
+    """
+    ok, dni_origen = _dni_existente(cuentas, registro.get("dni"))
+    if not ok:
+        return False, dni_origen
+
+    ok, dni_destino = _dni_existente(cuentas, registro.get("dni_destino"))
+    if not ok:
+        return False, dni_destino
+
+    if dni_origen == dni_destino:
+        return False, constantes.MSG_INPUT_INVALIDO
+
+    ok, monto = _monto_valido(
+        registro.get("monto"), constantes.MONTO_MINIMO, constantes.MSG_MONTO_INVALIDO
+    )
+    if not ok:
+        return False, monto
+
+    motivo = negocio.intentar_transferencia(cuentas, dni_origen, dni_destino, monto)
+    if motivo is not None:
+        return False, motivo
+
+    return True, constantes.MSG_OK
+
+
+def _otorgar_prestamo(cuentas: dict, registro: dict) -> tuple[bool, str]:
+    """
+    Aplica un registro `otorgar_prestamo`. Mismas reglas que `operaciones.otorgar_prestamo`.
+    """
+    ok, dni = _dni_existente(cuentas, registro.get("dni"))
+    if not ok:
+        return False, dni
+
+    ok, interes = _monto_valido(
+        registro.get("interes"),
+        constantes.INTERES_MINIMO,
+        constantes.MSG_TASA_INTERES_INVALIDA,
+    )
+    if not ok:
+        return False, interes
+
+    ok, monto = _monto_valido(
+        registro.get("monto"), constantes.MONTO_MINIMO, constantes.MSG_MONTO_INVALIDO
+    )
+    if not ok:
+        return False, monto
+
+    negocio.otorgar_prestamo(cuentas, dni, interes, monto)
+    return True, constantes.MSG_OK
+
+
+def _pagar_prestamo(cuentas: dict, registro: dict) -> tuple[bool, str]:
+    """
+    Aplica un registro `pagar_prestamo`. Mismas reglas que `operaciones.pagar_prestamo`.
+    El préstamo se identifica con `id_prestamo` (los ids empiezan en 1 por cuenta).
+    """
+    ok, dni = _dni_existente(cuentas, registro.get("dni"))
+    if not ok:
+        return False, dni
+
+    cuenta = cuentas[dni]
+    id_prestamo = _convertir_entero(registro.get("id_prestamo"))
+    if id_prestamo is None:
+        return False, constantes.MSG_SELECCION_INVALIDA
+
+    prestamo = negocio.buscar_prestamo(cuenta, id_prestamo)
+    if prestamo is None:
+        # los ids ya otorgados que no están activos corresponden a préstamos saldados
+        if 1 <= id_prestamo < cuenta["next_prestamo_id"]:
+            return False, constantes.MSG_PRESTAMO_NO_ACTIVO
+        return False, constantes.MSG_SELECCION_INVALIDA
+
+    deuda_total = negocio.deuda_total_prestamo(prestamo)
+
+    ok, monto = _monto_valido(
+        registro.get("monto"),
+        constantes.MONTO_MINIMO_PAGO,
+        constantes.MSG_MONTO_INVALIDO,
+    )
+    if not ok:
+        return False, monto
+
+    if cuenta["saldo_disponible"] < monto:
+        return False, constantes.MSG_SALDO_INSUFICIENTE
+
+    negocio.pagar_prestamo(cuenta, prestamo, min(monto, deuda_total))
+    return True, constantes.MSG_OK
+
+
+OPERACIONES_LOTE = {
+    "crear_cuenta": _crear_cuenta,
+    "ingresar_dinero": _ingresar_dinero,
+    "transferir_dinero": _transferir_dinero,
+    "otorgar_prestamo": _otorgar_prestamo,
+    "pagar_prestamo": _pagar_prestamo,
+}
+
+
+def procesar_registro(cuentas: dict, registro: dict | None) -> tuple[bool, str]:
+    """
+    Valida y aplica un registro del lote.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+        - `registro` es el diccionario leído del archivo, o None si la línea no se pudo leer.
+    Post:
+        - Si el registro es válido, se aplica con `negocio` y devuelve (True, MSG_OK).
+        - Si no, `cuentas` no es modificado y devuelve (False, mensaje_error).
+    """
+    if not isinstance(registro, dict):
+        return False, constantes.MSG_INPUT_INVALIDO
+
+    operacion = registro.get("operacion")
+    aplicar = None
+    if isinstance(operacion, str):
+        aplicar = OPERACIONES_LOTE.get(operacion)
+
+    if aplicar is None:
+        return False, constantes.MSG_OPERACION_DESCONOCIDA.format(operacion=operacion)
+
+    return aplicar(cuentas, registro)
+
+
+# los mensajes fijos se repiten en casi todos los registros: se codifican una sola vez
+_MENSAJES_JSON = {
+    mensaje: json.dumps(mensaje, ensure_ascii=False)
+    for mensaje in (
+        constantes.MSG_OK,
+        constantes.MSG_INPUT_INVALIDO,
+        constantes.MSG_DNI_INVALIDO,
+        constantes.MSG_NO_EXISTE_CUENTA,
+        constantes.MSG_NOMBRE_INVALIDO,
+        constantes.MSG_MONTO_INVALIDO,
+        constantes.MSG_TASA_INTERES_INVALIDA,
+        constantes.MSG_MONTO_NO_DISPONIBLE,
+        constantes.MSG_LIMITE_TRANSFERENCIAS,
+        constantes.MSG_SELECCION_INVALIDA,
+        constantes.MSG_PRESTAMO_NO_ACTIVO,
+        constantes.MSG_SALDO_INSUFICIENTE,
+    )
+}
+
+
+def _leer_jsonl(archivo) -> Iterator[tuple[int, dict | None]]:
+    """
+    Recorre un archivo JSONL y devuelve (número de línea, registro) uno por vez.
+    Las líneas vacías se saltean; las líneas mal formadas devuelven None.
+    """
+    for numero_linea, linea in enumerate(archivo, start=1):
+        if not linea.strip():
+            continue
+        try:
+            yield numero_linea, json.loads(linea)
+        except ValueError:
+            yield numero_linea, None
+
+
+def _leer_csv(archivo) -> Iterator[tuple[int, dict | None]]:
+    """
+    Recorre un archivo CSV con encabezado y devuelve (número de línea, registro)
+    uno por vez. Las celdas vacías se ignoran.
+    """
+    lector = csv.DictReader(archivo)
+    for registro in lector:
+        campos = {}
+        for clave, valor in registro.items():
+            if clave is not None and valor:
+                campos[clave.strip()] = valor.strip()
+        yield lector.line_num, campos
+
+
+def leer_registros(archivo, es_csv: bool) -> Iterator[tuple[int, dict | None]]:
+    """
+    Devuelve los registros de un archivo abierto, sin cargarlo completo en memoria.
+
+    Pre:
+        - `archivo` es un archivo de texto abierto para lectura.
+        - `es_csv` indica si el formato es CSV (True) o JSONL (False).
+    Post:
+        - Devuelve un iterador de tuplas (número de línea, registro).
+    """
+    if es_csv:
+        return _leer_csv(archivo)
+    return _leer_jsonl(archivo)
+
+
+def procesar_archivo(
+    cuentas: dict, ruta_entrada: str, ruta_salida: str
+) -> tuple[int, int] | None:
+    """
+    Aplica todos los registros de `ruta_entrada` y escribe un resultado por
+    registro en `ruta_salida`.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+        - `ruta_entrada` es un archivo .csv (con encabezado) o JSONL.
+        - `ruta_salida` es la ruta del archivo JSONL de resultados.
+    Post:
+        - Cada línea de salida es {"linea": n, "ok": bool, "mensaje": str}.
+        - Devuelve (aceptados, rechazados), o None si no se pudieron abrir los archivos.
+    """
+    es_csv = ruta_entrada.lower().endswith(".csv")
+    aceptados = 0
+    rechazados = 0
+
+    try:
+        with open(ruta_entrada, "r", encoding="utf8", newline="") as entrada, open(
+            ruta_salida,
+            "w",
+            encoding="utf8",
+            buffering=constantes.TAMANIO_BUFFER_LOTE,
+        ) as salida:
+            for numero_linea, registro in leer_registros(entrada, es_csv):
+                ok, mensaje = procesar_registro(cuentas, registro)
+
+                mensaje_json = _MENSAJES_JSON.get(mensaje)
+                if mensaje_json is None:
+                    mensaje_json = json.dumps(mensaje, ensure_ascii=False)
+
+                if ok:
+                    aceptados += 1
+                    salida.write(
+                        f'{{"linea": {numero_linea}, "ok": true, '
+                        f'"mensaje": {mensaje_json}}}\n'
+                    )
+                else:
+                    rechazados += 1
+                    salida.write(
+                        f'{{"linea": {numero_linea}, "ok": false, '
+                        f'"mensaje": {mensaje_json}}}\n'
+                    )
+    except OSError:
+        return None
+
+    return aceptados, rechazados
+
+
+def main():
+    """
+    Punto de entrada del procesamiento por lotes.
+
+    Post:
+        - Procesa el archivo indicado sobre un diccionario `cuentas` vacío
+          e imprime la cantidad de registros aceptados y rechazados.
+    """
+    if len(sys.argv) != 3:
+        print(constantes.MSG_USO_LOTE)
+        return
+
+    resultado = procesar_archivo({}, sys.argv[1], sys.argv[2])
+    if resultado is None:
+        print(constantes.MSG_INPUT_INVALIDO)
+        return
+
+    aceptados, rechazados = resultado
+    print(constantes.MSG_RESUMEN_LOTE.format(aceptados=aceptados, rechazados=rechazados))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Pruebas del procesamiento por lotes (`lote`).
+
+Se pueden correr con pytest o directamente con `python lote_test.py`.
+"""
+
+import io
+import json
+import os
+import tempfile
+
+import constantes
+import lote
+import negocio
+
+ANA = "12.345.678"
+JUAN = "23.456.789"
+
+
+def _procesar(ruta_entrada: str, contenido: str) -> tuple:
+    """
+    Escribe `contenido` en `ruta_entrada` (dentro de un directorio temporal),
+    lo procesa sobre cuentas vacías y devuelve (resultado, cuentas, líneas de salida).
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        entrada = os.path.join(directorio, ruta_entrada)
+        salida = os.path.join(directorio, "resultados.jsonl")
+        with open(entrada, "w", encoding="utf8", newline="") as archivo:
+            archivo.write(contenido)
+
+        cuentas = {}
+        resultado = lote.procesar_archivo(cuentas, entrada, salida)
+        with open(salida, encoding="utf8") as archivo:
+            lineas = [json.loads(linea) for linea in archivo]
+    return resultado, cuentas, lineas
+
+
+def test_01_lectura_jsonl():
+    archivo = io.StringIO(
+        '{"operacion": "crear_cuenta", "dni": "12.345.678"}\n'
+        "\n"
+        "   \n"
+        "{no es json\n"
+        "[1, 2]\n"
+    )
+    assert list(lote.leer_registros(archivo, es_csv=False)) == [
+        (1, {"operacion": "crear_cuenta", "dni": "12.345.678"}),
+        (4, None),
+        (5, [1, 2]),
+    ]
+
+
+def test_02_lectura_csv():
+    archivo = io.StringIO(
+        "operacion,nombre,dni,monto\n"
+        "crear_cuenta, Ana Lopez ,12.345.678,\n"
+        'ingresar_dinero,,12.345.678," 500 "\n'
+        "ingresar_dinero,,12.345.678\n"
+    )
+    assert list(lote.leer_registros(archivo, es_csv=True)) == [
+        (2, {"operacion": "crear_cuenta", "nombre": "Ana Lopez", "dni": ANA}),
+        (3, {"operacion": "ingresar_dinero", "dni": ANA, "monto": "500"}),
+        (4, {"operacion": "ingresar_dinero", "dni": ANA}),
+    ]
+
+
+def test_03_motivos_de_rechazo():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    negocio.acreditar_dinero(cuentas, 12_345_678, 1_000)
+    negocio.otorgar_prestamo(cuentas, 23_456_789, 10, 100)  # deuda 130
+    negocio.pagar_prestamo(
+        cuentas[23_456_789], cuentas[23_456_789]["prestamos"][1], 130
+    )
+    negocio.otorgar_prestamo(cuentas, 23_456_789, 10, 100)
+
+    casos = [
+        (None, constantes.MSG_INPUT_INVALIDO),
+        ([1, 2], constantes.MSG_INPUT_INVALIDO),
+        ({}, constantes.MSG_OPERACION_DESCONOCIDA.format(operacion=None)),
+        (
+            {"operacion": "volar"},
+            constantes.MSG_OPERACION_DESCONOCIDA.format(operacion="volar"),
+        ),
+        (
+            {"operacion": "crear_cuenta", "nombre": "Ana 2", "dni": "34.567.890"},
+            constantes.MSG_NOMBRE_INVALIDO,
+        ),
+        (
+            {"operacion": "crear_cuenta", "nombre": "Eva Diaz", "dni": 34_567_890},
+            constantes.MSG_DNI_INVALIDO,
+        ),
+        (
+            {"operacion": "crear_cuenta", "nombre": "Eva Diaz", "dni": ANA},
+            constantes.MSG_CUENTA_EXISTE.format(nombre="Ana Lopez"),
+        ),
+        (
+            {"operacion": "ingresar_dinero", "dni": "34.567.890", "monto": 500},
+            constantes.MSG_NO_EXISTE_CUENTA,
+        ),
+        (
+            {"operacion": "ingresar_dinero", "dni": ANA, "monto": 99},
+            constantes.MSG_MONTO_INVALIDO,
+        ),
+        (
+            {"operacion": "ingresar_dinero", "dni": ANA, "monto": True},
+            constantes.MSG_MONTO_INVALIDO,
+        ),
+        (
+            {"operacion": "ingresar_dinero", "dni": ANA, "monto": "cien"},
+            constantes.MSG_MONTO_INVALIDO,
+        ),
+        (
+            {"operacion": "transferir_dinero", "dni": ANA, "dni_destino": ANA, "monto": 100},
+            constantes.MSG_INPUT_INVALIDO,
+        ),
+        (
+            {"operacion": "transferir_dinero", "dni": ANA, "dni_destino": "1", "monto": 100},
+            constantes.MSG_DNI_INVALIDO,
+        ),
+        (
+            {"operacion": "transferir_dinero", "dni": ANA, "dni_destino": JUAN, "monto": 5_000},
+            constantes.MSG_MONTO_NO_DISPONIBLE,
+        ),
+        (
+            {"operacion": "otorgar_prestamo", "dni": ANA, "interes": 4, "monto": 500},
+            constantes.MSG_TASA_INTERES_INVALIDA,
+        ),
+        (
+            {"operacion": "otorgar_prestamo", "dni": ANA, "interes": 10, "monto": 50},
+            constantes.MSG_MONTO_INVALIDO,
+        ),
+        (
+            {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": "x", "monto": 10},
+            constantes.MSG_SELECCION_INVALIDA,
+        ),
+        (
+            {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": 1, "monto": 10},
+            constantes.MSG_PRESTAMO_NO_ACTIVO,
+        ),
+        (
+            {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": 3, "monto": 10},
+            constantes.MSG_SELECCION_INVALIDA,
+        ),
+        (
+            {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": 2, "monto": 0},
+            constantes.MSG_MONTO_INVALIDO,
+        ),
+        (
+            {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": 2, "monto": 500},
+            constantes.MSG_SALDO_INSUFICIENTE,
+        ),
+    ]  # fmt: skip
+
+    antes = json.dumps(cuentas, sort_keys=True)
+    for registro, mensaje in casos:
+        assert lote.procesar_registro(cuentas, registro) == (False, mensaje), registro
+    # ningún rechazo modifica las cuentas
+    assert json.dumps(cuentas, sort_keys=True) == antes
+
+
+def test_04_archivo_jsonl_completo():
+    registros = [
+        {"operacion": "crear_cuenta", "nombre": "Ana Lopez", "dni": ANA},
+        {"operacion": "crear_cuenta", "nombre": "Juan Perez", "dni": JUAN},
+        {"operacion": "ingresar_dinero", "dni": ANA, "monto": 1_000},
+        {"operacion": "transferir_dinero", "dni": ANA, "dni_destino": JUAN, "monto": 400},
+        {"operacion": "transferir_dinero", "dni": ANA, "dni_destino": JUAN, "monto": 700},
+        {"operacion": "otorgar_prestamo", "dni": JUAN, "interes": 10, "monto": 1_000},
+        {"operacion": "pagar_prestamo", "dni": JUAN, "id_prestamo": 1, "monto": 5_000},
+    ]  # fmt: skip
+    contenido = "".join(json.dumps(registro) + "\n" for registro in registros)
+    contenido += "\n{roto\n"
+
+    resultado, cuentas, lineas = _procesar("entrada.jsonl", contenido)
+    assert resultado == (5, 3)
+    assert [(linea["linea"], linea["ok"]) for linea in lineas] == [
+        (1, True),
+        (2, True),
+        (3, True),
+        (4, True),
+        (5, False),
+        (6, True),
+        (7, False),
+        (9, False),
+    ]
+    assert lineas[4]["mensaje"] == constantes.MSG_MONTO_NO_DISPONIBLE
+    assert lineas[6]["mensaje"] == constantes.MSG_SALDO_INSUFICIENTE
+    assert lineas[7]["mensaje"] == constantes.MSG_INPUT_INVALIDO
+    assert cuentas[12_345_678]["saldo_disponible"] == 600
+    assert cuentas[23_456_789]["saldo_disponible"] == 1_400
+    assert cuentas[23_456_789]["deuda_pendiente"] == 1_300
+
+
+def test_05_archivo_csv_completo():
+    contenido = (
+        "operacion,nombre,dni,dni_destino,interes,monto,id_prestamo\n"
+        "crear_cuenta,Ana Lopez,12.345.678,,,,\n"
+        "crear_cuenta,Juan Perez,23.456.789,,,,\n"
+        "ingresar_dinero,,12.345.678,,,1000,\n"
+        "transferir_dinero,,12.345.678,23.456.789,,400,\n"
+        "otorgar_prestamo,,23.456.789,,10,1000,\n"
+        "pagar_prestamo,,23.456.789,,,500,1\n"
+        "pagar_prestamo,,23.456.789,,,500,9\n"
+        "crear_cuenta,Ana Lopez,12.345.678,,,,\n"
+    )
+    resultado, cuentas, lineas = _procesar("entrada.CSV", contenido)
+    assert resultado == (6, 2)
+    assert [linea["linea"] for linea in lineas] == list(range(2, 10))
+    assert lineas[-2]["mensaje"] == constantes.MSG_SELECCION_INVALIDA
+    assert lineas[-1]["mensaje"] == constantes.MSG_CUENTA_EXISTE.format(
+        nombre="Ana Lopez"
+    )
+    assert cuentas[23_456_789]["saldo_disponible"] == 400 + 1_000 - 500
+    assert cuentas[23_456_789]["deuda_pendiente"] == 1_300 - 500
+
+    # un archivo que no se puede abrir
+    with tempfile.TemporaryDirectory() as directorio:
+        assert (
+            lote.procesar_archivo(
+                {},
+                os.path.join(directorio, "no_existe.jsonl"),
+                os.path.join(directorio, "resultados.jsonl"),
+            )
+            is None
+        )
+
+
+def main():
+    pruebas = [
+        test_01_lectura_jsonl,
+        test_02_lectura_csv,
+        test_03_motivos_de_rechazo,
+        test_04_archivo_jsonl_completo,
+        test_05_archivo_csv_completo,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
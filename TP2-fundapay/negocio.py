@@ -1,33 +1,212 @@
 """
 Este módulo contiene la lógica de negocio.
+
+Cada función que modifica un diccionario de cuentas publica un evento (un
+diccionario con la clave "tipo" y los datos de la operación) a los
+observadores suscriptos a ese diccionario con `suscribir`. Así los índices y
+reportes se mantienen al día sin recorrer `cuentas`. Si no hay observadores,
+publicar no tiene costo.
+
+Las transferencias de un diccionario de cuentas pueden además pasar por un
+limitador (ver `velocidad`), instalado con `limitar_transferencias`, y sus
+registros viejos de transferencias pueden pasarse a un archivo en disco (ver
+`archivo_transferencias`), instalado con `archivar_transferencias`. Sin
+ellos, no hay costo extra.
+
+Observadores, limitador y archivador son de un diccionario de cuentas en
+particular: otro diccionario (el de una prueba, el de un fragmento en otro
+proceso) no los usa.
 """
 
+import amortizacion
 import constantes
 
+# ganchos instalados en cada diccionario de cuentas, por id(cuentas):
+#   {"cuentas": cuentas, "observadores": [...], "limitador": f o None, "archivador": f o None}
+# se guarda el diccionario para que su id no se reutilice mientras tenga ganchos
+_ganchos = {}
+
+
+def _ganchos_de(cuentas: dict) -> dict | None:
+    """
+    Devuelve los ganchos instalados en `cuentas`, o None si no tiene.
+    """
+    if not _ganchos:
+        return None
+    return _ganchos.get(id(cuentas))
+
+
+def _ganchos_de_cuenta(cuenta: dict) -> dict | None:
+    """
+    Devuelve los ganchos del diccionario de cuentas que contiene a `cuenta`,
+    o None si no tiene. Es para las funciones que reciben solo la cuenta.
+    """
+    for ganchos in _ganchos.values():
+        if ganchos["cuentas"].get(cuenta["dni"]) is cuenta:
+            return ganchos
+    return None
+
+
+def _instalar(cuentas: dict, clave: str, valor) -> None:
+    """
+    Asigna un gancho de `cuentas` y quita su entrada si ya no le queda ninguno.
+    """
+    ganchos = _ganchos.get(id(cuentas))
+    if ganchos is None:
+        ganchos = {
+            "cuentas": cuentas,
+            "observadores": [],
+            "limitador": None,
+            "archivador": None,
+        }
+        _ganchos[id(cuentas)] = ganchos
+    ganchos[clave] = valor
+
+    if (
+        not ganchos["observadores"]
+        and ganchos["limitador"] is None
+        and ganchos["archivador"] is None
+    ):
+        del _ganchos[id(cuentas)]
+
+
+def suscribir(cuentas: dict, observador) -> None:
+    """
+    Registra una función que recibe cada evento de las modificaciones de `cuentas`.
+
+    Pre:
+        - `observador` es una función que recibe un diccionario de evento.
+    Post:
+        - `observador` se llama después de cada modificación de `cuentas`,
+          en el orden en que se suscribió.
+    """
+    ganchos = _ganchos.get(id(cuentas))
+    observadores = [] if ganchos is None else ganchos["observadores"]
+    _instalar(cuentas, "observadores", observadores + [observador])
+
+
+def desuscribir(cuentas: dict, observador) -> None:
+    """
+    Quita un observador registrado con `suscribir`. Si no estaba, no hace nada.
+    """
+    ganchos = _ganchos.get(id(cuentas))
+    if ganchos is not None and observador in ganchos["observadores"]:
+        observadores = list(ganchos["observadores"])
+        observadores.remove(observador)
+        _instalar(cuentas, "observadores", observadores)
+
+
+def _observadores_de(cuentas: dict) -> list:
+    """
+    Devuelve los observadores suscriptos a `cuentas` (vacío si no tiene).
+    """
+    ganchos = _ganchos_de(cuentas)
+    return () if ganchos is None else ganchos["observadores"]
+
+
+def _publicar(observadores: list, evento: dict) -> None:
+    """
+    Entrega el evento a los observadores, en orden.
+    """
+    for observador in observadores:
+        observador(evento)
+
+
+def limitar_transferencias(cuentas: dict, limitador) -> None:
+    """
+    Instala (o quita, con None) el limitador de las transferencias de `cuentas`.
+
+    Pre:
+        - `limitador` es una función que recibe (dni_origen, monto) o
+          (dni_origen, monto_total, cantidad) para `cantidad` transferencias
+          juntas, y devuelve True si están permitidas, registrándolas en ese caso.
+    Post:
+        - `transferir_dinero` rechaza las transferencias que el limitador no permite.
+    """
+    _instalar(cuentas, "limitador", limitador)
+
+
+def archivar_transferencias(cuentas: dict, archivador) -> None:
+    """
+    Instala (o quita, con None) el archivador de transferencias viejas de `cuentas`.
+
+    Pre:
+        - `archivador` es una función que recibe (dni, lista de registros de
+          transferencia, del más viejo al más nuevo) y los guarda.
+    Post:
+        - Cuando una cuenta llega a 2 * `TRANSFERENCIAS_EN_MEMORIA` registros,
+          los `TRANSFERENCIAS_EN_MEMORIA` más viejos se pasan al archivador y
+          se quitan de la cuenta.
+    """
+    _instalar(cuentas, "archivador", archivador)
+
 
-def registrar_cuenta(cuentas: dict, nombre: str, dni: str) -> None:
+def registrar_cuenta(cuentas: dict, nombre: str, dni: int) -> None:
     """
     Crea una cuenta nueva y actualiza `cuentas`.
 
     Pre:
         - `cuentas` es el diccionario de cuentas.
         - `nombre` es el nombre y apellido del titular.
-        - `dni` es un identificador único no repetido en `cuentas`.
+        - `dni` es el DNI como entero, no repetido en `cuentas`.
     Post:
         - Se agrega una nueva cuenta con saldo inicial 0, sin préstamos ni transferencias.
+        - Se publica `EVENTO_CUENTA_REGISTRADA`.
+    """
+    cuentas[dni] = _nueva_cuenta(nombre, dni)
+
+    observadores = _observadores_de(cuentas)
+    if observadores:
+        _publicar(
+            observadores,
+            {"tipo": constantes.EVENTO_CUENTA_REGISTRADA, "dni": dni, "nombre": nombre},
+        )
+
+
+def _nueva_cuenta(nombre: str, dni: int) -> dict:
     """
-    nueva_cuenta = {
+    Devuelve el diccionario de una cuenta nueva, con saldo 0 y sin movimientos.
+    """
+    return {
         "nombre_apellido": nombre,
         "dni": dni,
         "saldo_disponible": 0,
         "next_prestamo_id": 1,
-        "prestamos": [],
+        "prestamos": {},
+        "prestamos_saldados": [],
+        "deuda_pendiente": 0,
         "transferencias": [],
     }
-    cuentas[dni] = nueva_cuenta
 
 
-def acreditar_dinero(cuentas: dict, dni: str, monto: int) -> None:
+def registrar_cuentas(cuentas: dict, altas) -> None:
+    """
+    Crea varias cuentas nuevas y las agrega a `cuentas` de una sola vez.
+
+    Pre:
+        - `altas` es un iterable de pares (dni, nombre), con DNI no repetidos
+          entre sí ni en `cuentas`.
+    Post:
+        - Cada cuenta queda igual que con `registrar_cuenta`.
+        - Se publica un `EVENTO_CUENTA_REGISTRADA` por cuenta, en el orden de `altas`.
+    """
+    nuevas = {dni: _nueva_cuenta(nombre, dni) for dni, nombre in altas}
+    cuentas.update(nuevas)
+
+    observadores = _observadores_de(cuentas)
+    if observadores:
+        for dni, cuenta in nuevas.items():
+            _publicar(
+                observadores,
+                {
+                    "tipo": constantes.EVENTO_CUENTA_REGISTRADA,
+                    "dni": dni,
+                    "nombre": cuenta["nombre_apellido"],
+                },
+            )
+
+
+def acreditar_dinero(cuentas: dict, dni: int, monto: int) -> None:
     """
     Acredita un monto en la cuenta indicada.
     Pre:
@@ -35,10 +214,120 @@ def acreditar_dinero(cuentas: dict, dni: str, monto: int) -> None:
         - `monto` es un número entero mayor que cero.
     Post:
         - Se incrementa el saldo disponible de la cuenta por el monto recibido.
+        - Se publica `EVENTO_DINERO_ACREDITADO`.
     """
     cuenta = cuentas[dni]
     cuenta["saldo_disponible"] += monto
 
+    observadores = _observadores_de(cuentas)
+    if observadores:
+        _publicar(
+            observadores,
+            {
+                "tipo": constantes.EVENTO_DINERO_ACREDITADO,
+                "dni": dni,
+                "monto": monto,
+                "saldo": cuenta["saldo_disponible"],
+            },
+        )
+
+
+def _archivador_de_cuenta(cuenta: dict):
+    """
+    Devuelve el archivador del diccionario de cuentas que contiene a `cuenta`, o None.
+    """
+    if not _ganchos:
+        return None
+    ganchos = _ganchos_de_cuenta(cuenta)
+    return None if ganchos is None else ganchos["archivador"]
+
+
+def registrar_transferencia(
+    cuenta: dict, tipo: str, monto: int, dni_contraparte: int
+) -> None:
+    """
+    Agrega un registro de transferencia a la cuenta. No modifica saldos.
+
+    El registro es la tupla (monto, tipo, dni_contraparte): una tupla ocupa
+    bastante menos memoria que un diccionario y cada cuenta acumula una por
+    transferencia.
+
+    Pre:
+        - `cuenta` es el diccionario de una cuenta.
+        - `tipo` es "envia" o "recibe".
+        - `monto` es un entero positivo.
+        - `dni_contraparte` es el DNI de la otra cuenta. El registro guarda solo
+          esa referencia: el nombre se busca al mostrarlo (`presentacion`), así
+          que un cambio de nombre se ve en todo el historial.
+    Post:
+        - Se agrega la transferencia al final de la lista "transferencias" de la cuenta.
+        - Si las cuentas de `cuenta` tienen un archivador instalado y la lista
+          llegó al doble de `TRANSFERENCIAS_EN_MEMORIA`, la mitad más vieja
+          pasa al archivador.
+    """
+    _agregar_transferencia(
+        cuenta, (monto, tipo, dni_contraparte), _archivador_de_cuenta(cuenta)
+    )
+
+
+def _agregar_transferencia(cuenta: dict, registro: tuple, archivador) -> None:
+    """
+    Agrega un registro a la cuenta y archiva la mitad vieja si hace falta
+    (ver `registrar_transferencia`). `archivador` puede ser None.
+    """
+    transferencias = cuenta["transferencias"]
+    transferencias.append(registro)
+
+    # se archiva de a bloques para que cada escritura en disco agrupe varios registros
+    if (
+        archivador is not None
+        and len(transferencias) >= 2 * constantes.TRANSFERENCIAS_EN_MEMORIA
+    ):
+        archivador(
+            cuenta["dni"], transferencias[: constantes.TRANSFERENCIAS_EN_MEMORIA]
+        )
+        del transferencias[: constantes.TRANSFERENCIAS_EN_MEMORIA]
+
+
+def registrar_transferencias(cuenta: dict, registros: list[tuple]) -> None:
+    """
+    Agrega varios registros de transferencia a la cuenta de una sola vez.
+    No modifica saldos.
+
+    Pre:
+        - `registros` son tuplas (monto, tipo, dni_contraparte), como las de
+          `registrar_transferencia`, de la más vieja a la más nueva.
+    Post:
+        - Se agregan al final de la lista "transferencias" de la cuenta.
+        - Si las cuentas de `cuenta` tienen un archivador instalado y la lista
+          llegó al doble de `TRANSFERENCIAS_EN_MEMORIA`, todas menos las
+          `TRANSFERENCIAS_EN_MEMORIA` más nuevas pasan al archivador en un
+          solo bloque.
+    """
+    _agregar_transferencias(cuenta, registros, _archivador_de_cuenta(cuenta))
+
+
+def _agregar_transferencias(cuenta: dict, registros: list[tuple], archivador) -> None:
+    """
+    Agrega los registros a la cuenta y archiva los viejos si hace falta
+    (ver `registrar_transferencias`). `archivador` puede ser None.
+    """
+    cuenta["transferencias"].extend(registros)
+    if archivador is not None:
+        _archivar_viejas(cuenta, archivador)
+
+
+def _archivar_viejas(cuenta: dict, archivador) -> None:
+    """
+    Si la cuenta llegó al doble de `TRANSFERENCIAS_EN_MEMORIA` registros, pasa
+    todos menos los `TRANSFERENCIAS_EN_MEMORIA` más nuevos al archivador.
+    """
+    transferencias = cuenta["transferencias"]
+    if len(transferencias) >= 2 * constantes.TRANSFERENCIAS_EN_MEMORIA:
+        corte = len(transferencias) - constantes.TRANSFERENCIAS_EN_MEMORIA
+        archivador(cuenta["dni"], transferencias[:corte])
+        del transferencias[:corte]
+
 
 def transferir_dinero(cuentas, dni_origen, dni_destino, monto_a_transferir):
     """Realiza la transferencia entre dos cuentas si hay fondos suficientes.
@@ -47,44 +336,174 @@ def transferir_dinero(cuentas, dni_origen, dni_destino, monto_a_transferir):
         - `cuentas` es el diccionario de cuentas.
         - `monto_a_transferir` es un entero positivo.
     Post:
-        - Si el saldo de la cuenta de origen es suficiente:
+        - Igual que `intentar_transferencia`, pero devuelve True si se
+          realizó y False si se rechazó.
+    """
+    return (
+        intentar_transferencia(cuentas, dni_origen, dni_destino, monto_a_transferir)
+        is None
+    )
+
+
+def intentar_transferencia(
+    cuentas: dict, dni_origen: int, dni_destino: int, monto_a_transferir: int
+) -> str | None:
+    """
+    Realiza la transferencia entre dos cuentas si está permitida e informa
+    el motivo si no lo está.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+        - `monto_a_transferir` es un entero positivo.
+    Post:
+        - Si el saldo de la cuenta de origen es suficiente y el limitador
+          instalado la permite:
             - Se debita el monto en la cuenta de origen y se acredita en la cuenta destino.
             - Se registran las transferencias en ambas cuentas (envío y recepción).
-            - Devuelve True.
-        - Si el saldo es insuficiente:
-            - No se modifican los saldos ni los registros.
-            - Devuelve False.
+            - Se publica `EVENTO_TRANSFERENCIA_REALIZADA`.
+            - Devuelve None.
+        - Si no, no se modifican los saldos ni los registros y devuelve el
+          motivo: `MSG_MONTO_NO_DISPONIBLE` o `MSG_LIMITE_TRANSFERENCIAS`.
     """
-
     cuenta_origen = cuentas[dni_origen]
     cuenta_destino = cuentas[dni_destino]
 
     if cuenta_origen["saldo_disponible"] < monto_a_transferir:
-        return False
+        return constantes.MSG_MONTO_NO_DISPONIBLE
+
+    ganchos = _ganchos_de(cuentas)
+    if ganchos is None:
+        archivador = None
+        observadores = ()
+    else:
+        limitador = ganchos["limitador"]
+        if limitador is not None and not limitador(dni_origen, monto_a_transferir):
+            return constantes.MSG_LIMITE_TRANSFERENCIAS
+        archivador = ganchos["archivador"]
+        observadores = ganchos["observadores"]
 
     cuenta_origen["saldo_disponible"] -= monto_a_transferir
     cuenta_destino["saldo_disponible"] += monto_a_transferir
 
-    transferencia_origen = {
-        "monto": monto_a_transferir,
-        "tipo": "envia",
-        "nombre_contraparte": cuenta_destino["nombre_apellido"],
-        "dni_contraparte": dni_destino,
-    }
-    cuenta_origen["transferencias"].append(transferencia_origen)
+    # se guarda el mismo objeto entero de la clave de cada cuenta: todos los
+    # registros que apuntan a una cuenta comparten su DNI en vez de copiarlo
+    _agregar_transferencia(
+        cuenta_origen, (monto_a_transferir, "envia", cuenta_destino["dni"]), archivador
+    )
+    _agregar_transferencia(
+        cuenta_destino, (monto_a_transferir, "recibe", cuenta_origen["dni"]), archivador
+    )
 
-    transferencia_destino = {
-        "monto": monto_a_transferir,
-        "tipo": "recibe",
-        "nombre_contraparte": cuenta_origen["nombre_apellido"],
-        "dni_contraparte": dni_origen,
-    }
-    cuenta_destino["transferencias"].append(transferencia_destino)
+    if observadores:
+        _publicar(
+            observadores,
+            {
+                "tipo": constantes.EVENTO_TRANSFERENCIA_REALIZADA,
+                "dni_origen": dni_origen,
+                "dni_destino": dni_destino,
+                "monto": monto_a_transferir,
+                "saldo_origen": cuenta_origen["saldo_disponible"],
+                "saldo_destino": cuenta_destino["saldo_disponible"],
+            },
+        )
+
+    return None
+
+
+def transferir_lote(cuentas: dict, dni_origen: int, pagos: list[tuple]) -> bool:
+    """
+    Realiza todas las transferencias de `pagos` desde una misma cuenta, o ninguna.
+
+    Es el camino de sueldos y pagos divididos: los fondos y el limitador se
+    verifican una sola vez por el total, y los registros de la cuenta de
+    origen se agregan juntos. El limitador cuenta cada pago como una
+    transferencia: un lote no esquiva los límites de cantidad.
+
+    Pre:
+        - `pagos` es una lista de pares (dni_destino, monto), con cuentas
+          existentes en `cuentas` (pueden repetirse entre sí).
+    Post:
+        - Si todos los montos son positivos, ningún destino es la
+          cuenta de origen, el saldo de origen alcanza para el total y el
+          limitador instalado permite los `len(pagos)` pagos juntos:
+            - Se debita el total de la cuenta de origen y se acredita cada
+              monto en su cuenta destino.
+            - Cada pago queda registrado en ambas cuentas, en el orden de
+              `pagos`, igual que con `transferir_dinero`.
+            - Se publica un `EVENTO_TRANSFERENCIA_REALIZADA` por pago, con los
+              saldos que quedan después de ese pago.
+            - Devuelve True.
+        - Si no, no se modifica ninguna cuenta y devuelve False.
+        - El archivador y los observadores se llaman recién cuando todos los
+          saldos y registros del lote están aplicados: si alguno falla, las
+          cuentas ya quedaron completas y consistentes.
+    """
+    cuenta_origen = cuentas[dni_origen]
+    # se buscan todas las cuentas y se validan los pagos antes de modificar nada
+    cuentas_destino = [cuentas[dni_destino] for dni_destino, _ in pagos]
+
+    total = 0
+    for cuenta_destino, (_, monto) in zip(cuentas_destino, pagos):
+        if monto <= 0 or cuenta_destino is cuenta_origen:
+            return False
+        total += monto
+
+    if cuenta_origen["saldo_disponible"] < total:
+        return False
+
+    ganchos = _ganchos_de(cuentas)
+    if ganchos is None:
+        archivador = None
+        observadores = ()
+    else:
+        limitador = ganchos["limitador"]
+        if limitador is not None and not limitador(dni_origen, total, len(pagos)):
+            return False
+        archivador = ganchos["archivador"]
+        observadores = ganchos["observadores"]
+
+    saldo_origen = cuenta_origen["saldo_disponible"]
+    cuenta_origen["saldo_disponible"] = saldo_origen - total
+
+    dni_cuenta_origen = cuenta_origen["dni"]
+    registros_origen = []
+    eventos = []
+    for cuenta_destino, (_, monto) in zip(cuentas_destino, pagos):
+        cuenta_destino["saldo_disponible"] += monto
+        registros_origen.append((monto, "envia", cuenta_destino["dni"]))
+        cuenta_destino["transferencias"].append((monto, "recibe", dni_cuenta_origen))
+
+        if observadores:
+            saldo_origen -= monto
+            eventos.append(
+                {
+                    "tipo": constantes.EVENTO_TRANSFERENCIA_REALIZADA,
+                    "dni_origen": dni_origen,
+                    "dni_destino": cuenta_destino["dni"],
+                    "monto": monto,
+                    "saldo_origen": saldo_origen,
+                    "saldo_destino": cuenta_destino["saldo_disponible"],
+                }
+            )
+    cuenta_origen["transferencias"].extend(registros_origen)
+
+    # todo el lote ya está aplicado: recién ahora se llama a código de afuera
+    if archivador is not None:
+        _archivar_viejas(cuenta_origen, archivador)
+        for cuenta_destino in {
+            id(cuenta): cuenta for cuenta in cuentas_destino
+        }.values():
+            _archivar_viejas(cuenta_destino, archivador)
+
+    for evento in eventos:
+        _publicar(observadores, evento)
 
     return True
 
 
-def otorgar_prestamo(cuentas, dni, interes, monto):
+def otorgar_prestamo(
+    cuentas, dni, interes, monto, cantidad_cuotas=constantes.CUOTAS_PRESTAMO
+):
     """
     Crea un nuevo préstamo para la cuenta indicada, aplicando los impuestos
     e intereses correspondientes.
@@ -93,20 +512,26 @@ def otorgar_prestamo(cuentas, dni, interes, monto):
         - `cuentas` es el diccionario de cuentas.
         - `interes` es un porcentaje entero mayor o igual al mínimo permitido.
         - `monto` es un número entero mayor o igual al mínimo permitido.
+        - `cantidad_cuotas` es el plazo del préstamo, un entero positivo.
     Post:
-        - Se calcula el total de impuestos e intereses sobre el monto original.
-        - Se crea un nuevo préstamo y se agrega a la lista de préstamos de la cuenta.
+        - Se cotiza el préstamo (`amortizacion.cotizar_prestamo`): impuestos e
+          intereses sobre el monto original, en `cantidad_cuotas` cuotas.
+        - Se crea un nuevo préstamo y se agrega a los préstamos activos de la cuenta.
         - Se actualiza el saldo disponible con el monto prestado.
+        - Se suma la deuda del préstamo a la deuda pendiente de la cuenta.
+        - Se publica `EVENTO_PRESTAMO_OTORGADO`.
     """
     cuenta = cuentas[dni]
-    impuestos_calculados = (constantes.IMPUESTOS_PRESTAMO * monto) // 100
-    intereses_calculados = (interes * monto) // 100
+    cotizacion = amortizacion.cotizar_prestamo(monto, interes, cantidad_cuotas)
+    impuestos_calculados = cotizacion["impuestos"]
+    intereses_calculados = cotizacion["intereses"]
     siguiente_id = cuenta["next_prestamo_id"]
 
     nuevo_prestamo = {
         "id_prestamo": siguiente_id,
         "monto_capital_original": monto,
         "tasa_interes": interes,
+        "cantidad_cuotas": cantidad_cuotas,
         "impuestos_total_original": impuestos_calculados,
         "intereses_total_original": intereses_calculados,
         "capital_pendiente": monto,
@@ -117,9 +542,81 @@ def otorgar_prestamo(cuentas, dni, interes, monto):
         "total_pagado_capital": 0,
     }
 
-    cuenta["prestamos"].append(nuevo_prestamo)
+    cuenta["prestamos"][siguiente_id] = nuevo_prestamo
     cuenta["next_prestamo_id"] += 1
     cuenta["saldo_disponible"] += monto
+    cuenta["deuda_pendiente"] += monto + intereses_calculados + impuestos_calculados
+
+    observadores = _observadores_de(cuentas)
+    if observadores:
+        _publicar(
+            observadores,
+            {
+                "tipo": constantes.EVENTO_PRESTAMO_OTORGADO,
+                "dni": dni,
+                "prestamo": nuevo_prestamo,
+                "saldo": cuenta["saldo_disponible"],
+            },
+        )
+
+
+def buscar_prestamo(cuenta: dict, id_prestamo: int) -> dict | None:
+    """
+    Busca un préstamo activo (con deuda pendiente) de la cuenta por su id.
+
+    Pre:
+        - `cuenta` es el diccionario de una cuenta.
+        - `id_prestamo` es un número entero.
+    Post:
+        - Devuelve el diccionario del préstamo, o None si no existe o ya fue saldado.
+    """
+    return cuenta["prestamos"].get(id_prestamo)
+
+
+def deuda_total_prestamo(prestamo: dict) -> int:
+    """
+    Devuelve la deuda pendiente de un préstamo (impuestos + intereses + capital).
+    """
+    return (
+        prestamo["impuestos_pendientes"]
+        + prestamo["intereses_pendientes"]
+        + prestamo["capital_pendiente"]
+    )
+
+
+def _expandir_prestamo_saldado(saldado: tuple) -> dict:
+    """
+    Reconstruye el diccionario completo de un préstamo archivado en `prestamos_saldados`.
+    Un préstamo saldado no tiene nada pendiente y lo pagado es igual a lo original.
+    """
+    id_prestamo, capital, tasa_interes, impuestos, intereses, cantidad_cuotas = saldado
+    return {
+        "id_prestamo": id_prestamo,
+        "monto_capital_original": capital,
+        "tasa_interes": tasa_interes,
+        "cantidad_cuotas": cantidad_cuotas,
+        "impuestos_total_original": impuestos,
+        "intereses_total_original": intereses,
+        "capital_pendiente": 0,
+        "intereses_pendientes": 0,
+        "impuestos_pendientes": 0,
+        "total_pagado_impuestos": impuestos,
+        "total_pagado_intereses": intereses,
+        "total_pagado_capital": capital,
+    }
+
+
+def listar_prestamos(cuenta: dict) -> list[dict]:
+    """
+    Devuelve todos los préstamos de la cuenta, activos y saldados, ordenados por id.
+    Pensado para mostrar; no se usa al pagar.
+    """
+    prestamos = list(cuenta["prestamos"].values())
+    for saldado in cuenta["prestamos_saldados"]:
+        prestamos.append(_expandir_prestamo_saldado(saldado))
+
+    prestamos.sort(key=lambda prestamo: prestamo["id_prestamo"])
+    return prestamos
 
 
 def aplicar_pago_a_componente(
@@ -182,14 +679,99 @@ def pagar_prestamo(cuentas, prestamo_a_pagar, monto_a_aplicar):
         - Se descuenta del saldo de la cuenta el monto aplicado.
         - Se distribuye el pago entre impuestos, intereses y capital.
         - Si el monto excede la deuda total, solo se aplica lo necesario para saldarla.
+        - Se descuenta el monto aplicado de la deuda pendiente de la cuenta.
+        - Si el préstamo queda saldado, se quita de los activos y se archiva,
+          compactado, en `prestamos_saldados`.
+        - Se publica `EVENTO_PRESTAMO_PAGADO` con el monto aplicado.
     """
-    deuda_total = (
-        prestamo_a_pagar["capital_pendiente"]
-        + prestamo_a_pagar["intereses_pendientes"]
-        + prestamo_a_pagar["impuestos_pendientes"]
-    )
+    deuda_total = deuda_total_prestamo(prestamo_a_pagar)
 
     # caso de un monto mayor a la deuda total, solo se aplica lo necesario para saldarla
     monto_restante = min(monto_a_aplicar, deuda_total)
     cuentas["saldo_disponible"] -= monto_restante
+    cuentas["deuda_pendiente"] -= monto_restante
     distribuir_pago(prestamo_a_pagar, monto_restante)
+
+    _cerrar_pago(cuentas, prestamo_a_pagar, monto_restante)
+
+
+def aplicar_pagos_calculados(cuentas: dict, pagos: list[tuple]) -> None:
+    """
+    Aplica en una sola pasada pagos cuyo reparto entre componentes ya fue
+    calculado afuera (por ejemplo, en bloque por `debito_automatico`).
+
+    Pre:
+        - `pagos` es una lista de tuplas (cuenta, prestamo, monto,
+          pagos_por_componente): `prestamo` es un préstamo activo de `cuenta`,
+          que es una cuenta de `cuentas`, y aparece una sola vez.
+        - `pagos_por_componente` tiene un monto por cada par de
+          `PRIORIDADES_PAGO`, en ese orden, calculado con la misma regla que
+          `distribuir_pago`, y su suma es `monto`.
+    Post:
+        - Mismo resultado que `pagar_prestamo(cuenta, prestamo, monto)` para
+          cada pago, en orden.
+        - Los `EVENTO_PRESTAMO_PAGADO` se publican recién después de aplicar
+          todos los pagos.
+    """
+    observadores = _observadores_de(cuentas)
+    eventos = []
+
+    for cuenta, prestamo, monto, pagos_por_componente in pagos:
+        cuenta["saldo_disponible"] -= monto
+        cuenta["deuda_pendiente"] -= monto
+
+        for (clave_pendiente, clave_pagado), pago in zip(
+            constantes.PRIORIDADES_PAGO, pagos_por_componente
+        ):
+            prestamo[clave_pendiente] -= pago
+            prestamo[clave_pagado] += pago
+
+        _archivar_si_saldado(cuenta, prestamo)
+        if observadores:
+            eventos.append(_evento_pago(cuenta, prestamo, monto))
+
+    for evento in eventos:
+        _publicar(observadores, evento)
+
+
+def _evento_pago(cuenta: dict, prestamo: dict, monto: int) -> dict:
+    """
+    Arma el `EVENTO_PRESTAMO_PAGADO` de un pago recién aplicado.
+    """
+    return {
+        "tipo": constantes.EVENTO_PRESTAMO_PAGADO,
+        "dni": cuenta["dni"],
+        "prestamo": prestamo,
+        "monto": monto,
+        "saldo": cuenta["saldo_disponible"],
+    }
+
+
+def _archivar_si_saldado(cuenta: dict, prestamo: dict) -> None:
+    """
+    Si el préstamo quedó saldado, lo quita de los activos y lo archiva compactado.
+    """
+    if deuda_total_prestamo(prestamo) == 0:
+        del cuenta["prestamos"][prestamo["id_prestamo"]]
+        cuenta["prestamos_saldados"].append(
+            (
+                prestamo["id_prestamo"],
+                prestamo["monto_capital_original"],
+                prestamo["tasa_interes"],
+                prestamo["impuestos_total_original"],
+                prestamo["intereses_total_original"],
+                prestamo["cantidad_cuotas"],
+            )
+        )
+
+
+def _cerrar_pago(cuenta: dict, prestamo: dict, monto: int) -> None:
+    """
+    Archiva el préstamo si quedó saldado y publica `EVENTO_PRESTAMO_PAGADO`.
+    """
+    _archivar_si_saldado(cuenta, prestamo)
+
+    if _ganchos:
+        ganchos = _ganchos_de_cuenta(cuenta)
+        if ganchos is not None and ganchos["observadores"]:
+            _publicar(ganchos["observadores"], _evento_pago(cuenta, prestamo, monto))
@@ -0,0 +1,202 @@
+"""
+Pruebas de la lógica de negocio (`negocio`).
+
+Se pueden correr con pytest o directamente con `python negocio_test.py`.
+"""
+
+import copy
+import random
+
+import constantes
+import negocio
+
+ORIGEN = 12_345_678
+DESTINOS = [23_456_789, 34_567_890, 45_678_901]
+
+
+def _crear_cuentas() -> dict:
+    """Crea la cuenta de origen con saldo 10.000 y tres cuentas destino."""
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", ORIGEN)
+    negocio.acreditar_dinero(cuentas, ORIGEN, 10_000)
+    for dni in DESTINOS:
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+    return cuentas
+
+
+def test_01_lote_invalido_no_modifica_nada():
+    cuentas = _crear_cuentas()
+    antes = copy.deepcopy(cuentas)
+
+    for pagos in (
+        [(DESTINOS[0], 100), (DESTINOS[1], -50)],  # monto negativo
+        [(DESTINOS[0], 100), (DESTINOS[1], 0)],  # monto cero
+        [(DESTINOS[0], 100), (ORIGEN, 100)],  # el origen como destino
+        [(DESTINOS[0], 5_000), (DESTINOS[1], 5_001)],  # saldo insuficiente
+    ):
+        assert not negocio.transferir_lote(cuentas, ORIGEN, pagos)
+        assert cuentas == antes
+
+
+def test_02_lote_queda_completo_aunque_falle_un_observador():
+    cuentas = _crear_cuentas()
+    recibidos = []
+
+    def observador(evento):
+        recibidos.append(evento)
+        raise RuntimeError("Observador con error")
+
+    negocio.suscribir(cuentas, observador)
+    try:
+        negocio.transferir_lote(
+            cuentas, ORIGEN, [(dni, 1_000) for dni in DESTINOS + DESTINOS[:1]]
+        )
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Se esperaba RuntimeError")
+    finally:
+        negocio.desuscribir(cuentas, observador)
+
+    # el observador se llamó después de aplicar todo el lote
+    assert len(recibidos) == 1
+    assert cuentas[ORIGEN]["saldo_disponible"] == 6_000
+    assert len(cuentas[ORIGEN]["transferencias"]) == 4
+    assert cuentas[DESTINOS[0]]["saldo_disponible"] == 2_000
+    assert cuentas[DESTINOS[0]]["transferencias"] == [
+        (1_000, "recibe", ORIGEN),
+        (1_000, "recibe", ORIGEN),
+    ]
+
+
+def test_03_lote_con_archivador_y_eventos_por_pago():
+    cuentas = _crear_cuentas()
+    archivadas = {}
+    eventos = []
+
+    def archivador(dni, transferencias):
+        archivadas.setdefault(dni, []).extend(transferencias)
+
+    negocio.archivar_transferencias(cuentas, archivador)
+    negocio.suscribir(cuentas, eventos.append)
+    try:
+        pagos = [(DESTINOS[indice % 2], 1 + indice) for indice in range(80)]
+        assert negocio.transferir_lote(cuentas, ORIGEN, pagos)
+    finally:
+        negocio.archivar_transferencias(cuentas, None)
+        negocio.desuscribir(cuentas, eventos.append)
+
+    for dni in (ORIGEN, DESTINOS[0], DESTINOS[1]):
+        en_memoria = cuentas[dni]["transferencias"]
+        assert len(en_memoria) == constantes.TRANSFERENCIAS_EN_MEMORIA
+        historial = archivadas.get(dni, []) + en_memoria
+        assert len(historial) == (80 if dni == ORIGEN else 40)
+    assert archivadas[DESTINOS[0]] + cuentas[DESTINOS[0]]["transferencias"] == [
+        (monto, "recibe", ORIGEN) for dni, monto in pagos if dni == DESTINOS[0]
+    ]
+
+    assert [evento["monto"] for evento in eventos] == [monto for _, monto in pagos]
+    assert eventos[-1]["saldo_origen"] == cuentas[ORIGEN]["saldo_disponible"]
+    assert eventos[0]["saldo_origen"] == 10_000 - 1
+
+
+def test_04_deuda_pendiente_y_prestamos_saldados():
+    cuentas = _crear_cuentas()
+    cuenta = cuentas[ORIGEN]
+    negocio.otorgar_prestamo(cuentas, ORIGEN, 10, 1_000)  # deuda 1300
+    negocio.otorgar_prestamo(cuentas, ORIGEN, 20, 500)  # deuda 700
+    negocio.otorgar_prestamo(cuentas, ORIGEN, 5, 2_000)  # deuda 2500
+    assert cuenta["deuda_pendiente"] == 4_500
+
+    # el segundo se paga en dos partes y queda saldado
+    segundo = cuenta["prestamos"][2]
+    negocio.pagar_prestamo(cuenta, segundo, 150)
+    assert segundo["impuestos_pendientes"] == 0
+    assert segundo["intereses_pendientes"] == 50
+    assert cuenta["deuda_pendiente"] == 4_350
+
+    esperado = copy.deepcopy(segundo)
+    negocio.pagar_prestamo(cuenta, segundo, 10_000)  # solo se aplica lo que falta
+    for clave_pendiente, clave_pagado in constantes.PRIORIDADES_PAGO:
+        esperado[clave_pagado] += esperado[clave_pendiente]
+        esperado[clave_pendiente] = 0
+
+    assert 2 not in cuenta["prestamos"]
+    assert cuenta["prestamos_saldados"] == [
+        (2, 500, 20, 100, 100, constantes.CUOTAS_PRESTAMO)
+    ]
+    assert cuenta["deuda_pendiente"] == 3_800
+    assert cuenta["saldo_disponible"] == 10_000 + 3_500 - 700
+
+    # el préstamo archivado se reconstruye igual que como quedó al saldarse
+    assert negocio._expandir_prestamo_saldado(cuenta["prestamos_saldados"][0]) == (
+        esperado
+    )
+    assert segundo == esperado
+    assert negocio.buscar_prestamo(cuenta, 2) is None
+    assert [
+        prestamo["id_prestamo"] for prestamo in negocio.listar_prestamos(cuenta)
+    ] == [
+        1,
+        2,
+        3,
+    ]
+    assert negocio.listar_prestamos(cuenta)[1] == esperado
+
+
+def test_05_deuda_pendiente_con_operaciones_al_azar():
+    generador = random.Random(5)
+    cuentas = _crear_cuentas()
+    cuenta = cuentas[ORIGEN]
+    otorgado = 0
+    pagado = 0
+
+    for _ in range(500):
+        if not cuenta["prestamos"] or generador.random() < 0.3:
+            negocio.otorgar_prestamo(
+                cuentas, ORIGEN, generador.randint(5, 40), generador.randint(100, 3_000)
+            )
+            otorgado += negocio.deuda_total_prestamo(
+                cuenta["prestamos"][cuenta["next_prestamo_id"] - 1]
+            )
+        else:
+            prestamo = generador.choice(list(cuenta["prestamos"].values()))
+            monto = min(
+                generador.randint(1, 2_000), negocio.deuda_total_prestamo(prestamo)
+            )
+            negocio.pagar_prestamo(cuenta, prestamo, monto)
+            pagado += monto
+
+        assert cuenta["deuda_pendiente"] == sum(
+            negocio.deuda_total_prestamo(prestamo)
+            for prestamo in cuenta["prestamos"].values()
+        )
+        assert cuenta["deuda_pendiente"] == otorgado - pagado
+
+    # cada préstamo está activo o saldado, nunca en los dos
+    activos = set(cuenta["prestamos"])
+    saldados = [saldado[0] for saldado in cuenta["prestamos_saldados"]]
+    assert not activos & set(saldados)
+    assert sorted(activos | set(saldados)) == list(range(1, cuenta["next_prestamo_id"]))
+    for prestamo in negocio.listar_prestamos(cuenta):
+        if prestamo["id_prestamo"] in activos:
+            assert negocio.deuda_total_prestamo(prestamo) > 0
+        else:
+            assert negocio.deuda_total_prestamo(prestamo) == 0
+
+
+def main():
+    pruebas = [
+        test_01_lote_invalido_no_modifica_nada,
+        test_02_lote_queda_completo_aunque_falle_un_observador,
+        test_03_lote_con_archivador_y_eventos_por_pago,
+        test_04_deuda_pendiente_y_prestamos_saldados,
+        test_05_deuda_pendiente_con_operaciones_al_azar,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Contiene las funciones que gestionan las operaciones de la aplicación.
 
 import presentacion
 import constantes
+import entrada_salida
 import validaciones
 import negocio
 
@@ -36,7 +37,7 @@ def crear_cuenta(cuentas: dict) -> None:
 
     negocio.registrar_cuenta(cuentas, nombre, dni)
 
-    print(constantes.MSG_CUENTA_CREADA)
+    entrada_salida.mostrar(constantes.MSG_CUENTA_CREADA)
 
 
 def ingresar_dinero(cuentas: dict) -> None:
@@ -61,13 +62,15 @@ def ingresar_dinero(cuentas: dict) -> None:
     if dni is None:
         return
 
-    monto_a_acreditar = validaciones.solicitar_monto_minimo("Ingrese monto: ", 100)
+    monto_a_acreditar = validaciones.solicitar_monto_minimo(
+        "Ingrese monto: ", constantes.MONTO_MINIMO
+    )
     if monto_a_acreditar is None:
         return
 
     negocio.acreditar_dinero(cuentas, dni, monto_a_acreditar)
 
-    print(
+    entrada_salida.mostrar(
         constantes.MSG_INGRESO_ACREDITADO.format(
             monto=monto_a_acreditar, nombre=cuentas[dni]["nombre_apellido"]
         )
@@ -85,7 +88,7 @@ def transferir_dinero(cuentas: dict) -> None:
         - `cuentas` es el diccionario de cuentas.
     Post:
         - Si la operación es exitosa:
-            - Se ejecuta la función `negocio.transferir_dinero`, que actualiza los saldos
+            - Se ejecuta la función `negocio.intentar_transferencia`, que actualiza los saldos
               y registra las transferencias en ambas cuentas.
             - Se imprime `MSG_TRANSFERENCIA_EXITOSA`.
         - Si alguna validación falla (DNIs inválidos o iguales, monto insuficiente, etc.):
@@ -107,22 +110,23 @@ def transferir_dinero(cuentas: dict) -> None:
         return
 
     if dni_destino == dni_origen:
-        print(constantes.MSG_INPUT_INVALIDO)
+        entrada_salida.mostrar(constantes.MSG_INPUT_INVALIDO)
         return
 
-    monto_a_transferir = validaciones.solicitar_monto_minimo("Ingrese monto: ", 100)
+    monto_a_transferir = validaciones.solicitar_monto_minimo(
+        "Ingrese monto: ", constantes.MONTO_MINIMO
+    )
     if monto_a_transferir is None:
         return
 
-    transferencia_realizada = negocio.transferir_dinero(
+    motivo = negocio.intentar_transferencia(
         cuentas, dni_origen, dni_destino, monto_a_transferir
     )
-
-    if not transferencia_realizada:
-        print(constantes.MSG_MONTO_NO_DISPONIBLE)
+    if motivo is not None:
+        entrada_salida.mostrar(motivo)
         return
 
-    print(
+    entrada_salida.mostrar(
         constantes.MSG_TRANSFERENCIA_EXITOSA.format(
             monto=monto_a_transferir,
             nombre_origen=cuentas[dni_origen]["nombre_apellido"],
@@ -158,17 +162,21 @@ def otorgar_prestamo(cuentas: dict) -> None:
     if dni is None:
         return
 
-    interes = validaciones.solicitar_interes_minimo("Ingrese interés: ", 5)
+    interes = validaciones.solicitar_interes_minimo(
+        "Ingrese interés: ", constantes.INTERES_MINIMO
+    )
     if interes is None:
         return
 
-    monto = validaciones.solicitar_monto_minimo("Ingrese monto: ", 100)
+    monto = validaciones.solicitar_monto_minimo(
+        "Ingrese monto: ", constantes.MONTO_MINIMO
+    )
     if monto is None:
         return
 
     negocio.otorgar_prestamo(cuentas, dni, interes, monto)
 
-    print(
+    entrada_salida.mostrar(
         constantes.MSG_PRESTAMO_CREADO.format(
             nombre=cuentas[dni]["nombre_apellido"],
             balance=cuentas[dni]["saldo_disponible"],
@@ -201,11 +209,13 @@ def pagar_prestamo(cuentas: dict) -> None:
     cuenta = cuentas[dni]
 
     if not validaciones.hay_prestamos_pendientes(cuenta):
-        print(constantes.MSG_PRESTAMO_NO_ACTIVO)
+        entrada_salida.mostrar(constantes.MSG_PRESTAMO_NO_ACTIVO)
         return
 
     # se muestra el saldo disponible de la cuenta y los préstamos pendientes
-    print(constantes.SALDO_DISPONIBLE_TEMPLATE.format(monto=cuenta["saldo_disponible"]))
+    entrada_salida.mostrar(
+        constantes.SALDO_DISPONIBLE_TEMPLATE.format(monto=cuenta["saldo_disponible"])
+    )
 
     prestamo_a_pagar = validaciones.seleccionar_prestamo(cuenta)
     if prestamo_a_pagar is None:
@@ -222,7 +232,7 @@ def pagar_prestamo(cuentas: dict) -> None:
 
     negocio.pagar_prestamo(cuenta, prestamo_a_pagar, monto_a_aplicar)
 
-    print(constantes.MSG_PRESTAMO_PAGADO)
+    entrada_salida.mostrar(constantes.MSG_PRESTAMO_PAGADO)
 
 
 def ver_resumen(cuentas: dict) -> None:
@@ -246,4 +256,4 @@ def ver_resumen(cuentas: dict) -> None:
         return
 
     cuenta = cuentas[dni]
-    presentacion.mostrar_resumen_cuenta(cuenta)
+    presentacion.mostrar_resumen_cuenta(cuenta, cuentas)
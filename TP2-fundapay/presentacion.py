@@ -3,11 +3,27 @@ Este módulo contiene funciones que construyen la interfaz de usuario.
 """
 
 import constantes
+import entrada_salida
+import negocio
+
+
+def formatear_dni(dni: int) -> str:
+    """
+    Convierte la clave numérica de una cuenta al formato XX.YYY.ZZZ.
+
+    Pre:
+        - `dni` es un entero de hasta 8 dígitos.
+    Post:
+        - Devuelve el DNI formateado, completando con ceros a la izquierda.
+    """
+    digitos = f"{dni:08d}"
+    return f"{digitos[:2]}.{digitos[2:5]}.{digitos[5:]}"
 
 
 def pedir_opcion_menu() -> str:
     """
-    Construye el string completo del menú principal y lo usa como prompt para un input().
+    Construye el string completo del menú principal y lo usa como prompt para
+    `entrada_salida.pedir`.
 
     Post:
         - Muestra el menú principal de opciones en la consola.
@@ -23,101 +39,139 @@ def pedir_opcion_menu() -> str:
         "7) Salir\n"
         ">>> "
     )
-    return input(menu_str)
+    return entrada_salida.pedir(menu_str)
 
 
-def mostrar_prestamos_cuenta(cuentas: dict) -> None:
+def formatear_prestamo(prestamo: dict) -> str:
     """
-    Muestra todos los préstamos de una cuenta en el formato especificado.
+    Devuelve el texto de un préstamo según `PRESTAMO_TEMPLATE`.
 
     Pre:
-        - `cuentas` es el diccionario de las cuentas.
+        - `prestamo` es el diccionario de un préstamo.
+    """
+    monto_total_original = (
+        prestamo["monto_capital_original"]
+        + prestamo["intereses_total_original"]
+        + prestamo["impuestos_total_original"]
+    )
+    total_pendiente = (
+        prestamo["capital_pendiente"]
+        + prestamo["intereses_pendientes"]
+        + prestamo["impuestos_pendientes"]
+    )
+
+    return constantes.PRESTAMO_TEMPLATE.format(
+        id_prestamo=prestamo["id_prestamo"],
+        monto_total=monto_total_original,
+        tasa_interes=prestamo["tasa_interes"],
+        total_pendiente=total_pendiente,
+        total_impuestos=prestamo["impuestos_total_original"],
+        total_pagado_impuestos=prestamo["total_pagado_impuestos"],
+        total_intereses=prestamo["intereses_total_original"],
+        total_pagado_intereses=prestamo["total_pagado_intereses"],
+        capital_total=prestamo["monto_capital_original"],
+        total_pagado_capital=prestamo["total_pagado_capital"],
+    )
+
+
+def nombre_contraparte(cuentas: dict, dni: int) -> str:
+    """
+    Devuelve el nombre actual del titular de la cuenta `dni`.
+    Los registros de transferencia guardan solo el DNI de la contraparte.
+
     Post:
-        - Imprime el encabezado `PRESTAMOS_PENDIENTES`.
-        - Si hay préstamos, imprime cada uno siguiendo `PRESTAMO_TEMPLATE`,
-          y muestra los IDs de préstamo desde 1 y en el orden original de otorgamiento.
+        - Si la cuenta no está en `cuentas` (por ejemplo, en otro fragmento),
+          devuelve `NOMBRE_CONTRAPARTE_DESCONOCIDA`.
     """
-    print(constantes.PRESTAMOS_PENDIENTES)
+    cuenta = cuentas.get(dni)
+    if cuenta is None:
+        return constantes.NOMBRE_CONTRAPARTE_DESCONOCIDA
+    return cuenta["nombre_apellido"]
 
-    lista_prestamos = cuentas["prestamos"]
 
-    if not lista_prestamos:
-        return
+def formatear_transferencia(transferencia: tuple, cuentas: dict) -> str:
+    """
+    Devuelve la línea de una transferencia, entrante o saliente.
 
-    for i in range(len(lista_prestamos)):
-        prestamo = lista_prestamos[i]
+    Pre:
+        - `transferencia` es un registro (monto, tipo, dni_contraparte) con
+          tipo "recibe" o "envia".
+        - `cuentas` es el diccionario de cuentas, para buscar el nombre de la contraparte.
+    """
+    monto, tipo, dni_contraparte = transferencia
+    if tipo == "recibe":
+        plantilla = constantes.TRANSFERENCIA_ENTRANTE_TEMPLATE
+    else:
+        plantilla = constantes.TRANSFERENCIA_SALIENTE_TEMPLATE
 
-        monto_total_original = (
-            prestamo["monto_capital_original"]
-            + prestamo["intereses_total_original"]
-            + prestamo["impuestos_total_original"]
-        )
-        total_pendiente = (
-            prestamo["capital_pendiente"]
-            + prestamo["intereses_pendientes"]
-            + prestamo["impuestos_pendientes"]
-        )
+    return plantilla.format(
+        monto=monto,
+        nombre=nombre_contraparte(cuentas, dni_contraparte),
+        dni=formatear_dni(dni_contraparte),
+    )
 
-        print(
-            constantes.PRESTAMO_TEMPLATE.format(
-                id_prestamo=i + 1,
-                monto_total=monto_total_original,
-                tasa_interes=prestamo["tasa_interes"],
-                total_pendiente=total_pendiente,
-                total_impuestos=prestamo["impuestos_total_original"],
-                total_pagado_impuestos=prestamo["total_pagado_impuestos"],
-                total_intereses=prestamo["intereses_total_original"],
-                total_pagado_intereses=prestamo["total_pagado_intereses"],
-                capital_total=prestamo["monto_capital_original"],
-                total_pagado_capital=prestamo["total_pagado_capital"],
-            )
+
+def formatear_resumen_cuenta(cuenta: dict, cuentas: dict) -> list[str]:
+    """
+    Devuelve las líneas del resumen de una cuenta, con el mismo contenido que
+    imprime `mostrar_resumen_cuenta`.
+
+    Pre:
+        - `cuenta` es el diccionario de una cuenta.
+        - `cuentas` es el diccionario de cuentas, para los nombres de las contrapartes.
+    Post:
+        - Devuelve una lista de textos: el encabezado de `RESUMEN_TEMPLATE`,
+          las últimas transferencias (de la más reciente a la más antigua), el
+          título `PRESTAMOS_PENDIENTES` y cada préstamo, activo o saldado.
+    """
+    lineas = [
+        constantes.RESUMEN_TEMPLATE.format(
+            nombre=cuenta["nombre_apellido"], saldo=cuenta["saldo_disponible"]
         )
+    ]
 
+    ultimas_transferencias = cuenta["transferencias"][
+        -constantes.TRANSFERENCIAS_A_MOSTRAR :
+    ][::-1]
+    for transferencia in ultimas_transferencias:
+        lineas.append(formatear_transferencia(transferencia, cuentas))
 
-def mostrar_resumen_cuenta(cuentas: dict) -> None:
+    lineas.append(constantes.PRESTAMOS_PENDIENTES)
+    for prestamo in negocio.listar_prestamos(cuenta):
+        lineas.append(formatear_prestamo(prestamo))
+
+    return lineas
+
+
+def mostrar_prestamos(prestamos) -> None:
+    """
+    Muestra una lista de préstamos en el formato especificado.
+
+    Pre:
+        - `prestamos` es un iterable de diccionarios de préstamo.
+    Post:
+        - Imprime el encabezado `PRESTAMOS_PENDIENTES`.
+        - Imprime cada préstamo siguiendo `PRESTAMO_TEMPLATE`, con su id de préstamo
+          (los ids empiezan en 1 y siguen el orden original de otorgamiento).
+    """
+    entrada_salida.mostrar(constantes.PRESTAMOS_PENDIENTES)
+
+    for prestamo in prestamos:
+        entrada_salida.mostrar(formatear_prestamo(prestamo))
+
+
+def mostrar_resumen_cuenta(cuenta: dict, cuentas: dict) -> None:
     """
     Muestra el resumen completo de una cuenta, incluyendo nombre, saldo,
     últimas 5 transferencias y todos los préstamos.
 
     Pre:
+        - `cuenta` es el diccionario de la cuenta.
         - `cuentas` es el diccionario de las cuentas.
     Post:
-        - Imprime el nombre y saldo de la cuenta usando `RESUMEN_TEMPLATE`.
-        - Si hay transferencias, imprime las últimas 5 transferencias (enviadas o recibidas)
-          desde la más reciente a la más antigua.
-        - Si no hay transferencias, solo se imprime el título de la sección de transferencias.
-        - Luego, llama a `mostrar_prestamos_cuenta` para imprimir la lista de préstamos.
+        - Imprime cada línea de `formatear_resumen_cuenta`: el nombre y saldo
+          de la cuenta, las últimas 5 transferencias (si las hay) desde la
+          más reciente a la más antigua, y la lista de préstamos.
     """
-    print(
-        constantes.RESUMEN_TEMPLATE.format(
-            nombre=cuentas["nombre_apellido"], saldo=cuentas["saldo_disponible"]
-        )
-    )
-
-    if cuentas["transferencias"]:
-        ultimas_transferencias = cuentas["transferencias"][
-            -constantes.TRANSFERENCIAS_A_MOSTRAR :
-        ][::-1]
-        for transferencia in ultimas_transferencias:
-            if transferencia["tipo"] == "recibe":
-                print(
-                    constantes.TRANSFERENCIA_ENTRANTE_TEMPLATE.format(
-                        monto=transferencia["monto"],
-                        nombre=transferencia["nombre_contraparte"],
-                        dni=transferencia["dni_contraparte"],
-                    )
-                )
-            elif transferencia["tipo"] == "envia":
-                print(
-                    constantes.TRANSFERENCIA_SALIENTE_TEMPLATE.format(
-                        monto=transferencia["monto"],
-                        nombre=transferencia["nombre_contraparte"],
-                        dni=transferencia["dni_contraparte"],
-                    )
-                )
-    else:
-        # RESUMEN_TEMPLATE ya incluye "Últimas 5 transferencias:",
-        # por lo que no se necesita un print acá.
-        pass
-
-    mostrar_prestamos_cuenta(cuentas)
+    for linea in formatear_resumen_cuenta(cuenta, cuentas):
+        entrada_salida.mostrar(linea)
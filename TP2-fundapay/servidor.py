@@ -0,0 +1,290 @@
+"""
+Este módulo contiene un servidor asyncio que expone FundaPay por red local.
+
+El protocolo es de líneas: cada pedido es un objeto JSON en una línea y cada
+respuesta también. Los pedidos usan los mismos campos que `lote`, más un "id"
+opcional que se devuelve en la respuesta:
+
+    {"id": 1, "operacion": "transferir_dinero", "dni": "12.345.678",
+     "dni_destino": "23.456.789", "monto": 500}
+    -> {"id": 1, "ok": true, "mensaje": "OK"}
+
+Un pedido que modifica cuentas puede incluir una "clave_idempotencia"
+(texto): si el cliente lo reintenta con la misma clave, recibe la respuesta
+original y la operación no se aplica dos veces (ver `idempotencia`). Un
+pedido distinto con una clave ya usada se rechaza.
+
+Además de las operaciones de `lote`, acepta "ver_resumen" (con "dni"),
+"buscar_cliente" (con "texto", una parte del nombre y apellido; ver
+`indice_nombres`) y "estadisticas" (latencias p50/p99 del servidor). Las
+latencias se acumulan en un histograma (`estadisticas`), así que responder
+"estadisticas" no ordena muestras ni frena el loop de eventos.
+
+Un cliente puede enviar varios pedidos sin esperar las respuestas
+(pipelining): se procesan y responden en orden. La cantidad de conexiones
+atendidas a la vez está acotada por `MAX_CONEXIONES_ACTIVAS`; el resto
+espera su turno.
+"""
+
+import asyncio
+import json
+import resource
+import sys
+import time
+
+import constantes
+import estadisticas
+import idempotencia
+import indice_nombres
+import lote
+import negocio
+import presentacion
+import validaciones
+
+
+def crear_servidor(cuentas: dict) -> dict:
+    """
+    Crea el estado del servidor.
+
+    Pre:
+        - `cuentas` es el diccionario de cuentas.
+    Post:
+        - Devuelve un diccionario con las cuentas, el índice de nombres
+          (suscripto a las altas de `cuentas`), el histograma de latencias
+          (en nanosegundos), la cantidad de pedidos atendidos y el caché de
+          claves de idempotencia.
+    """
+    nombres = indice_nombres.crear_indice(cuentas)
+    indice_nombres.conectar(nombres, cuentas)
+    return {
+        "cuentas": cuentas,
+        "nombres": nombres,
+        "idempotencia": idempotencia.crear_cache(),
+        "latencias": {},
+        "pedidos": 0,
+    }
+
+
+def registrar_latencia(servidor: dict, nanosegundos: int) -> None:
+    """
+    Suma la latencia de un pedido al histograma.
+    """
+    estadisticas.registrar(servidor["latencias"], nanosegundos)
+    servidor["pedidos"] += 1
+
+
+def obtener_estadisticas(servidor: dict) -> dict:
+    """
+    Devuelve la cantidad de pedidos y las latencias p50 y p99 en microsegundos
+    (con el error relativo de a lo sumo 1/16 del histograma).
+    """
+    latencias = servidor["latencias"]
+    return {
+        "pedidos": servidor["pedidos"],
+        "p50_us": round(estadisticas.percentil_histograma(latencias, 0.50) / 1e3, 1),
+        "p99_us": round(estadisticas.percentil_histograma(latencias, 0.99) / 1e3, 1),
+    }
+
+
+def _resumen(cuentas: dict, dni) -> tuple[bool, str, dict | None]:
+    """
+    Arma el resumen de una cuenta con la misma información que muestra
+    `presentacion.mostrar_resumen_cuenta`.
+    """
+    if not isinstance(dni, str) or not validaciones.validar_formato_dni(dni):
+        return False, constantes.MSG_DNI_INVALIDO, None
+
+    cuenta = cuentas.get(validaciones.convertir_dni(dni))
+    if cuenta is None:
+        return False, constantes.MSG_NO_EXISTE_CUENTA, None
+
+    transferencias = []
+    for monto, tipo, dni_contraparte in cuenta["transferencias"][
+        -constantes.TRANSFERENCIAS_A_MOSTRAR :
+    ][::-1]:
+        transferencias.append(
+            {
+                "monto": monto,
+                "tipo": tipo,
+                "nombre_contraparte": presentacion.nombre_contraparte(
+                    cuentas, dni_contraparte
+                ),
+                "dni_contraparte": presentacion.formatear_dni(dni_contraparte),
+            }
+        )
+
+    resumen = {
+        "nombre": cuenta["nombre_apellido"],
+        "saldo": cuenta["saldo_disponible"],
+        "transferencias": transferencias,
+        "prestamos": negocio.listar_prestamos(cuenta),
+    }
+    return True, constantes.MSG_OK, resumen
+
+
+def _buscar_clientes(servidor: dict, texto) -> tuple[bool, str, list | None]:
+    """
+    Busca cuentas por una parte del nombre y devuelve, de la mejor
+    coincidencia a la peor, su DNI formateado y su nombre.
+    """
+    if not isinstance(texto, str):
+        return False, constantes.MSG_INPUT_INVALIDO, None
+
+    cuentas = servidor["cuentas"]
+    encontradas = []
+    for dni in indice_nombres.buscar(servidor["nombres"], texto):
+        encontradas.append(
+            {
+                "dni": presentacion.formatear_dni(dni),
+                "nombre": cuentas[dni]["nombre_apellido"],
+            }
+        )
+    return True, constantes.MSG_OK, encontradas
+
+
+def _huella(pedido: dict) -> str:
+    """
+    Devuelve la huella de un pedido: la operación y sus campos, sin el "id"
+    ni la clave de idempotencia, que cambian entre reintentos o son la clave.
+    """
+    campos = {
+        campo: valor
+        for campo, valor in pedido.items()
+        if campo not in ("id", "clave_idempotencia")
+    }
+    return json.dumps(campos, sort_keys=True)
+
+
+def procesar_pedido(servidor: dict, linea: bytes) -> bytes:
+    """
+    Procesa una línea del protocolo y devuelve la línea de respuesta.
+
+    Pre:
+        - `linea` es una línea recibida del cliente (puede ser inválida).
+    Post:
+        - Si el pedido es válido, se aplica sobre `servidor["cuentas"]`.
+        - Devuelve la respuesta JSON terminada en salto de línea.
+    """
+    try:
+        pedido = json.loads(linea)
+    except ValueError:
+        pedido = None
+
+    if not isinstance(pedido, dict):
+        respuesta = {"id": None, "ok": False, "mensaje": constantes.MSG_INPUT_INVALIDO}
+        return json.dumps(respuesta, ensure_ascii=False).encode() + b"\n"
+
+    operacion = pedido.get("operacion")
+    respuesta = {"id": pedido.get("id")}
+
+    if operacion == "ver_resumen":
+        ok, mensaje, resumen = _resumen(servidor["cuentas"], pedido.get("dni"))
+        respuesta["ok"] = ok
+        respuesta["mensaje"] = mensaje
+        if resumen is not None:
+            respuesta["cuenta"] = resumen
+    elif operacion == "buscar_cliente":
+        ok, mensaje, encontradas = _buscar_clientes(servidor, pedido.get("texto"))
+        respuesta["ok"] = ok
+        respuesta["mensaje"] = mensaje
+        if encontradas is not None:
+            respuesta["cuentas"] = encontradas
+    elif operacion == "estadisticas":
+        respuesta["ok"] = True
+        respuesta["mensaje"] = constantes.MSG_OK
+        respuesta["estadisticas"] = obtener_estadisticas(servidor)
+    else:
+        clave = pedido.get("clave_idempotencia")
+        if clave is not None and not isinstance(clave, str):
+            ok, mensaje = False, constantes.MSG_INPUT_INVALIDO
+        else:
+            try:
+                ok, mensaje = idempotencia.ejecutar_una_vez(
+                    servidor["idempotencia"],
+                    clave,
+                    lambda: lote.procesar_registro(servidor["cuentas"], pedido),
+                    huella=_huella(pedido),
+                )
+            except ValueError:
+                ok, mensaje = False, constantes.MSG_CLAVE_IDEMPOTENCIA_REUTILIZADA
+        respuesta["ok"] = ok
+        respuesta["mensaje"] = mensaje
+
+    return json.dumps(respuesta, ensure_ascii=False).encode() + b"\n"
+
+
+async def _atender_conexion(
+    servidor: dict, semaforo: asyncio.Semaphore, lector, escritor
+) -> None:
+    """
+    Atiende una conexión hasta que el cliente la cierra.
+    Los pedidos se leen y responden en orden; `drain()` frena la lectura si el
+    cliente no consume las respuestas.
+    """
+    async with semaforo:
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+
+                inicio = time.perf_counter_ns()
+                escritor.write(procesar_pedido(servidor, linea))
+                registrar_latencia(servidor, time.perf_counter_ns() - inicio)
+
+                await escritor.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            escritor.close()
+
+
+def elevar_limite_archivos() -> None:
+    """
+    Sube el límite de descriptores abiertos al máximo permitido, para poder
+    tener miles de conexiones a la vez.
+    """
+    _, maximo = resource.getrlimit(resource.RLIMIT_NOFILE)
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (maximo, maximo))
+    except (ValueError, OSError):
+        pass
+
+
+async def servir(servidor: dict, host: str, puerto: int) -> None:
+    """
+    Escucha conexiones en `host`:`puerto` hasta que se cancela.
+    """
+    semaforo = asyncio.Semaphore(constantes.MAX_CONEXIONES_ACTIVAS)
+
+    async def atender(lector, escritor):
+        await _atender_conexion(servidor, semaforo, lector, escritor)
+
+    servidor_red = await asyncio.start_server(
+        atender, host, puerto, backlog=constantes.MAX_CONEXIONES_ACTIVAS
+    )
+    async with servidor_red:
+        await servidor_red.serve_forever()
+
+
+def main():
+    """
+    Inicia el servidor. Uso: python servidor.py [puerto]
+    Al terminar con Ctrl+C imprime las estadísticas de latencia.
+    """
+    puerto = constantes.PUERTO_SERVIDOR
+    if len(sys.argv) > 1:
+        puerto = int(sys.argv[1])
+
+    elevar_limite_archivos()
+    servidor = crear_servidor({})
+    try:
+        asyncio.run(servir(servidor, constantes.HOST_SERVIDOR, puerto))
+    except KeyboardInterrupt:
+        pass
+
+    print(obtener_estadisticas(servidor))
+
+
+if __name__ == "__main__":
+    main()
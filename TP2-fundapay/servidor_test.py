@@ -0,0 +1,215 @@
+"""
+Pruebas del servidor de red (`servidor`).
+
+Se pueden correr con pytest o directamente con `python servidor_test.py`.
+"""
+
+import asyncio
+import json
+import socket
+
+import constantes
+import negocio
+import servidor
+
+
+def _pedir(estado: dict, pedido) -> dict:
+    """Procesa un pedido (un objeto o una línea ya armada) y devuelve la respuesta."""
+    linea = pedido if isinstance(pedido, bytes) else json.dumps(pedido).encode()
+    respuesta = servidor.procesar_pedido(estado, linea + b"\n")
+    assert respuesta.endswith(b"\n")
+    return json.loads(respuesta)
+
+
+def test_01_operaciones_y_resumen():
+    estado = servidor.crear_servidor({})
+    pedidos = [
+        {"id": 1, "operacion": "crear_cuenta", "nombre": "Ana Lopez", "dni": "12.345.678"},
+        {"id": 2, "operacion": "crear_cuenta", "nombre": "Juan Perez", "dni": "23.456.789"},
+        {"id": 3, "operacion": "ingresar_dinero", "dni": "12.345.678", "monto": 1000},
+        {
+            "id": 4,
+            "operacion": "transferir_dinero",
+            "dni": "12.345.678",
+            "dni_destino": "23.456.789",
+            "monto": 400,
+        },
+    ]  # fmt: skip
+    for pedido in pedidos:
+        assert _pedir(estado, pedido) == {
+            "id": pedido["id"],
+            "ok": True,
+            "mensaje": constantes.MSG_OK,
+        }
+
+    respuesta = _pedir(
+        estado, {"id": 5, "operacion": "ver_resumen", "dni": "12.345.678"}
+    )
+    assert respuesta["ok"]
+    assert respuesta["cuenta"] == {
+        "nombre": "Ana Lopez",
+        "saldo": 600,
+        "transferencias": [
+            {
+                "monto": 400,
+                "tipo": "envia",
+                "nombre_contraparte": "Juan Perez",
+                "dni_contraparte": "23.456.789",
+            }
+        ],
+        "prestamos": [],
+    }
+
+
+def test_02_pedidos_invalidos():
+    estado = servidor.crear_servidor({})
+    invalido = {"id": None, "ok": False, "mensaje": constantes.MSG_INPUT_INVALIDO}
+    assert _pedir(estado, b"{no es json") == invalido
+    assert _pedir(estado, b"[1, 2]") == invalido
+
+    assert _pedir(estado, {"id": 1, "operacion": "volar"}) == {
+        "id": 1,
+        "ok": False,
+        "mensaje": constantes.MSG_OPERACION_DESCONOCIDA.format(operacion="volar"),
+    }
+    assert _pedir(estado, {"id": 2, "operacion": "ver_resumen", "dni": "123"}) == {
+        "id": 2,
+        "ok": False,
+        "mensaje": constantes.MSG_DNI_INVALIDO,
+    }
+    assert _pedir(
+        estado, {"id": 3, "operacion": "ver_resumen", "dni": "12.345.678"}
+    ) == {"id": 3, "ok": False, "mensaje": constantes.MSG_NO_EXISTE_CUENTA}
+    assert estado["cuentas"] == {}
+
+
+def test_03_estadisticas_de_latencia():
+    estado = servidor.crear_servidor({})
+    assert servidor.obtener_estadisticas(estado) == {
+        "pedidos": 0,
+        "p50_us": 0.0,
+        "p99_us": 0.0,
+    }
+
+    # 98 pedidos de 10 us y 2 de 1 ms
+    for _ in range(98):
+        servidor.registrar_latencia(estado, 10_000)
+    for _ in range(2):
+        servidor.registrar_latencia(estado, 1_000_000)
+
+    respuesta = _pedir(estado, {"id": 1, "operacion": "estadisticas"})
+    assert respuesta["ok"]
+    estadisticas = respuesta["estadisticas"]
+    assert estadisticas["pedidos"] == 100
+    # el histograma informa el límite inferior del bucket: a lo sumo 1/16 menos
+    assert 10 * 15 / 16 <= estadisticas["p50_us"] <= 10
+    assert 1_000 * 15 / 16 <= estadisticas["p99_us"] <= 1_000
+
+
+def test_04_buscar_cliente_por_nombre():
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", 12_345_678)
+    estado = servidor.crear_servidor(cuentas)
+    # las cuentas creadas después también se encuentran
+    assert _pedir(
+        estado,
+        {"operacion": "crear_cuenta", "nombre": "Mariana Lopez", "dni": "23.456.789"},
+    )["ok"]
+
+    assert _pedir(estado, {"id": 1, "operacion": "buscar_cliente", "texto": "ana"}) == {
+        "id": 1,
+        "ok": True,
+        "mensaje": constantes.MSG_OK,
+        "cuentas": [
+            {"dni": "12.345.678", "nombre": "Ana Lopez"},
+            {"dni": "23.456.789", "nombre": "Mariana Lopez"},
+        ],
+    }
+    respuesta = _pedir(estado, {"operacion": "buscar_cliente", "texto": "MARI lóp"})
+    assert respuesta["cuentas"] == [{"dni": "23.456.789", "nombre": "Mariana Lopez"}]
+    respuesta = _pedir(estado, {"operacion": "buscar_cliente", "texto": "perez"})
+    assert respuesta["ok"] and respuesta["cuentas"] == []
+
+    assert _pedir(estado, {"id": 2, "operacion": "buscar_cliente"}) == {
+        "id": 2,
+        "ok": False,
+        "mensaje": constantes.MSG_INPUT_INVALIDO,
+    }
+
+
+def _puerto_libre() -> int:
+    """Devuelve un puerto local que no está en uso."""
+    with socket.socket() as libre:
+        libre.bind((constantes.HOST_SERVIDOR, 0))
+        return libre.getsockname()[1]
+
+
+async def _sesion_con_pipelining(estado: dict, puerto: int) -> list[dict]:
+    """Envía varios pedidos sin esperar respuestas y devuelve las respuestas."""
+    tarea = asyncio.create_task(
+        servidor.servir(estado, constantes.HOST_SERVIDOR, puerto)
+    )
+    try:
+        for _ in range(100):
+            try:
+                lector, escritor = await asyncio.open_connection(
+                    constantes.HOST_SERVIDOR, puerto
+                )
+                break
+            except OSError:
+                await asyncio.sleep(0.01)
+        else:
+            raise AssertionError("El servidor no empezó a escuchar")
+
+        pedidos = [
+            {"id": 1, "operacion": "crear_cuenta", "nombre": "Ana Lopez", "dni": "12.345.678"},
+            {"id": 2, "operacion": "ingresar_dinero", "dni": "12.345.678", "monto": 500},
+            {"id": 3, "operacion": "ingresar_dinero", "dni": "99.999.999", "monto": 500},
+            {"id": 4, "operacion": "estadisticas"},
+        ]  # fmt: skip
+        escritor.write(
+            b"".join(json.dumps(pedido).encode() + b"\n" for pedido in pedidos)
+        )
+        await escritor.drain()
+
+        respuestas = [json.loads(await lector.readline()) for _ in pedidos]
+        escritor.close()
+        await escritor.wait_closed()
+        return respuestas
+    finally:
+        tarea.cancel()
+        try:
+            await tarea
+        except asyncio.CancelledError:
+            pass
+
+
+def test_05_conexion_con_pipelining():
+    estado = servidor.crear_servidor({})
+    respuestas = asyncio.run(_sesion_con_pipelining(estado, _puerto_libre()))
+
+    # se responden en orden
+    assert [respuesta["id"] for respuesta in respuestas] == [1, 2, 3, 4]
+    assert [respuesta["ok"] for respuesta in respuestas] == [True, True, False, True]
+    assert respuestas[2]["mensaje"] == constantes.MSG_NO_EXISTE_CUENTA
+    # las estadísticas se calculan antes de medir su propio pedido
+    assert respuestas[3]["estadisticas"]["pedidos"] == 3
+    assert estado["pedidos"] == 4
+    assert estado["cuentas"][12_345_678]["saldo_disponible"] == 500
+
+
+def main():
+    pruebas = [
+        test_01_operaciones_y_resumen,
+        test_02_pedidos_invalidos,
+        test_03_estadisticas_de_latencia,
+        test_04_buscar_cliente_por_nombre,
+        test_05_conexion_con_pipelining,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()
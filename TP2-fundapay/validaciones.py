@@ -3,6 +3,8 @@ Este módulo contiene funciones que solicitan y validan las entradas del usuario
 """
 
 import constantes
+import entrada_salida
+import negocio
 import presentacion
 
 
@@ -19,11 +21,9 @@ def _es_solo_letras_y_espacios(cadena: str) -> bool:
     if not cadena:
         return False
 
-    for caracter in cadena:
-        if not (caracter.isalpha() or caracter == " "):
-            return False
-
-    return True
+    # isalpha() recorre la cadena en C; una cadena de solo espacios queda vacía
+    sin_espacios = cadena.replace(" ", "")
+    return not sin_espacios or sin_espacios.isalpha()
 
 
 def es_nombre_apellido_valido(nombre_apellido: str) -> bool:
@@ -52,35 +52,45 @@ def es_nombre_apellido_valido(nombre_apellido: str) -> bool:
     return True
 
 
-def validar_formato_dni(dni: str) -> bool:
+def convertir_dni(dni: str) -> int | None:
     """
-    Valida que el DNI cumpla con el formato XX.YYY.ZZZ y contenga
-    exactamente 8 dígitos numéricos.
+    Valida que el DNI cumpla con el formato XX.YYY.ZZZ y lo convierte
+    al entero de 8 dígitos que se usa como clave en `cuentas`.
 
     Pre:
         - `dni` es una cadena de texto.
     Post:
-        - Devuelve True si `dni_str` tiene la longitud correcta (10 caracteres),
-          los puntos en las posiciones esperadas (2 y 6), y las partes numéricas
-          suman 8 dígitos en total.
-        - Devuelve False en cualquier otro caso.
+        - Devuelve el DNI como entero si `dni` tiene la longitud correcta
+          (10 caracteres), los puntos en las posiciones esperadas (2 y 6),
+          y 8 dígitos numéricos en el resto de las posiciones.
+        - Devuelve None en cualquier otro caso.
     """
     if len(dni) != 10:
-        return False
+        return None
 
     if dni[2] != "." or dni[6] != ".":
-        return False
+        return None
 
-    partes = dni.split(".")
-    for parte in partes:
-        if not parte.isdigit():
-            return False
+    # isdecimal() y no isdigit(): este último acepta caracteres como "²"
+    # que int() no puede convertir
+    digitos = dni[:2] + dni[3:6] + dni[7:]
+    if not digitos.isdecimal():
+        return None
 
-    dni_numerico = "".join(partes)
-    if len(dni_numerico) != 8:
-        return False
+    return int(digitos)
 
-    return True
+
+def validar_formato_dni(dni: str) -> bool:
+    """
+    Valida que el DNI cumpla con el formato XX.YYY.ZZZ y contenga
+    exactamente 8 dígitos numéricos.
+
+    Pre:
+        - `dni` es una cadena de texto.
+    Post:
+        - Devuelve True si `convertir_dni` puede convertirlo, False en caso contrario.
+    """
+    return convertir_dni(dni) is not None
 
 
 def solicitar_nombre_apellido(mensaje: str) -> str | None:
@@ -96,7 +106,7 @@ def solicitar_nombre_apellido(mensaje: str) -> str | None:
         - Devuelve None si el usuario ingresa `COMANDO_RETROCEDER`.
     """
     while True:
-        nombre_apellido = input(mensaje)
+        nombre_apellido = entrada_salida.pedir(mensaje)
 
         if nombre_apellido == constantes.COMANDO_RETROCEDER:
             return None
@@ -104,10 +114,10 @@ def solicitar_nombre_apellido(mensaje: str) -> str | None:
         if es_nombre_apellido_valido(nombre_apellido):
             return nombre_apellido
 
-        print(constantes.MSG_NOMBRE_INVALIDO)
+        entrada_salida.mostrar(constantes.MSG_NOMBRE_INVALIDO)
 
 
-def solicitar_dni(cuentas: dict, mensaje: str, debe_existir: bool) -> str | None:
+def solicitar_dni(cuentas: dict, mensaje: str, debe_existir: bool) -> int | None:
     """
     Solicita al usuario un DNI, valida su formato y su existencia/unicidad
     en el diccionario `cuentas`, según el parámetro `debe_existir`.
@@ -120,31 +130,34 @@ def solicitar_dni(cuentas: dict, mensaje: str, debe_existir: bool) -> str | None
         - Imprime `MSG_DNI_INVALIDO` si el formato es incorrecto.
         - Imprime `MSG_NO_EXISTE_CUENTA` si el DNI no existe cuando se esperaba.
         - Imprime `MSG_CUENTA_EXISTE` si el DNI ya existe cuando no se esperaba.
-        - Devuelve la cadena de texto del DNI validado.
+        - Devuelve el DNI validado como entero (la clave de `cuentas`).
         - Devuelve None si el usuario ingresa `COMANDO_RETROCEDER`, o si el DNI
           no cumple con la condición `debe_existir` tras la primera validación.
     """
     while True:
-        dni = input(mensaje)
+        dni_str = entrada_salida.pedir(mensaje)
 
-        if dni == constantes.COMANDO_RETROCEDER:
+        if dni_str == constantes.COMANDO_RETROCEDER:
             return None
 
-        if not validar_formato_dni(dni):
-            print(constantes.MSG_DNI_INVALIDO)
+        dni = convertir_dni(dni_str)
+        if dni is None:
+            entrada_salida.mostrar(constantes.MSG_DNI_INVALIDO)
             continue
 
         # caso donde el DNI debe existir - debe_existir == True
         if debe_existir:
             if dni not in cuentas:
-                print(constantes.MSG_NO_EXISTE_CUENTA)
+                entrada_salida.mostrar(constantes.MSG_NO_EXISTE_CUENTA)
                 return None
             return dni
 
         # caso donde el DNI NO debe existir (para crear cuenta) - debe_existir == False
         if dni in cuentas:
             nombre_existente = cuentas[dni]["nombre_apellido"]
-            print(constantes.MSG_CUENTA_EXISTE.format(nombre=nombre_existente))
+            entrada_salida.mostrar(
+                constantes.MSG_CUENTA_EXISTE.format(nombre=nombre_existente)
+            )
             return None
 
         return dni
@@ -166,7 +179,7 @@ def solicitar_entero_minimo(
         - Devuelve None si el usuario retrocede o ingresa un valor inválido.
     """
     while True:
-        entero_str = input(mensaje)
+        entero_str = entrada_salida.pedir(mensaje)
 
         if entero_str == constantes.COMANDO_RETROCEDER:
             return None
@@ -174,11 +187,11 @@ def solicitar_entero_minimo(
         try:
             entero_int = int(entero_str)
             if entero_int < min_valor:
-                print(mensaje_error)
+                entrada_salida.mostrar(mensaje_error)
             else:
                 return entero_int
         except ValueError:
-            print(mensaje_error)
+            entrada_salida.mostrar(mensaje_error)
 
 
 def solicitar_monto_minimo(mensaje: str, min_monto: int) -> int | None:
@@ -199,40 +212,36 @@ def solicitar_interes_minimo(mensaje: str, min_interes: int) -> int | None:
     )
 
 
-def solicitar_indice_prestamo(
-    mensaje: str, num_prestamos_disponibles: int
-) -> int | None:
+def solicitar_id_prestamo(mensaje: str, prestamos_activos: dict) -> int | None:
     """
     Solicita al usuario el id de un préstamo a seleccionar,
-    y valida que sea un número entero y esté dentro del rango de préstamos disponibles.
+    y valida que sea un número entero y corresponda a un préstamo activo.
 
     Pre:
         - `mensaje` es una cadena de texto a mostrar como prompt.
-        - `num_prestamos_disponibles` es un número entero positivo que indica
-          la cantidad total de préstamos para validar el rango de selección.
+        - `prestamos_activos` es el diccionario de préstamos activos de la cuenta
+          (id -> préstamo).
     Post:
-        - Solicita el índice repetidamente hasta que sea válido o se ingrese el COMANDO_RETROCEDER.
+        - Solicita el id repetidamente hasta que sea válido o se ingrese el COMANDO_RETROCEDER.
         - Imprime `MSG_SELECCION_INVALIDA` si la entrada no es un entero
-          o está fuera del rango de 1 a `num_prestamos_disponibles`.
-        - Devuelve el índice del préstamo validado.
+          o no es el id de un préstamo activo.
+        - Devuelve el id del préstamo validado.
         - Devuelve None si el usuario ingresa `COMANDO_RETROCEDER`.
     """
     while True:
-        seleccion_str = input(mensaje)
+        seleccion_str = entrada_salida.pedir(mensaje)
 
         if seleccion_str == constantes.COMANDO_RETROCEDER:
             return None
 
         try:
             seleccion_int = int(seleccion_str)
-            if 1 <= seleccion_int <= num_prestamos_disponibles:
-                # ajusta la selección del usuario (id que comienza desde 1) a la posición
-                # de una lista, donde el indice del primer elemento es 0.
-                return seleccion_int - 1
-            print(constantes.MSG_SELECCION_INVALIDA)
+            if seleccion_int in prestamos_activos:
+                return seleccion_int
+            entrada_salida.mostrar(constantes.MSG_SELECCION_INVALIDA)
 
         except ValueError:
-            print(constantes.MSG_SELECCION_INVALIDA)
+            entrada_salida.mostrar(constantes.MSG_SELECCION_INVALIDA)
 
 
 def hay_prestamos_pendientes(cuenta: dict) -> bool:
@@ -244,25 +253,13 @@ def hay_prestamos_pendientes(cuenta: dict) -> bool:
     Post:
         - Devuelve True si hay algún préstamo con deuda pendiente, False en caso contrario.
     """
-    tiene_prestamos_pendientes = False
-
-    for prestamo in cuenta["prestamos"]:
-        deuda_restante = (
-            prestamo["capital_pendiente"]
-            + prestamo["intereses_pendientes"]
-            + prestamo["impuestos_pendientes"]
-        )
-
-        if deuda_restante > 0:
-            tiene_prestamos_pendientes = True
-            break
-
-    return tiene_prestamos_pendientes
+    # la cuenta mantiene el total adeudado, no hace falta recorrer los préstamos
+    return cuenta["deuda_pendiente"] > 0
 
 
 def seleccionar_prestamo(cuenta: dict) -> dict | None:
     """
-    Muestra los préstamos de la cuenta y permite seleccionar uno.
+    Muestra los préstamos activos de la cuenta y permite seleccionar uno.
     Devuelve el préstamo elegido o None si la selección es inválida.
 
     Pre:
@@ -271,15 +268,15 @@ def seleccionar_prestamo(cuenta: dict) -> dict | None:
         - Si la operación es exitosa, devuelve el diccionario de un préstamo.
         - Devuelve None si la selección es inválida.
     """
-    presentacion.mostrar_prestamos_cuenta(cuenta)
-    indice_seleccionado = solicitar_indice_prestamo(
-        "Seleccione préstamo: ", len(cuenta["prestamos"])
+    presentacion.mostrar_prestamos(cuenta["prestamos"].values())
+    id_seleccionado = solicitar_id_prestamo(
+        "Seleccione préstamo: ", cuenta["prestamos"]
     )
 
-    if indice_seleccionado is None:
+    if id_seleccionado is None:
         return None
 
-    return cuenta["prestamos"][indice_seleccionado]
+    return cuenta["prestamos"][id_seleccionado]
 
 
 def obtener_deuda_total_valida(prestamo: dict) -> int | None:
@@ -292,14 +289,10 @@ def obtener_deuda_total_valida(prestamo: dict) -> int | None:
         - Devuelve el monto total pendiente del préstamo o None si ya está saldado,
         e imprime `MSG_PRESTAMO_NO_ACTIVO` en ese caso.
     """
-    deuda_total_prestamo = (
-        prestamo["impuestos_pendientes"]
-        + prestamo["intereses_pendientes"]
-        + prestamo["capital_pendiente"]
-    )
+    deuda_total_prestamo = negocio.deuda_total_prestamo(prestamo)
 
     if deuda_total_prestamo <= 0:
-        print(constantes.MSG_PRESTAMO_NO_ACTIVO)
+        entrada_salida.mostrar(constantes.MSG_PRESTAMO_NO_ACTIVO)
         return None
 
     return deuda_total_prestamo
@@ -315,13 +308,15 @@ def solicitar_monto_pago(cuenta: dict, deuda_total_prestamo: int) -> int | None:
     Post:
         - Devuelve el monto a aplicar o None si es inválido.
     """
-    monto_pago = solicitar_monto_minimo("Ingrese monto a abonar: ", 1)
+    monto_pago = solicitar_monto_minimo(
+        "Ingrese monto a abonar: ", constantes.MONTO_MINIMO_PAGO
+    )
 
     if monto_pago is None:
         return None
 
     if cuenta["saldo_disponible"] < monto_pago:
-        print(constantes.MSG_SALDO_INSUFICIENTE)
+        entrada_salida.mostrar(constantes.MSG_SALDO_INSUFICIENTE)
         return None
 
     return min(monto_pago, deuda_total_prestamo)
@@ -0,0 +1,182 @@
+"""
+Este módulo contiene los límites de velocidad de transferencias por cuenta.
+
+Cada cuenta de origen tiene, por cada ventana (el último minuto y la última
+hora), un contador de transferencias y otro de montos. Una ventana es un
+anillo de buckets de tiempo fijo: el minuto son 12 buckets de 5 segundos y
+la hora 12 de 5 minutos (ver `constantes`), así la memoria por cuenta es fija
+y la ventana se desliza de a un bucket.
+
+Los buckets vencidos no se limpian con un proceso aparte: se descartan recién
+cuando la cuenta vuelve a transferir (envejecimiento perezoso), restando su
+contenido de los totales. Una cuenta inactiva no consume tiempo, y en el caso
+común (otra transferencia en el mismo bucket) no hay nada que descartar.
+
+Estructura de los límites:
+
+    {
+        "configuracion": (segundos_por_bucket_minuto, buckets_minuto,
+                          max_cantidad_minuto, max_monto_minuto,
+                          segundos_por_bucket_hora, buckets_hora,
+                          max_cantidad_hora, max_monto_hora),
+        "cuentas": {dni: estado},
+        "reloj": time.monotonic,
+    }
+
+El estado de cada cuenta es una lista plana (se consulta en cada
+transferencia, así que se evita un diccionario por ventana):
+
+    [bucket_minuto, cantidad_minuto, monto_minuto,
+     bucket_hora, cantidad_hora, monto_hora,
+     anillo_minuto, anillo_hora]
+
+donde cada anillo es una lista con las cantidades de cada bucket seguidas de
+los montos de cada bucket.
+"""
+
+import functools
+import time
+
+import constantes
+import negocio
+
+
+def crear_limites(
+    max_transferencias_minuto: int = constantes.MAX_TRANSFERENCIAS_MINUTO,
+    max_monto_minuto: int = constantes.MAX_MONTO_MINUTO,
+    max_transferencias_hora: int = constantes.MAX_TRANSFERENCIAS_HORA,
+    max_monto_hora: int = constantes.MAX_MONTO_HORA,
+    reloj=time.monotonic,
+) -> dict:
+    """
+    Crea los límites sin ninguna cuenta registrada.
+
+    Pre:
+        - `reloj` es una función sin argumentos que devuelve segundos crecientes.
+    """
+    return {
+        "configuracion": (
+            constantes.SEGUNDOS_POR_BUCKET_MINUTO,
+            constantes.BUCKETS_MINUTO,
+            max_transferencias_minuto,
+            max_monto_minuto,
+            constantes.SEGUNDOS_POR_BUCKET_HORA,
+            constantes.BUCKETS_HORA,
+            max_transferencias_hora,
+            max_monto_hora,
+        ),
+        "cuentas": {},
+        "reloj": reloj,
+    }
+
+
+# posiciones dentro del estado de una cuenta
+_BUCKET = 0
+_CANTIDAD = 1
+_MONTO = 2
+_VENTANA_HORA = 3
+_ANILLO_MINUTO = 6
+_ANILLO_HORA = 7
+
+
+def _envejecer(estado: list, inicio: int, anillo: list, bucket: int, buckets: int):
+    """
+    Avanza la ventana que empieza en `estado[inicio]` hasta `bucket`, restando
+    de sus totales los buckets que quedaron fuera.
+    """
+    ultimo = estado[inicio + _BUCKET]
+    estado[inicio + _BUCKET] = bucket
+    if bucket - ultimo >= buckets:
+        estado[inicio + _CANTIDAD] = 0
+        estado[inicio + _MONTO] = 0
+        anillo[:] = [0] * (2 * buckets)
+        return
+
+    for numero in range(ultimo + 1, bucket + 1):
+        posicion = numero % buckets
+        estado[inicio + _CANTIDAD] -= anillo[posicion]
+        estado[inicio + _MONTO] -= anillo[buckets + posicion]
+        anillo[posicion] = 0
+        anillo[buckets + posicion] = 0
+
+
+def permitir(limites: dict, dni: int, monto: int, cantidad: int = 1) -> bool:
+    """
+    Decide si la cuenta `dni` puede hacer ahora `cantidad` transferencias que
+    suman `monto` (un lote cuenta una transferencia por pago).
+
+    Post:
+        - Si ninguna ventana supera su límite con estas transferencias, las
+          registra en ambas y devuelve True.
+        - Si no, no registra nada y devuelve False.
+    """
+    (
+        segundos_minuto,
+        buckets_minuto,
+        max_cantidad_minuto,
+        max_monto_minuto,
+        segundos_hora,
+        buckets_hora,
+        max_cantidad_hora,
+        max_monto_hora,
+    ) = limites["configuracion"]
+    ahora = limites["reloj"]()
+    bucket_minuto = int(ahora // segundos_minuto)
+    bucket_hora = int(ahora // segundos_hora)
+
+    estado = limites["cuentas"].get(dni)
+    if estado is None:
+        estado = [
+            bucket_minuto,
+            0,
+            0,
+            bucket_hora,
+            0,
+            0,
+            [0] * (2 * buckets_minuto),
+            [0] * (2 * buckets_hora),
+        ]
+        limites["cuentas"][dni] = estado
+
+    anillo_minuto = estado[_ANILLO_MINUTO]
+    anillo_hora = estado[_ANILLO_HORA]
+
+    # en el caso común la transferencia anterior fue en el mismo bucket
+    if estado[_BUCKET] != bucket_minuto:
+        _envejecer(estado, 0, anillo_minuto, bucket_minuto, buckets_minuto)
+    if estado[_VENTANA_HORA + _BUCKET] != bucket_hora:
+        _envejecer(estado, _VENTANA_HORA, anillo_hora, bucket_hora, buckets_hora)
+
+    if (
+        estado[_CANTIDAD] + cantidad > max_cantidad_minuto
+        or estado[_MONTO] + monto > max_monto_minuto
+        or estado[_VENTANA_HORA + _CANTIDAD] + cantidad > max_cantidad_hora
+        or estado[_VENTANA_HORA + _MONTO] + monto > max_monto_hora
+    ):
+        return False
+
+    posicion = bucket_minuto % buckets_minuto
+    anillo_minuto[posicion] += cantidad
+    anillo_minuto[buckets_minuto + posicion] += monto
+    posicion = bucket_hora % buckets_hora
+    anillo_hora[posicion] += cantidad
+    anillo_hora[buckets_hora + posicion] += monto
+
+    estado[_CANTIDAD] += cantidad
+    estado[_MONTO] += monto
+    estado[_VENTANA_HORA + _CANTIDAD] += cantidad
+    estado[_VENTANA_HORA + _MONTO] += monto
+    return True
+
+
+def conectar(limites: dict, cuentas: dict):
+    """
+    Instala los límites en las transferencias de `negocio` entre `cuentas`.
+
+    Post:
+        - Devuelve el limitador instalado. Se quita con
+          `negocio.limitar_transferencias(cuentas, None)`.
+    """
+    limitador = functools.partial(permitir, limites)
+    negocio.limitar_transferencias(cuentas, limitador)
+    return limitador
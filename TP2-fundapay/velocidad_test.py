@@ -0,0 +1,241 @@
+"""
+Pruebas de los límites de velocidad de transferencias (`velocidad`).
+
+Se pueden correr con pytest o directamente con `python velocidad_test.py`.
+"""
+
+import random
+
+import constantes
+import lote
+import negocio
+import velocidad
+
+DNI = 12_345_678
+
+
+class _Reloj:
+    """Reloj manual: devuelve `ahora` y se adelanta a mano."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+def _crear_limites(reloj: _Reloj, **maximos) -> dict:
+    """Crea límites muy altos salvo los indicados en `maximos`."""
+    configuracion = {
+        "max_transferencias_minuto": 10**9,
+        "max_monto_minuto": 10**12,
+        "max_transferencias_hora": 10**9,
+        "max_monto_hora": 10**12,
+    }
+    configuracion.update(maximos)
+    return velocidad.crear_limites(reloj=reloj, **configuracion)
+
+
+def test_01_limite_por_minuto_y_rotacion_de_buckets():
+    reloj = _Reloj()
+    limites = _crear_limites(reloj, max_transferencias_minuto=4)
+    segundos_bucket = constantes.SEGUNDOS_POR_BUCKET_MINUTO
+    ventana = segundos_bucket * constantes.BUCKETS_MINUTO
+
+    # dos en el primer bucket y dos a mitad del minuto
+    assert velocidad.permitir(limites, DNI, 1)
+    assert velocidad.permitir(limites, DNI, 1)
+    reloj.ahora = ventana / 2
+    assert velocidad.permitir(limites, DNI, 1)
+    assert velocidad.permitir(limites, DNI, 1)
+    assert not velocidad.permitir(limites, DNI, 1)
+
+    # el último segundo del primer bucket sigue dentro de la ventana
+    reloj.ahora = ventana - 0.001
+    assert not velocidad.permitir(limites, DNI, 1)
+
+    # al rotar, el primer bucket sale de la ventana y libera dos lugares
+    reloj.ahora = ventana
+    assert velocidad.permitir(limites, DNI, 1)
+    assert velocidad.permitir(limites, DNI, 1)
+    assert not velocidad.permitir(limites, DNI, 1)
+
+    # otra cuenta no comparte el límite
+    assert velocidad.permitir(limites, DNI + 1, 1)
+
+    # después de una ventana entera sin actividad, todo se reinicia
+    reloj.ahora = 10 * ventana
+    for _ in range(4):
+        assert velocidad.permitir(limites, DNI, 1)
+    assert not velocidad.permitir(limites, DNI, 1)
+
+
+def test_02_limites_de_monto_y_por_hora():
+    reloj = _Reloj()
+    limites = _crear_limites(reloj, max_monto_minuto=1_000, max_transferencias_hora=5)
+    ventana_minuto = constantes.SEGUNDOS_POR_BUCKET_MINUTO * constantes.BUCKETS_MINUTO
+    ventana_hora = constantes.SEGUNDOS_POR_BUCKET_HORA * constantes.BUCKETS_HORA
+
+    assert velocidad.permitir(limites, DNI, 600)
+    # superaría el monto del minuto: se rechaza sin registrarse
+    assert not velocidad.permitir(limites, DNI, 401)
+    assert velocidad.permitir(limites, DNI, 400)
+
+    # en minutos distintos no cuenta el monto, pero sí la cantidad por hora
+    for minuto in range(1, 4):
+        reloj.ahora = minuto * ventana_minuto
+        assert velocidad.permitir(limites, DNI, 1_000)
+    reloj.ahora = 4 * ventana_minuto
+    assert not velocidad.permitir(limites, DNI, 1)
+
+    # una hora después vuelve a haber lugar
+    reloj.ahora = ventana_hora
+    assert velocidad.permitir(limites, DNI, 1)
+
+
+def test_03_igual_a_contar_las_transferencias_de_la_ventana():
+    reloj = _Reloj()
+    maximos = {
+        "max_transferencias_minuto": 6,
+        "max_monto_minuto": 3_000,
+        "max_transferencias_hora": 40,
+        "max_monto_hora": 20_000,
+    }
+    limites = _crear_limites(reloj, **maximos)
+    ventanas = (
+        (
+            constantes.SEGUNDOS_POR_BUCKET_MINUTO,
+            constantes.BUCKETS_MINUTO,
+            maximos["max_transferencias_minuto"],
+            maximos["max_monto_minuto"],
+        ),
+        (
+            constantes.SEGUNDOS_POR_BUCKET_HORA,
+            constantes.BUCKETS_HORA,
+            maximos["max_transferencias_hora"],
+            maximos["max_monto_hora"],
+        ),
+    )
+
+    generador = random.Random(3)
+    aceptadas = []  # (instante, monto)
+    rechazos = 0
+    for _ in range(3_000):
+        reloj.ahora += generador.choice((0, 0.5, 2, 7, 40, 400))
+        monto = generador.randint(1, 1_500)
+
+        # modelo de referencia: se cuentan las aceptadas en los buckets de cada ventana
+        esperado = True
+        for segundos, buckets, max_cantidad, max_monto in ventanas:
+            bucket_actual = int(reloj.ahora // segundos)
+            en_ventana = [
+                monto_aceptado
+                for instante, monto_aceptado in aceptadas
+                if int(instante // segundos) > bucket_actual - buckets
+            ]
+            if len(en_ventana) >= max_cantidad or sum(en_ventana) + monto > max_monto:
+                esperado = False
+
+        assert velocidad.permitir(limites, DNI, monto) == esperado
+        if esperado:
+            aceptadas.append((reloj.ahora, monto))
+        else:
+            rechazos += 1
+
+        # las que ya salieron de la hora no vuelven a contar
+        aceptadas = [
+            (instante, monto_aceptado)
+            for instante, monto_aceptado in aceptadas
+            if reloj.ahora - instante
+            < constantes.SEGUNDOS_POR_BUCKET_HORA * (constantes.BUCKETS_HORA + 1)
+        ]
+
+    assert 0 < rechazos < 3_000
+
+
+def test_04_conectado_a_negocio_y_lote():
+    reloj = _Reloj()
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", DNI)
+    negocio.registrar_cuenta(cuentas, "Juan Perez", 23_456_789)
+    negocio.acreditar_dinero(cuentas, DNI, 10_000)
+
+    velocidad.conectar(_crear_limites(reloj, max_transferencias_minuto=1), cuentas)
+    try:
+        registro = {
+            "operacion": "transferir_dinero",
+            "dni": "12.345.678",
+            "dni_destino": "23.456.789",
+            "monto": 100,
+        }
+        assert lote.procesar_registro(cuentas, registro) == (True, constantes.MSG_OK)
+        assert lote.procesar_registro(cuentas, registro) == (
+            False,
+            constantes.MSG_LIMITE_TRANSFERENCIAS,
+        )
+
+        # sin saldo se informa el saldo, aunque también supere el límite
+        registro["monto"] = 100_000
+        assert lote.procesar_registro(cuentas, registro) == (
+            False,
+            constantes.MSG_MONTO_NO_DISPONIBLE,
+        )
+        assert negocio.intentar_transferencia(cuentas, DNI, 23_456_789, 100) == (
+            constantes.MSG_LIMITE_TRANSFERENCIAS
+        )
+    finally:
+        negocio.limitar_transferencias(cuentas, None)
+
+    assert cuentas[DNI]["saldo_disponible"] == 9_900
+    assert negocio.intentar_transferencia(cuentas, DNI, 23_456_789, 100) is None
+
+
+def test_05_un_lote_cuenta_cada_pago():
+    reloj = _Reloj()
+    cuentas = {}
+    negocio.registrar_cuenta(cuentas, "Ana Lopez", DNI)
+    negocio.acreditar_dinero(cuentas, DNI, 10_000)
+    destinos = [23_456_789, 34_567_890, 45_678_901]
+    for dni in destinos:
+        negocio.registrar_cuenta(cuentas, "Cliente Prueba", dni)
+
+    limites = _crear_limites(reloj, max_transferencias_minuto=5)
+    velocidad.conectar(limites, cuentas)
+    try:
+        # 6 pagos no entran en un límite de 5, aunque sean un solo lote
+        pagos = [(dni, 10) for dni in destinos * 2]
+        assert not negocio.transferir_lote(cuentas, DNI, pagos)
+        assert cuentas[DNI]["saldo_disponible"] == 10_000
+
+        # 3 sí; después quedan 2 lugares
+        assert negocio.transferir_lote(cuentas, DNI, pagos[:3])
+        assert not negocio.transferir_lote(cuentas, DNI, pagos[:3])
+        assert negocio.transferir_lote(cuentas, DNI, pagos[:2])
+        assert negocio.intentar_transferencia(cuentas, DNI, destinos[0], 10) == (
+            constantes.MSG_LIMITE_TRANSFERENCIAS
+        )
+    finally:
+        negocio.limitar_transferencias(cuentas, None)
+
+    assert cuentas[DNI]["saldo_disponible"] == 10_000 - 50
+    # pasado el minuto vuelve a haber lugar para un lote
+    reloj.ahora = constantes.SEGUNDOS_POR_BUCKET_MINUTO * constantes.BUCKETS_MINUTO
+    assert velocidad.permitir(limites, DNI, 50, 5)
+    assert not velocidad.permitir(limites, DNI, 1)
+
+
+def main():
+    pruebas = [
+        test_01_limite_por_minuto_y_rotacion_de_buckets,
+        test_02_limites_de_monto_y_por_hora,
+        test_03_igual_a_contar_las_transferencias_de_la_ventana,
+        test_04_conectado_a_negocio_y_lote,
+        test_05_un_lote_cuenta_cada_pago,
+    ]
+    for prueba in pruebas:
+        prueba()
+        print(f"OK {prueba.__name__}")
+
+
+if __name__ == "__main__":
+    main()